@@ -0,0 +1,385 @@
+"""
+Embedding Inference Service - Process-shared, dynamically batched SentenceTransformers inference.
+
+Every SentenceTransformersProvider used to load its own copy of the model and
+encode each request on a private 2-thread pool, so embedding workers that
+submit one text at a time ran many tiny model.encode calls and throughput
+scaled with thread count rather than with load.
+
+This service loads each model once per process and runs one batching thread
+per model. Concurrent requests (from any thread or event loop) are queued and
+coalesced into a single model.encode call of up to EMBEDDING_BATCH_MAX_SIZE
+texts, waiting at most EMBEDDING_BATCH_MAX_WAIT_MS for a batch to fill. Local
+models configured on active Embedding integrations are loaded and warmed up
+during application startup (see warm_up_local_embedding_models).
+
+Inference backends (integration setting 'inference_backend', per tenant):
+- torch: the full-precision PyTorch model (default)
+- onnx_int8: the same model exported to ONNX with dynamic int8 quantization
+  (EMBEDDING_ONNX_QUANTIZATION selects the CPU instruction set), run through
+  ONNX Runtime. Exports are cached under EMBEDDING_ONNX_CACHE_DIR. Requires
+  sentence-transformers[onnx]. compare_backends() reports the cosine similarity
+  drift against the torch backend.
+
+Batch sizes, queue wait and encode latency are recorded per model and backend (see get_stats)
+and exported as pulse_embedding_batcher_* metrics.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.engine_registry import PoolWaitHistogram, WAIT_TIME_BUCKETS
+from app.core.metrics import family_header, get_metrics_registry, histogram_lines, sample_line
+
+logger = logging.getLogger(__name__)
+
+TORCH_BACKEND = "torch"
+ONNX_INT8_BACKEND = "onnx_int8"
+INFERENCE_BACKENDS = (TORCH_BACKEND, ONNX_INT8_BACKEND)
+
+# Upper bounds of the batch size histogram buckets; a final +Inf bucket is implied
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+WARM_UP_TEXT = "warm up"
+
+
+@dataclass
+class _EncodeRequest:
+    texts: List[str]
+    future: Future = field(default_factory=Future)
+    submitted_at: float = field(default_factory=time.perf_counter)
+
+
+class ModelBatcher:
+    """
+    Batching thread for one loaded model.
+
+    submit() enqueues texts and returns a concurrent.futures.Future resolving to
+    their embeddings (one row per text, in order).
+    """
+
+    def __init__(self, model_name: str, model: Any, max_batch_size: int, max_wait_seconds: float):
+        self.model_name = model_name
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+
+        self.batch_sizes = PoolWaitHistogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait = PoolWaitHistogram(WAIT_TIME_BUCKETS)
+        self.encode_time = PoolWaitHistogram(WAIT_TIME_BUCKETS)
+        self.requests = 0
+        self.texts = 0
+        self.failures = 0
+
+        self._queue: "queue.Queue[Optional[_EncodeRequest]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"embedding-batcher-{model_name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        request = _EncodeRequest(list(texts))
+        self._queue.put(request)
+        return request.future
+
+    def stop(self, timeout: float = 5.0):
+        """Finish queued requests and stop the batching thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'texts': self.texts,
+            'failures': self.failures,
+            'queue_depth': self._queue.qsize(),
+            'batch_size': self.batch_sizes.snapshot(),
+            'queue_wait': self.queue_wait.snapshot(),
+            'encode_time': self.encode_time.snapshot(),
+        }
+
+    # ============ BATCHING THREAD ============
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch, size = [first], len(first.texts)
+            deadline = time.perf_counter() + self.max_wait_seconds
+            while size < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            self._encode(batch)
+
+    def _encode(self, batch: List[_EncodeRequest]):
+        # Drop requests whose caller already gave up (e.g. a cancelled await)
+        batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        started = time.perf_counter()
+        for request in batch:
+            self.queue_wait.observe(started - request.submitted_at)
+        texts = [text for request in batch for text in request.texts]
+
+        try:
+            embeddings = self.model.encode(texts, convert_to_numpy=True, batch_size=self.max_batch_size)
+        except Exception as e:
+            logger.error(f"Batched encode of {len(texts)} texts with {self.model_name} failed: {e}")
+            self.failures += len(batch)
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        self.encode_time.observe(time.perf_counter() - started)
+        self.batch_sizes.observe(len(texts))
+        self.requests += len(batch)
+        self.texts += len(texts)
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(embeddings[offset:offset + len(request.texts)])
+            offset += len(request.texts)
+
+
+def batcher_key(model_name: str, backend: str) -> str:
+    """Name of a loaded model/backend pair (as reported by get_stats)."""
+    return f"{model_name}:{backend}"
+
+
+def _load_sentence_transformer(model_name: str, backend: str = TORCH_BACKEND):
+    """Load a SentenceTransformer model on the given backend (blocking operation)"""
+    from sentence_transformers import SentenceTransformer
+
+    if backend == TORCH_BACKEND:
+        return SentenceTransformer(model_name)
+    if backend == ONNX_INT8_BACKEND:
+        return _load_onnx_int8(model_name)
+    raise ValueError(f"Unknown inference backend: {backend}")
+
+
+def _load_onnx_int8(model_name: str):
+    """Load the int8 ONNX export of model_name, exporting and quantizing it on first use."""
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    quantization = os.getenv("EMBEDDING_ONNX_QUANTIZATION", "avx2")
+    file_suffix = f"qint8_{quantization}"
+    export_dir = os.path.join(
+        os.getenv("EMBEDDING_ONNX_CACHE_DIR", "models/onnx"),
+        model_name.strip("/").replace("/", "__")
+    )
+    quantized_file = f"onnx/model_{file_suffix}.onnx"
+
+    if not os.path.exists(os.path.join(export_dir, quantized_file)):
+        logger.info(f"Exporting {model_name} to ONNX with dynamic int8 quantization ({quantization})")
+        # Exports the ONNX graph from the PyTorch weights when the model ships without one
+        model = SentenceTransformer(model_name, backend="onnx")
+        model.save_pretrained(export_dir)
+        export_dynamic_quantized_onnx_model(model, quantization, export_dir, file_suffix=file_suffix)
+
+    return SentenceTransformer(export_dir, backend="onnx", model_kwargs={"file_name": quantized_file})
+
+
+def cosine_similarities(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """Row-wise cosine similarity of two embedding matrices."""
+    expected = np.asarray(expected, dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    norms = np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1)
+    return np.sum(expected * actual, axis=1) / np.maximum(norms, 1e-12)
+
+
+class EmbeddingInferenceService:
+    """Loads each embedding model once per process and serves it through a ModelBatcher."""
+
+    def __init__(self, max_batch_size: Optional[int] = None, max_wait_ms: Optional[float] = None,
+                 model_loader: Callable[[str, str], Any] = _load_sentence_transformer):
+        if max_batch_size is None:
+            max_batch_size = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64"))
+        if max_wait_ms is None:
+            max_wait_ms = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "10"))
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000
+        self.model_loader = model_loader
+
+        self._batchers: Dict[str, ModelBatcher] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def load_model(self, model_name: str, backend: str = TORCH_BACKEND) -> ModelBatcher:
+        """
+        Load model_name on backend if it is not loaded yet (blocking operation).
+
+        Concurrent callers for the same model and backend wait for a single load.
+        """
+        key = batcher_key(model_name, backend)
+        batcher = self._batchers.get(key)
+        if batcher is not None:
+            return batcher
+
+        if backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unknown inference backend: {backend}")
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            batcher = self._batchers.get(key)
+            if batcher is None:
+                logger.info(f"Loading Sentence Transformers model: {model_name} ({backend})")
+                started = time.perf_counter()
+                model = self.model_loader(model_name, backend)
+                batcher = ModelBatcher(key, model, self.max_batch_size, self.max_wait_seconds)
+                with self._lock:
+                    self._batchers[key] = batcher
+                logger.info(f"Loaded model {model_name} ({backend}) in {time.perf_counter() - started:.1f}s")
+        return batcher
+
+    async def load(self, model_name: str, backend: str = TORCH_BACKEND) -> ModelBatcher:
+        """Load model_name on backend without blocking the event loop."""
+        batcher = self._batchers.get(batcher_key(model_name, backend))
+        if batcher is not None:
+            return batcher
+        return await asyncio.to_thread(self.load_model, model_name, backend)
+
+    async def encode(self, model_name: str, texts: List[str], backend: str = TORCH_BACKEND) -> np.ndarray:
+        """Embed texts with model_name on backend, batched together with concurrent requests."""
+        batcher = await self.load(model_name, backend)
+        return await asyncio.wrap_future(batcher.submit(texts))
+
+    async def warm_up(self, models: List[Tuple[str, str]]) -> List[str]:
+        """Load and run one encode per (model, backend) so the first real request is not slowed down."""
+        warmed = []
+        for model_name, backend in models:
+            try:
+                await self.encode(model_name, [WARM_UP_TEXT], backend)
+                warmed.append(batcher_key(model_name, backend))
+            except Exception as e:
+                logger.warning(f"Failed to warm up embedding model {model_name} ({backend}): {e}")
+        return warmed
+
+    async def compare_backends(self, model_name: str, texts: List[str], backend: str = ONNX_INT8_BACKEND,
+                               reference: str = TORCH_BACKEND) -> Dict[str, Any]:
+        """
+        Parity check: cosine similarity between backend and reference embeddings of the same texts.
+
+        drift is 1 - the lowest similarity (0.0 means identical directions).
+        """
+        expected = await self.encode(model_name, texts, reference)
+        actual = await self.encode(model_name, texts, backend)
+        similarities = cosine_similarities(expected, actual)
+        return {
+            'model': model_name,
+            'backend': backend,
+            'reference': reference,
+            'texts': len(texts),
+            'mean_cosine': float(similarities.mean()),
+            'min_cosine': float(similarities.min()),
+            'drift': float(1.0 - similarities.min())
+        }
+
+    def get_model(self, model_name: str, backend: str = TORCH_BACKEND) -> Optional[Any]:
+        batcher = self._batchers.get(batcher_key(model_name, backend))
+        return batcher.model if batcher else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Batch size histogram, queue wait and encode latency per loaded model and backend."""
+        return {name: batcher.get_stats() for name, batcher in list(self._batchers.items())}
+
+    def shutdown(self):
+        """Stop all batching threads and drop the loaded models."""
+        with self._lock:
+            batchers, self._batchers = list(self._batchers.values()), {}
+        for batcher in batchers:
+            batcher.stop()
+
+
+async def warm_up_local_embedding_models() -> List[str]:
+    """Load and warm the local models of all active Embedding integrations (application startup)."""
+    from app.core.database import get_database
+    from app.models.unified_models import Integration
+
+    database = get_database()
+    with database.get_read_session_context() as session:
+        integrations = session.query(Integration).filter(
+            Integration.type == 'Embedding',
+            Integration.active == True
+        ).all()
+        models = sorted({
+            (settings.get('model_path', 'all-mpnet-base-v2'), settings.get('inference_backend', TORCH_BACKEND))
+            for settings in (integration.settings or {} for integration in integrations)
+            if settings.get('source', 'external') == 'local'
+        })
+
+    if not models:
+        return []
+    return await get_embedding_inference_service().warm_up(models)
+
+
+# Global embedding inference service instance
+_embedding_inference_service: Optional[EmbeddingInferenceService] = None
+_embedding_inference_service_lock = threading.Lock()
+
+
+def get_embedding_inference_service() -> EmbeddingInferenceService:
+    """Get the global embedding inference service instance"""
+    global _embedding_inference_service
+    if _embedding_inference_service is None:
+        with _embedding_inference_service_lock:
+            if _embedding_inference_service is None:
+                _embedding_inference_service = EmbeddingInferenceService()
+    return _embedding_inference_service
+
+
+def _collect_metrics() -> List[str]:
+    """Batcher histograms and counters per loaded model and backend (nothing before first use)."""
+    if _embedding_inference_service is None:
+        return []
+    stats = _embedding_inference_service.get_stats()
+    if not stats:
+        return []
+
+    labels = {}
+    for key in stats:
+        model, _, backend = key.rpartition(':')
+        labels[key] = {'model': model, 'backend': backend}
+
+    lines = []
+    for field, documentation in (('batch_size', 'Texts per batched model.encode call.'),
+                                 ('queue_wait', 'Seconds requests waited for their batch.'),
+                                 ('encode_time', 'Seconds per batched model.encode call.')):
+        name = f'pulse_embedding_batcher_{field}' + ('' if field == 'batch_size' else '_seconds')
+        lines.extend(family_header(name, 'histogram', documentation))
+        for key, batcher_stats in stats.items():
+            lines.extend(histogram_lines(name, labels[key], batcher_stats[field]))
+    for field, documentation in (('requests', 'Encode requests served.'), ('texts', 'Texts encoded.'),
+                                 ('failures', 'Encode requests that failed.')):
+        name = f'pulse_embedding_batcher_{field}_total'
+        lines.extend(family_header(name, 'counter', documentation))
+        lines.extend(sample_line(name, labels[key], batcher_stats[field]) for key, batcher_stats in stats.items())
+    lines.extend(family_header('pulse_embedding_batcher_queue_depth', 'gauge', 'Requests waiting for a batch.'))
+    lines.extend(sample_line('pulse_embedding_batcher_queue_depth', labels[key], batcher_stats['queue_depth'])
+                 for key, batcher_stats in stats.items())
+    return lines
+
+
+get_metrics_registry().register_collector(_collect_metrics)
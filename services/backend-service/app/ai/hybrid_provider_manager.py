@@ -12,6 +12,8 @@ from sqlalchemy.orm import Session
 
 from app.models.unified_models import Integration, AIUsageTracking
 from app.core.config import AppConfig
+from app.core.credential_cache import get_credential_cache
+from app.core.metrics import EMBEDDING_BATCH_SIZE
 from .providers.wex_gateway_provider import WEXGatewayProvider
 from .providers.sentence_transformers_provider import SentenceTransformersProvider
 
@@ -80,7 +82,7 @@ class HybridProviderManager:
                     provider=integration.provider,
                     type=integration.type,
                     base_url=integration.base_url,
-                    api_key=AppConfig.decrypt_token(integration.password, AppConfig.load_key()) if integration.password else None,
+                    api_key=get_credential_cache().decrypt(integration.id, integration.password),
                     ai_model=settings.get('model_path', ''),  # model_path from settings JSON
                     ai_model_config=settings,  # Use entire settings as model config
                     cost_config={'cost_tier': settings.get('cost_tier', 'free')},  # Extract cost_tier
@@ -170,6 +172,19 @@ class HybridProviderManager:
             logger.error(f"Error getting embedding provider: {e}")
             return None
 
+    def get_model_key(self, integration_type: str) -> Optional[str]:
+        """
+        Identify the model that auto selection uses for an integration type ('AI' or 'Embedding').
+
+        Returns "<integration_id>:<model>[:<inference_backend>]" (used to key cached
+        results per model), or None if no provider of that type is initialized.
+        """
+        for config in self.provider_configs.values():
+            if config.type == integration_type:
+                backend = config.ai_model_config.get('inference_backend')
+                return f"{config.integration_id}:{config.ai_model}" + (f":{backend}" if backend else "")
+        return None
+
     async def generate_embeddings(self, texts: List[str], tenant_id: int,
                                  preferred_provider: str = "auto") -> ProviderResponse:
         """Generate embeddings with intelligent provider selection"""
@@ -207,6 +222,7 @@ class HybridProviderManager:
             # Generate embeddings using selected provider
             embeddings = await selected_provider.generate_embeddings(texts)
             processing_time = time.time() - start_time
+            EMBEDDING_BATCH_SIZE.observe(len(texts), selected_provider.__class__.__name__)
             
             # Calculate cost (zero for local models)
             cost = await self._calculate_cost(selected_provider, "embedding", len(texts))
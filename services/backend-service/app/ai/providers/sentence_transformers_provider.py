@@ -3,14 +3,14 @@ Sentence Transformers Provider - Phase 3-2 Hybrid Provider Framework
 Local embedding generation using Sentence Transformers for zero-cost operations.
 """
 
-import asyncio
 import logging
 import time
 import threading
 from typing import List, Dict, Any, Optional
-from concurrent.futures import ThreadPoolExecutor
-import numpy as np
 
+from app.ai.embedding_inference_service import (
+    INFERENCE_BACKENDS, TORCH_BACKEND, batcher_key, get_embedding_inference_service
+)
 from app.models.unified_models import Integration
 
 logger = logging.getLogger(__name__)
@@ -29,6 +29,13 @@ class SentenceTransformersProvider:
         self.model_path = settings.get('model_path', 'all-mpnet-base-v2')
         self.model_name = self.model_path
 
+        # 'torch' (full precision) or 'onnx_int8' (quantized ONNX, CPU-optimized)
+        self.inference_backend = settings.get('inference_backend', TORCH_BACKEND)
+        if self.inference_backend not in INFERENCE_BACKENDS:
+            logger.warning(f"Unknown inference_backend '{self.inference_backend}' for integration "
+                           f"{integration.id}, using {TORCH_BACKEND}")
+            self.inference_backend = TORCH_BACKEND
+
         # Model and performance tracking
         self.model = None
         self.model_loaded = False
@@ -36,8 +43,8 @@ class SentenceTransformersProvider:
         self.total_processing_time = 0.0
         self.avg_response_time = 0.0
 
-        # Thread pool for CPU-intensive operations
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        # Model loading and batched encoding are shared by all providers in the process
+        self.inference_service = get_embedding_inference_service()
         self._lock = threading.Lock()
 
     async def initialize(self) -> bool:
@@ -51,14 +58,10 @@ class SentenceTransformersProvider:
             else:
                 logger.info(f"Loading Sentence Transformers model: {self.model_name}")
 
-            # Load model in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            self.model = await loop.run_in_executor(
-                self.executor,
-                self._load_model,
-                self.model_name
-            )
-            
+            # Loaded once per process (a no-op when already loaded or pre-warmed at startup)
+            batcher = await self.inference_service.load(self.model_name, self.inference_backend)
+            self.model = batcher.model
+
             self.model_loaded = True
             logger.info(f"Successfully loaded model: {self.model_name}")
             return True
@@ -70,11 +73,6 @@ class SentenceTransformersProvider:
             logger.error(f"Failed to load Sentence Transformers model {self.model_name}: {e}")
             return False
 
-    def _load_model(self, model_name: str):
-        """Load model in thread pool (blocking operation)"""
-        from sentence_transformers import SentenceTransformer
-        return SentenceTransformer(model_name)
-
     async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Ultra-fast local embedding generation (1000+ embeddings/second)"""
         if not texts:
@@ -87,13 +85,8 @@ class SentenceTransformersProvider:
         start_time = time.time()
 
         try:
-            # Run in thread pool to avoid blocking async loop
-            loop = asyncio.get_event_loop()
-            embeddings = await loop.run_in_executor(
-                self.executor,
-                self._encode_texts,
-                texts
-            )
+            # Coalesced with concurrent requests into one batched encode
+            embeddings = await self.inference_service.encode(self.model_name, texts, self.inference_backend)
 
             processing_time = time.time() - start_time
             
@@ -111,10 +104,6 @@ class SentenceTransformersProvider:
             logger.error(f"Local embedding generation failed: {e}")
             return []
 
-    def _encode_texts(self, texts: List[str]) -> np.ndarray:
-        """Encode texts using the loaded model (blocking operation)"""
-        return self.model.encode(texts, convert_to_numpy=True)
-
     async def health_check(self) -> Dict[str, Any]:
         """Check health of local model"""
         try:
@@ -172,6 +161,8 @@ class SentenceTransformersProvider:
             "request_count": self.request_count,
             "avg_response_time": self.avg_response_time,
             "total_processing_time": self.total_processing_time,
+            "inference_backend": self.inference_backend,
+            "batching": self.inference_service.get_stats().get(batcher_key(self.model_name, self.inference_backend)),
             "status": "active" if self.model_loaded else "inactive"
         }
 
@@ -196,9 +187,7 @@ class SentenceTransformersProvider:
         }
 
     async def cleanup(self):
-        """Cleanup resources"""
-        if self.executor:
-            self.executor.shutdown(wait=True)
+        """Cleanup resources (the shared model stays loaded for other providers)"""
         self.model = None
         self.model_loaded = False
         logger.info("Sentence Transformers provider cleaned up")
@@ -10,7 +10,7 @@ from typing import List, Dict, Any, Optional
 from openai import AsyncOpenAI
 
 from app.models.unified_models import Integration
-from app.core.config import AppConfig
+from app.core.credential_cache import get_credential_cache
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +20,7 @@ class WEXGatewayProvider:
     def __init__(self, integration: Integration):
         self.integration = integration
         self.base_url = integration.base_url
-        self.api_key = AppConfig.decrypt_token(integration.password, AppConfig.load_key()) if integration.password else None
+        self.api_key = get_credential_cache().decrypt(integration.id, integration.password)
 
         # Extract settings from JSON field (new schema)
         settings = integration.settings or {}
@@ -4,11 +4,14 @@ High-performance vector operations with tenant isolation and batch processing.
 """
 
 import asyncio
+import heapq
 import logging
 import time
 import uuid
 from typing import List, Dict, Any, Optional, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from app.core.metrics import QDRANT_UPSERT_DURATION, QDRANT_UPSERTED_POINTS
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +22,7 @@ class VectorSearchResult:
     score: float
     payload: Dict[str, Any]
     vector: Optional[List[float]] = None
+    collection: Optional[str] = None
 
 @dataclass
 class VectorOperationResult:
@@ -29,6 +33,23 @@ class VectorOperationResult:
     processing_time: float
     error: Optional[str] = None
 
+@dataclass
+class MultiCollectionSearchResult:
+    """Merged result of a search fanned out over several collections"""
+    results: List[VectorSearchResult]  # Best score first, across all collections
+    total_found: int
+    processing_time: float
+    collection_status: Dict[str, str] = field(default_factory=dict)  # 'ok' | 'timeout' | 'error' | 'unavailable'
+
+
+def is_missing_collection(error: BaseException) -> bool:
+    """True if a Qdrant error means the collection does not exist (server 404, or local mode's ValueError)"""
+    from qdrant_client.http.exceptions import UnexpectedResponse
+
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 404
+    return isinstance(error, ValueError) and 'not found' in str(error)
+
 class PulseQdrantClient:
     """High-performance Qdrant client with tenant isolation and batch operations"""
 
@@ -38,6 +59,8 @@ class PulseQdrantClient:
         self.host = host or os.getenv("QDRANT_HOST", "localhost")
         self.port = port or int(os.getenv("QDRANT_PORT", "6333"))
         self.timeout = timeout or int(os.getenv("QDRANT_TIMEOUT", "120"))
+        # Per-collection budget of a multi-collection search (search_collections)
+        self.search_timeout = float(os.getenv("QDRANT_SEARCH_TIMEOUT", "5"))
         self.client = None
         self.connected = False
 
@@ -287,6 +310,8 @@ class PulseQdrantClient:
             
             processing_time = time.time() - start_time
             self._update_metrics(processing_time)
+            QDRANT_UPSERT_DURATION.observe(processing_time, 'ok')
+            QDRANT_UPSERTED_POINTS.inc(amount=total_upserted)
             
             logger.info(f"Upserted {total_upserted} vectors to {collection_name}")
             
@@ -298,6 +323,7 @@ class PulseQdrantClient:
             )
 
         except Exception as e:
+            QDRANT_UPSERT_DURATION.observe(time.time() - start_time, 'error')
             logger.error(f"Failed to upsert vectors to {collection_name}: {e}")
             return VectorOperationResult(
                 success=False,
@@ -307,6 +333,56 @@ class PulseQdrantClient:
                 error=str(e)
             )
 
+    async def _search(self, collection_name: str, query_vector: List[float], limit: int,
+                      score_threshold: float, filter_conditions: Optional[Dict[str, Any]]) -> List[VectorSearchResult]:
+        """Search one collection (raises on failure)"""
+        from qdrant_client.http import models
+
+        start_time = time.time()
+
+        # Build filter if provided
+        query_filter = None
+        if filter_conditions:
+            query_filter = models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key=key,
+                        match=models.MatchValue(value=value)
+                    )
+                    for key, value in filter_conditions.items()
+                ]
+            )
+
+        # Perform search
+        search_result = await asyncio.get_event_loop().run_in_executor(
+            None,
+            lambda: self.client.search(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                query_filter=query_filter,
+                limit=limit,
+                with_payload=True
+            )
+        )
+
+        processing_time = time.time() - start_time
+        self._update_metrics(processing_time)
+
+        # Convert to our result format
+        results = []
+        for hit in search_result:
+            if hit.score >= score_threshold:
+                results.append(VectorSearchResult(
+                    id=str(hit.id),
+                    score=hit.score,
+                    payload=hit.payload or {},
+                    vector=hit.vector,
+                    collection=collection_name
+                ))
+
+        logger.debug(f"Found {len(results)} similar vectors in {collection_name}")
+        return results
+
     async def search_vectors(self, collection_name: str, query_vector: List[float],
                            limit: int = 10, score_threshold: float = 0.0,
                            filter_conditions: Optional[Dict[str, Any]] = None) -> List[VectorSearchResult]:
@@ -314,57 +390,75 @@ class PulseQdrantClient:
         if not self.connected:
             return []
 
-        start_time = time.time()
-        
         try:
-            from qdrant_client.http import models
-            
-            # Build filter if provided
-            query_filter = None
-            if filter_conditions:
-                query_filter = models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key=key,
-                            match=models.MatchValue(value=value)
-                        )
-                        for key, value in filter_conditions.items()
-                    ]
-                )
-            
-            # Perform search
-            search_result = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.search(
-                    collection_name=collection_name,
-                    query_vector=query_vector,
-                    query_filter=query_filter,
-                    limit=limit,
-                    with_payload=True
-                )
-            )
-            
-            processing_time = time.time() - start_time
-            self._update_metrics(processing_time)
-            
-            # Convert to our result format
-            results = []
-            for hit in search_result:
-                if hit.score >= score_threshold:
-                    results.append(VectorSearchResult(
-                        id=str(hit.id),
-                        score=hit.score,
-                        payload=hit.payload or {},
-                        vector=hit.vector
-                    ))
-            
-            logger.debug(f"Found {len(results)} similar vectors in {collection_name}")
-            return results
-
+            return await self._search(collection_name, query_vector, limit, score_threshold, filter_conditions)
         except Exception as e:
             logger.error(f"Vector search failed in {collection_name}: {e}")
             return []
 
+    async def search_collections(self, collection_names: List[str], query_vector: List[float],
+                                 limit: int = 10, score_threshold: float = 0.0,
+                                 filter_conditions: Optional[Dict[str, Any]] = None,
+                                 timeout: Optional[float] = None,
+                                 top_k: Optional[int] = None) -> MultiCollectionSearchResult:
+        """
+        Search several collections concurrently and merge the hits by score.
+
+        `limit` hits are requested per collection; the best `top_k` (default `limit`)
+        across all collections are returned.
+
+        Each collection gets `timeout` seconds (default QDRANT_SEARCH_TIMEOUT); a collection
+        that times out ('timeout'), does not exist ('unavailable') or fails ('error')
+        contributes no hits and is reported in collection_status instead of failing or
+        stalling the whole search. Total latency is that of the slowest collection
+        (bounded by the timeout), not the sum.
+        """
+        start_time = time.time()
+        if not self.connected:
+            return MultiCollectionSearchResult(
+                results=[], total_found=0, processing_time=0.0,
+                collection_status={name: 'unavailable' for name in collection_names}
+            )
+
+        timeout = self.search_timeout if timeout is None else timeout
+
+        async def search_one(collection_name: str):
+            try:
+                hits = await asyncio.wait_for(
+                    self._search(collection_name, query_vector, limit, score_threshold, filter_conditions),
+                    timeout
+                )
+                return collection_name, hits, 'ok'
+            except asyncio.TimeoutError:
+                # The executor thread finishes in the background; its result is discarded
+                logger.warning(f"Vector search in {collection_name} timed out after {timeout}s")
+                return collection_name, [], 'timeout'
+            except Exception as e:
+                if is_missing_collection(e):
+                    logger.info(f"Vector search skipped {collection_name}: collection does not exist")
+                    return collection_name, [], 'unavailable'
+                logger.warning(f"Vector search failed in {collection_name}: {e}")
+                return collection_name, [], 'error'
+
+        outcomes = await asyncio.gather(*(search_one(name) for name in collection_names))
+
+        all_hits = [hit for _, hits, _ in outcomes for hit in hits]
+        return MultiCollectionSearchResult(
+            results=heapq.nlargest(top_k or limit, all_hits, key=lambda hit: hit.score),
+            total_found=len(all_hits),
+            processing_time=time.time() - start_time,
+            collection_status={name: status for name, _, status in outcomes}
+        )
+
+    async def get_collection_info(self, collection_name: str) -> Dict[str, Any]:
+        """Point count and status of a collection (raises if it does not exist)"""
+        info = await asyncio.to_thread(self.client.get_collection, collection_name)
+        return {
+            "name": collection_name,
+            "points_count": info.points_count or 0,
+            "status": str(getattr(info.status, 'value', info.status))
+        }
+
     def _update_metrics(self, processing_time: float):
         """Update performance metrics"""
         self.operation_count += 1
@@ -0,0 +1,165 @@
+"""
+Query Cache - Process-level cache of query embeddings and intents.
+
+AIQueryProcessor is created per request, and every query used to regenerate its
+embedding (and re-run intent analysis) even when the same question was asked
+moments ago or the user was paging through results. This cache keeps both in
+memory, keyed by tenant, the model that produced them and the normalized query
+text, so a repeated query never reaches the provider.
+
+Entries expire after AI_QUERY_CACHE_TTL_SECONDS and the least recently used
+entries are evicted beyond AI_QUERY_CACHE_MAX_ENTRIES (per kind). Only
+successful provider results are cached; heuristic fallback intents are not, so
+intent analysis is retried once the provider recovers.
+"""
+
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING = "embedding"
+INTENT = "intent"
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text for cache lookups (case and whitespace insensitive)."""
+    return " ".join(query.casefold().split())
+
+
+class _LRUStore:
+    """Thread-safe LRU map with a TTL and hit/miss/eviction counters per tenant."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[int, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._counters: Dict[int, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tenant_id: int, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get((tenant_id, key))
+            if entry is not None and time.monotonic() - entry[0] >= self.ttl_seconds:
+                del self._entries[(tenant_id, key)]
+                entry = None
+            if entry is None:
+                self._count(tenant_id, "misses")
+                return None
+            self._entries.move_to_end((tenant_id, key))
+            self._count(tenant_id, "hits")
+            return entry[1]
+
+    def put(self, tenant_id: int, key: Hashable, value: Any):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[(tenant_id, key)] = (time.monotonic(), value)
+            self._entries.move_to_end((tenant_id, key))
+            while len(self._entries) > self.max_entries:
+                (evicted_tenant, _), _ = self._entries.popitem(last=False)
+                self._count(evicted_tenant, "evictions")
+
+    def invalidate_tenant(self, tenant_id: int):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == tenant_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+    def stats(self, tenant_id: Optional[int] = None) -> Dict[str, int]:
+        with self._lock:
+            if tenant_id is None:
+                counters = self._counters.values()
+                size = len(self._entries)
+            else:
+                counters = [self._counters.get(tenant_id, {})]
+                size = sum(1 for key in self._entries if key[0] == tenant_id)
+            stats = {name: sum(c.get(name, 0) for c in counters) for name in ("hits", "misses", "evictions")}
+            stats["size"] = size
+            return stats
+
+    def _count(self, tenant_id: int, name: str):
+        counters = self._counters.setdefault(tenant_id, {})
+        counters[name] = counters.get(name, 0) + 1
+
+
+class QueryCache:
+    """
+    Tenant-scoped LRU/TTL cache of query embeddings and query intents.
+
+    Keys include the model that produced the value (see
+    HybridProviderManager.get_model_key), so switching a tenant's embedding or
+    AI model never serves vectors or intents from the previous one.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        if max_entries is None:
+            max_entries = int(os.getenv("AI_QUERY_CACHE_MAX_ENTRIES", "1000"))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("AI_QUERY_CACHE_TTL_SECONDS", "3600"))
+        self._stores = {
+            EMBEDDING: _LRUStore(max_entries, ttl_seconds),
+            INTENT: _LRUStore(max_entries, ttl_seconds),
+        }
+
+    # ============ EMBEDDINGS ============
+
+    def get_embedding(self, tenant_id: int, model_key: str, query: str) -> Optional[List[float]]:
+        """Cached embedding of query, or None on a miss."""
+        vector = self._stores[EMBEDDING].get(tenant_id, (model_key, normalize_query(query)))
+        return list(vector) if vector is not None else None
+
+    def put_embedding(self, tenant_id: int, model_key: str, query: str, vector: List[float]):
+        # Stored as a tuple so callers cannot mutate the cached vector
+        self._stores[EMBEDDING].put(tenant_id, (model_key, normalize_query(query)), tuple(vector))
+
+    # ============ INTENTS ============
+
+    def get_intent(self, tenant_id: int, model_key: str, query: str) -> Optional[Dict[str, Any]]:
+        """Cached intent analysis of query, or None on a miss."""
+        intent = self._stores[INTENT].get(tenant_id, (model_key, normalize_query(query)))
+        return copy.deepcopy(intent) if intent is not None else None
+
+    def put_intent(self, tenant_id: int, model_key: str, query: str, intent: Dict[str, Any]):
+        self._stores[INTENT].put(tenant_id, (model_key, normalize_query(query)), copy.deepcopy(intent))
+
+    # ============ MAINTENANCE ============
+
+    def invalidate_tenant(self, tenant_id: int):
+        """Drop all cached embeddings and intents of one tenant."""
+        for store in self._stores.values():
+            store.invalidate_tenant(tenant_id)
+        logger.debug(f"Query cache invalidated for tenant {tenant_id}")
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        for store in self._stores.values():
+            store.clear()
+
+    def stats(self, tenant_id: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """Hit/miss/eviction counters and current size per kind, for one tenant or overall."""
+        return {kind: store.stats(tenant_id) for kind, store in self._stores.items()}
+
+
+# Global query cache instance
+_query_cache: Optional[QueryCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryCache:
+    """Get the global query cache instance"""
+    global _query_cache
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                _query_cache = QueryCache()
+    return _query_cache
@@ -7,13 +7,14 @@ import asyncio
 import json
 import logging
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from .hybrid_provider_manager import HybridProviderManager
-from .qdrant_client import PulseQdrantClient
+from .qdrant_client import PulseQdrantClient, is_missing_collection
+from .query_cache import get_query_cache
 from ..models.unified_models import QdrantVector
 
 logger = logging.getLogger(__name__)
@@ -37,6 +38,7 @@ class AIQueryProcessor:
         self.db_session = db_session
         self.hybrid_provider_manager = HybridProviderManager(db_session)
         self.qdrant_client = PulseQdrantClient()
+        self.query_cache = get_query_cache()
 
     async def initialize(self, tenant_id: int):
         """Initialize query processor"""
@@ -74,6 +76,7 @@ class AIQueryProcessor:
                 metadata={
                     "intent": query_intent,
                     "steps": result["steps"],
+                    "collection_status": result.get("collection_status", {}),
                     "context": context or {}
                 }
             )
@@ -93,6 +96,12 @@ class AIQueryProcessor:
 
     async def _analyze_query_intent(self, query: str, tenant_id: int) -> Dict[str, Any]:
         """Analyze query to determine processing approach"""
+        model_key = self.hybrid_provider_manager.get_model_key("AI")
+        if model_key:
+            cached_intent = self.query_cache.get_intent(tenant_id, model_key, query)
+            if cached_intent is not None:
+                return cached_intent
+
         try:
             # Use AI provider to analyze query intent
             prompt = f"""Analyze this query and determine the best processing approach:
@@ -115,6 +124,8 @@ Respond with JSON:
             if provider_response.success:
                 try:
                     intent_data = json.loads(provider_response.data)
+                    if model_key:
+                        self.query_cache.put_intent(tenant_id, model_key, query, intent_data)
                     return intent_data
                 except json.JSONDecodeError:
                     logger.warning(f"Failed to parse intent analysis JSON: {provider_response.data}")
@@ -153,18 +164,39 @@ Respond with JSON:
             "complexity": "medium"
         }
 
+    async def _get_query_embedding(self, query: str, tenant_id: int) -> Tuple[Optional[List[float]], bool]:
+        """
+        Embedding of query from the query cache, or from the embedding provider on a miss.
+
+        Returns (vector, served_from_cache); vector is None if generation failed.
+        """
+        model_key = self.hybrid_provider_manager.get_model_key("Embedding")
+        if model_key:
+            query_vector = self.query_cache.get_embedding(tenant_id, model_key, query)
+            if query_vector is not None:
+                return query_vector, True
+
+        embedding_response = await self.hybrid_provider_manager.generate_embeddings(
+            texts=[query],
+            tenant_id=tenant_id,
+            preferred_provider="auto"
+        )
+        if not embedding_response.success:
+            return None, False
+
+        query_vector = embedding_response.data[0]
+        if model_key:
+            self.query_cache.put_embedding(tenant_id, model_key, query, query_vector)
+        return query_vector, False
+
     async def _process_semantic_query(self, query: str, tenant_id: int,
                                     intent: Dict[str, Any]) -> Dict[str, Any]:
         """Process query using semantic search"""
         try:
-            # Generate embedding for the query
-            embedding_response = await self.hybrid_provider_manager.generate_embeddings(
-                texts=[query],
-                tenant_id=tenant_id,
-                preferred_provider="auto"
-            )
+            # Generate (or reuse) the embedding for the query
+            query_vector, cached = await self._get_query_embedding(query, tenant_id)
 
-            if not embedding_response.success:
+            if query_vector is None:
                 return {
                     "answer": "I couldn't process your semantic query.",
                     "sources": [],
@@ -172,8 +204,6 @@ Respond with JSON:
                     "steps": ["embedding_generation_failed"]
                 }
 
-            query_vector = embedding_response.data[0]
-
             # Search across relevant collections
             collections_to_search = [
                 f"client_{tenant_id}_work_items",
@@ -182,32 +212,15 @@ Respond with JSON:
                 f"client_{tenant_id}_projects"
             ]
 
-            all_results = []
-            for collection_name in collections_to_search:
-                try:
-                    search_results = await self.qdrant_client.search_vectors(
-                        collection_name=collection_name,
-                        query_vector=query_vector,
-                        limit=5,
-                        score_threshold=0.7
-                    )
-
-                    # Convert VectorSearchResult to dict format
-                    for result in search_results:
-                        all_results.append({
-                            "id": result.id,
-                            "score": result.score,
-                            "payload": result.payload,
-                            "collection": collection_name
-                        })
-
-                except Exception as e:
-                    logger.warning(f"Search failed for collection {collection_name}: {e}")
-                    continue
-
-            # Sort by score and limit results
-            all_results.sort(key=lambda x: x.get("score", 0), reverse=True)
-            top_results = all_results[:10]
+            # Query all collections concurrently; slow or missing ones are skipped
+            search = await self.qdrant_client.search_collections(
+                collection_names=collections_to_search,
+                query_vector=query_vector,
+                limit=5,
+                score_threshold=0.7,
+                top_k=10
+            )
+            top_results = [self._search_result_to_dict(result) for result in search.results]
 
             # Generate response based on results
             if top_results:
@@ -221,7 +234,8 @@ Respond with JSON:
                 "answer": response,
                 "sources": top_results,
                 "confidence": confidence,
-                "steps": ["embedding_generation", "semantic_search", "response_generation"]
+                "steps": ["embedding_cache_hit" if cached else "embedding_generation", "semantic_search", "response_generation"],
+                "collection_status": search.collection_status
             }
 
         except Exception as e:
@@ -359,22 +373,16 @@ Return only the SQL query, no explanation."""
                             limit: int = 10) -> Dict[str, Any]:
         """Perform semantic search across specified collections"""
         try:
-            # Generate embedding for the query
-            embedding_response = await self.hybrid_provider_manager.generate_embeddings(
-                texts=[query],
-                tenant_id=tenant_id,
-                preferred_provider="auto"
-            )
+            # Generate (or reuse) the embedding for the query
+            query_vector, _ = await self._get_query_embedding(query, tenant_id)
 
-            if not embedding_response.success:
+            if query_vector is None:
                 return {
                     "success": False,
                     "results": [],
                     "error": "Failed to generate query embedding"
                 }
 
-            query_vector = embedding_response.data[0]
-
             # Use provided collections or default ones
             if not collections:
                 collections = [
@@ -384,38 +392,20 @@ Return only the SQL query, no explanation."""
                     f"client_{tenant_id}_projects"
                 ]
 
-            all_results = []
-            for collection_name in collections:
-                try:
-                    search_results = await self.qdrant_client.search_vectors(
-                        collection_name=collection_name,
-                        query_vector=query_vector,
-                        limit=limit,
-                        score_threshold=0.6
-                    )
-
-                    # Convert VectorSearchResult to dict format
-                    for result in search_results:
-                        all_results.append({
-                            "id": result.id,
-                            "score": result.score,
-                            "payload": result.payload,
-                            "collection": collection_name
-                        })
-
-                except Exception as e:
-                    logger.warning(f"Search failed for collection {collection_name}: {e}")
-                    continue
-
-            # Sort by score and limit results
-            all_results.sort(key=lambda x: x.get("score", 0), reverse=True)
-            top_results = all_results[:limit]
+            # Query all collections concurrently; slow or missing ones are skipped
+            search = await self.qdrant_client.search_collections(
+                collection_names=collections,
+                query_vector=query_vector,
+                limit=limit,
+                score_threshold=0.6
+            )
 
             return {
                 "success": True,
-                "results": top_results,
-                "total_found": len(all_results),
-                "collections_searched": collections
+                "results": [self._search_result_to_dict(result) for result in search.results],
+                "total_found": search.total_found,
+                "collections_searched": collections,
+                "collection_status": search.collection_status
             }
 
         except Exception as e:
@@ -441,20 +431,26 @@ Return only the SQL query, no explanation."""
                 f"client_{tenant_id}_changelogs"
             ]
 
-            for collection_name in collection_names:
-                try:
-                    info = await self.qdrant_client.get_collection_info(collection_name)
-                    if info.success:
-                        collections.append({
-                            "name": collection_name,
-                            "vector_count": info.data.get("vectors_count", 0),
-                            "status": "available"
-                        })
-                except:
+            # Inspect all collections concurrently
+            timeout = self.qdrant_client.search_timeout
+            infos = await asyncio.gather(
+                *(asyncio.wait_for(self.qdrant_client.get_collection_info(name), timeout) for name in collection_names),
+                return_exceptions=True
+            )
+
+            for collection_name, info in zip(collection_names, infos):
+                if isinstance(info, BaseException):
+                    # Not created yet (nothing embedded) vs. Qdrant down, timed out or failing
                     collections.append({
                         "name": collection_name,
                         "vector_count": 0,
-                        "status": "unavailable"
+                        "status": "unavailable" if is_missing_collection(info) else "error"
+                    })
+                else:
+                    collections.append({
+                        "name": collection_name,
+                        "vector_count": info.get("points_count", 0),
+                        "status": "available"
                     })
 
             return {
@@ -467,6 +463,7 @@ Return only the SQL query, no explanation."""
                 },
                 "collections": collections,
                 "query_types": ["semantic", "structured", "hybrid"],
+                "query_cache": self.query_cache.stats(tenant_id),
                 "tenant_id": tenant_id
             }
 
@@ -477,6 +474,16 @@ Return only the SQL query, no explanation."""
                 "error": str(e)
             }
 
+    @staticmethod
+    def _search_result_to_dict(result) -> Dict[str, Any]:
+        """Convert a VectorSearchResult to the source dict format"""
+        return {
+            "id": result.id,
+            "score": result.score,
+            "payload": result.payload,
+            "collection": result.collection
+        }
+
     async def cleanup(self):
         """Cleanup AI providers to prevent event loop errors"""
         try:
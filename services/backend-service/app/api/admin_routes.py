@@ -55,6 +55,8 @@ class WorkerStatusResponse(BaseModel):
     workers: Dict[str, Dict[str, Any]]
     queue_stats: Dict[str, Any]
     raw_data_stats: Dict[str, Any]
+    autoscaler: Optional[Dict[str, Any]] = None  # Latest scaling decisions and their inputs
+    fairness: Optional[Dict[str, Any]] = None  # Fair scheduler state and queue wait times
 
 
 class QueueMessageStats(BaseModel):
@@ -80,6 +82,7 @@ class QueueInfo(BaseModel):
     consumer_utilisation: float = 0.0
     memory: int = 0
     message_stats: Optional[QueueMessageStats] = None
+    worker_processes: int = 0  # Live processes from standalone worker runtimes
 
 
 class QueuesStatusResponse(BaseModel):
@@ -153,6 +156,7 @@ class DatabaseCapacityResponse(BaseModel):
     current_usage_percent: float
     can_add_workers: bool
     warning_message: Optional[str] = None
+    pool_metrics: Optional[Dict[str, Any]] = None  # Live per-role pool usage and checkout wait histograms
 
 
 # 🚀 ETL Service Notification Functions
@@ -2024,11 +2028,17 @@ async def get_queues_status(
         queue_types = ['extraction', 'transform', 'embedding']
         queues_data = {}
 
+        # Standalone worker processes poll with basic_get, so RabbitMQ does not count them as consumers
+        from app.etl.workers.worker_registry import get_worker_registry
+        worker_registry = get_worker_registry()
+
         for queue_type in queue_types:
             queue_name = f"{queue_type}_queue_{current_tenant_tier}"
 
             # Find the queue in the response
             queue_info = next((q for q in all_queues if q['name'] == queue_name), None)
+            # Per-tenant sub-queues of this tier queue (fair scheduling) count towards its backlog
+            tenant_queues = [q for q in all_queues if q['name'].startswith(f"{queue_name}.t")]
 
             if queue_info:
                 # Extract message stats if available
@@ -2049,13 +2059,14 @@ async def get_queues_status(
                     name=queue_info['name'],
                     vhost=queue_info['vhost'],
                     state=queue_info.get('state', 'unknown'),
-                    messages=queue_info.get('messages', 0),
-                    messages_ready=queue_info.get('messages_ready', 0),
-                    messages_unacknowledged=queue_info.get('messages_unacknowledged', 0),
+                    messages=sum(q.get('messages', 0) for q in [queue_info] + tenant_queues),
+                    messages_ready=sum(q.get('messages_ready', 0) for q in [queue_info] + tenant_queues),
+                    messages_unacknowledged=sum(q.get('messages_unacknowledged', 0) for q in [queue_info] + tenant_queues),
                     consumers=queue_info.get('consumers', 0),
                     consumer_utilisation=queue_info.get('consumer_utilisation', 0.0),
                     memory=queue_info.get('memory', 0),
-                    message_stats=message_stats
+                    message_stats=message_stats,
+                    worker_processes=worker_registry.count_processes(current_tenant_tier, queue_type)
                 )
             else:
                 # Queue doesn't exist yet - return default values
@@ -2069,7 +2080,8 @@ async def get_queues_status(
                     consumers=0,
                     consumer_utilisation=0.0,
                     memory=0,
-                    message_stats=None
+                    message_stats=None,
+                    worker_processes=worker_registry.count_processes(current_tenant_tier, queue_type)
                 )
 
         return QueuesStatusResponse(
@@ -2135,14 +2147,14 @@ async def get_worker_status(
             for queue_type in queue_types:
                 queue_name = queue_manager.get_tier_queue_name(current_tenant_tier, queue_type)
                 try:
-                    # Get message count from RabbitMQ
-                    with queue_manager.get_channel() as channel:
-                        method = channel.queue_declare(queue=queue_name, passive=True)
-                        message_count = method.method.message_count
-                        queue_stats['tier_queues'][current_tenant_tier][queue_type] = {
-                            'queue_name': queue_name,
-                            'message_count': message_count
-                        }
+                    # Get message count from RabbitMQ (including per-tenant sub-queues)
+                    stats = queue_manager.get_queue_stats(queue_name, include_tenant_queues=True)
+                    if stats is None:
+                        raise RuntimeError(f"Queue {queue_name} unavailable")
+                    queue_stats['tier_queues'][current_tenant_tier][queue_type] = {
+                        'queue_name': queue_name,
+                        'message_count': stats['message_count']
+                    }
                 except Exception as e:
                     queue_stats['tier_queues'][current_tenant_tier][queue_type] = {
                         'queue_name': queue_name,
@@ -2183,11 +2195,16 @@ async def get_worker_status(
         except Exception as e:
             raw_data_stats = {'error': str(e)}
 
+        from app.etl.workers.worker_autoscaler import get_worker_autoscaler
+        from app.etl.workers.fair_scheduler import get_fair_scheduler_status
+
         return WorkerStatusResponse(
             running=all_worker_status.get('running', False),
             workers=filtered_workers,  # Only current tenant's tier workers
             queue_stats=queue_stats,
-            raw_data_stats=raw_data_stats
+            raw_data_stats=raw_data_stats,
+            autoscaler=get_worker_autoscaler().get_status(),
+            fairness=get_fair_scheduler_status(tenant_id=current_user.tenant_id)  # Own wait times + tier aggregate
         )
 
     except Exception as e:
@@ -2316,6 +2333,7 @@ async def set_tenant_tier(
     try:
         from app.core.database import get_database
         from app.etl.workers.worker_manager import get_worker_manager
+        from app.etl.workers.queue_manager import invalidate_tenant_tiers
         from sqlalchemy import text
 
         tenant_id = current_user.tenant_id
@@ -2345,6 +2363,9 @@ async def set_tenant_tier(
             session.execute(update_query, {'tenant_id': tenant_id, 'tier': new_tier, 'now': now})
             session.commit()
 
+        # Route new messages to the new tier's queues right away
+        invalidate_tenant_tiers()
+
         # Get worker allocation for new tier
         tier_configs = manager.get_tier_config()
         worker_allocation = tier_configs.get(new_tier, tier_configs['free'])
@@ -2393,14 +2414,13 @@ async def get_database_capacity(
         # Database connection pool settings
         pool_size = settings.DB_POOL_SIZE  # 50
         max_overflow = settings.DB_MAX_OVERFLOW  # 50
-        total_connections = pool_size + max_overflow  # 100
 
-        # Reserve connections for UI operations (estimated)
-        reserved_for_ui = 20
-        available_for_workers = total_connections - reserved_for_ui  # 80
-
-        # Calculate max recommended workers (leave 20% buffer)
-        max_recommended_workers = int(available_for_workers * 0.8)  # 64
+        # Connection budget shared with the autoscaler (20 reserved for UI, 20% buffer)
+        capacity = manager.get_worker_capacity()
+        total_connections = capacity['total_connections']  # 100
+        reserved_for_ui = capacity['reserved_for_ui']
+        available_for_workers = capacity['available_for_workers']  # 80
+        max_recommended_workers = capacity['max_recommended_workers']  # 64
 
         # Calculate current usage
         current_usage_percent = (current_worker_count / available_for_workers) * 100
@@ -2415,6 +2435,10 @@ async def get_database_capacity(
         elif current_usage_percent > 60:
             warning_message = f"⚠️ Moderate worker usage ({current_usage_percent:.1f}%). Monitor database connection pool."
 
+        # Live pool usage of this process (checked-out connections, overflow, checkout wait times)
+        from app.core.database_router import get_database_router
+        pool_metrics = get_database_router().get_connection_pool_stats()
+
         return DatabaseCapacityResponse(
             total_connections=total_connections,
             pool_size=pool_size,
@@ -2425,7 +2449,8 @@ async def get_database_capacity(
             max_recommended_workers=max_recommended_workers,
             current_usage_percent=round(current_usage_percent, 2),
             can_add_workers=can_add_workers,
-            warning_message=warning_message
+            warning_message=warning_message,
+            pool_metrics=pool_metrics
         )
 
     except Exception as e:
@@ -2469,12 +2494,8 @@ async def update_worker_counts(
         total_workers = request.extraction_workers + request.transform_workers + request.embedding_workers
 
         # Check against database capacity
-        pool_size = settings.DB_POOL_SIZE
-        max_overflow = settings.DB_MAX_OVERFLOW
-        total_connections = pool_size + max_overflow
-        reserved_for_ui = 20
-        available_for_workers = total_connections - reserved_for_ui
-        max_recommended_workers = int(available_for_workers * 0.8)
+        from app.etl.workers.worker_manager import WorkerManager
+        max_recommended_workers = WorkerManager.get_worker_capacity()['max_recommended_workers']
 
         if total_workers > max_recommended_workers:
             raise HTTPException(
@@ -48,6 +48,7 @@ class AICapabilitiesResponse(BaseModel):
     collections: List[Dict[str, Any]]
     query_types: List[str]
     tenant_id: int
+    query_cache: Optional[Dict[str, Any]] = None
 
 @router.post("/ai/query", response_model=AIQueryResponse)
 async def process_natural_language_query(
@@ -185,7 +186,8 @@ async def get_ai_capabilities(
                     capabilities=result["capabilities"],
                     collections=result["collections"],
                     query_types=result["query_types"],
-                    tenant_id=result["tenant_id"]
+                    tenant_id=result["tenant_id"],
+                    query_cache=result.get("query_cache")
                 )
             finally:
                 # Cleanup AI providers to prevent event loop errors
@@ -1,21 +1,41 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import Optional
-from sqlalchemy import func, case, text
+from typing import List, Optional
+from sqlalchemy import func, case, text, select
 from datetime import datetime, timedelta
 import statistics
 
 from app.auth.auth_middleware import require_authentication
-from app.core.database import get_database
+from app.core.async_database import get_async_database
 from app.core.logging_config import get_logger
-from app.models.unified_models import (
-    WorkItem, Project, Status, StatusMapping, Wit, WitMapping,
-    WitHierarchy, WorkItemPrLink
-)
+from app.core.response_cache import cached_response
+from app.core.text_search import contains
+from app.models.unified_models import DoraLeadTimeFact
 
 router = APIRouter(prefix="/api/v1/metrics/dora", tags=["DORA Metrics"])
 logger = get_logger(__name__)
 
+# The lead-time endpoints read dora_lead_time_facts: the done, level-0 Story/Tech Enhancement
+# work items with a merged PR, precomputed at the end of each ETL job
+# (see app/services/dora_lead_time_facts_service.py)
+# Trend bucket sizes accepted by lead-time-trend (date_trunc fields)
+TREND_BUCKETS = ('week', 'month', 'quarter')
+
+
+def _parse_percentiles(percentiles: Optional[str]) -> List[int]:
+    """Parse a comma-separated percentile list ("75,90") into sorted unique integers in 1..99."""
+    if not percentiles:
+        return []
+    try:
+        values = sorted({int(value) for value in percentiles.split(',') if value.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid percentiles: {percentiles}")
+    if any(value < 1 or value > 99 for value in values):
+        raise HTTPException(status_code=400, detail="Percentiles must be between 1 and 99")
+    return values
+
+
 @router.get("/lead-time-trend")
+@cached_response("dora.lead_time_trend")
 async def lead_time_trend(
     team: Optional[str] = None,
     project_key: Optional[str] = None,
@@ -23,161 +43,85 @@ async def lead_time_trend(
     aha_initiative: Optional[str] = None,
     aha_project_code: Optional[str] = None,
     aha_milestone: Optional[str] = None,
+    bucket: str = 'week',
+    percentiles: Optional[str] = None,
     user = Depends(require_authentication)
 ):
     """
-    Get DORA Lead Time trend data grouped by week for chart visualization.
-    Returns weekly aggregated lead time metrics using optimized query.
+    Get DORA Lead Time trend data grouped by week (or month/quarter) for chart visualization.
+    Median, average, count and optional percentiles (e.g. percentiles=75,90) are aggregated
+    in PostgreSQL, so only one row per bucket is transferred.
     """
+    if bucket not in TREND_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Invalid bucket. Valid buckets: {list(TREND_BUCKETS)}")
+    extra_percentiles = _parse_percentiles(percentiles)
+
     try:
-        database = get_database()
+        database = get_async_database()
 
         # Calculate date range for filtering
         from app.core.utils import DateTimeHelper
-        from datetime import timedelta
         one_year_ago = DateTimeHelper.now_default() - timedelta(days=365)
 
-        with database.get_read_session_context() as session:
-            # Build the optimized DORA query with dynamic filters
-            base_query = """
-            SELECT
-                DATE_TRUNC('month', i.work_last_completed_at)   AS month,
-                DATE_TRUNC('week', i.work_last_completed_at)    AS week,
-                i.work_last_completed_at,
-                EXTRACT(YEAR FROM i.work_last_completed_at)     AS completion_year,
-                EXTRACT(QUARTER FROM i.work_last_completed_at)  AS completion_quarter,
-                CASE
-                    WHEN i.total_lead_time_seconds <= 86400 THEN '≤ 1 day'
-                    WHEN i.total_lead_time_seconds <= 604800 THEN '≤ 1 week'
-                    WHEN i.total_lead_time_seconds <= 2592000 THEN '≤ 1 month'
-                    ELSE '> 1 month'
-                END                                             AS lead_time_bucket,
-                i.id                                            AS issue_id,
-                i.key                                           AS issue_key,
-                p.key                                           AS project_key,
-                i.team,
-                im.wit_from,
-                im.wit_to,
-                sm.status_to,
-                i.story_points,
-                i.priority,
-                i.assignee,
-                i.created                                       AS issue_created_at,
-                i.updated                                       AS issue_updated_at,
-                i.total_lead_time_seconds,
-                i.total_lead_time_seconds / 3600.0              AS lead_time_hours,
-                i.total_lead_time_seconds / 86400.0             AS lead_time_days,
-                i.custom_field_01                               AS aha_epic_url,
-                i.custom_field_02                               AS aha_initiative,
-                i.custom_field_03                               AS aha_project_code,
-                i.custom_field_04                               AS project_code,
-                i.custom_field_05                               AS aha_milestone,
-                i.tenant_id
-            FROM
-                work_items i
-            INNER JOIN projects p               ON i.project_id = p.id
-            INNER JOIN statuses s               ON i.status_id = s.id
-            INNER JOIN statuses_mappings sm     ON s.status_mapping_id = sm.id
-            INNER JOIN wits it                  ON i.wit_id = it.id
-            INNER JOIN wits_mappings im         ON it.wits_mapping_id = im.id
-            INNER JOIN wits_hierarchies ih      ON im.wits_hierarchy_id = ih.id
-            WHERE
-                sm.status_to = 'Done'
-                AND ih.level_number = 0
-                AND im.wit_to IN ('Story', 'Tech Enhancement')
-                AND i.total_lead_time_seconds > 0
-                AND i.tenant_id = :tenant_id
-                AND i.work_last_completed_at >= :one_year_ago
-                AND EXISTS (
-                    SELECT 1
-                    FROM work_items_prs_links jprl
-                    WHERE jprl.work_item_id = i.id
-                      AND jprl.pr_status = 'MERGED'
-                      AND jprl.active = true -- Also check for active here
-                )
-                -- Active status checks for all joined tables
-                AND i.active = true
-                AND p.active = true
-                AND s.active = true
-                AND sm.active = true
-                AND it.active = true
-                AND im.active = true
-                AND ih.active = true
-            """
-
-            # Build dynamic WHERE conditions
-            where_conditions = []
-            params = {'tenant_id': user.tenant_id, 'one_year_ago': one_year_ago}
+        async with database.get_analytics_session_context() as session:
+            period = func.date_trunc(bucket, DoraLeadTimeFact.work_last_completed_at)
+            lead_time_days = DoraLeadTimeFact.total_lead_time_seconds / 86400.0
+
+            query = select(
+                period.label('period_start'),
+                func.count().label('issue_count'),
+                func.avg(lead_time_days).label('avg_lead_time_days'),
+                func.percentile_cont(0.5).within_group(lead_time_days).label('median_lead_time_days'),
+                *[
+                    func.percentile_cont(value / 100.0).within_group(lead_time_days).label(f'p{value}')
+                    for value in extra_percentiles
+                ]
+            ).where(
+                DoraLeadTimeFact.tenant_id == user.tenant_id,
+                DoraLeadTimeFact.work_last_completed_at >= one_year_ago
+            )
 
+            # Apply filters
             if team:
-                where_conditions.append("AND i.team ILIKE :team")
-                params['team'] = f'%{team}%'
+                query = query.where(contains(DoraLeadTimeFact.team, team))
             if project_key:
-                where_conditions.append("AND p.key ILIKE :project_key")
-                params['project_key'] = f'%{project_key}%'
+                query = query.where(contains(DoraLeadTimeFact.project_key, project_key))
             if wit_to:
-                where_conditions.append("AND im.wit_to = :wit_to")
-                params['wit_to'] = wit_to
+                query = query.where(DoraLeadTimeFact.wit_to == wit_to)
             if aha_initiative:
-                where_conditions.append("AND i.custom_field_02 ILIKE :aha_initiative")
-                params['aha_initiative'] = f'%{aha_initiative}%'
+                query = query.where(contains(DoraLeadTimeFact.aha_initiative, aha_initiative))
             if aha_project_code:
-                where_conditions.append("AND i.custom_field_03 ILIKE :aha_project_code")
-                params['aha_project_code'] = f'%{aha_project_code}%'
+                query = query.where(contains(DoraLeadTimeFact.aha_project_code, aha_project_code))
             if aha_milestone:
-                where_conditions.append("AND i.custom_field_05 ILIKE :aha_milestone")
-                params['aha_milestone'] = f'%{aha_milestone}%'
-
-            # Add dynamic conditions to query
-            if where_conditions:
-                base_query += " " + " ".join(where_conditions)
-
-            # Add ordering
-            base_query += """
-            ORDER BY
-                i.work_last_completed_at DESC, i.team
-            """
+                query = query.where(contains(DoraLeadTimeFact.aha_milestone, aha_milestone))
 
-            # Execute the raw SQL query
-            from sqlalchemy import text
-            results = session.execute(text(base_query), params).fetchall()
+            # Oldest first - left to right chronologically
+            query = query.group_by(period).order_by(period)
 
-            # Group results by week and calculate aggregations
-            from collections import defaultdict
-            import statistics
+            results = (await session.execute(query)).fetchall()
 
-            weekly_data = defaultdict(list)
-
-            # Group by week
-            for row in results:
-                if row.week:
-                    weekly_data[row.week].append(row.lead_time_days)
-
-            # Convert to chart format with aggregations
             trend_data = []
-            for week_start, lead_times in weekly_data.items():
-                # Calculate statistics
-                issue_count = len(lead_times)
-                avg_lead_time = sum(lead_times) / len(lead_times) if lead_times else 0
-                median_lead_time = statistics.median(lead_times) if lead_times else 0
-
-                # Format week as "MMM DD, YYYY" (e.g., "Jan 15, 2024")
-                week_label = week_start.strftime('%b %d, %Y') if week_start else 'Unknown'
-
-                trend_data.append({
-                    'week': week_start.isoformat() if week_start else None,
-                    'week_label': week_label,
-                    'value': round(float(median_lead_time), 1),  # Use median for DORA
-                    'avg_value': round(float(avg_lead_time), 1),
-                    'issue_count': issue_count
-                })
-
-            # Sort by week (oldest first - left to right chronologically)
-            trend_data.sort(key=lambda x: x['week'] or '', reverse=False)
+            for row in results:
+                period_start = row.period_start
+
+                # 'week'/'week_label' hold the bucket start for every bucket size (chart contract)
+                point = {
+                    'week': period_start.isoformat() if period_start else None,
+                    # Format as "MMM DD, YYYY" (e.g., "Jan 15, 2024")
+                    'week_label': period_start.strftime('%b %d, %Y') if period_start else 'Unknown',
+                    'value': round(float(row.median_lead_time_days), 1),  # Use median for DORA
+                    'avg_value': round(float(row.avg_lead_time_days), 1),
+                    'issue_count': row.issue_count
+                }
+                for value in extra_percentiles:
+                    point[f'p{value}'] = round(float(getattr(row, f'p{value}')), 1)
+                trend_data.append(point)
 
             return {
                 'trend_data': trend_data,
                 'total_weeks': len(trend_data),
+                'bucket': bucket,
+                'percentiles': extra_percentiles,
                 'filters_applied': {
                     'team': team,
                     'project_key': project_key,
@@ -194,6 +138,7 @@ async def lead_time_trend(
         raise HTTPException(status_code=500, detail=f"Error getting DORA lead time trend: {str(e)}")
 
 @router.get("/lead-time-metrics")
+@cached_response("dora.lead_time_metrics")
 async def lead_time_metrics(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
@@ -211,102 +156,75 @@ async def lead_time_metrics(
     Returns unique issues with merged PRs for accurate metric calculations.
     """
     try:
-        database = get_database()
-
-        with database.get_read_session_context() as session:
-            # Base query for unique issues with merged PRs (based on your SQL)
-            query = session.query(
-                func.date_trunc('month', WorkItem.work_last_completed_at).label('month'),
-                func.date_trunc('week', WorkItem.work_last_completed_at).label('week'),
-                WorkItem.work_last_completed_at,
-                func.extract('year', WorkItem.work_last_completed_at).label('completion_year'),
-                func.extract('quarter', WorkItem.work_last_completed_at).label('completion_quarter'),
+        database = get_async_database()
+
+        async with database.get_analytics_session_context() as session:
+            # One fact row per work item, so no DISTINCT over PR links is needed
+            query = select(
+                func.date_trunc('month', DoraLeadTimeFact.work_last_completed_at).label('month'),
+                func.date_trunc('week', DoraLeadTimeFact.work_last_completed_at).label('week'),
+                DoraLeadTimeFact.work_last_completed_at,
+                func.extract('year', DoraLeadTimeFact.work_last_completed_at).label('completion_year'),
+                func.extract('quarter', DoraLeadTimeFact.work_last_completed_at).label('completion_quarter'),
                 case(
-                    (WorkItem.total_lead_time_seconds <= 86400, '≤ 1 day'),
-                    (WorkItem.total_lead_time_seconds <= 604800, '≤ 1 week'),
-                    (WorkItem.total_lead_time_seconds <= 2592000, '≤ 1 month'),
+                    (DoraLeadTimeFact.total_lead_time_seconds <= 86400, '≤ 1 day'),
+                    (DoraLeadTimeFact.total_lead_time_seconds <= 604800, '≤ 1 week'),
+                    (DoraLeadTimeFact.total_lead_time_seconds <= 2592000, '≤ 1 month'),
                     else_='> 1 month'
                 ).label('lead_time_bucket'),
-                WorkItem.id.label('issue_id'),
-                WorkItem.key.label('issue_key'),
-                Project.key.label('project_key'),
-                WorkItem.team,
-                WitMapping.wit_from,
-                WitMapping.wit_to,
-                StatusMapping.status_to,
-                WorkItem.story_points,
-                WorkItem.priority,
-                WorkItem.assignee,
-                WorkItem.created.label('issue_created_at'),
-                WorkItem.updated.label('issue_updated_at'),
-                WorkItem.total_lead_time_seconds,
-                (WorkItem.total_lead_time_seconds / 3600.0).label('lead_time_hours'),
-                (WorkItem.total_lead_time_seconds / 86400.0).label('lead_time_days'),
-                WorkItem.custom_field_01.label('aha_epic_url'),
-                WorkItem.custom_field_02.label('aha_initiative'),
-                WorkItem.custom_field_03.label('aha_project_code'),
-                WorkItem.custom_field_04.label('project_code'),
-                WorkItem.custom_field_05.label('aha_milestone'),
-                WorkItem.tenant_id
-            ).distinct().select_from(
-                WorkItemPrLink
-            ).join(
-                WorkItem, WorkItemPrLink.work_item_id == WorkItem.id
-            ).join(
-                Status, WorkItem.status_id == Status.id
-            ).join(
-                StatusMapping, Status.status_mapping_id == StatusMapping.id
-            ).join(
-                Wit, WorkItem.wit_id == Wit.id
-            ).join(
-                WitMapping, Wit.wit_mapping_id == WitMapping.id
-            ).join(
-                Project, WorkItem.project_id == Project.id
-            ).join(
-                WitHierarchy, WitMapping.wits_hierarchy_id == WitHierarchy.id
-            ).filter(
-                StatusMapping.status_to == 'Done',
-                WitHierarchy.level_number == 0,
-                WitMapping.wit_to.in_(['Story', 'Tech Enhancement']),
-                WorkItemPrLink.pr_status == 'MERGED',
-                WorkItem.total_lead_time_seconds > 0,
-                WorkItem.tenant_id == user.tenant_id,
-                # ✅ SECURITY: Exclude deactivated records at ANY level
-                WorkItem.active == True,
-                Status.active == True,
-                Wit.active == True,
-                Project.active == True,
-                WorkItemPrLink.active == True
+                DoraLeadTimeFact.work_item_id.label('issue_id'),
+                DoraLeadTimeFact.issue_key,
+                DoraLeadTimeFact.project_key,
+                DoraLeadTimeFact.team,
+                DoraLeadTimeFact.wit_from,
+                DoraLeadTimeFact.wit_to,
+                DoraLeadTimeFact.status_to,
+                DoraLeadTimeFact.story_points,
+                DoraLeadTimeFact.priority,
+                DoraLeadTimeFact.assignee,
+                DoraLeadTimeFact.issue_created_at,
+                DoraLeadTimeFact.issue_updated_at,
+                DoraLeadTimeFact.total_lead_time_seconds,
+                (DoraLeadTimeFact.total_lead_time_seconds / 3600.0).label('lead_time_hours'),
+                (DoraLeadTimeFact.total_lead_time_seconds / 86400.0).label('lead_time_days'),
+                DoraLeadTimeFact.aha_epic_url,
+                DoraLeadTimeFact.aha_initiative,
+                DoraLeadTimeFact.aha_project_code,
+                DoraLeadTimeFact.project_code,
+                DoraLeadTimeFact.aha_milestone,
+                DoraLeadTimeFact.tenant_id
+            ).where(
+                DoraLeadTimeFact.tenant_id == user.tenant_id
             )
             # Apply filters
             if start_date:
-                query = query.filter(WorkItem.work_last_completed_at >= start_date)
+                query = query.where(DoraLeadTimeFact.work_last_completed_at >= start_date)
             if end_date:
-                query = query.filter(WorkItem.work_last_completed_at < end_date)
+                query = query.where(DoraLeadTimeFact.work_last_completed_at < end_date)
             if team:
-                query = query.filter(WorkItem.team.ilike(f'%{team}%'))
+                query = query.where(contains(DoraLeadTimeFact.team, team))
             if project_key:
-                query = query.filter(Project.key.ilike(f'%{project_key}%'))
+                query = query.where(contains(DoraLeadTimeFact.project_key, project_key))
             if issue_type:
-                query = query.filter(WitMapping.wit_to == issue_type)
+                query = query.where(DoraLeadTimeFact.wit_to == issue_type)
             if priority:
-                query = query.filter(WorkItem.priority.ilike(f'%{priority}%'))
+                query = query.where(contains(DoraLeadTimeFact.priority, priority))
             if assignee:
-                query = query.filter(WorkItem.assignee.ilike(f'%{assignee}%'))
+                query = query.where(contains(DoraLeadTimeFact.assignee, assignee))
             if aha_initiative:
-                query = query.filter(WorkItem.custom_field_02.ilike(f'%{aha_initiative}%'))
+                query = query.where(contains(DoraLeadTimeFact.aha_initiative, aha_initiative))
             if project_code:
-                query = query.filter(WorkItem.custom_field_04.ilike(f'%{project_code}%'))
+                query = query.where(contains(DoraLeadTimeFact.project_code, project_code))
 
             # Order results
             query = query.order_by(
                 text('month DESC'),
-                WorkItem.key,
-                WorkItem.team
+                DoraLeadTimeFact.issue_key,
+                DoraLeadTimeFact.team
             )
 
             # Execute query
-            results = query.all()
+            results = (await session.execute(query)).all()
 
             # Convert to list of dictionaries for JSON response
             issues = []
@@ -318,7 +236,7 @@ async def lead_time_metrics(
                     'completion_year': int(row.completion_year) if row.completion_year else None,
                     'completion_quarter': int(row.completion_quarter) if row.completion_quarter else None,
                     'lead_time_bucket': row.lead_time_bucket,
-                    'issue_id': row.work_item_id,
+                    'issue_id': row.issue_id,
                     'issue_key': row.issue_key,
                     'project_key': row.project_key,
                     'team': row.team,
@@ -383,6 +301,7 @@ async def lead_time_metrics(
 
 
 @router.get("/filter-options")
+@cached_response("dora.filter_options")
 async def get_filter_options(
     user = Depends(require_authentication)
 ):
@@ -391,55 +310,21 @@ async def get_filter_options(
     Returns lists of unique values for each filter field.
     """
     try:
-        database = get_database()
-
-        with database.get_read_session_context() as session:
-            # Use the same optimized query structure for filter options
-            filter_query = """
-            SELECT DISTINCT
-                i.team,
-                p.key                                           AS project_key,
-                im.wit_to,
-                i.custom_field_02                               AS aha_initiative,
-                i.custom_field_03                               AS aha_project_code,
-                i.custom_field_05                               AS aha_milestone
-            FROM
-                work_items i
-            INNER JOIN projects p               ON i.project_id = p.id
-            INNER JOIN statuses s               ON i.status_id = s.id
-            INNER JOIN statuses_mappings sm     ON s.status_mapping_id = sm.id
-            INNER JOIN wits it                  ON i.wit_id = it.id
-            INNER JOIN wits_mappings im         ON it.wits_mapping_id = im.id
-            INNER JOIN wits_hierarchies ih      ON im.wits_hierarchy_id = ih.id
-            WHERE
-                sm.status_to = 'Done'
-                AND ih.level_number = 0
-                AND im.wit_to IN ('Story', 'Tech Enhancement')
-                AND i.total_lead_time_seconds > 0
-                AND i.tenant_id = :tenant_id
-                AND EXISTS (
-                    SELECT 1
-                    FROM work_items_prs_links jprl
-                    WHERE jprl.work_item_id = i.id
-                      AND jprl.pr_status = 'MERGED'
-                      AND jprl.active = true -- Also check for active here
-                )
-                -- Active status checks for all joined tables
-                AND i.active = true
-                AND p.active = true
-                AND s.active = true
-                AND sm.active = true
-                AND it.active = true
-                AND im.active = true
-                AND ih.active = true
-            ORDER BY
-                i.team, p.key, im.wit_to,
-                i.custom_field_02, i.custom_field_03, i.custom_field_05
-            """
-
-            # Execute the raw SQL query
-            from sqlalchemy import text
-            results = session.execute(text(filter_query), {'tenant_id': user.tenant_id}).fetchall()
+        database = get_async_database()
+
+        async with database.get_analytics_session_context() as session:
+            query = select(
+                DoraLeadTimeFact.team,
+                DoraLeadTimeFact.project_key,
+                DoraLeadTimeFact.wit_to,
+                DoraLeadTimeFact.aha_initiative,
+                DoraLeadTimeFact.aha_project_code,
+                DoraLeadTimeFact.aha_milestone
+            ).distinct().where(
+                DoraLeadTimeFact.tenant_id == user.tenant_id
+            )
+
+            results = (await session.execute(query)).fetchall()
 
             # Extract distinct values for each field
             teams = sorted(list(set(row.team for row in results if row.team)))
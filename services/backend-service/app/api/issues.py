@@ -6,17 +6,25 @@ Provides CRUD operations for issues with optional ML fields support.
 from typing import Optional, List
 from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, desc, select
 from pydantic import BaseModel
 
 from app.core.database import get_read_session, get_write_session
+from app.core.async_database import get_async_db_read_session
 from app.core.logging_config import get_logger
+from app.core.pagination import Keyset, InvalidCursorError, NULL_TIMESTAMP_SENTINEL
+from app.core.response_cache import bump_data_generation, cached_response
+from app.core.text_search import contains
 from app.models.unified_models import WorkItem, Project, Status, Wit
 from app.auth.auth_middleware import UserData, require_authentication
 
 router = APIRouter(prefix="/api", tags=["WorkItems"])
 logger = get_logger(__name__)
 
+# Newest first; served by idx_work_items_tenant_created_id
+WORK_ITEM_KEYSET = Keyset('work_items', WorkItem.created_at, WorkItem.id, null_sentinel=NULL_TIMESTAMP_SENTINEL)
+
 
 # Request/Response Models
 class WorkItemCreateRequest(BaseModel):
@@ -54,11 +62,13 @@ async def get_work_items(
     tenant_id: int = Query(..., description="Tenant ID for data isolation"),
     include_ml_fields: bool = Query(False, description="Include ML fields in response"),
     limit: int = Query(100, le=1000, description="Maximum number of issues to return"),
-    offset: int = Query(0, ge=0, description="Number of issues to skip for pagination"),
+    offset: int = Query(0, ge=0, description="Number of issues to skip for pagination (ignored with cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Count all matching issues (skip for faster paging)"),
     project_key: Optional[str] = Query(None, description="Filter by project key"),
     status: Optional[str] = Query(None, description="Filter by issue status"),
     assignee: Optional[str] = Query(None, description="Filter by assignee"),
-    db: Session = Depends(get_read_session),
+    db: AsyncSession = Depends(get_async_db_read_session),
     user: UserData = Depends(require_authentication)
 ):
     """Get issues with optional ML fields"""
@@ -71,26 +81,30 @@ async def get_work_items(
             )
         
         # Build query with filters
-        query = db.query(WorkItem).filter(
+        query = select(WorkItem).where(
             WorkItem.tenant_id == tenant_id,
             WorkItem.active == True
         )
         
         # Apply optional filters
         if project_key:
-            query = query.join(Project).filter(Project.key == project_key)
+            query = query.join(Project).where(Project.key == project_key)
         
         if status:
-            query = query.filter(WorkItem.status_name == status)
+            query = query.join(Status, WorkItem.status_id == Status.id).where(Status.original_name == status)
             
         if assignee:
-            query = query.filter(WorkItem.assignee.ilike(f"%{assignee}%"))
+            query = query.where(contains(WorkItem.assignee, assignee))
         
         # Get total count before pagination
-        total_count = query.count()
+        total_count = await db.scalar(select(func.count()).select_from(query.subquery())) if include_total else None
         
-        # Apply pagination and ordering
-        issues = query.order_by(WorkItem.created_at.desc()).offset(offset).limit(limit).all()
+        # Apply pagination and ordering (one extra row tells whether another page exists)
+        query = query.order_by(*WORK_ITEM_KEYSET.order_by())
+        query = query.where(WORK_ITEM_KEYSET.after(cursor)) if cursor else query.offset(offset)
+        issues = (await db.scalars(query.limit(limit + 1))).all()
+        next_cursor = WORK_ITEM_KEYSET.next_cursor(issues, limit)
+        issues = issues[:limit]
         
         # Enhanced response with optional ML fields
         result = []
@@ -104,6 +118,7 @@ async def get_work_items(
             'total_count': total_count,
             'offset': offset,
             'limit': limit,
+            'next_cursor': next_cursor,
             'ml_fields_included': include_ml_fields,
             'filters': {
                 'project_key': project_key,
@@ -114,6 +129,8 @@ async def get_work_items(
         
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching issues: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch issues")
@@ -180,6 +197,7 @@ async def create_work_item(
         
         db.add(work_item)
         db.commit()
+        bump_data_generation(user.tenant_id)
         db.refresh(work_item)
 
         logger.info(f"Created work item {work_item.key} for tenant {user.tenant_id}")
@@ -220,6 +238,7 @@ async def update_work_item(
         work_item.last_updated_at = DateTimeHelper.now_utc()
 
         db.commit()
+        bump_data_generation(user.tenant_id)
         db.refresh(work_item)
 
         logger.info(f"Updated work item {work_item.key} for tenant {user.tenant_id}")
@@ -257,6 +276,7 @@ async def delete_work_item(
         work_item.last_updated_at = DateTimeHelper.now_utc()
 
         db.commit()
+        bump_data_generation(user.tenant_id)
 
         logger.info(f"Deleted work item {work_item.key} for tenant {user.tenant_id}")
         return {"message": "WorkItem deleted successfully", "work_item_id": work_item_id}
@@ -270,9 +290,10 @@ async def delete_work_item(
 
 
 @router.get("/work-items/stats")
+@cached_response("work_items.stats")
 async def get_work_items_stats(
     tenant_id: int = Query(..., description="Tenant ID for data isolation"),
-    db: Session = Depends(get_read_session),
+    db: AsyncSession = Depends(get_async_db_read_session),
     user: UserData = Depends(require_authentication)
 ):
     """Get work item statistics for the tenant"""
@@ -285,28 +306,30 @@ async def get_work_items_stats(
             )
         
         # Get basic stats
-        total_issues = db.query(func.count(WorkItem.id)).filter(
+        total_issues = await db.scalar(select(func.count(WorkItem.id)).where(
             WorkItem.tenant_id == tenant_id,
             WorkItem.active == True
-        ).scalar()
+        ))
         
         # Get status breakdown
-        status_stats = db.query(
-            WorkItem.status_name,
+        status_stats = (await db.execute(select(
+            Status.original_name.label('status_name'),
             func.count(WorkItem.id).label('count')
-        ).filter(
+        ).join(
+            Status, WorkItem.status_id == Status.id
+        ).where(
             WorkItem.tenant_id == tenant_id,
             WorkItem.active == True
-        ).group_by(WorkItem.status_name).all()
+        ).group_by(Status.original_name))).all()
         
         # Get priority breakdown
-        priority_stats = db.query(
+        priority_stats = (await db.execute(select(
             WorkItem.priority,
             func.count(WorkItem.id).label('count')
-        ).filter(
+        ).where(
             WorkItem.tenant_id == tenant_id,
             WorkItem.active == True
-        ).group_by(WorkItem.priority).all()
+        ).group_by(WorkItem.priority))).all()
         
         return {
             'total_issues': total_issues,
@@ -0,0 +1,28 @@
+"""
+Prometheus metrics endpoint (see app/core/metrics.py for the exported metrics).
+"""
+
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from app.core.config import get_settings
+from app.core.metrics import CONTENT_TYPE, get_metrics_registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Metrics of this process in the Prometheus text exposition format."""
+    settings = get_settings()
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+
+    if settings.METRICS_BEARER_TOKEN:
+        expected = f"Bearer {settings.METRICS_BEARER_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+    return Response(content=get_metrics_registry().render(), media_type=CONTENT_TYPE)
@@ -5,12 +5,13 @@ Provides read-only access to ML monitoring tables for Phase 1-4.
 
 from typing import Optional, List
 from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, desc, select
 from datetime import timedelta
 
-from app.core.database import get_read_session
+from app.core.async_database import get_async_db_read_session
 from app.core.logging_config import get_logger
+from app.core.response_cache import cached_response
 from app.models.unified_models import AILearningMemory, AIPrediction, MLAnomalyAlert
 from app.auth.auth_middleware import UserData, require_authentication
 
@@ -34,7 +35,7 @@ async def get_learning_memory(
     error_type: Optional[str] = Query(None, description="Filter by error type"),
     limit: int = Query(50, le=100, description="Maximum number of records to return"),
     offset: int = Query(0, ge=0, description="Number of records to skip for pagination"),
-    db: Session = Depends(get_read_session),
+    db: AsyncSession = Depends(get_async_db_read_session),
     user: UserData = Depends(require_admin_user)
 ):
     """Get AI learning memory for analysis (admin only)"""
@@ -46,19 +47,19 @@ async def get_learning_memory(
                 detail="Access denied: Tenant ID mismatch"
             )
         
-        query = db.query(AILearningMemory).filter(
+        query = select(AILearningMemory).where(
             AILearningMemory.tenant_id == tenant_id,
             AILearningMemory.active == True
         )
         
         if error_type:
-            query = query.filter(AILearningMemory.error_type == error_type)
+            query = query.where(AILearningMemory.error_type == error_type)
         
         # Get total count before pagination
-        total_count = query.count()
+        total_count = await db.scalar(select(func.count()).select_from(query.subquery()))
         
         # Apply pagination and ordering
-        memories = query.order_by(AILearningMemory.created_at.desc()).offset(offset).limit(limit).all()
+        memories = (await db.scalars(query.order_by(AILearningMemory.created_at.desc()).offset(offset).limit(limit))).all()
         
         result = []
         for memory in memories:
@@ -91,7 +92,7 @@ async def get_predictions(
     prediction_type: Optional[str] = Query(None, description="Filter by prediction type"),
     limit: int = Query(50, le=100, description="Maximum number of records to return"),
     offset: int = Query(0, ge=0, description="Number of records to skip for pagination"),
-    db: Session = Depends(get_read_session),
+    db: AsyncSession = Depends(get_async_db_read_session),
     user: UserData = Depends(require_admin_user)
 ):
     """Get AI predictions for monitoring (admin only)"""
@@ -103,22 +104,22 @@ async def get_predictions(
                 detail="Access denied: Tenant ID mismatch"
             )
         
-        query = db.query(AIPrediction).filter(
+        query = select(AIPrediction).where(
             AIPrediction.tenant_id == tenant_id,
             AIPrediction.active == True
         )
         
         if model_name:
-            query = query.filter(AIPrediction.model_name == model_name)
+            query = query.where(AIPrediction.model_name == model_name)
             
         if prediction_type:
-            query = query.filter(AIPrediction.prediction_type == prediction_type)
+            query = query.where(AIPrediction.prediction_type == prediction_type)
         
         # Get total count before pagination
-        total_count = query.count()
+        total_count = await db.scalar(select(func.count()).select_from(query.subquery()))
         
         # Apply pagination and ordering
-        predictions = query.order_by(AIPrediction.created_at.desc()).offset(offset).limit(limit).all()
+        predictions = (await db.scalars(query.order_by(AIPrediction.created_at.desc()).offset(offset).limit(limit))).all()
         
         result = []
         for prediction in predictions:
@@ -152,7 +153,7 @@ async def get_anomaly_alerts(
     severity: Optional[str] = Query(None, description="Filter by severity level"),
     limit: int = Query(50, le=100, description="Maximum number of alerts to return"),
     offset: int = Query(0, ge=0, description="Number of alerts to skip for pagination"),
-    db: Session = Depends(get_read_session),
+    db: AsyncSession = Depends(get_async_db_read_session),
     user: UserData = Depends(require_admin_user)
 ):
     """Get ML anomaly alerts for monitoring (admin only)"""
@@ -164,22 +165,22 @@ async def get_anomaly_alerts(
                 detail="Access denied: Tenant ID mismatch"
             )
         
-        query = db.query(MLAnomalyAlert).filter(
+        query = select(MLAnomalyAlert).where(
             MLAnomalyAlert.tenant_id == tenant_id,
             MLAnomalyAlert.active == True
         )
         
         if acknowledged is not None:
-            query = query.filter(MLAnomalyAlert.acknowledged == acknowledged)
+            query = query.where(MLAnomalyAlert.acknowledged == acknowledged)
             
         if severity:
-            query = query.filter(MLAnomalyAlert.severity == severity)
+            query = query.where(MLAnomalyAlert.severity == severity)
         
         # Get total count before pagination
-        total_count = query.count()
+        total_count = await db.scalar(select(func.count()).select_from(query.subquery()))
         
         # Apply pagination and ordering
-        alerts = query.order_by(MLAnomalyAlert.created_at.desc()).offset(offset).limit(limit).all()
+        alerts = (await db.scalars(query.order_by(MLAnomalyAlert.created_at.desc()).offset(offset).limit(limit))).all()
         
         result = []
         for alert in alerts:
@@ -207,10 +208,11 @@ async def get_anomaly_alerts(
 
 
 @router.get("/stats")
+@cached_response("ml_monitoring.stats")
 async def get_ml_stats(
     tenant_id: int = Query(..., description="Tenant ID for data isolation"),
     days: int = Query(30, ge=1, le=365, description="Number of days to include in stats"),
-    db: Session = Depends(get_read_session),
+    db: AsyncSession = Depends(get_async_db_read_session),
     user: UserData = Depends(require_admin_user)
 ):
     """Get ML monitoring statistics (admin only)"""
@@ -228,42 +230,42 @@ async def get_ml_stats(
         start_date = end_date - timedelta(days=days)
         
         # Get learning memory stats
-        learning_memory_count = db.query(func.count(AILearningMemory.id)).filter(
+        learning_memory_count = await db.scalar(select(func.count(AILearningMemory.id)).where(
             AILearningMemory.tenant_id == tenant_id,
             AILearningMemory.active == True,
             AILearningMemory.created_at >= start_date
-        ).scalar()
+        ))
         
         # Get prediction stats
-        prediction_count = db.query(func.count(AIPrediction.id)).filter(
+        prediction_count = await db.scalar(select(func.count(AIPrediction.id)).where(
             AIPrediction.tenant_id == tenant_id,
             AIPrediction.active == True,
             AIPrediction.created_at >= start_date
-        ).scalar()
+        ))
         
         # Get anomaly alert stats
-        alert_count = db.query(func.count(MLAnomalyAlert.id)).filter(
+        alert_count = await db.scalar(select(func.count(MLAnomalyAlert.id)).where(
             MLAnomalyAlert.tenant_id == tenant_id,
             MLAnomalyAlert.active == True,
             MLAnomalyAlert.created_at >= start_date
-        ).scalar()
+        ))
         
-        unacknowledged_alerts = db.query(func.count(MLAnomalyAlert.id)).filter(
+        unacknowledged_alerts = await db.scalar(select(func.count(MLAnomalyAlert.id)).where(
             MLAnomalyAlert.tenant_id == tenant_id,
             MLAnomalyAlert.active == True,
             MLAnomalyAlert.acknowledged == False,
             MLAnomalyAlert.created_at >= start_date
-        ).scalar()
+        ))
         
         # Get model usage stats
-        model_stats = db.query(
+        model_stats = (await db.execute(select(
             AIPrediction.model_name,
             func.count(AIPrediction.id).label('prediction_count')
-        ).filter(
+        ).where(
             AIPrediction.tenant_id == tenant_id,
             AIPrediction.active == True,
             AIPrediction.created_at >= start_date
-        ).group_by(AIPrediction.model_name).all()
+        ).group_by(AIPrediction.model_name))).all()
         
         return {
             "period": {
@@ -294,7 +296,7 @@ async def get_ml_stats(
 @router.get("/health")
 async def get_ml_monitoring_health(
     tenant_id: int = Query(..., description="Tenant ID for data isolation"),
-    db: Session = Depends(get_read_session),
+    db: AsyncSession = Depends(get_async_db_read_session),
     user: UserData = Depends(require_admin_user)
 ):
     """Get ML monitoring system health (admin only)"""
@@ -316,10 +318,10 @@ async def get_ml_monitoring_health(
         
         for table_name, model_class in tables:
             try:
-                count = db.query(func.count(model_class.id)).filter(
+                count = await db.scalar(select(func.count(model_class.id)).where(
                     model_class.tenant_id == tenant_id,
                     model_class.active == True
-                ).scalar()
+                ))
                 table_status[table_name] = {
                     "accessible": True,
                     "record_count": count
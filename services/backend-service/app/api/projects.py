@@ -11,12 +11,18 @@ from pydantic import BaseModel
 
 from app.core.database import get_read_session, get_write_session
 from app.core.logging_config import get_logger
+from app.core.pagination import Keyset, InvalidCursorError, NULL_TIMESTAMP_SENTINEL
+from app.core.text_search import contains
 from app.models.unified_models import Project, WorkItem, Repository
 from app.auth.auth_middleware import UserData, require_authentication
 
 router = APIRouter(prefix="/api", tags=["Projects"])
 logger = get_logger(__name__)
 
+# Served by idx_projects_tenant_name_id and idx_work_items_tenant_project_created_id
+PROJECT_KEYSET = Keyset('projects', Project.name, Project.id, descending=False)
+PROJECT_WORK_ITEM_KEYSET = Keyset('project_work_items', WorkItem.created_at, WorkItem.id, null_sentinel=NULL_TIMESTAMP_SENTINEL)
+
 
 # Request/Response Models
 class ProjectCreateRequest(BaseModel):
@@ -42,7 +48,9 @@ async def get_projects(
     tenant_id: int = Query(..., description="Tenant ID for data isolation"),
     include_ml_fields: bool = Query(False, description="Include ML fields in response"),
     limit: int = Query(100, le=1000, description="Maximum number of projects to return"),
-    offset: int = Query(0, ge=0, description="Number of projects to skip for pagination"),
+    offset: int = Query(0, ge=0, description="Number of projects to skip for pagination (ignored with cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Count all matching projects (skip for faster paging)"),
     project_type: Optional[str] = Query(None, description="Filter by project type"),
     search: Optional[str] = Query(None, description="Search in project name or key"),
     db: Session = Depends(get_read_session),
@@ -69,15 +77,19 @@ async def get_projects(
             
         if search:
             query = query.filter(
-                (Project.name.ilike(f"%{search}%")) |
-                (Project.key.ilike(f"%{search}%"))
+                contains(Project.name, search) |
+                contains(Project.key, search)
             )
         
         # Get total count before pagination
-        total_count = query.count()
+        total_count = query.count() if include_total else None
         
-        # Apply pagination and ordering
-        projects = query.order_by(Project.name.asc()).offset(offset).limit(limit).all()
+        # Apply pagination and ordering (one extra row tells whether another page exists)
+        query = query.order_by(*PROJECT_KEYSET.order_by())
+        query = query.filter(PROJECT_KEYSET.after(cursor)) if cursor else query.offset(offset)
+        projects = query.limit(limit + 1).all()
+        next_cursor = PROJECT_KEYSET.next_cursor(projects, limit)
+        projects = projects[:limit]
         
         # Enhanced response with optional ML fields
         result = []
@@ -91,6 +103,7 @@ async def get_projects(
             'total_count': total_count,
             'offset': offset,
             'limit': limit,
+            'next_cursor': next_cursor,
             'ml_fields_included': include_ml_fields,
             'filters': {
                 'project_type': project_type,
@@ -100,6 +113,8 @@ async def get_projects(
         
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching projects: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch projects")
@@ -296,7 +311,9 @@ async def get_project_issues(
     project_id: int,
     include_ml_fields: bool = Query(False, description="Include ML fields in response"),
     limit: int = Query(100, le=1000, description="Maximum number of issues to return"),
-    offset: int = Query(0, ge=0, description="Number of issues to skip for pagination"),
+    offset: int = Query(0, ge=0, description="Number of issues to skip for pagination (ignored with cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Count all of the project's issues (skip for faster paging)"),
     db: Session = Depends(get_read_session),
     user: UserData = Depends(require_authentication)
 ):
@@ -319,8 +336,12 @@ async def get_project_issues(
             WorkItem.active == True
         )
         
-        total_count = query.count()
-        issues = query.order_by(WorkItem.created_at.desc()).offset(offset).limit(limit).all()
+        total_count = query.count() if include_total else None
+        query = query.order_by(*PROJECT_WORK_ITEM_KEYSET.order_by())
+        query = query.filter(PROJECT_WORK_ITEM_KEYSET.after(cursor)) if cursor else query.offset(offset)
+        issues = query.limit(limit + 1).all()
+        next_cursor = PROJECT_WORK_ITEM_KEYSET.next_cursor(issues, limit)
+        issues = issues[:limit]
         
         # Enhanced response with optional ML fields
         result = []
@@ -335,11 +356,14 @@ async def get_project_issues(
             'total_count': total_count,
             'offset': offset,
             'limit': limit,
+            'next_cursor': next_cursor,
             'ml_fields_included': include_ml_fields
         }
         
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching issues for project {project_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch project issues")
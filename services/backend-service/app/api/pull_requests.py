@@ -12,12 +12,18 @@ from datetime import datetime
 
 from app.core.database import get_read_session, get_write_session
 from app.core.logging_config import get_logger
+from app.core.pagination import Keyset, InvalidCursorError, NULL_TIMESTAMP_SENTINEL
+from app.core.response_cache import bump_data_generation, cached_response
+from app.core.text_search import contains
 from app.models.unified_models import Pr, Repository, PrComment, PrReview
 from app.auth.auth_middleware import UserData, require_authentication
 
 router = APIRouter(prefix="/api", tags=["Pull Requests"])
 logger = get_logger(__name__)
 
+# Newest first; served by idx_prs_tenant_pr_created_id
+PR_KEYSET = Keyset('prs', Pr.pr_created_at, Pr.id, null_sentinel=NULL_TIMESTAMP_SENTINEL)
+
 
 # Request/Response Models
 class PrCreateRequest(BaseModel):
@@ -64,7 +70,9 @@ async def get_pull_requests(
     tenant_id: int = Query(..., description="Tenant ID for data isolation"),
     include_ml_fields: bool = Query(False, description="Include ML fields in response"),
     limit: int = Query(100, le=1000, description="Maximum number of PRs to return"),
-    offset: int = Query(0, ge=0, description="Number of PRs to skip for pagination"),
+    offset: int = Query(0, ge=0, description="Number of PRs to skip for pagination (ignored with cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="Count all matching PRs (skip for faster paging)"),
     repository: Optional[str] = Query(None, description="Filter by repository name"),
     status: Optional[str] = Query(None, description="Filter by PR status"),
     user_name: Optional[str] = Query(None, description="Filter by user name"),
@@ -88,19 +96,23 @@ async def get_pull_requests(
         
         # Apply optional filters
         if repository:
-            query = query.join(Repository).filter(Repository.name.ilike(f"%{repository}%"))
+            query = query.join(Repository).filter(contains(Repository.name, repository))
         
         if status:
             query = query.filter(Pr.status == status)
             
         if user_name:
-            query = query.filter(Pr.user_name.ilike(f"%{user_name}%"))
+            query = query.filter(contains(Pr.user_name, user_name))
         
         # Get total count before pagination
-        total_count = query.count()
+        total_count = query.count() if include_total else None
         
-        # Apply pagination and ordering
-        pull_requests = query.order_by(Pr.pr_created_at.desc()).offset(offset).limit(limit).all()
+        # Apply pagination and ordering (one extra row tells whether another page exists)
+        query = query.order_by(*PR_KEYSET.order_by())
+        query = query.filter(PR_KEYSET.after(cursor)) if cursor else query.offset(offset)
+        pull_requests = query.limit(limit + 1).all()
+        next_cursor = PR_KEYSET.next_cursor(pull_requests, limit)
+        pull_requests = pull_requests[:limit]
         
         # Enhanced response with optional ML fields
         result = []
@@ -114,6 +126,7 @@ async def get_pull_requests(
             'total_count': total_count,
             'offset': offset,
             'limit': limit,
+            'next_cursor': next_cursor,
             'ml_fields_included': include_ml_fields,
             'filters': {
                 'repository': repository,
@@ -124,6 +137,8 @@ async def get_pull_requests(
         
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching pull requests: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch pull requests")
@@ -196,6 +211,7 @@ async def create_pull_request(
         
         db.add(pr)
         db.commit()
+        bump_data_generation(user.tenant_id)
         db.refresh(pr)
         
         logger.info(f"Created pull request #{pr.number} for client {user.tenant_id}")
@@ -236,6 +252,7 @@ async def update_pull_request(
         pr.last_updated_at = DateTimeHelper.now_utc()
 
         db.commit()
+        bump_data_generation(user.tenant_id)
         db.refresh(pr)
 
         logger.info(f"Updated pull request #{pr.number} for client {user.tenant_id}")
@@ -273,6 +290,7 @@ async def delete_pull_request(
         pr.last_updated_at = DateTimeHelper.now_utc()
 
         db.commit()
+        bump_data_generation(user.tenant_id)
 
         logger.info(f"Deleted pull request #{pr.number} for client {user.tenant_id}")
         return {"message": "Pull request deleted successfully", "pr_id": pr_id}
@@ -286,6 +304,7 @@ async def delete_pull_request(
 
 
 @router.get("/pull-requests/stats")
+@cached_response("pull_requests.stats")
 async def get_pull_requests_stats(
     tenant_id: int = Query(..., description="Tenant ID for data isolation"),
     db: Session = Depends(get_read_session),
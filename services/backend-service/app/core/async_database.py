@@ -0,0 +1,303 @@
+"""
+Async Database Router for Backend Service
+Non-blocking database access for async FastAPI routes (SQLAlchemy asyncio + asyncpg).
+
+Async routes that use DatabaseRouter run synchronous psycopg2 queries on the
+event loop, so one slow analytics query stalls every request in the process.
+AsyncDatabaseRouter has the same primary/replica routing as DatabaseRouter
+but yields AsyncSession objects whose queries are awaited.
+
+Usage in a route:
+    async with get_async_database().get_read_session_context() as session:
+        rows = (await session.execute(text(query), params)).fetchall()
+
+or as a dependency:
+    session: AsyncSession = Depends(get_async_db_read_session)
+"""
+
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncGenerator, Optional
+from uuid import uuid4
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import get_settings
+from app.core.utils import DateTimeHelper
+from app.core.replica_lag_monitor import (
+    get_replica_lag_monitor, lsn_reached, COMMIT_LSN_QUERY, REPLAY_LSN_QUERY
+)
+
+# Import pgvector for PostgreSQL vector type support
+try:
+    from pgvector.asyncpg import register_vector
+except ImportError:
+    register_vector = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabaseRouter:
+    """
+    Async counterpart of DatabaseRouter.
+    Routes reads to the replica when configured (falling back to primary) and writes to primary.
+    Shares the replica lag monitor and read-your-writes tokens (min_lsn) with DatabaseRouter.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.primary_engine = None
+        self.replica_engine = None
+        self.replica_available = True
+        self.last_health_check: Optional[datetime] = None
+        self.lag_monitor = None
+        self._initialize_engines()
+        if self.replica_engine is not None:
+            self.lag_monitor = get_replica_lag_monitor()
+
+    def _setup_pgvector_event_listener(self, engine):
+        """Register pgvector on every new asyncpg connection."""
+        if register_vector is None:
+            logger.warning("pgvector not available - vector operations may not work on async sessions")
+            return False
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def register_vector_on_connect(dbapi_connection, connection_record):
+            try:
+                dbapi_connection.run_async(register_vector)
+            except Exception as e:
+                logger.warning(f"Failed to register pgvector for async connection: {e}")
+
+        return True
+
+    def _engine_options(self, pool_timeout: int) -> dict:
+        """Pool and driver options shared by the async engines (see engine_registry for PgBouncer notes)."""
+        options = {'echo': self.settings.DEBUG, 'pool_pre_ping': True}
+        if self.settings.DB_USE_NULL_POOL:
+            options['poolclass'] = NullPool
+        else:
+            options.update(
+                pool_size=self.settings.DB_ASYNC_POOL_SIZE,
+                max_overflow=self.settings.DB_ASYNC_MAX_OVERFLOW,
+                pool_timeout=pool_timeout,
+                pool_recycle=self.settings.DB_POOL_RECYCLE
+            )
+        if self.settings.DB_PGBOUNCER_ENABLED:
+            # Transaction pooling: a prepared statement may be missing on the next server connection
+            options['connect_args'] = {
+                'statement_cache_size': 0,
+                'prepared_statement_cache_size': 0,
+                'prepared_statement_name_func': lambda: f"__asyncpg_{uuid4()}__"
+            }
+        return options
+
+    def _initialize_engines(self):
+        """Initialize async engines for primary and replica."""
+        self.primary_engine = create_async_engine(
+            self.settings.postgres_async_connection_string,
+            **self._engine_options(self.settings.DB_POOL_TIMEOUT)
+        )
+        self._setup_pgvector_event_listener(self.primary_engine)
+        self.primary_session_factory = async_sessionmaker(self.primary_engine, expire_on_commit=False)
+
+        self.replica_session_factory = None
+        if self.settings.USE_READ_REPLICA and self.settings.POSTGRES_REPLICA_HOST:
+            self.replica_engine = create_async_engine(
+                self.settings.postgres_replica_async_connection_string,
+                **self._engine_options(self.settings.DB_REPLICA_POOL_TIMEOUT)
+            )
+            self._setup_pgvector_event_listener(self.replica_engine)
+            self.replica_session_factory = async_sessionmaker(self.replica_engine, expire_on_commit=False)
+            logger.info("✅ Async database router initialized with replica support")
+        else:
+            logger.info("✅ Async database router initialized (primary only)")
+
+    def _should_use_replica(self) -> bool:
+        """Determine if replica should be used for reads (same rules as DatabaseRouter)."""
+        if not self.settings.USE_READ_REPLICA or not self.replica_engine:
+            return False
+
+        if not self.replica_available:
+            # Check if we should retry replica
+            if self.last_health_check:
+                time_since_check = DateTimeHelper.now_default() - self.last_health_check
+                if time_since_check.total_seconds() < 60:  # Don't retry for 1 minute
+                    return False
+            self.replica_available = True
+
+        # Lagging, unreachable or unmonitored replica: read from primary
+        if self.lag_monitor is not None and not self.lag_monitor.is_healthy():
+            return False
+
+        return True
+
+    def _mark_replica_failed(self, error: Exception):
+        logger.warning(f"Replica connection failed, falling back to primary: {error}")
+        self.replica_available = False
+        self.last_health_check = DateTimeHelper.now_default()
+
+    async def _replica_has_replayed(self, session: AsyncSession, min_lsn: Optional[str]) -> bool:
+        """Check a read-your-writes token against the lag monitor, then the replica itself."""
+        if not min_lsn:
+            return True
+        if self.lag_monitor is not None and self.lag_monitor.has_replayed(min_lsn):
+            return True
+        return lsn_reached(await session.scalar(REPLAY_LSN_QUERY), min_lsn)
+
+    async def _open_read_session(self, min_lsn: Optional[str] = None) -> AsyncSession:
+        """Open a read session on the replica if available and caught up to min_lsn, otherwise on primary."""
+        if self._should_use_replica():
+            session = self.replica_session_factory()
+            try:
+                await session.connection()  # Fail over now rather than on the first query
+                if await self._replica_has_replayed(session, min_lsn):
+                    return session
+                await session.close()
+                return self.primary_session_factory()
+            except Exception as e:
+                await session.close()
+                if not self.settings.REPLICA_FALLBACK_ENABLED:
+                    raise
+                self._mark_replica_failed(e)
+
+        return self.primary_session_factory()
+
+    async def _record_commit_lsn(self, session: AsyncSession):
+        """Store the primary WAL position after commit as the session's read-your-writes token (see min_lsn)."""
+        if self.replica_engine is None:
+            return
+        try:
+            session.info['commit_lsn'] = await session.scalar(COMMIT_LSN_QUERY)
+        except Exception as e:
+            logger.warning(f"Failed to read commit LSN: {e}")
+
+    @asynccontextmanager
+    async def get_write_session_context(self) -> AsyncGenerator[AsyncSession, None]:
+        """Async context manager for write operations (always primary)."""
+        session = self.primary_session_factory()
+        try:
+            yield session
+            await session.commit()
+            await self._record_commit_lsn(session)
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    @asynccontextmanager
+    async def get_read_session_context(self, min_lsn: Optional[str] = None) -> AsyncGenerator[AsyncSession, None]:
+        """Async context manager for read operations (replica if available and caught up to min_lsn)."""
+        session = await self._open_read_session(min_lsn)
+        try:
+            yield session
+        except Exception as e:
+            logger.error(f"Async read session error: {e}")
+            raise
+        finally:
+            await session.close()
+
+    @asynccontextmanager
+    async def get_primary_read_session_context(self) -> AsyncGenerator[AsyncSession, None]:
+        """Async context manager for reads that must see the latest writes (always primary)."""
+        session = self.primary_session_factory()
+        try:
+            yield session
+        except Exception as e:
+            logger.error(f"Async primary read session error: {e}")
+            raise
+        finally:
+            await session.close()
+
+    @asynccontextmanager
+    async def get_analytics_session_context(self) -> AsyncGenerator[AsyncSession, None]:
+        """Async context manager for analytics queries (read-only transaction, 60s timeout)."""
+        session = await self._open_read_session()
+        try:
+            # SET LOCAL: settings end with the transaction instead of sticking to the pooled connection
+            await session.execute(text("SET LOCAL statement_timeout = '60s'"))
+            await session.execute(text("SET TRANSACTION READ ONLY"))
+            yield session
+        except Exception as e:
+            logger.error(f"Async analytics session error: {e}")
+            raise
+        finally:
+            await session.close()
+
+    def get_connection_pool_stats(self) -> dict:
+        """Get current async connection pool statistics."""
+        def pool_stats(engine) -> Optional[dict]:
+            if engine is None:
+                return None
+            pool = engine.sync_engine.pool
+            size = getattr(pool, 'size', lambda: 0)()
+            checked_out = getattr(pool, 'checkedout', lambda: 0)()
+            overflow = getattr(pool, 'overflow', lambda: 0)()
+            total_capacity = size + max(overflow, 0)
+            return {
+                'size': size,
+                'checked_in': getattr(pool, 'checkedin', lambda: 0)(),
+                'checked_out': checked_out,
+                'overflow': overflow,
+                'utilization': checked_out / total_capacity if total_capacity > 0 else 0
+            }
+
+        return {
+            'primary': pool_stats(self.primary_engine),
+            'replica': pool_stats(self.replica_engine),
+            'replica_available': self.replica_available,
+            'replica_lag': self.lag_monitor.get_status() if self.lag_monitor else None,
+            'timestamp': DateTimeHelper.now_default()
+        }
+
+    async def close_connections(self):
+        """Closes all async database connections (primary and replica)."""
+        try:
+            if self.primary_engine:
+                await self.primary_engine.dispose()
+            if self.replica_engine:
+                await self.replica_engine.dispose()
+            logger.info("Async database connections closed")
+        except Exception as e:
+            logger.error(f"Error closing async connections: {e}")
+
+
+# Global async database router instance
+_async_database_router: Optional[AsyncDatabaseRouter] = None
+
+
+def get_async_database() -> AsyncDatabaseRouter:
+    """Get the global async database router instance."""
+    global _async_database_router
+    if _async_database_router is None:
+        _async_database_router = AsyncDatabaseRouter()
+    return _async_database_router
+
+
+async def close_async_database():
+    """Dispose the async engines if they were created (application shutdown)."""
+    if _async_database_router is not None:
+        await _async_database_router.close_connections()
+
+
+async def get_async_db_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async READ database session in FastAPI.
+
+    Use this for async GET endpoints. Routes to the replica if available.
+    """
+    async with get_async_database().get_read_session_context() as session:
+        yield session
+
+
+async def get_async_db_analytics_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async analytics session in FastAPI.
+
+    Read-only transaction with a 60s statement timeout, for reporting endpoints.
+    """
+    async with get_async_database().get_analytics_session_context() as session:
+        yield session
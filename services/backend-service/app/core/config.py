@@ -55,6 +55,22 @@ class Settings(BaseSettings):
     DB_REPLICA_POOL_SIZE: int = 30  # Large pool for UI queries
     DB_REPLICA_MAX_OVERFLOW: int = 20  # Allow 50 total read connections
     DB_REPLICA_POOL_TIMEOUT: int = 3  # Fail fast for UI responsiveness
+    DB_REPLICA_MAX_LAG_SECONDS: float = 30.0  # Reads go to primary while replica replay lag exceeds this
+    DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 5.0  # Background lag sampling interval
+
+    # Analytics Pool Settings (reporting/ML queries)
+    # 0 = share the read pool; > 0 = dedicated pool on the read target so long queries can't starve UI reads
+    DB_ANALYTICS_POOL_SIZE: int = 0
+    DB_ANALYTICS_MAX_OVERFLOW: int = 5
+
+    # PgBouncer (transaction pooling) compatibility
+    DB_PGBOUNCER_ENABLED: bool = False  # Disable asyncpg prepared statement caches
+    DB_USE_NULL_POOL: bool = False  # No client-side pooling: PgBouncer owns the connections
+
+    # Async Database Pool Settings (asyncpg, used by async analytics/list routes)
+    # One pool per engine (primary, replica); connections are only held while a query awaits
+    DB_ASYNC_POOL_SIZE: int = 20
+    DB_ASYNC_MAX_OVERFLOW: int = 10
 
     # Feature Flags
     USE_READ_REPLICA: bool = False
@@ -86,6 +102,55 @@ class Settings(BaseSettings):
     # Cache Configuration
     REDIS_URL: Optional[str] = "redis://localhost:6379/0"
     CACHE_TTL_SECONDS: int = 3600
+    CREDENTIAL_CACHE_TTL_SECONDS: int = 300  # Decrypted integration credentials kept in worker memory
+    TENANT_TIER_CACHE_TTL_SECONDS: int = 60  # Tenant tier routing table used by QueueManager
+    RESPONSE_CACHE_ENABLED: bool = True  # Dashboard responses cached per tenant data generation (ETag/304)
+    RESPONSE_CACHE_TTL_SECONDS: int = 300  # Upper bound on staleness for data changed outside ETL jobs
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000  # Cached responses kept per process
+
+    # ETL Worker Runtime
+    ETL_IN_PROCESS_WORKERS: bool = True  # False when workers run via `python -m app.etl.workers.run`
+    ETL_WORKER_DRAIN_TIMEOUT_SECONDS: int = 120  # Time for in-flight messages to finish on SIGTERM
+    ETL_WORKER_HEARTBEAT_TTL_SECONDS: int = 30  # Standalone runtimes missing heartbeats this long drop out of status
+    ETL_WORKER_METRICS_PORT: int = 0  # Standalone worker processes serve /metrics on this port + process slot (0 = off)
+    ETL_WORKER_METRICS_HOST: str = '127.0.0.1'  # Interface of the worker /metrics servers (0.0.0.0 to let other hosts scrape)
+
+    # Prometheus Metrics (GET /metrics)
+    METRICS_ENABLED: bool = True
+    METRICS_BEARER_TOKEN: Optional[str] = None  # When set, scrapes must send "Authorization: Bearer <token>"
+
+    # ETL Worker Autoscaling (in-process pools)
+    ETL_AUTOSCALE_ENABLED: bool = False
+    ETL_AUTOSCALE_INTERVAL_SECONDS: int = 30
+    ETL_AUTOSCALE_MIN_WORKERS: int = 1  # Per pool
+    ETL_AUTOSCALE_MAX_WORKERS: int = 20  # Per pool, also bounded by the DB connection budget
+    ETL_AUTOSCALE_TARGET_DRAIN_SECONDS: int = 120  # Size pools to clear the backlog within this time
+    ETL_AUTOSCALE_COOLDOWN_SECONDS: int = 300  # No scale-down this soon after a scale-up
+
+    # ETL Fair Scheduling (per-tenant sub-queues of shared tier queues)
+    ETL_FAIR_SCHEDULING_ENABLED: bool = False
+    ETL_FAIR_HIGH_PRIORITY_WEIGHT: int = 4  # Incremental syncs / manual runs get 4 turns per backfill turn
+    ETL_FAIR_MAX_INFLIGHT_SHARE: float = 0.5  # Max share of a process's workers one tenant may occupy
+    ETL_FAIR_REFRESH_SECONDS: float = 1.0  # How often sub-queue depths are re-read
+
+    # ETL In-flight Tracking (per-job-token message counters in Redis)
+    ETL_INFLIGHT_TTL_SECONDS: int = 21600  # Counters idle this long expire (crashed workers, expired messages)
+    ETL_INFLIGHT_STALE_SECONDS: int = 600  # Non-zero counters unchanged this long fall back to the queue check
+
+    # ETL Message Encoding (consumers decode any codec by content_type, see message_codec.py)
+    ETL_MESSAGE_CODEC: str = "json"  # json | orjson | msgpack
+    ETL_MESSAGE_COMPRESSION_THRESHOLD_BYTES: int = 0  # zstd-compress bodies at least this large (0 = off)
+    ETL_MESSAGE_ZSTD_LEVEL: int = 3
+
+    # External API Rate Limit Pacing (GitHub/Jira)
+    RATE_LIMIT_USE_REDIS: bool = False  # Share budgets across worker processes via Redis
+    RATE_LIMIT_MAX_WAIT_SECONDS: int = 900  # Longer waits fall back to RATE_LIMITED job status
+    RATE_LIMIT_RESERVE_FRACTION: float = 0.02  # Budget kept in reserve for UI/admin calls
+    RATE_LIMIT_PACING_THRESHOLD: float = 0.25  # Start spreading requests below this share of the limit
+
+    # GitHub API endpoint (GitHub Enterprise, or a local fake server for ETL benchmarks)
+    GITHUB_API_URL: str = "https://api.github.com"
+    GITHUB_GRAPHQL_URL: Optional[str] = None  # Unset: derived from GITHUB_API_URL (.../api/v3 -> .../api/graphql)
 
     # Service Communication URLs
     BACKEND_SERVICE_URL: str = "http://localhost:3001"  # Backend service
@@ -119,6 +184,18 @@ class Settings(BaseSettings):
         replica_port = self.POSTGRES_REPLICA_PORT if self.POSTGRES_REPLICA_HOST else self.POSTGRES_PORT
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{replica_host}:{replica_port}/{self.POSTGRES_DATABASE}?client_encoding=utf8"
     
+    @property
+    def postgres_async_connection_string(self) -> str:
+        """Primary connection string for the asyncpg driver (asyncpg does not accept client_encoding)"""
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DATABASE}"
+
+    @property
+    def postgres_replica_async_connection_string(self) -> str:
+        """Read replica connection string for the asyncpg driver (falls back to primary if no replica configured)"""
+        replica_host = self.POSTGRES_REPLICA_HOST or self.POSTGRES_HOST
+        replica_port = self.POSTGRES_REPLICA_PORT if self.POSTGRES_REPLICA_HOST else self.POSTGRES_PORT
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{replica_host}:{replica_port}/{self.POSTGRES_DATABASE}"
+
     # NOTE: Legacy jira_base_url_legacy property removed
     # Jira configuration now stored in database (integrations table)
     
@@ -153,9 +230,14 @@ class AppConfig:
             return token
     
     @staticmethod
-    def decrypt_token(encrypted_token: str, key: str) -> str:
+    def decrypt_token(encrypted_token: str, key: str, strict: bool = False) -> str:
         """
         Decrypts a token using the provided key.
+
+        With strict=True a Fernet token (a value starting with 'gAAAA') that
+        cannot be decrypted raises instead of being returned as is. Other
+        values are still returned as is: seed migrations store tokens in
+        plaintext when encryption is unavailable.
         """
         try:
             from cryptography.fernet import Fernet
@@ -166,6 +248,8 @@ class AppConfig:
             decrypted_token = fernet.decrypt(encrypted_token.encode('utf-8'))
             return decrypted_token.decode('utf-8')
         except Exception as e:
+            if strict and encrypted_token.startswith('gAAAA'):
+                raise  # Encrypted with another key or corrupted, never usable as a token
             # Fallback: returns token without decryption
             print(f"Warning: Failed to decrypt token: {e}")
             return encrypted_token
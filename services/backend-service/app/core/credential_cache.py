@@ -0,0 +1,199 @@
+"""
+Credential Cache - Process-level cache of integrations with decrypted credentials.
+
+Extraction workers and AI providers used to load the Integration row and
+decrypt its token on every message. This cache keeps the integration fields,
+the decrypted token and the API clients built from them in memory for
+CREDENTIAL_CACHE_TTL_SECONDS, keyed by integration id. Clients hold an HTTP
+session and mutable rate limit state, so each worker thread gets its own.
+
+Decrypted tokens are never written to Redis, the database or logs. Entries are
+invalidated when an integration is updated, toggled or deleted through
+app/etl/integrations.py; other processes pick up changes when the TTL expires.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Callable
+
+from app.core.config import AppConfig, get_settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CachedIntegration:
+    """Integration fields needed by API clients, with the token already decrypted."""
+    id: int
+    tenant_id: int
+    provider: str
+    type: str
+    base_url: Optional[str]
+    username: Optional[str]
+    token: Optional[str] = field(repr=False)
+    settings: Dict[str, Any]
+    active: bool
+    loaded_at: float = field(default_factory=time.time)
+    clients: threading.local = field(default_factory=threading.local, repr=False)  # client_type -> client, per thread
+
+
+class CredentialCache:
+    """
+    TTL cache of integrations and their ready-to-use API clients.
+
+    get_integration() loads and decrypts an integration at most once per TTL.
+    get_client() builds a client from a cached integration once per thread and
+    returns the same instance to that thread until the integration is
+    invalidated or expires.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else get_settings().CREDENTIAL_CACHE_TTL_SECONDS
+        self._entries: Dict[int, CachedIntegration] = {}
+        self._decrypted: Dict[int, tuple] = {}  # integration_id -> (encrypted, decrypted, loaded_at)
+        self._lock = threading.RLock()
+
+    # ============ LOOKUPS ============
+
+    def get_integration(self, tenant_id: int, integration_id: int) -> Optional[CachedIntegration]:
+        """
+        Get an integration with its decrypted token.
+
+        Args:
+            tenant_id: Tenant ID (entries never cross tenants)
+            integration_id: Integration ID
+
+        Returns:
+            CachedIntegration, or None if the integration does not exist for this tenant
+        """
+        with self._lock:
+            entry = self._entries.get(integration_id)
+            if entry and entry.tenant_id == tenant_id and not self._is_expired(entry.loaded_at):
+                return entry
+
+        entry = self._load_integration(tenant_id, integration_id)
+
+        with self._lock:
+            if entry is None:
+                self._entries.pop(integration_id, None)
+            else:
+                self._entries[integration_id] = entry
+        return entry
+
+    def get_client(self, integration: CachedIntegration, client_type: str, factory: Callable[[], Any]) -> Any:
+        """
+        Get an API client built from a cached integration.
+
+        Args:
+            integration: Entry returned by get_integration()
+            client_type: Name of the client kind (e.g. 'github_graphql', 'jira')
+            factory: Builds the client when it is not cached yet
+
+        Returns:
+            Client instance shared by the calling thread's callers of this integration
+        """
+        client = getattr(integration.clients, client_type, None)
+        if client is None:
+            client = factory()
+            setattr(integration.clients, client_type, client)
+        return client
+
+    def decrypt(self, integration_id: int, encrypted_token: Optional[str]) -> Optional[str]:
+        """
+        Decrypt an integration token the caller already loaded, caching the result.
+
+        The cached value is reused only while the encrypted value is unchanged,
+        so callers holding a fresh Integration row never get a stale token.
+        Plaintext tokens are returned as is; returns None for a Fernet token
+        that cannot be decrypted.
+        """
+        if not encrypted_token:
+            return None
+
+        with self._lock:
+            cached = self._decrypted.get(integration_id)
+            if cached and cached[0] == encrypted_token and not self._is_expired(cached[2]):
+                return cached[1]
+
+        try:
+            decrypted = AppConfig.decrypt_token(encrypted_token, AppConfig.load_key(), strict=True)
+        except Exception as e:
+            logger.error(f"Failed to decrypt token for integration {integration_id}: {e}")
+            return None
+
+        with self._lock:
+            self._decrypted[integration_id] = (encrypted_token, decrypted, time.time())
+        return decrypted
+
+    # ============ INVALIDATION ============
+
+    def invalidate(self, integration_id: int):
+        """Drop the cached integration, token and clients for one integration."""
+        with self._lock:
+            removed = self._entries.pop(integration_id, None)
+            self._decrypted.pop(integration_id, None)
+        if removed:
+            logger.debug(f"🗑️ Credential cache invalidated for integration {integration_id}")
+
+    def clear(self):
+        """Drop all cached integrations."""
+        with self._lock:
+            self._entries.clear()
+            self._decrypted.clear()
+
+    # ============ INTERNALS ============
+
+    def _is_expired(self, loaded_at: float) -> bool:
+        return time.time() - loaded_at >= self.ttl_seconds
+
+    def _load_integration(self, tenant_id: int, integration_id: int) -> Optional[CachedIntegration]:
+        """Load an integration from the database and decrypt its token."""
+        from app.core.database import get_database
+        from app.models.unified_models import Integration
+
+        database = get_database()
+        with database.get_read_session_context() as db:
+            integration = db.query(Integration).filter(
+                Integration.id == integration_id,
+                Integration.tenant_id == tenant_id
+            ).first()
+
+            if not integration:
+                return None
+
+            token = None
+            if integration.password:
+                try:
+                    token = AppConfig.decrypt_token(integration.password, AppConfig.load_key(), strict=True)
+                except Exception as e:
+                    # Undecryptable Fernet token: callers treat a missing token as a configuration error
+                    logger.error(f"Failed to decrypt token for integration {integration_id}: {e}")
+
+            return CachedIntegration(
+                id=integration.id,
+                tenant_id=integration.tenant_id,
+                provider=integration.provider,
+                type=integration.type,
+                base_url=integration.base_url,
+                username=integration.username,
+                token=token,
+                settings=integration.settings or {},
+                active=integration.active
+            )
+
+
+# Global credential cache instance
+_credential_cache: Optional[CredentialCache] = None
+_credential_cache_lock = threading.Lock()
+
+
+def get_credential_cache() -> CredentialCache:
+    """Get the global credential cache instance"""
+    global _credential_cache
+    if _credential_cache is None:
+        with _credential_cache_lock:
+            if _credential_cache is None:
+                _credential_cache = CredentialCache()
+    return _credential_cache
@@ -4,75 +4,39 @@ Migrated from Snowflake to PostgreSQL for better performance.
 Enhanced with read replica routing for improved scalability.
 """
 
-from sqlalchemy import create_engine, text, event
+from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Optional
 import logging
 
 from app.core.config import get_settings
 from app.models.unified_models import Base
+from app.core.engine_registry import get_engine_registry, ROLE_PRIMARY
 from app.core.database_router import (
     get_database_router, get_write_session, get_read_session,
     get_ml_session_context, get_ml_session, test_vector_column_access
 )
 
-# Import pgvector for PostgreSQL vector type support
-try:
-    from pgvector.psycopg2 import register_vector
-except ImportError:
-    register_vector = None
-
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
 class PostgreSQLDatabase:
-    """PostgreSQL connection manager."""
+    """PostgreSQL connection manager (shares the registry's primary engine with DatabaseRouter)."""
 
     def __init__(self):
         self.engine = None
         self.SessionLocal = None
         self._initialize_engine()
 
-    def _setup_pgvector_event_listener(self, engine):
-        """Set up event listener to register pgvector on every new connection."""
-        if register_vector is not None:
-            @event.listens_for(engine, "connect")
-            def register_vector_on_connect(dbapi_connection, connection_record):
-                try:
-                    if register_vector is not None:  # Double check for type safety
-                        register_vector(dbapi_connection)
-                        logger.debug("pgvector registered for new connection")
-                except Exception as e:
-                    logger.warning(f"Failed to register pgvector for connection: {e}")
-
-            logger.info("pgvector event listener registered for all new connections")
-            return True
-        else:
-            logger.warning("pgvector not available - vector operations may not work")
-            return False
-
     def _initialize_engine(self):
-        """Initializes SQLAlchemy engine with PostgreSQL connection."""
+        """Uses the shared primary engine from the engine registry."""
         try:
-            # Create SQLAlchemy engine for PostgreSQL
-            self.engine = create_engine(
-                settings.postgres_connection_string,
-                poolclass=QueuePool,
-                pool_size=settings.DB_POOL_SIZE,
-                max_overflow=settings.DB_MAX_OVERFLOW,
-                pool_timeout=settings.DB_POOL_TIMEOUT,
-                pool_recycle=settings.DB_POOL_RECYCLE,
-                pool_pre_ping=True,
-                echo=False  # Disable SQLAlchemy logging completely
-            )
+            registry = get_engine_registry()
+            self.engine = registry.get_engine(ROLE_PRIMARY)
 
-            # Set up pgvector event listener for all new connections
-            self._setup_pgvector_event_listener(self.engine)
-
-            # Create sessionmaker
+            # Legacy sessions: no autoflush, otherwise identical to the router's primary sessions
             self.SessionLocal = sessionmaker(
                 autocommit=False,
                 autoflush=False,
@@ -84,8 +48,6 @@ class PostgreSQLDatabase:
         except Exception as e:
             logger.error(f"Failed to initialize PostgreSQL connection: {e}")
             raise
-    
-
 
     def get_write_session(self) -> Session:
         """Get a write session (always routes to primary database)."""
@@ -103,10 +65,10 @@ class PostgreSQLDatabase:
             yield session
 
     @contextmanager
-    def get_read_session_context(self) -> Generator[Session, None, None]:
-        """Context manager for read operations (replica if available)."""
+    def get_read_session_context(self, min_lsn: Optional[str] = None) -> Generator[Session, None, None]:
+        """Context manager for read operations (replica if available and caught up to min_lsn)."""
         router = get_database_router()
-        with router.get_read_session_context() as session:
+        with router.get_read_session_context(min_lsn) as session:
             yield session
 
     @contextmanager
@@ -217,8 +179,7 @@ class PostgreSQLDatabase:
     def close_connections(self):
         """Closes all connections."""
         try:
-            if self.engine:
-                self.engine.dispose()
+            get_engine_registry().dispose()
             logger.info("Database connections closed")
         except Exception as e:
             logger.error(f"Error closing connections: {e}")
@@ -226,19 +187,15 @@ class PostgreSQLDatabase:
 
 # Global database instance (lazy initialization)
 _database = None
-_database_router = None
 
 
 def get_database():
     """
     Returns the database router instance with read/write separation.
     This is the CORRECT way to get database access for ETL operations.
+    Same instance as get_database_router().
     """
-    global _database_router
-    if _database_router is None:
-        from app.core.database_router import DatabaseRouter
-        _database_router = DatabaseRouter()
-    return _database_router
+    return get_database_router()
 
 
 def get_legacy_database() -> PostgreSQLDatabase:
@@ -4,20 +4,18 @@ Intelligent database routing for read/write operations with replica support.
 """
 
 import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Optional
 from contextlib import contextmanager
-from sqlalchemy import create_engine, text, event
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy import text
+from sqlalchemy.orm import Session
 from app.core.config import get_settings
 from app.core.utils import DateTimeHelper
-
-# Import pgvector for PostgreSQL vector type support
-try:
-    from pgvector.psycopg2 import register_vector
-except ImportError:
-    register_vector = None
+from app.core.engine_registry import get_engine_registry, ROLE_PRIMARY, ROLE_REPLICA, ROLE_ANALYTICS
+from app.core.replica_lag_monitor import (
+    get_replica_lag_monitor, lsn_reached, COMMIT_LSN_QUERY, REPLAY_LSN_QUERY
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +24,10 @@ class DatabaseRouter:
     """
     Intelligent database routing for read/write operations.
     Routes queries to appropriate database instance based on operation type.
+
+    Reads avoid the replica while its lag exceeds DB_REPLICA_MAX_LAG_SECONDS
+    (see ReplicaLagMonitor). Write sessions record the commit LSN in
+    session.info['commit_lsn']; pass it as min_lsn to read your own writes.
     """
     
     def __init__(self):
@@ -34,79 +36,70 @@ class DatabaseRouter:
         self.replica_engine = None
         self.replica_available = True
         self.last_health_check = None
-        self.max_lag_seconds = 30
+        self.max_lag_seconds = self.settings.DB_REPLICA_MAX_LAG_SECONDS
+        self.lag_monitor = None
         self._initialize_engines()
-
-    def _setup_pgvector_event_listener(self, engine):
-        """Set up event listener to register pgvector on every new connection."""
-        if register_vector is not None:
-            @event.listens_for(engine, "connect")
-            def register_vector_on_connect(dbapi_connection, connection_record):
-                try:
-                    if register_vector is not None:  # Double check for type safety
-                        register_vector(dbapi_connection)
-                        logger.debug("pgvector registered for new connection")
-                except Exception as e:
-                    logger.warning(f"Failed to register pgvector for connection: {e}")
-
-            logger.info("pgvector event listener registered for database router engine")
-            return True
-        else:
-            logger.warning("pgvector not available - vector operations may not work")
-            return False
+        if self.replica_engine is not None:
+            self.lag_monitor = get_replica_lag_monitor()
 
     def _initialize_engines(self):
-        """Initialize database engines for primary and replica."""
-        # Primary database engine (writes)
-        self.primary_engine = create_engine(
-            self.settings.postgres_connection_string,
-            poolclass=QueuePool,
-            pool_size=self.settings.DB_POOL_SIZE,
-            max_overflow=self.settings.DB_MAX_OVERFLOW,
-            pool_timeout=self.settings.DB_POOL_TIMEOUT,
-            pool_recycle=self.settings.DB_POOL_RECYCLE,
-            echo=self.settings.DEBUG,
-            pool_pre_ping=True
-        )
-        # Set up pgvector event listener for primary engine
-        self._setup_pgvector_event_listener(self.primary_engine)
-        
-        # Replica database engine (reads) - only if replica is configured
-        if self.settings.USE_READ_REPLICA and self.settings.POSTGRES_REPLICA_HOST:
-            self.replica_engine = create_engine(
-                self.settings.postgres_replica_connection_string,
-                poolclass=QueuePool,
-                pool_size=self.settings.DB_REPLICA_POOL_SIZE,
-                max_overflow=self.settings.DB_REPLICA_MAX_OVERFLOW,
-                pool_timeout=self.settings.DB_REPLICA_POOL_TIMEOUT,
-                pool_recycle=self.settings.DB_POOL_RECYCLE,
-                echo=self.settings.DEBUG,
-                pool_pre_ping=True
-            )
-            # Set up pgvector event listener for replica engine
-            self._setup_pgvector_event_listener(self.replica_engine)
+        """Take the primary and replica engines from the process-wide engine registry."""
+        self.engines = get_engine_registry()
+        self.primary_engine = self.engines.get_engine(ROLE_PRIMARY)
+        self.replica_engine = self.engines.get_engine(ROLE_REPLICA)
+        if self.replica_engine is not None:
             logger.info("✅ Database router initialized with replica support")
         else:
             logger.info("✅ Database router initialized (primary only)")
     
     def get_write_session(self) -> Session:
         """Always routes to primary database for write operations."""
-        SessionLocal = sessionmaker(bind=self.primary_engine)
-        return SessionLocal()
+        return self.engines.get_session_factory(ROLE_PRIMARY)()
 
-    def get_read_session(self) -> Session:
-        """Routes to replica if available, fallback to primary."""
+    def get_read_session(self, min_lsn: Optional[str] = None) -> Session:
+        """
+        Routes to replica if available, fallback to primary.
+
+        Args:
+            min_lsn: Read-your-writes token (commit_lsn of a write session). The
+                replica is only used once it has replayed past this position.
+        """
         if self._should_use_replica():
+            session = None
             try:
-                SessionLocal = sessionmaker(bind=self.replica_engine)
-                return SessionLocal()
+                session = self.engines.get_session_factory(ROLE_REPLICA)()
+                if not self._replica_has_replayed(session, min_lsn):
+                    session.close()
+                    return self.get_primary_read_session()
+                return session
             except Exception as e:
-                logger.warning(f"Replica connection failed, falling back to primary: {e}")
-                self.replica_available = False
+                if session is not None:
+                    session.close()
+                self._mark_replica_failed(e)
 
         # Fallback to primary
-        SessionLocal = sessionmaker(bind=self.primary_engine)
-        return SessionLocal()
+        return self.engines.get_session_factory(ROLE_PRIMARY)()
+
+    def _replica_has_replayed(self, session: Session, min_lsn: Optional[str]) -> bool:
+        """Check a read-your-writes token against the lag monitor, then the replica itself."""
+        if not min_lsn:
+            return True
+        if self.lag_monitor is not None and self.lag_monitor.has_replayed(min_lsn):
+            return True
+        replay_lsn = session.execute(REPLAY_LSN_QUERY).scalar()
+        if lsn_reached(replay_lsn, min_lsn):
+            return True
+        logger.debug(f"Replica at {replay_lsn} has not replayed {min_lsn}, reading from primary")
+        return False
+
+    def _record_commit_lsn(self, session: Session):
+        """Store the primary WAL position after commit as the session's read-your-writes token."""
+        if self.replica_engine is None:
+            return
+        try:
+            session.info['commit_lsn'] = session.execute(COMMIT_LSN_QUERY).scalar()
+        except Exception as e:
+            logger.warning(f"Failed to read commit LSN: {e}")
 
     def get_primary_read_session(self) -> Session:
         """
@@ -119,8 +112,18 @@ class DatabaseRouter:
         - Embedding worker reading entities just inserted by transform worker
         - Any worker that needs consistent read-after-write semantics
         """
-        SessionLocal = sessionmaker(bind=self.primary_engine)
-        return SessionLocal()
+        return self.engines.get_session_factory(ROLE_PRIMARY)()
+
+    def get_analytics_session(self) -> Session:
+        """
+        Session for long reporting/ML queries.
+
+        Uses the dedicated analytics pool when configured (DB_ANALYTICS_POOL_SIZE)
+        and its read target is usable, otherwise a regular read session.
+        """
+        if self.engines.has_dedicated_analytics_pool and (self.replica_engine is None or self._should_use_replica()):
+            return self.engines.get_session_factory(ROLE_ANALYTICS)()
+        return self.get_read_session()
 
 
     
@@ -131,6 +134,7 @@ class DatabaseRouter:
         try:
             yield session
             session.commit()
+            self._record_commit_lsn(session)
         except Exception as e:
             session.rollback()
             raise
@@ -138,9 +142,9 @@ class DatabaseRouter:
             session.close()
     
     @contextmanager
-    def get_read_session_context(self):
-        """Context manager for read operations (replica if available)."""
-        session = self.get_read_session()
+    def get_read_session_context(self, min_lsn: Optional[str] = None):
+        """Context manager for read operations (replica if available and caught up to min_lsn)."""
+        session = self.get_read_session(min_lsn)
         try:
             yield session
         except Exception as e:
@@ -171,11 +175,12 @@ class DatabaseRouter:
     @contextmanager
     def get_analytics_session_context(self):
         """Context manager for analytics queries (read-only, optimized)."""
-        session = self.get_read_session()
+        session = self.get_analytics_session()
         try:
-            # Optimize for read queries
-            session.execute(text("SET statement_timeout = '60s'"))
-            session.execute(text("SET transaction_read_only = on"))
+            # Optimize for read queries (SET LOCAL: ends with the transaction instead of
+            # sticking to the pooled or PgBouncer server connection)
+            session.execute(text("SET LOCAL statement_timeout = '60s'"))
+            session.execute(text("SET TRANSACTION READ ONLY"))
             yield session
         except Exception as e:
             logger.error(f"Analytics session error: {e}")
@@ -186,13 +191,13 @@ class DatabaseRouter:
     @contextmanager
     def get_ml_session_context(self):
         """Context manager for ML operations (replica-only, optimized)."""
-        session = self.get_read_session()  # Always routes to replica
+        session = self.get_analytics_session()  # Routes to replica when available
         try:
-            # Optimize for ML workloads
-            session.execute(text("SET statement_timeout = '300s'"))
-            session.execute(text("SET transaction_read_only = on"))
-            session.execute(text("SET work_mem = '256MB'"))  # Larger work memory for ML
-            session.execute(text("SET random_page_cost = 1.1"))  # Optimize for SSD
+            # Optimize for ML workloads (transaction-scoped, see get_analytics_session_context)
+            session.execute(text("SET LOCAL statement_timeout = '300s'"))
+            session.execute(text("SET TRANSACTION READ ONLY"))
+            session.execute(text("SET LOCAL work_mem = '256MB'"))  # Larger work memory for ML
+            session.execute(text("SET LOCAL random_page_cost = 1.1"))  # Optimize for SSD
 
             logger.debug("ML session context initialized")
             yield session
@@ -238,8 +243,18 @@ class DatabaseRouter:
                 time_since_check = DateTimeHelper.now_default() - self.last_health_check
                 if time_since_check.total_seconds() < 60:  # Don't retry for 1 minute
                     return False
-        
+            self.replica_available = True
+
+        # Lagging, unreachable or unmonitored replica: read from primary
+        if self.lag_monitor is not None and not self.lag_monitor.is_healthy():
+            return False
+
         return True
+
+    def _mark_replica_failed(self, error: Exception):
+        logger.warning(f"Replica connection failed, falling back to primary: {error}")
+        self.replica_available = False
+        self.last_health_check = DateTimeHelper.now_default()
     
     def is_connection_alive(self) -> bool:
         """
@@ -283,16 +298,8 @@ class DatabaseRouter:
             raise
 
     def close_connections(self):
-        """Closes all database connections (primary and replica)."""
-        try:
-            if self.primary_engine:
-                self.primary_engine.dispose()
-                logger.info("Primary database connections closed")
-            if self.replica_engine:
-                self.replica_engine.dispose()
-                logger.info("Replica database connections closed")
-        except Exception as e:
-            logger.error(f"Error closing connections: {e}")
+        """Closes all database connections (every engine in the registry)."""
+        self.engines.dispose()
 
     async def check_replica_health(self) -> bool:
         """Check replica health and availability."""
@@ -300,28 +307,19 @@ class DatabaseRouter:
             return False
 
         try:
-            # Check primary LSN
-            with self.get_write_session() as primary:
-                primary_lsn = primary.execute(
-                    text("SELECT pg_current_wal_lsn()")
-                ).scalar()
-            
-            # Check replica LSN
-            with self.get_read_session() as replica:
-                replica_lsn = replica.execute(
-                    text("SELECT pg_last_wal_replay_lsn()")
-                ).scalar()
-            
-            # Calculate lag (simplified - in production you'd want more precise calculation)
-            lag_acceptable = True  # For now, assume lag is acceptable
-            
-            self.replica_available = lag_acceptable
+            # Sample lag now instead of waiting for the next background check
+            sample = self.lag_monitor.sample() if self.lag_monitor else None
+            if sample is not None and sample.error:
+                raise Exception(sample.error)
+
+            lag_acceptable = self.lag_monitor.is_healthy() if self.lag_monitor else True
+            self.replica_available = True
             self.last_health_check = DateTimeHelper.now_default()
             
             if not lag_acceptable:
-                logger.warning("Replica lag detected, falling back to primary")
+                logger.warning(f"Replica lag {sample.lag_seconds}s detected, falling back to primary")
             
-            return self.replica_available
+            return lag_acceptable
             
         except Exception as e:
             logger.error(f"Replica health check failed: {e}")
@@ -330,84 +328,32 @@ class DatabaseRouter:
             return False
     
     def get_connection_pool_stats(self) -> dict:
-        """Get current connection pool statistics."""
-        try:
-            # Get pool stats safely with proper attribute access
-            if self.primary_engine is None:
-                raise Exception("Primary engine not initialized")
-            pool = self.primary_engine.pool
-            size = getattr(pool, 'size', lambda: 0)()
-            checked_in = getattr(pool, 'checkedin', lambda: 0)()
-            checked_out = getattr(pool, 'checkedout', lambda: 0)()
-            overflow = getattr(pool, 'overflow', lambda: 0)()
-
-            total_capacity = size + overflow
-            utilization = checked_out / total_capacity if total_capacity > 0 else 0
-
-            primary_stats = {
-                'size': size,
-                'checked_in': checked_in,
-                'checked_out': checked_out,
-                'overflow': overflow,
-                'utilization': utilization
-            }
-        except Exception as e:
-            logger.warning(f"Failed to get primary pool stats: {e}")
-            primary_stats = {
-                'size': 0,
-                'checked_in': 0,
-                'checked_out': 0,
-                'overflow': 0,
-                'utilization': 0
-            }
-
-        replica_stats = None
-        if self.replica_engine:
-            try:
-                # Get replica pool stats safely with proper attribute access
-                pool = self.replica_engine.pool
-                size = getattr(pool, 'size', lambda: 0)()
-                checked_in = getattr(pool, 'checkedin', lambda: 0)()
-                checked_out = getattr(pool, 'checkedout', lambda: 0)()
-                overflow = getattr(pool, 'overflow', lambda: 0)()
-
-                total_capacity = size + overflow
-                utilization = checked_out / total_capacity if total_capacity > 0 else 0
-
-                replica_stats = {
-                    'size': size,
-                    'checked_in': checked_in,
-                    'checked_out': checked_out,
-                    'overflow': overflow,
-                    'utilization': utilization
-                }
-            except Exception as e:
-                logger.warning(f"Failed to get replica pool stats: {e}")
-                replica_stats = {
-                    'size': 0,
-                    'checked_in': 0,
-                    'checked_out': 0,
-                    'overflow': 0,
-                    'utilization': 0
-                }
-        
+        """Get current connection pool statistics (including checkout wait time histograms)."""
+        pool_stats = self.engines.get_all_pool_stats()
+        empty_stats = {'size': 0, 'checked_in': 0, 'checked_out': 0, 'overflow': 0, 'utilization': 0}
+
         return {
-            'primary': primary_stats,
-            'replica': replica_stats,
+            'primary': pool_stats[ROLE_PRIMARY] or empty_stats,
+            'replica': pool_stats[ROLE_REPLICA],
+            'analytics': pool_stats[ROLE_ANALYTICS],
             'replica_available': self.replica_available,
+            'replica_lag': self.lag_monitor.get_status() if self.lag_monitor else None,
             'timestamp': DateTimeHelper.now_default()
         }
 
 
 # Global database router instance
 _database_router: Optional[DatabaseRouter] = None
+_database_router_lock = threading.Lock()
 
 
 def get_database_router() -> DatabaseRouter:
     """Get the global database router instance."""
     global _database_router
     if _database_router is None:
-        _database_router = DatabaseRouter()
+        with _database_router_lock:
+            if _database_router is None:
+                _database_router = DatabaseRouter()
     return _database_router
 
 
@@ -417,9 +363,9 @@ def get_write_session() -> Session:
     return get_database_router().get_write_session()
 
 
-def get_read_session() -> Session:
+def get_read_session(min_lsn: Optional[str] = None) -> Session:
     """Get a read session (replica if available, fallback to primary)."""
-    return get_database_router().get_read_session()
+    return get_database_router().get_read_session(min_lsn)
 
 
 def get_write_session_context():
@@ -427,9 +373,9 @@ def get_write_session_context():
     return get_database_router().get_write_session_context()
 
 
-def get_read_session_context():
+def get_read_session_context(min_lsn: Optional[str] = None):
     """Get a read session context manager."""
-    return get_database_router().get_read_session_context()
+    return get_database_router().get_read_session_context(min_lsn)
 
 
 def get_analytics_session_context():
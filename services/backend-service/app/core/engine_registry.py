@@ -0,0 +1,283 @@
+"""
+Engine Registry for Backend Service
+One SQLAlchemy engine and one cached sessionmaker per database role, per process.
+
+Roles:
+- primary: writes and read-after-write reads
+- replica: UI/API reads (only when USE_READ_REPLICA and POSTGRES_REPLICA_HOST are set)
+- analytics: long reporting/ML queries. Shares the read pool (replica, else primary)
+  unless DB_ANALYTICS_POOL_SIZE > 0, in which case it gets its own small pool on the
+  read target so long queries cannot exhaust the UI pool.
+
+DatabaseRouter and PostgreSQLDatabase both take their engines from here, so each
+process opens at most DB_POOL_SIZE + DB_MAX_OVERFLOW primary connections instead of
+one such pool per wrapper.
+
+Pools record connection checkout wait times in a histogram (see get_pool_stats).
+
+PgBouncer (transaction pooling):
+- DB_PGBOUNCER_ENABLED: session-level SETs are replaced by SET LOCAL and asyncpg
+  prepared statement caches are disabled (see async_database)
+- DB_USE_NULL_POOL: no client-side pooling, every session gets a fresh PgBouncer
+  connection (PgBouncer does the pooling)
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.core.config import get_settings
+
+# Import pgvector for PostgreSQL vector type support
+try:
+    from pgvector.psycopg2 import register_vector
+except ImportError:
+    register_vector = None
+
+logger = logging.getLogger(__name__)
+
+ROLE_PRIMARY = 'primary'
+ROLE_REPLICA = 'replica'
+ROLE_ANALYTICS = 'analytics'
+
+# Upper bounds (seconds) of the checkout wait histogram buckets; a final +Inf bucket is implied
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class PoolWaitHistogram:
+    """Cumulative histogram of connection checkout wait times for one pool."""
+
+    def __init__(self, buckets=WAIT_TIME_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._timeouts = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._counts[bisect_left(self.buckets, seconds)] += 1
+            self._sum += seconds
+
+    def record_timeout(self):
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self) -> dict:
+        """Cumulative bucket counts (Prometheus style), count, sum and pool timeouts."""
+        with self._lock:
+            counts, total_sum, timeouts = list(self._counts), self._sum, self._timeouts
+
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            running += count
+            cumulative['+Inf' if bound == float('inf') else str(bound)] = running
+        return {
+            'buckets': cumulative,
+            'count': running,
+            'sum': round(total_sum, 6),
+            'timeouts': timeouts
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    wait_histogram: Optional[PoolWaitHistogram] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.wait_histogram is not None:
+                self.wait_histogram.record_timeout()
+            raise
+        finally:
+            if self.wait_histogram is not None:
+                self.wait_histogram.observe(time.perf_counter() - started)
+
+    def recreate(self):
+        # engine.dispose() swaps in a recreated pool: keep recording into the same histogram
+        pool = super().recreate()
+        pool.wait_histogram = self.wait_histogram
+        return pool
+
+
+def _setup_pgvector_event_listener(engine: Engine) -> bool:
+    """Register pgvector on every new connection of engine."""
+    if register_vector is None:
+        logger.warning("pgvector not available - vector operations may not work")
+        return False
+
+    @event.listens_for(engine, "connect")
+    def register_vector_on_connect(dbapi_connection, connection_record):
+        try:
+            register_vector(dbapi_connection)
+            logger.debug("pgvector registered for new connection")
+        except Exception as e:
+            logger.warning(f"Failed to register pgvector for connection: {e}")
+
+    return True
+
+
+class EngineRegistry:
+    """Lazily created engines and session factories keyed by role."""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._engines: Dict[str, Engine] = {}
+        self._session_factories: Dict[str, sessionmaker] = {}
+        self._wait_histograms: Dict[str, PoolWaitHistogram] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def has_replica(self) -> bool:
+        return bool(self.settings.USE_READ_REPLICA and self.settings.POSTGRES_REPLICA_HOST)
+
+    @property
+    def has_dedicated_analytics_pool(self) -> bool:
+        return self.settings.DB_ANALYTICS_POOL_SIZE > 0
+
+    def _engine_options(self, role: str) -> dict:
+        """Connection string and pool options for a role's own engine."""
+        settings = self.settings
+        if role == ROLE_PRIMARY:
+            url, pool_size, max_overflow, pool_timeout = (
+                settings.postgres_connection_string, settings.DB_POOL_SIZE,
+                settings.DB_MAX_OVERFLOW, settings.DB_POOL_TIMEOUT
+            )
+        elif role == ROLE_REPLICA:
+            url, pool_size, max_overflow, pool_timeout = (
+                settings.postgres_replica_connection_string, settings.DB_REPLICA_POOL_SIZE,
+                settings.DB_REPLICA_MAX_OVERFLOW, settings.DB_REPLICA_POOL_TIMEOUT
+            )
+        elif role == ROLE_ANALYTICS:
+            url = settings.postgres_replica_connection_string if self.has_replica else settings.postgres_connection_string
+            pool_size, max_overflow, pool_timeout = (
+                settings.DB_ANALYTICS_POOL_SIZE, settings.DB_ANALYTICS_MAX_OVERFLOW, settings.DB_POOL_TIMEOUT
+            )
+        else:
+            raise ValueError(f"Unknown database role: {role}")
+
+        options = {'echo': settings.DEBUG, 'pool_pre_ping': True}
+        if settings.DB_USE_NULL_POOL:
+            options['poolclass'] = NullPool
+        else:
+            options.update(
+                poolclass=InstrumentedQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=settings.DB_POOL_RECYCLE
+            )
+        return {'url': url, **options}
+
+    def _resolve_role(self, role: str) -> Optional[str]:
+        """Role whose engine actually serves role (analytics may share the read pool)."""
+        if role == ROLE_REPLICA and not self.has_replica:
+            return None
+        if role == ROLE_ANALYTICS and not self.has_dedicated_analytics_pool:
+            return ROLE_REPLICA if self.has_replica else ROLE_PRIMARY
+        return role
+
+    def get_engine(self, role: str) -> Optional[Engine]:
+        """Engine for role, created on first use (None for replica when not configured)."""
+        role = self._resolve_role(role)
+        if role is None:
+            return None
+
+        engine = self._engines.get(role)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(role)
+                if engine is None:
+                    options = self._engine_options(role)
+                    engine = create_engine(options.pop('url'), **options)
+                    if isinstance(engine.pool, InstrumentedQueuePool):
+                        histogram = PoolWaitHistogram()
+                        engine.pool.wait_histogram = histogram
+                        self._wait_histograms[role] = histogram
+                    _setup_pgvector_event_listener(engine)
+                    self._engines[role] = engine
+                    logger.info(f"Database engine created for role '{role}'")
+        return engine
+
+    def get_session_factory(self, role: str) -> Optional[sessionmaker]:
+        """Cached sessionmaker bound to the role's engine (None for replica when not configured)."""
+        resolved = self._resolve_role(role)
+        if resolved is None:
+            return None
+
+        factory = self._session_factories.get(resolved)
+        if factory is None:
+            with self._lock:
+                factory = self._session_factories.get(resolved)
+                if factory is None:
+                    factory = sessionmaker(bind=self.get_engine(resolved))
+                    self._session_factories[resolved] = factory
+        return factory
+
+    def get_pool_stats(self, role: str) -> Optional[dict]:
+        """Checked-out/overflow counts and checkout wait histogram for a created engine."""
+        resolved = self._resolve_role(role)
+        engine = self._engines.get(resolved) if resolved else None
+        if engine is None:
+            return None
+
+        pool = engine.pool
+        size = getattr(pool, 'size', lambda: 0)()
+        checked_in = getattr(pool, 'checkedin', lambda: 0)()
+        checked_out = getattr(pool, 'checkedout', lambda: 0)()
+        overflow = getattr(pool, 'overflow', lambda: 0)()
+        max_overflow = getattr(pool, '_max_overflow', 0)
+        total_capacity = size + max(max_overflow, 0)
+
+        histogram = self._wait_histograms.get(resolved)
+        return {
+            'engine_role': resolved,
+            'pool_class': type(pool).__name__,
+            'size': size,
+            'checked_in': checked_in,
+            'checked_out': checked_out,
+            'overflow': overflow,
+            'max_overflow': max_overflow,
+            'utilization': checked_out / total_capacity if total_capacity > 0 else 0,
+            'wait_time': histogram.snapshot() if histogram else None
+        }
+
+    def get_all_pool_stats(self) -> dict:
+        """Pool stats per role (None for roles without an engine yet)."""
+        return {role: self.get_pool_stats(role) for role in (ROLE_PRIMARY, ROLE_REPLICA, ROLE_ANALYTICS)}
+
+    def dispose(self):
+        """Close pooled connections of every engine (engines stay usable and reconnect lazily)."""
+        with self._lock:
+            for role, engine in self._engines.items():
+                try:
+                    engine.dispose()
+                    logger.info(f"Database connections closed for role '{role}'")
+                except Exception as e:
+                    logger.error(f"Error closing connections for role '{role}': {e}")
+
+
+# Global engine registry instance
+_engine_registry: Optional[EngineRegistry] = None
+_engine_registry_lock = threading.Lock()
+
+
+def get_engine_registry() -> EngineRegistry:
+    """Get the global engine registry instance"""
+    global _engine_registry
+    if _engine_registry is None:
+        with _engine_registry_lock:
+            if _engine_registry is None:
+                _engine_registry = EngineRegistry()
+    return _engine_registry
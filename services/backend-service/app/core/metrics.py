@@ -0,0 +1,310 @@
+"""
+Metrics Registry - Prometheus metrics for the API and the ETL pipeline.
+
+Counters and histograms live in process memory and are rendered in the
+Prometheus text exposition format by GET /metrics (app/api/metrics_routes.py).
+Standalone worker processes serve their own /metrics when
+ETL_WORKER_METRICS_PORT is set (see serve_metrics and workers/run.py), bound
+to ETL_WORKER_METRICS_HOST. Both require METRICS_BEARER_TOKEN when it is set.
+No client library is needed: each label set of a histogram is a
+PoolWaitHistogram.
+
+Recording is a dict lookup plus a short locked update, cheap enough for every
+HTTP request and queue message. Label values are bounded: route templates
+(not raw paths), tiers, worker classes, ETL step names and table names, never
+tenant IDs. METRICS_ENABLED=false turns recording into a no-op.
+
+Recorded metrics:
+- pulse_http_request_duration_seconds{method, route, status}
+- pulse_etl_queue_publish_seconds{queue_type, tier, status}
+- pulse_etl_queue_wait_seconds{worker_type, tier}
+- pulse_etl_message_duration_seconds{worker_type, tier, step, status}
+- pulse_etl_bulk_rows_total, pulse_etl_bulk_write_seconds{operation, table}
+- pulse_qdrant_upsert_seconds{status}, pulse_qdrant_upserted_points_total
+- pulse_embedding_batch_size{provider}
+
+Collected at scrape time from existing stats:
+- pulse_db_pool_* (engine_registry pool checkout waits and usage)
+- pulse_response_cache_* (registered by response_cache)
+- pulse_embedding_batcher_* (registered by embedding_inference_service)
+"""
+
+import hmac
+import logging
+import re
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from app.core.config import get_settings
+from app.core.engine_registry import PoolWaitHistogram, WAIT_TIME_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds (seconds) for request and message durations; ETL messages can run for minutes
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+# Upper bounds for batch sizes (texts per embedding call)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+_TIER_QUEUE_PATTERN = re.compile(r'^(extraction|transform|embedding)_queue_([a-z]+)')
+
+
+@lru_cache(maxsize=256)
+def queue_labels(queue_name: str) -> Tuple[str, str]:
+    """(queue_type, tier) of a tier queue or one of its per-tenant sub-queues, else (queue_name, '')."""
+    match = _TIER_QUEUE_PATTERN.match(queue_name or '')
+    return (match.group(1), match.group(2)) if match else (queue_name or 'unknown', '')
+
+
+# ============ EXPOSITION FORMAT ============
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: Union[int, float]) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def family_header(name: str, kind: str, documentation: str) -> List[str]:
+    """HELP and TYPE lines of a metric family."""
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+
+
+def sample_line(name: str, labels: Dict[str, str], value: Union[int, float]) -> str:
+    return f"{name}{_format_labels(labels)} {_format_value(value)}"
+
+
+def histogram_lines(name: str, labels: Dict[str, str], snapshot: dict) -> List[str]:
+    """Bucket, sum and count samples of a PoolWaitHistogram snapshot."""
+    lines = [sample_line(f"{name}_bucket", {**labels, 'le': bound}, count)
+             for bound, count in snapshot['buckets'].items()]
+    lines.append(sample_line(f"{name}_sum", labels, snapshot['sum']))
+    lines.append(sample_line(f"{name}_count", labels, snapshot['count']))
+    return lines
+
+
+# ============ METRICS ============
+
+class Histogram:
+    """Histogram with one PoolWaitHistogram per label value tuple."""
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str, labelnames: Tuple[str, ...],
+                 buckets=DURATION_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._children: Dict[Tuple[str, ...], PoolWaitHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        """Record a value; labels are given positionally in labelnames order."""
+        if not self.registry.enabled:
+            return
+        child = self._children.get(labels)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labels, PoolWaitHistogram(self.buckets))
+        child.observe(value)
+
+    def snapshot(self, *labels: str) -> Optional[dict]:
+        child = self._children.get(labels)
+        return child.snapshot() if child else None
+
+    def collect(self) -> List[str]:
+        lines = family_header(self.name, 'histogram', self.documentation)
+        with self._lock:
+            children = sorted(self._children.items())
+        for labels, child in children:
+            lines.extend(histogram_lines(self.name, dict(zip(self.labelnames, labels)), child.snapshot()))
+        return lines
+
+
+class Counter:
+    """Monotonic counter per label value tuple (name should end in _total)."""
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str, labelnames: Tuple[str, ...]):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        """Add amount; labels are given positionally in labelnames order."""
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def collect(self) -> List[str]:
+        lines = family_header(self.name, 'counter', self.documentation)
+        with self._lock:
+            values = sorted(self._values.items())
+        lines.extend(sample_line(self.name, dict(zip(self.labelnames, labels)), value) for labels, value in values)
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide metrics plus collectors that read other components' stats at scrape time."""
+
+    def __init__(self):
+        self.enabled = get_settings().METRICS_ENABLED
+        self._metrics: Dict[str, Union[Histogram, Counter]] = {}
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets=DURATION_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def register_collector(self, collector: Callable[[], Iterable[str]]):
+        """Add a function returning exposition lines (HELP/TYPE included) on every scrape."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.collect())
+        for collector in list(self._collectors):
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+        return '\n'.join(lines) + '\n'
+
+
+_metrics_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the global metrics registry instance"""
+    return _metrics_registry
+
+
+# ============ RECORDED METRICS ============
+
+HTTP_REQUEST_DURATION = _metrics_registry.histogram(
+    'pulse_http_request_duration_seconds', 'HTTP request latency by route template.',
+    ('method', 'route', 'status')
+)
+QUEUE_PUBLISH_DURATION = _metrics_registry.histogram(
+    'pulse_etl_queue_publish_seconds', 'Time to publish one ETL message (channel checkout included).',
+    ('queue_type', 'tier', 'status'), WAIT_TIME_BUCKETS
+)
+QUEUE_WAIT = _metrics_registry.histogram(
+    'pulse_etl_queue_wait_seconds', 'Time ETL messages waited in the queue before a worker took them.',
+    ('worker_type', 'tier')
+)
+MESSAGE_DURATION = _metrics_registry.histogram(
+    'pulse_etl_message_duration_seconds', 'ETL message processing time per worker type and step.',
+    ('worker_type', 'tier', 'step', 'status')
+)
+BULK_ROWS = _metrics_registry.counter(
+    'pulse_etl_bulk_rows_total', 'Rows written by BulkOperations.', ('operation', 'table')
+)
+BULK_WRITE_DURATION = _metrics_registry.histogram(
+    'pulse_etl_bulk_write_seconds', 'BulkOperations call duration.', ('operation', 'table')
+)
+QDRANT_UPSERT_DURATION = _metrics_registry.histogram(
+    'pulse_qdrant_upsert_seconds', 'Qdrant upsert_vectors call duration.', ('status',)
+)
+QDRANT_UPSERTED_POINTS = _metrics_registry.counter(
+    'pulse_qdrant_upserted_points_total', 'Points upserted into Qdrant.'
+)
+EMBEDDING_BATCH_SIZE = _metrics_registry.histogram(
+    'pulse_embedding_batch_size', 'Texts per embedding generation call.', ('provider',), SIZE_BUCKETS
+)
+
+
+# ============ SCRAPE-TIME COLLECTORS ============
+
+def _collect_db_pools() -> List[str]:
+    """Pool checkout waits and usage of the engines this process created."""
+    from app.core.engine_registry import get_engine_registry
+
+    pools = {}
+    for stats in get_engine_registry().get_all_pool_stats().values():
+        if stats:
+            pools.setdefault(stats['engine_role'], stats)  # analytics may share the read engine
+    if not pools:
+        return []
+
+    lines = family_header('pulse_db_pool_checkout_wait_seconds', 'histogram',
+                          'Time sessions waited for a pooled connection.')
+    for role, stats in pools.items():
+        if stats['wait_time']:
+            lines.extend(histogram_lines('pulse_db_pool_checkout_wait_seconds', {'role': role}, stats['wait_time']))
+    lines.extend(family_header('pulse_db_pool_checkout_timeouts_total', 'counter',
+                               'Checkouts that gave up after DB_POOL_TIMEOUT.'))
+    lines.extend(sample_line('pulse_db_pool_checkout_timeouts_total', {'role': role}, stats['wait_time']['timeouts'])
+                 for role, stats in pools.items() if stats['wait_time'])
+    for field, documentation in (('checked_out', 'Connections in use.'), ('size', 'Configured pool size.'),
+                                 ('overflow', 'Connections opened beyond the pool size.')):
+        name = f'pulse_db_pool_{field}'
+        lines.extend(family_header(name, 'gauge', documentation))
+        lines.extend(sample_line(name, {'role': role}, stats[field]) for role, stats in pools.items())
+    return lines
+
+
+_metrics_registry.register_collector(_collect_db_pools)
+
+
+# ============ STANDALONE EXPOSITION ============
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        token = get_settings().METRICS_BEARER_TOKEN
+        if token and not hmac.compare_digest(self.headers.get('Authorization', ''), f"Bearer {token}"):
+            self.send_error(401, 'Invalid metrics token')
+            return
+        body = get_metrics_registry().render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port: int, host: Optional[str] = None) -> ThreadingHTTPServer:
+    """Serve GET /metrics from a daemon thread (processes without the FastAPI app, e.g. worker processes)."""
+    host = host or get_settings().ETL_WORKER_METRICS_HOST
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=f"metrics-{port}", daemon=True).start()
+    logger.info(f"Serving metrics on {host}:{port}/metrics")
+    return server
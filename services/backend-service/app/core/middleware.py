@@ -12,6 +12,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from app.core.logging_config import RequestLogger, get_enhanced_logger
 from app.core.config import get_settings
 from app.core.security import SecurityValidator, validate_request_data, default_rate_limiter
+from app.core.metrics import HTTP_REQUEST_DURATION
 
 logger = get_enhanced_logger(__name__)
 settings = get_settings()
@@ -262,3 +263,39 @@ class HealthCheckMiddleware(BaseHTTPMiddleware):
             )
 
         return await call_next(request)
+
+
+class MetricsMiddleware:
+    """
+    Records request latency per route template for /metrics.
+
+    Plain ASGI middleware (no BaseHTTPMiddleware request/response wrapping) to
+    keep per-request overhead minimal. Requests that match no route are
+    labeled 'unmatched' so raw paths never become label values.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                scope["method"], getattr(route, "path", "unmatched"), str(status_code)
+            )
@@ -0,0 +1,107 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+OFFSET pagination makes PostgreSQL read and discard every row before the
+requested page, so deep pages get slower and slower. Keyset pagination
+remembers the sort key of the last row returned (in an opaque cursor) and asks
+for the rows after it:
+
+    WHERE tenant_id = :tenant_id AND (created_at, id) < (:last_created_at, :last_id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit
+
+With a composite index on (tenant_id, created_at, id) (see migration 0007)
+every page is an index range scan of `limit` rows, whatever its depth.
+
+Nullable sort columns are compared through COALESCE(column, <sentinel>) so
+NULL rows keep a stable position; the matching indexes are built on the same
+expression.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import DateTime, func, literal_column, tuple_
+
+# Sort position of NULL timestamps (after every real date in descending order)
+NULL_TIMESTAMP_SENTINEL = "'0001-01-01 00:00:00'::timestamp"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not belong to the listing."""
+
+
+class Keyset:
+    """
+    Sort key of a paginated listing: one sort column plus the primary key as tie-breaker.
+
+    Works with both Query.filter()/order_by() and select().where()/order_by().
+    """
+
+    def __init__(self, name: str, sort_column, id_column, descending: bool = True,
+                 null_sentinel: Optional[str] = None):
+        self.name = name
+        self.sort_column = sort_column
+        self.id_column = id_column
+        self.descending = descending
+        self.null_sentinel = null_sentinel
+        self.is_datetime = isinstance(sort_column.type, DateTime)
+
+    @property
+    def sort_key(self):
+        """Sort expression (COALESCEd with an inline constant so expression indexes match)."""
+        if self.null_sentinel is None:
+            return self.sort_column
+        return func.coalesce(self.sort_column, literal_column(self.null_sentinel, self.sort_column.type))
+
+    def order_by(self) -> List:
+        if self.descending:
+            return [self.sort_key.desc(), self.id_column.desc()]
+        return [self.sort_key.asc(), self.id_column.asc()]
+
+    def after(self, cursor: str):
+        """Condition selecting the rows that follow the row encoded in cursor."""
+        value, row_id = self.decode(cursor)
+        if value is None:
+            # Row sorted at the NULL sentinel: compare against the sentinel itself
+            value = literal_column(self.null_sentinel, self.sort_column.type)
+        row, last = tuple_(self.sort_key, self.id_column), tuple_(value, row_id)
+        return row < last if self.descending else row > last
+
+    def encode(self, item) -> str:
+        """Opaque cursor pointing just past item (an ORM instance or row)."""
+        value = getattr(item, self.sort_column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = {'k': self.name, 'v': value, 'id': getattr(item, self.id_column.key)}
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+    def decode(self, cursor: str):
+        """Decode a cursor into (sort value, id)."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if payload['k'] != self.name:
+                raise InvalidCursorError(f"Cursor does not belong to {self.name}")
+            value, row_id = payload['v'], int(payload['id'])
+            if value is not None and self.is_datetime:
+                value = datetime.fromisoformat(value)
+            elif value is None and self.null_sentinel is None:
+                raise InvalidCursorError("Cursor has no sort value")
+            return value, row_id
+        except InvalidCursorError:
+            raise
+        except Exception as e:
+            raise InvalidCursorError(f"Invalid cursor: {e}")
+
+    def next_cursor(self, items: Sequence[Any], limit: int) -> Optional[str]:
+        """
+        Cursor for the page after items, fetched with LIMIT limit + 1.
+
+        Returns None on the last page (no extra row was fetched).
+        """
+        if len(items) <= limit:
+            return None
+        return self.encode(items[limit - 1])
@@ -0,0 +1,208 @@
+"""
+Replica Lag Monitor
+Background sampling of read replica lag for lag-aware read routing.
+
+A daemon thread samples the replica every DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS:
+- replay lag: now() - pg_last_xact_replay_timestamp(), reported as 0 when the
+  replica has replayed everything it received (an idle primary produces no new
+  transactions, so the replay timestamp alone would look like growing lag)
+- replay LSN: pg_last_wal_replay_lsn(), used to serve read-your-writes tokens
+
+The routers stop sending reads to the replica while lag exceeds
+DB_REPLICA_MAX_LAG_SECONDS, when the last sample failed, or when the last
+sample is too old to trust (monitor stalled).
+
+Read-your-writes: write sessions record the primary WAL position after commit
+(session.info['commit_lsn']). A read passed that token is served by the replica
+only once the replica has replayed past it, otherwise by the primary.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import get_settings
+from app.core.utils import DateTimeHelper
+
+logger = logging.getLogger(__name__)
+
+# A replica host that is not in recovery (e.g. pointed at the primary in development) never lags
+LAG_QUERY = text("""
+    SELECT
+        CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END AS lag_seconds,
+        CASE
+            WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn()
+            ELSE pg_current_wal_lsn()
+        END::text AS replay_lsn
+""")
+
+COMMIT_LSN_QUERY = text("SELECT pg_current_wal_lsn()::text")
+REPLAY_LSN_QUERY = text("""
+    SELECT CASE WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn() ELSE pg_current_wal_lsn() END::text
+""")
+
+
+def parse_lsn(lsn: Optional[str]) -> Optional[int]:
+    """Convert a PostgreSQL LSN ('16/B374D848') to an integer for comparison."""
+    if not lsn:
+        return None
+    try:
+        high, low = lsn.split('/')
+        return (int(high, 16) << 32) | int(low, 16)
+    except (ValueError, AttributeError):
+        logger.warning(f"Invalid LSN: {lsn}")
+        return None
+
+
+def lsn_reached(replay_lsn: Optional[str], target_lsn: Optional[str]) -> bool:
+    """True if replay_lsn is at or past target_lsn (unknown replay position never counts)."""
+    replay, target = parse_lsn(replay_lsn), parse_lsn(target_lsn)
+    if target is None:
+        return True
+    return replay is not None and replay >= target
+
+
+@dataclass
+class LagSample:
+    """One replica lag measurement"""
+    lag_seconds: Optional[float]
+    replay_lsn: Optional[str]
+    sampled_at: float  # time.monotonic()
+    error: Optional[str] = None
+
+
+class ReplicaLagMonitor:
+    """
+    Samples replica lag in a background thread.
+
+    Shared by DatabaseRouter and AsyncDatabaseRouter; uses its own single
+    connection so sampling never waits on the request pools.
+    """
+
+    def __init__(self, engine):
+        self.settings = get_settings()
+        self.engine = engine
+        self.max_lag_seconds = self.settings.DB_REPLICA_MAX_LAG_SECONDS
+        self.interval_seconds = self.settings.DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS
+        self.last_sample: Optional[LagSample] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> LagSample:
+        """Measure replica lag now and store the result."""
+        try:
+            with self.engine.connect() as conn:
+                row = conn.execute(LAG_QUERY).fetchone()
+            lag_seconds = float(row.lag_seconds) if row.lag_seconds is not None else None
+            sample = LagSample(lag_seconds=lag_seconds, replay_lsn=row.replay_lsn, sampled_at=time.monotonic())
+            if lag_seconds is not None and lag_seconds > self.max_lag_seconds:
+                logger.warning(f"Replica lag {lag_seconds:.1f}s exceeds {self.max_lag_seconds}s, routing reads to primary")
+        except Exception as e:
+            logger.warning(f"Replica lag check failed: {e}")
+            sample = LagSample(lag_seconds=None, replay_lsn=None, sampled_at=time.monotonic(), error=str(e))
+
+        self.last_sample = sample
+        return sample
+
+    def _current_sample(self) -> Optional[LagSample]:
+        """Last sample if recent enough to route on (a stalled monitor must not pin reads to the replica)."""
+        sample = self.last_sample
+        if sample is None:
+            return None
+        if time.monotonic() - sample.sampled_at > max(3 * self.interval_seconds, 15):
+            return None
+        return sample
+
+    def is_healthy(self) -> bool:
+        """True if the replica answered the last check and lag is within DB_REPLICA_MAX_LAG_SECONDS."""
+        sample = self._current_sample()
+        if sample is None or sample.error or sample.lag_seconds is None:
+            return False
+        return sample.lag_seconds <= self.max_lag_seconds
+
+    def has_replayed(self, lsn: Optional[str]) -> bool:
+        """True if the last sample shows the replica has replayed past lsn."""
+        sample = self._current_sample()
+        return sample is not None and lsn_reached(sample.replay_lsn, lsn)
+
+    def get_status(self) -> dict:
+        """Lag monitor status for admin/health endpoints."""
+        sample = self.last_sample
+        return {
+            'healthy': self.is_healthy(),
+            'lag_seconds': sample.lag_seconds if sample else None,
+            'replay_lsn': sample.replay_lsn if sample else None,
+            'max_lag_seconds': self.max_lag_seconds,
+            'sample_age_seconds': round(time.monotonic() - sample.sampled_at, 1) if sample else None,
+            'error': sample.error if sample else None,
+            'timestamp': DateTimeHelper.now_default()
+        }
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.sample()
+            self._stop_event.wait(self.interval_seconds)
+
+    def start(self):
+        """Start background sampling (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-lag-monitor", daemon=True)
+        self._thread.start()
+        logger.info(f"Replica lag monitor started (interval {self.interval_seconds}s, max lag {self.max_lag_seconds}s)")
+
+    def stop(self):
+        """Stop background sampling and release the monitor connection."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.engine.dispose()
+
+
+# Global replica lag monitor instance
+_replica_lag_monitor: Optional[ReplicaLagMonitor] = None
+_replica_lag_monitor_lock = threading.Lock()
+
+
+def get_replica_lag_monitor() -> Optional[ReplicaLagMonitor]:
+    """Get the global replica lag monitor, started on first use (None without a replica)."""
+    global _replica_lag_monitor
+    settings = get_settings()
+    if not (settings.USE_READ_REPLICA and settings.POSTGRES_REPLICA_HOST):
+        return None
+
+    if _replica_lag_monitor is None:
+        with _replica_lag_monitor_lock:
+            if _replica_lag_monitor is None:
+                engine = create_engine(
+                    settings.postgres_replica_connection_string,
+                    poolclass=QueuePool,
+                    pool_size=1,
+                    max_overflow=0,
+                    pool_timeout=settings.DB_REPLICA_POOL_TIMEOUT,
+                    pool_recycle=settings.DB_POOL_RECYCLE,
+                    pool_pre_ping=True
+                )
+                monitor = ReplicaLagMonitor(engine)
+                monitor.start()
+                _replica_lag_monitor = monitor
+    return _replica_lag_monitor
+
+
+def stop_replica_lag_monitor():
+    """Stop the global monitor if it was started (application shutdown)."""
+    global _replica_lag_monitor
+    if _replica_lag_monitor is not None:
+        _replica_lag_monitor.stop()
+        _replica_lag_monitor = None
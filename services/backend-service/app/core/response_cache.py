@@ -0,0 +1,278 @@
+"""
+Response Cache - Tenant-scoped cache of dashboard responses with ETag revalidation.
+
+Dashboard endpoints (DORA metrics, ML stats, Qdrant dashboard, work item and
+pull request stats) recomputed identical results on every refresh although
+their data only changes when an ETL job completes. Endpoints decorated with
+@cached_response keep their serialized JSON body in process memory, keyed by
+
+    (tenant_id, data generation, endpoint name, path, query string)
+
+The data generation is a per-tenant counter bumped by bump_data_generation():
+at the end of every ETL job (WorkerStatusManager.complete_etl_job) and by the
+write endpoints of cached data. Bumping makes every older entry of the tenant
+unreachable at once. Counters live in Redis so all API and worker processes
+agree on them; without Redis they are process-local and entries only expire
+through RESPONSE_CACHE_TTL_SECONDS, which also bounds staleness for data
+changed outside ETL jobs.
+
+Hits, misses, 304s and size are exported as pulse_response_cache_* metrics.
+
+Responses carry an ETag (hash of the body). A request whose If-None-Match
+matches the cached entry gets 304 Not Modified without touching PostgreSQL;
+a request without it gets the cached body.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+from app.core.metrics import family_header, get_metrics_registry, sample_line
+
+logger = get_logger(__name__)
+
+CACHE_CONTROL = "private, no-cache"  # Browsers keep the body but revalidate with If-None-Match
+
+
+@dataclass
+class CachedResponse:
+    """Serialized JSON body of a cached response."""
+    body: bytes
+    etag: str
+    stored_at: float
+
+
+class DataGenerationCounter:
+    """
+    Per-tenant data generation counters.
+
+    Key layout: pulse:data_generation:{tenant_id} -> integer
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.key_prefix = "pulse:data_generation:"
+        self.redis_client = None
+        self._local: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._initialize_redis()
+
+    def _initialize_redis(self):
+        """Initialize Redis connection for shared generation counters"""
+        try:
+            if self.settings.REDIS_URL:
+                import redis
+                self.redis_client = redis.from_url(
+                    self.settings.REDIS_URL,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                    socket_timeout=5
+                )
+                self.redis_client.ping()
+            else:
+                logger.warning("⚠️ Redis URL not configured, response cache generations are process-local")
+        except Exception as e:
+            logger.warning(f"⚠️ Redis not available for response cache generations, using process-local counters: {e}")
+            self.redis_client = None
+
+    def get(self, tenant_id: int) -> Optional[int]:
+        """
+        Current data generation of a tenant.
+
+        Returns:
+            int generation, or None if it cannot be read (callers must not use the cache)
+        """
+        if self.redis_client is None:
+            with self._lock:
+                return self._local.get(tenant_id, 0)
+        try:
+            return int(self.redis_client.get(f"{self.key_prefix}{tenant_id}") or 0)
+        except Exception as e:
+            logger.warning(f"Failed to read data generation for tenant {tenant_id}: {e}")
+            return None
+
+    def bump(self, tenant_id: int) -> Optional[int]:
+        """Start a new data generation for a tenant (invalidates its cached responses)."""
+        with self._lock:
+            self._local[tenant_id] = self._local.get(tenant_id, 0) + 1
+            local = self._local[tenant_id]
+        if self.redis_client is None:
+            return local
+        try:
+            return int(self.redis_client.incr(f"{self.key_prefix}{tenant_id}"))
+        except Exception as e:
+            logger.warning(f"Failed to bump data generation for tenant {tenant_id}: {e}")
+            return None
+
+
+class ResponseCache:
+    """LRU/TTL map of serialized responses, keyed by tenant data generation."""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[int] = None,
+                 generations: Optional[DataGenerationCounter] = None):
+        settings = get_settings()
+        self.enabled = settings.RESPONSE_CACHE_ENABLED
+        self.max_entries = max_entries if max_entries is not None else settings.RESPONSE_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.RESPONSE_CACHE_TTL_SECONDS
+        self.generations = generations or DataGenerationCounter()
+        self._entries: "OrderedDict[Tuple, CachedResponse]" = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'not_modified': 0}
+        self._lock = threading.Lock()
+
+    def key_for(self, name: str, tenant_id: int, request: Request) -> Optional[Tuple]:
+        """Cache key of a request, or None when the tenant's generation is unavailable."""
+        generation = self.generations.get(tenant_id)
+        if generation is None:
+            return None
+        query = tuple(sorted(request.query_params.multi_items()))
+        return tenant_id, generation, name, request.url.path, query
+
+    def get(self, key: Tuple, ttl_seconds: Optional[int] = None) -> Optional[CachedResponse]:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.stored_at >= ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry
+
+    def put(self, key: Tuple, content: Any) -> CachedResponse:
+        """Serialize content like FastAPI's JSONResponse and store it."""
+        body = json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+        entry = CachedResponse(body=body, etag=f'"{hashlib.sha1(body).hexdigest()}"', stored_at=time.monotonic())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def respond(self, entry: CachedResponse, request: Request) -> Response:
+        """304 when the client already has this body, else the cached body."""
+        headers = {"ETag": entry.etag, "Cache-Control": CACHE_CONTROL}
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            with self._lock:
+                self._stats['not_modified'] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, 'size': len(self._entries)}
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak comparison, as RFC 9110 requires for this header)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in [candidate.removeprefix("W/") for candidate in candidates]
+
+
+def cached_response(name: str, ttl_seconds: Optional[int] = None) -> Callable:
+    """
+    Cache a tenant dashboard endpoint's JSON response (see module docstring).
+
+    Apply below the router decorator. The endpoint must take the authenticated
+    user as `user`; only its plain return values are cached (a Response it returns,
+    or an exception it raises, is passed through). Direct calls without a request
+    (from other code) bypass the cache. ttl_seconds overrides
+    RESPONSE_CACHE_TTL_SECONDS for endpoints that show live progress.
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        signature = inspect.signature(endpoint)
+        adds_request = 'request' not in signature.parameters
+        is_coroutine = inspect.iscoroutinefunction(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            request = kwargs.pop('request', None) if adds_request else kwargs.get('request')
+            user = kwargs.get('user')
+            cache = get_response_cache()
+
+            key = None
+            if cache.enabled and request is not None and user is not None:
+                key = cache.key_for(name, user.tenant_id, request)
+            if key is not None:
+                entry = cache.get(key, ttl_seconds)
+                if entry is not None:
+                    return cache.respond(entry, request)
+
+            if is_coroutine:
+                result = await endpoint(*args, **kwargs)
+            else:
+                result = await run_in_threadpool(endpoint, *args, **kwargs)
+
+            if key is None or isinstance(result, Response):
+                return result
+            return cache.respond(cache.put(key, result), request)
+
+        if adds_request:
+            # Let FastAPI inject the Request the cache key is built from
+            parameters = list(signature.parameters.values())
+            parameters.append(inspect.Parameter('request', inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+            wrapper.__signature__ = signature.replace(parameters=parameters)
+        return wrapper
+
+    return decorator
+
+
+def bump_data_generation(tenant_id: int) -> Optional[int]:
+    """Invalidate every cached response of a tenant (call after its data changed)."""
+    generation = get_response_cache().generations.bump(tenant_id)
+    logger.debug(f"Data generation for tenant {tenant_id} is now {generation}")
+    return generation
+
+
+# Global response cache instance
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the global response cache instance"""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
+
+
+def _collect_metrics() -> list:
+    """Hits, misses, 304s and size of this process's cache (nothing before first use)."""
+    if _response_cache is None:
+        return []
+    stats = _response_cache.stats()
+    lines = family_header('pulse_response_cache_requests_total', 'counter', 'Dashboard response cache lookups.')
+    lines.extend(sample_line('pulse_response_cache_requests_total', {'result': result}, stats[result])
+                 for result in ('hits', 'misses', 'not_modified'))
+    lines.extend(family_header('pulse_response_cache_entries', 'gauge', 'Cached dashboard responses.'))
+    lines.append(sample_line('pulse_response_cache_entries', {}, stats['size']))
+    return lines
+
+
+get_metrics_registry().register_collector(_collect_metrics)
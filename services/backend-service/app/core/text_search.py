@@ -0,0 +1,56 @@
+"""
+Substring search backed by pg_trgm GIN indexes.
+
+A leading-wildcard filter (column ILIKE '%term%') cannot use a B-tree index,
+so without help every search is a sequential scan over the tenant's rows.
+A GIN index with gin_trgm_ops splits values into trigrams and serves
+LIKE/ILIKE '%term%' for terms of MIN_TRIGRAM_TERM_LENGTH characters or more
+(shorter terms have no complete trigram and PostgreSQL falls back to a scan).
+
+Searchable columns are listed in TRIGRAM_INDEXED_COLUMNS; migration 0008 creates
+one index per column, named by trigram_index_name(). Routes filter those
+columns through contains() so user input containing % or _ is matched
+literally instead of acting as a wildcard.
+"""
+
+from typing import Dict, Tuple
+
+# Columns with a pg_trgm GIN index, by table
+TRIGRAM_INDEXED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'work_items': ('assignee',),
+    'prs': ('user_name',),
+    'repositories': ('name',),
+    'projects': ('name', 'key'),
+    'dora_lead_time_facts': (
+        'team', 'project_key', 'priority', 'assignee',
+        'aha_initiative', 'aha_project_code', 'project_code', 'aha_milestone'
+    ),
+}
+
+MIN_TRIGRAM_TERM_LENGTH = 3
+
+LIKE_ESCAPE = '/'
+
+
+def trigram_index_name(table: str, column: str) -> str:
+    """Name of the trigram index on table.column."""
+    return f"idx_{table}_{column}_trgm"
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards (and the escape character) in a user supplied term."""
+    return (
+        term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace('%', f'{LIKE_ESCAPE}%')
+        .replace('_', f'{LIKE_ESCAPE}_')
+    )
+
+
+def contains(column, term: str):
+    """
+    Case-insensitive substring filter: column ILIKE '%term%'.
+
+    The pattern is bound as a single parameter (not concatenated in SQL) so the
+    planner can match it against the column's trigram index.
+    """
+    return column.ilike(f"%{escape_like(term)}%", escape=LIKE_ESCAPE)
@@ -14,11 +14,11 @@ Features:
 - Rate limit handling with checkpoint recovery
 - Incremental sync support
 - GraphQL-based PR extraction with nested data (commits, reviews, comments)
+- Batched nested pagination: pending cursors of many PRs fetched in one aliased query
 """
 
 import json
 import urllib.parse
-import pika
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from sqlalchemy import text
@@ -27,6 +27,7 @@ from app.core.logging_config import get_logger
 from app.core.utils import DateTimeHelper
 from app.models.unified_models import Integration, EtlJobsGithubCheckpoint
 from app.core.config import AppConfig
+from app.core.credential_cache import get_credential_cache
 from app.core.database import get_database
 from app.etl.github.github_graphql_client import GitHubGraphQLClient, GitHubRateLimitException as GraphQLRateLimitException
 from app.etl.github.github_rest_client import GitHubRestClient, GitHubRateLimitException
@@ -385,7 +386,10 @@ class GitHubExtractionWorker:
                 logger.debug(f"🚀 [GITHUB] Processing github_prs_commits_reviews_comments extraction")
 
                 # 🔑 Check if this is a nested extraction message or PR extraction message
-                if message.get('pr_node_id') and message.get('nested_type'):
+                if message.get('nested_batch'):
+                    logger.debug(f"🔀 [GITHUB] Routing to batched nested extraction ({len(message['nested_batch'])} items)")
+                    result = await self._extract_github_nested_batch(message)
+                elif message.get('pr_node_id') and message.get('nested_type'):
                     logger.debug(f"🔀 [GITHUB] Routing to nested extraction (type={message.get('nested_type')})")
                     result = await self._extract_github_nested(message)
                 else:
@@ -520,6 +524,48 @@ class GitHubExtractionWorker:
             logger.error(f"💥 [GITHUB] Full traceback: {traceback.format_exc()}")
             return False
 
+    async def _extract_github_nested_batch(self, message: Dict[str, Any]) -> bool:
+        """
+        Extract the next nested page for many PRs in one GraphQL query.
+
+        Args:
+            message: Message containing nested_batch items and job flags
+
+        Returns:
+            bool: True if extraction succeeded
+        """
+        try:
+            tenant_id = message.get('tenant_id')
+            logger.debug(f"🚀 [GITHUB] Starting batched nested extraction for tenant {tenant_id}")
+
+            result = await self.extract_nested_pagination_batch(
+                tenant_id=tenant_id,
+                integration_id=message.get('integration_id'),
+                job_id=message.get('job_id'),
+                nested_batch=message.get('nested_batch', []),
+                owner=message.get('owner'),
+                repo_name=message.get('repo_name'),
+                full_name=message.get('full_name'),
+                old_last_sync_date=message.get('old_last_sync_date'),
+                new_last_sync_date=message.get('new_last_sync_date'),
+                last_repo=message.get('last_repo', False),
+                last_pr_last_nested=message.get('last_pr_last_nested', False),
+                token=message.get('token')
+            )
+
+            if result.get('success'):
+                logger.debug(f"✅ [GITHUB] Batched nested extraction completed for tenant {tenant_id}")
+                return True
+            else:
+                logger.error(f"❌ [GITHUB] Batched nested extraction failed: {result.get('error')}")
+                return False
+
+        except Exception as e:
+            logger.error(f"💥 [GITHUB] Error extracting batched nested data: {e}")
+            import traceback
+            logger.error(f"💥 [GITHUB] Full traceback: {traceback.format_exc()}")
+            return False
+
     async def _extract_github_prs(self, message: Dict[str, Any]) -> bool:
         """
         Extract PRs with nested data from GitHub.
@@ -793,6 +839,7 @@ class GitHubExtractionWorker:
 
                 # 🚀 OPTIMIZATION: Reuse RabbitMQ channel for all publishes
                 logger.debug(f"Publishing {len(all_repositories)} messages to transform queue")
+                tier_queue = queue_manager.get_tenant_queue_name(tenant_id, 'transform')  # Resolved once per batch
                 with queue_manager.get_channel() as channel:
                     for i, (repo, raw_data_id) in enumerate(zip(all_repositories, raw_data_ids)):
                         is_first = (i == 0)
@@ -817,18 +864,7 @@ class GitHubExtractionWorker:
                         }
 
                         # Publish using shared channel
-                        tier = queue_manager._get_tenant_tier(tenant_id)
-                        tier_queue = queue_manager.get_tier_queue_name(tier, 'transform')
-
-                        channel.basic_publish(
-                            exchange='',
-                            routing_key=tier_queue,
-                            body=json.dumps(message),
-                            properties=pika.BasicProperties(
-                                delivery_mode=2,
-                                content_type='application/json'
-                            )
-                        )
+                        queue_manager.publish_on_channel(channel, tier_queue, message)
 
                         # Log progress every 100 repos
                         if (i + 1) % 100 == 0 or (i + 1) == len(all_repositories):
@@ -868,6 +904,7 @@ class GitHubExtractionWorker:
                 logger.info(f"📤 [LOOP 2] Queuing {len(all_repositories)} repositories to Step 2 extraction")
 
                 # 🚀 OPTIMIZATION: Reuse RabbitMQ channel for all publishes
+                tier_queue = queue_manager.get_tenant_queue_name(tenant_id, 'extraction')  # Resolved once per batch
                 with queue_manager.get_channel() as channel:
                     for i, repo in enumerate(all_repositories):
                         is_first = (i == 0)
@@ -894,18 +931,7 @@ class GitHubExtractionWorker:
                         }
 
                         # Publish using shared channel
-                        tier = queue_manager._get_tenant_tier(tenant_id)
-                        tier_queue = queue_manager.get_tier_queue_name(tier, 'extraction')
-
-                        channel.basic_publish(
-                            exchange='',
-                            routing_key=tier_queue,
-                            body=json.dumps(message),
-                            properties=pika.BasicProperties(
-                                delivery_mode=2,
-                                content_type='application/json'
-                            )
-                        )
+                        queue_manager.publish_on_channel(channel, tier_queue, message)
 
                         # Log progress every 100 repos
                         if (i + 1) % 100 == 0 or (i + 1) == len(all_repositories):
@@ -1084,6 +1110,23 @@ class GitHubExtractionWorker:
                     full_name=message.get('full_name'),
                     old_last_sync_date=message.get('old_last_sync_date')
                 )
+            # ROUTER: Check if this is a batched nested data continuation
+            elif message.get('nested_batch'):
+                logger.debug(f"🔀 [ROUTER] Routing to extract_nested_pagination_batch ({len(message['nested_batch'])} items)")
+                result = await self.extract_nested_pagination_batch(
+                    tenant_id=tenant_id,
+                    integration_id=integration_id,
+                    job_id=job_id,
+                    nested_batch=message['nested_batch'],
+                    owner=message.get('owner'),
+                    repo_name=message.get('repo_name'),
+                    full_name=message.get('full_name'),
+                    old_last_sync_date=message.get('old_last_sync_date'),
+                    new_last_sync_date=message.get('new_last_sync_date'),
+                    last_repo=message.get('last_repo', False),
+                    last_pr_last_nested=message.get('last_pr_last_nested', False),
+                    token=token
+                )
             # ROUTER: Check if this is nested data continuation
             elif message.get('nested_type'):
                 # NESTED CONTINUATION: Extract next page of nested data
@@ -1212,31 +1255,29 @@ class GitHubExtractionWorker:
             logger.debug(f"✅ Using owner and repo_name from message: {owner}/{repo_name}")
             logger.debug(f"📅 Using old_last_sync_date for filtering: {old_last_sync_date}")
 
-            # 🔑 Get integration (service-to-service, not data processing)
-            with get_read_session_context() as db:
-                integration = db.query(Integration).filter(
-                    Integration.id == integration_id,
-                    Integration.tenant_id == tenant_id
-                ).first()
+            # 🔑 Get integration with decrypted token (cached per process, not data processing)
+            credential_cache = get_credential_cache()
+            integration = credential_cache.get_integration(tenant_id, integration_id)
 
-                if not integration or not integration.password:
-                    logger.error(f"Integration {integration_id} not found or token missing")
-                    return {'success': False, 'error': 'Integration not found or token missing'}
-
-            # Decrypt the token
-            key = AppConfig.load_key()
-            github_token = AppConfig.decrypt_token(integration.password, key)
+            if not integration or not integration.token:
+                logger.error(f"Integration {integration_id} not found or token missing")
+                return {'success': False, 'error': 'Integration not found or token missing'}
 
-            # Get batch_size from integration settings
+            # Get batch_size and nested_batch_size from integration settings
             batch_size = 50  # Default
+            nested_batch_size = 50  # Default: nested connections fetched per batched GraphQL query
             if integration.settings and isinstance(integration.settings, dict):
                 sync_config = integration.settings.get('sync_config', {})
                 batch_size = sync_config.get('batch_size', 50)
-            logger.debug(f"🔧 Using batch_size={batch_size} from integration settings")
+                nested_batch_size = sync_config.get('nested_batch_size', 50)
+            logger.debug(f"🔧 Using batch_size={batch_size}, nested_batch_size={nested_batch_size} from integration settings")
 
             # Initialize clients
             from app.etl.github.github_graphql_client import GitHubGraphQLClient
-            github_client = GitHubGraphQLClient(github_token, batch_size=batch_size)
+            github_client = credential_cache.get_client(
+                integration, 'github_graphql',
+                lambda: GitHubGraphQLClient(integration.token, batch_size=batch_size)
+            )
             queue_manager = QueueManager()
 
             # STEP 1: Fetch PR page
@@ -1469,59 +1510,38 @@ class GitHubExtractionWorker:
 
             logger.debug(f"📤 Queued {len(raw_data_ids)} PRs to transform")
 
-            # STEP 5: Loop through each PR and queue nested pagination if needed
-            # 🔑 Build list of nested types that need pagination for this PR
-            for pr_index, pr in enumerate(filtered_prs):
+            # STEP 5: Collect nested pagination needed by every PR and queue it in batches
+            # 🔑 Many PRs' pending cursors are combined into one aliased GraphQL query per message
+            pending_nested = []
+            for pr in filtered_prs:
                 pr_node_id = pr['id']
-
-                # Determine which nested types need pagination
-                nested_types_needing_pagination = []
                 if pr['commits']['pageInfo']['hasNextPage']:
-                    nested_types_needing_pagination.append(('commits', pr['commits']['pageInfo']['endCursor']))
+                    pending_nested.append({'pr_node_id': pr_node_id, 'nested_type': 'commits', 'nested_cursor': pr['commits']['pageInfo']['endCursor']})
                 if pr['reviews']['pageInfo']['hasNextPage']:
-                    nested_types_needing_pagination.append(('reviews', pr['reviews']['pageInfo']['endCursor']))
+                    pending_nested.append({'pr_node_id': pr_node_id, 'nested_type': 'reviews', 'nested_cursor': pr['reviews']['pageInfo']['endCursor']})
                 if pr['comments']['pageInfo']['hasNextPage']:
-                    nested_types_needing_pagination.append(('comments', pr['comments']['pageInfo']['endCursor']))
+                    pending_nested.append({'pr_node_id': pr_node_id, 'nested_type': 'comments', 'nested_cursor': pr['comments']['pageInfo']['endCursor']})
                 if pr['reviewThreads']['pageInfo']['hasNextPage']:
-                    nested_types_needing_pagination.append(('review_threads', pr['reviewThreads']['pageInfo']['endCursor']))
+                    pending_nested.append({'pr_node_id': pr_node_id, 'nested_type': 'review_threads', 'nested_cursor': pr['reviewThreads']['pageInfo']['endCursor']})
 
-                # Queue each nested type with index info
-                # 🔑 Calculate last_pr_last_nested: true ONLY for the last nested type of the last PR
-                # This simplifies the logic - nested extraction only needs to check this one flag
-                is_last_pr_in_filtered = (pr_index == len(filtered_prs) - 1)
-
-                total_nested_types = len(nested_types_needing_pagination)
-                for nested_index, (nested_type, nested_cursor) in enumerate(nested_types_needing_pagination):
-                    logger.debug(f"🔍 GUSTAVO - NESTED")
-                    is_last_nested_type = (nested_index == total_nested_types - 1)
-
-                    # 🔑 Set last_pr_last_nested=true ONLY for the last nested type of the last PR of the last repo
-                    # This way, nested extraction only needs to check last_pr_last_nested (not is_last_nested_type)
-                    last_pr_last_nested = (is_last_pr_in_filtered and not has_next_page and last_repo and is_last_nested_type)
-
-                    queue_manager.publish_extraction_job(
-                        tenant_id=tenant_id,
-                        integration_id=integration_id,  # 🔑 Use integration_id from function parameter
-                        extraction_type='github_prs_commits_reviews_comments',  # Route to github_extraction_worker
-                        extraction_data={
-                            'owner': owner,  # 🔑 Pass repo info instead of repository_id
-                            'repo_name': repo_name,
-                            'full_name': f"{owner}/{repo_name}",
-                            'pr_node_id': pr_node_id,
-                            'nested_type': nested_type,
-                            'nested_cursor': nested_cursor
-                        },
-                        job_id=job_id,
-                        provider='github',
-                        old_last_sync_date=old_last_sync_date,  # 🔑 Used for filtering (old_last_sync_date)
-                        new_last_sync_date=extraction_end_date,  # 🔑 Used for job completion (extraction end date)
-                        first_item=False,
-                        last_item=False,                    # 🔑 Will be set to true only on final nested page
-                        last_job_item=False,                # 🔑 Will be set to true only on final nested page
-                        last_repo=last_repo,                # 🔑 Forward: true if last repository
-                        last_pr_last_nested=last_pr_last_nested  # 🔑 last_pr_last_nested: true ONLY for last nested type of last PR
-                    )
-                    logger.debug(f"📤 Queued {nested_type} pagination (nested_type={nested_type}, last_pr_last_nested={last_pr_last_nested})")
+            if pending_nested:
+                # 🔑 last_pr_last_nested=true ONLY on the batch holding the last nested type of the last PR of the last repo
+                self._publish_nested_batches(
+                    queue_manager=queue_manager,
+                    tenant_id=tenant_id,
+                    integration_id=integration_id,
+                    job_id=job_id,
+                    pending_nested=pending_nested,
+                    items_per_batch=github_client.max_nested_items_per_query(nested_batch_size),
+                    owner=owner,
+                    repo_name=repo_name,
+                    full_name=f"{owner}/{repo_name}",
+                    old_last_sync_date=old_last_sync_date,
+                    new_last_sync_date=extraction_end_date,
+                    last_repo=last_repo,
+                    last_pr_last_nested=(not has_next_page and last_repo),
+                    token=token
+                )
 
             logger.debug(f"📤 Queued nested pagination messages for PRs with incomplete data")
 
@@ -1725,21 +1745,14 @@ class GitHubExtractionWorker:
 
             logger.debug(f"✅ Using owner and repo_name from message: {owner}/{repo_name}")
 
-            # 🔑 Get integration and GitHub token (service-to-service, not data processing)
-            with get_read_session_context() as db:
-                integration = db.query(Integration).filter(
-                    Integration.id == integration_id,
-                    Integration.tenant_id == tenant_id
-                ).first()
+            # 🔑 Get integration with decrypted token (cached per process, not data processing)
+            credential_cache = get_credential_cache()
+            integration = credential_cache.get_integration(tenant_id, integration_id)
 
-            if not integration or not integration.password:
+            if not integration or not integration.token:
                 logger.error(f"Integration {integration_id} not found or token missing")
                 return {'success': False, 'error': 'Integration not found or token missing'}
 
-            # Decrypt the token
-            key = AppConfig.load_key()
-            github_token = AppConfig.decrypt_token(integration.password, key)
-
             # Get batch_size from integration settings
             batch_size = 50  # Default
             if integration.settings and isinstance(integration.settings, dict):
@@ -1749,7 +1762,10 @@ class GitHubExtractionWorker:
 
             # Initialize clients
             from app.etl.github.github_graphql_client import GitHubGraphQLClient
-            github_client = GitHubGraphQLClient(github_token, batch_size=batch_size)
+            github_client = credential_cache.get_client(
+                integration, 'github_graphql',
+                lambda: GitHubGraphQLClient(integration.token, batch_size=batch_size)
+            )
             queue_manager = QueueManager()
 
             # STEP 1: Fetch nested page based on type
@@ -1957,6 +1973,338 @@ class GitHubExtractionWorker:
             return {'success': False, 'error': str(e)}
 
 
+    def _publish_nested_batches(self,
+        queue_manager,
+        tenant_id: int,
+        integration_id: int,
+        job_id: int,
+        pending_nested: List[Dict[str, Any]],
+        items_per_batch: int,
+        owner: str,
+        repo_name: str,
+        full_name: str,
+        old_last_sync_date: Optional[str],
+        new_last_sync_date: Optional[str],
+        last_repo: bool,
+        last_pr_last_nested: bool,
+        token: str = None
+    ) -> int:
+        """
+        Queue nested pagination work as batched extraction messages.
+
+        Each message carries up to items_per_batch {pr_node_id, nested_type, nested_cursor}
+        items that are fetched together in one aliased GraphQL query.
+
+        Args:
+            pending_nested: Nested connections that still have pages to fetch
+            items_per_batch: Maximum items per message (see GitHubGraphQLClient.max_nested_items_per_query)
+            last_pr_last_nested: Set ONLY on the final batch (holds the last nested type of the last PR)
+
+        Returns:
+            Number of messages queued
+        """
+        items_per_batch = max(1, items_per_batch)
+        batches = [pending_nested[i:i + items_per_batch] for i in range(0, len(pending_nested), items_per_batch)]
+        extraction_queue = queue_manager.get_tenant_queue_name(tenant_id, 'extraction')
+
+        for batch_index, batch in enumerate(batches):
+            is_last_batch = (batch_index == len(batches) - 1)
+
+            queue_manager.publish_extraction_job(
+                tenant_id=tenant_id,
+                integration_id=integration_id,
+                extraction_type='github_prs_commits_reviews_comments',  # Route to github_extraction_worker
+                extraction_data={
+                    'owner': owner,
+                    'repo_name': repo_name,
+                    'full_name': full_name,
+                    'nested_batch': batch
+                },
+                job_id=job_id,
+                provider='github',
+                old_last_sync_date=old_last_sync_date,  # 🔑 Used for filtering (old_last_sync_date)
+                new_last_sync_date=new_last_sync_date,  # 🔑 Used for job completion (extraction end date)
+                first_item=False,
+                last_item=False,                # 🔑 Will be set to true only on final nested page
+                last_job_item=False,            # 🔑 Will be set to true only on final nested page
+                last_repo=last_repo,            # 🔑 Forward: true if last repository
+                last_pr_last_nested=(last_pr_last_nested and is_last_batch),
+                token=token,                    # 🔑 Forward token to nested extraction
+                queue_name=extraction_queue
+            )
+
+        logger.debug(f"📤 Queued {len(pending_nested)} nested connections in {len(batches)} batch message(s) for {full_name}")
+        return len(batches)
+
+    async def extract_nested_pagination_batch(self,
+        tenant_id: int,
+        integration_id: int,
+        job_id: int,
+        nested_batch: List[Dict[str, Any]],
+        owner: Optional[str] = None,
+        repo_name: Optional[str] = None,
+        full_name: Optional[str] = None,
+        old_last_sync_date: Optional[str] = None,
+        new_last_sync_date: Optional[str] = None,
+        last_repo: bool = False,
+        last_pr_last_nested: bool = False,
+        token: str = None
+    ) -> Dict[str, Any]:
+        """
+        Extract the next page of nested data for many PRs with a single GraphQL query.
+
+        Batched counterpart of extract_nested_pagination. Instead of one query and one
+        queue round-trip per (PR, nested type), the pending cursors of many PRs are
+        fetched together and stored as one raw_data row.
+
+        Flow:
+        1. Fetch all nested pages in one aliased query
+        2. Save to raw_data (github_prs_nested_batch)
+        3. Queue to transform
+        4. Queue one follow-up batch for the connections that still have more pages
+
+        Args:
+            tenant_id: Tenant ID
+            integration_id: Integration ID
+            job_id: ETL job ID
+            nested_batch: List of {pr_node_id, nested_type, nested_cursor}
+            owner: Repository owner (from message - avoids DB lookup)
+            repo_name: Repository name (from message - avoids DB lookup)
+            full_name: Full repository name (from message - avoids DB lookup)
+            old_last_sync_date: Old sync date for filtering
+            new_last_sync_date: New sync date for job completion tracking
+            last_repo: True if this is the last repository (from message)
+            last_pr_last_nested: True ONLY for the batch holding the last nested type of the last PR of the last repo
+            token: Job execution token
+
+        Returns:
+            Dictionary with extraction result
+        """
+        try:
+            logger.debug(f"🚀 Extracting batched nested data ({len(nested_batch)} connections)")
+
+            from app.core.database_router import get_read_session_context, get_write_session_context
+            from app.core.config import AppConfig
+            from app.etl.workers.queue_manager import QueueManager
+
+            if not owner or not repo_name:
+                logger.error(f"owner and repo_name required for nested extraction")
+                return {'success': False, 'error': 'owner and repo_name required'}
+
+            if not nested_batch:
+                logger.warning(f"Empty nested batch received for {owner}/{repo_name}")
+                return {'success': True, 'items_processed': 0, 'has_more': False}
+
+            full_name = full_name or f"{owner}/{repo_name}"
+
+            # 🔑 Get integration with decrypted token (cached per process, not data processing)
+            credential_cache = get_credential_cache()
+            integration = credential_cache.get_integration(tenant_id, integration_id)
+
+            if not integration or not integration.token:
+                logger.error(f"Integration {integration_id} not found or token missing")
+                return {'success': False, 'error': 'Integration not found or token missing'}
+
+            batch_size = 50  # Default
+            if integration.settings and isinstance(integration.settings, dict):
+                sync_config = integration.settings.get('sync_config', {})
+                batch_size = sync_config.get('batch_size', 50)
+
+            from app.etl.github.github_graphql_client import GitHubGraphQLClient
+            github_client = credential_cache.get_client(
+                integration, 'github_graphql',
+                lambda: GitHubGraphQLClient(integration.token, batch_size=batch_size)
+            )
+            queue_manager = QueueManager()
+
+            # STEP 1: Fetch all nested pages in one query
+            try:
+                response = await github_client.get_more_nested_for_prs(nested_batch)
+            except GraphQLRateLimitException as e:
+                logger.warning(f"⚠️ Rate limit hit during batched nested extraction: {e}")
+                rate_limit_reset_at = e.reset_at or github_client.rate_limit_reset
+
+                # 🔑 Save checkpoint_data with the whole batch so recovery can resume it
+                checkpoint_data = {
+                    'node_type': 'nested_batch',
+                    'nested_batch': nested_batch,
+                    'rate_limit_reset_at': rate_limit_reset_at  # GraphQL resetAt (ISO string)
+                }
+
+                logger.info(f"💾 Saving checkpoint data for repo {full_name} (nested batch)")
+                try:
+                    update_checkpoint_data(
+                        job_id=job_id,
+                        tenant_id=tenant_id,
+                        token=token,
+                        full_name=full_name,
+                        checkpoint_data=checkpoint_data
+                    )
+                    logger.info(f"✅ Checkpoint data saved for repo {full_name} (nested batch)")
+                except Exception as checkpoint_error:
+                    logger.error(f"Failed to save checkpoint data: {checkpoint_error}")
+
+                # 🔑 Send completion message to transform with rate_limited=True
+                logger.info(f"⚠️ Sending rate limit completion message for job {job_id} (nested batch)")
+                extraction_end_date = DateTimeHelper.now_default().strftime('%Y-%m-%d')
+
+                queue_manager.publish_transform_job(
+                    tenant_id=tenant_id,
+                    integration_id=integration_id,
+                    raw_data_id=None,  # Completion message marker
+                    data_type='github_prs_commits_reviews_comments',
+                    job_id=job_id,
+                    provider='github',
+                    first_item=False,
+                    last_item=True,
+                    last_job_item=True,
+                    old_last_sync_date=old_last_sync_date,
+                    new_last_sync_date=extraction_end_date,
+                    token=token,
+                    rate_limited=True  # 🔑 Signal rate limit to downstream workers
+                )
+
+                return {
+                    'success': False,
+                    'error': 'Rate limit exceeded',
+                    'is_rate_limit': True,
+                    'rate_limit_reset_at': rate_limit_reset_at,
+                    'status': 'RATE_LIMITED'
+                }
+
+            if not response or not response.get('data'):
+                logger.error(f"Failed to fetch nested batch for {full_name}")
+                return {'success': False, 'error': 'Failed to fetch nested batch'}
+
+            # 🔑 Aliases n0..nN map back to nested_batch items in order
+            results = []
+            for index, item in enumerate(nested_batch):
+                connection_field = github_client.NESTED_CONNECTIONS[item['nested_type']][0]
+                node = response['data'].get(f'n{index}') or {}
+                results.append(node.get(connection_field))
+
+            # STEP 2: Build raw_data entries and the follow-up batch
+            batch_entries = []
+            next_batch = []
+            items_processed = 0
+            for item, nested_data in zip(nested_batch, results):
+                pr_node_id = item['pr_node_id']
+                nested_type = item['nested_type']
+
+                if not nested_data:
+                    logger.warning(f"⚠️ No {nested_type} data returned for PR {pr_node_id} - skipping")
+                    continue
+
+                has_more = nested_data['pageInfo']['hasNextPage']
+                returned_nested_cursor = nested_data['pageInfo'].get('endCursor')
+
+                # 🔑 Detect infinite loop when API returns same cursor for nested data
+                if has_more and item.get('nested_cursor') and returned_nested_cursor == item.get('nested_cursor'):
+                    logger.warning(f"⚠️ [NESTED INFINITE LOOP DETECTED] API returned hasNextPage=True with SAME cursor={returned_nested_cursor} for {nested_type} - treating as hasNextPage=False")
+                    has_more = False
+
+                batch_entries.append({
+                    'pr_id': pr_node_id,
+                    'nested_type': nested_type,
+                    'data': nested_data['nodes'],
+                    'cursor': returned_nested_cursor if has_more else None,
+                    'has_more': has_more
+                })
+                items_processed += len(nested_data['nodes'])
+
+                if has_more:
+                    next_batch.append({
+                        'pr_node_id': pr_node_id,
+                        'nested_type': nested_type,
+                        'nested_cursor': returned_nested_cursor
+                    })
+
+            raw_data = {
+                'owner': owner,  # 🔑 Include repo info for transform
+                'repo_name': repo_name,
+                'full_name': full_name,
+                'nested_batch': batch_entries
+            }
+
+            with get_write_session_context() as db:
+                raw_data_id = self._store_raw_extraction_data(
+                    db, tenant_id, integration_id,
+                    'github_prs_nested_batch',
+                    raw_data, f"{full_name}:nested_batch"
+                )
+
+            has_more = bool(next_batch)
+            logger.debug(f"💾 Stored nested batch ({len(batch_entries)} connections, {items_processed} items, has_more={has_more})")
+
+            # STEP 3: Queue to transform
+            # 🔑 last_item/last_job_item=true ONLY if this batch holds the last nested type of the
+            # last PR of the last repo AND none of its connections have more pages
+            is_last_item = (last_pr_last_nested and not has_more)
+            is_last_job_item = is_last_item
+
+            queue_manager.publish_transform_job(
+                tenant_id=tenant_id,
+                integration_id=integration.id,
+                raw_data_id=raw_data_id,
+                data_type='github_prs_commits_reviews_comments',
+                job_id=job_id,
+                provider='github',
+                old_last_sync_date=old_last_sync_date,
+                new_last_sync_date=new_last_sync_date,
+                first_item=False,
+                last_item=is_last_item,
+                last_job_item=is_last_job_item,
+                last_repo=last_repo,
+                last_pr_last_nested=last_pr_last_nested,
+                token=token
+            )
+
+            # STEP 4: Queue the connections that still have more pages as one follow-up batch
+            if has_more:
+                self._publish_nested_batches(
+                    queue_manager=queue_manager,
+                    tenant_id=tenant_id,
+                    integration_id=integration_id,
+                    job_id=job_id,
+                    pending_nested=next_batch,
+                    items_per_batch=len(next_batch),
+                    owner=owner,
+                    repo_name=repo_name,
+                    full_name=full_name,
+                    old_last_sync_date=old_last_sync_date,
+                    new_last_sync_date=new_last_sync_date,
+                    last_repo=last_repo,
+                    last_pr_last_nested=last_pr_last_nested,
+                    token=token
+                )
+            elif last_pr_last_nested:
+                # 🔑 Update checkpoint status to 'completed' when nested extraction completes
+                try:
+                    update_checkpoint_status(
+                        job_id=job_id,
+                        tenant_id=tenant_id,
+                        token=token,
+                        full_name=full_name,
+                        status='completed'
+                    )
+                    logger.info(f"✅ Checkpoint marked as completed for repo {full_name} (nested complete)")
+                except Exception as e:
+                    logger.error(f"Failed to update checkpoint status: {e}")
+
+            logger.debug(f"✅ Batched nested extraction completed (connections: {len(batch_entries)}, items: {items_processed})")
+            return {
+                'success': True,
+                'connections_processed': len(batch_entries),
+                'items_processed': items_processed,
+                'has_more': has_more
+            }
+
+        except Exception as e:
+            logger.error(f"❌ Error in batched nested pagination: {e}")
+            import traceback
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            return {'success': False, 'error': str(e)}
+
     async def extract_nested_recovery(self, 
         tenant_id: int,
         integration_id: int,
@@ -5,8 +5,10 @@ Handles GraphQL requests to GitHub API for PR extraction with nested data.
 
 import requests
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from app.core.config import get_settings
 from app.core.logging_config import get_logger
+from app.etl.workers.rate_limit_governor import get_rate_limit_governor, parse_reset_timestamp
 
 logger = get_logger(__name__)
 
@@ -18,9 +20,61 @@ class GitHubRateLimitException(Exception):
         self.reset_at = reset_at
 
 
+def get_graphql_url() -> str:
+    """
+    GraphQL endpoint: GITHUB_GRAPHQL_URL, or derived from GITHUB_API_URL.
+
+    GitHub Enterprise serves REST under /api/v3 and GraphQL at /api/graphql,
+    so a trailing /v3 is replaced; other API URLs (api.github.com, the
+    benchmark's fake server) get /graphql appended.
+    """
+    settings = get_settings()
+    if settings.GITHUB_GRAPHQL_URL:
+        return settings.GITHUB_GRAPHQL_URL
+    api_url = settings.GITHUB_API_URL.rstrip('/')
+    if api_url.endswith('/v3'):
+        api_url = api_url[:-len('/v3')]
+    return f"{api_url}/graphql"
+
+
 class GitHubGraphQLClient:
     """Client for GitHub GraphQL API interactions with cursor-based pagination."""
-    
+
+    # GitHub GraphQL limits: at most 500,000 nodes per query; cost is ~1 point per 100 connection requests
+    MAX_NODES_PER_QUERY = 500000
+    MAX_NESTED_ALIASES_PER_QUERY = 100
+
+    # nested_type -> (PullRequest connection field, node selection)
+    NESTED_CONNECTIONS = {
+        'commits': ('commits', """
+                commit {
+                  oid
+                  message
+                  author {
+                    name
+                    email
+                    date
+                  }
+                }"""),
+        'reviews': ('reviews', """
+                id
+                state
+                author {
+                  login
+                }
+                createdAt"""),
+        'comments': ('comments', """
+                id
+                body
+                author {
+                  login
+                }
+                createdAt"""),
+        'review_threads': ('reviewThreads', """
+                id
+                isResolved"""),
+    }
+
     def __init__(self, token: str, db_session=None, batch_size: int = 50):
         """
         Initialize GitHub GraphQL client.
@@ -33,9 +87,14 @@ class GitHubGraphQLClient:
         self.token = token
         self.db_session = db_session
         self.batch_size = batch_size
-        self.graphql_url = "https://api.github.com/graphql"
+        self.graphql_url = get_graphql_url()
         self.rate_limit_remaining = 5000
         self.rate_limit_reset = None
+        self.last_query_cost = 1
+
+        # Shared rate budget for this token (paces requests across worker threads/processes)
+        self.rate_governor = get_rate_limit_governor()
+        self.rate_limit_key = self.rate_governor.github_key(token)
 
         self.session = requests.Session()
         self.session.headers.update({
@@ -50,7 +109,14 @@ class GitHubGraphQLClient:
             rate_limit = response_data['data']['rateLimit']
             self.rate_limit_remaining = rate_limit.get('remaining', self.rate_limit_remaining)
             self.rate_limit_reset = rate_limit.get('resetAt')
-            logger.debug(f"GraphQL rate limit updated: {self.rate_limit_remaining} points remaining")
+            self.last_query_cost = rate_limit.get('cost') or self.last_query_cost
+            self.rate_governor.record(
+                self.rate_limit_key,
+                remaining=self.rate_limit_remaining,
+                limit=rate_limit.get('limit'),
+                reset_at=parse_reset_timestamp(self.rate_limit_reset)
+            )
+            logger.debug(f"GraphQL rate limit updated: {self.rate_limit_remaining} points remaining (cost: {self.last_query_cost})")
 
     def is_rate_limited(self) -> bool:
         """Check if we have hit the rate limit."""
@@ -81,6 +147,9 @@ class GitHubGraphQLClient:
                 if self.is_rate_limited():
                     logger.warning(f"GraphQL rate limit reached: {self.rate_limit_remaining} points remaining")
 
+                # Pace against the shared budget (waits until reset when exhausted)
+                self.rate_governor.acquire(self.rate_limit_key, cost=self.last_query_cost)
+
                 logger.debug(f"Making GitHub GraphQL request (attempt {attempt + 1})")
                 response = self.session.post(self.graphql_url, json=payload, timeout=30)
 
@@ -150,6 +219,8 @@ class GitHubGraphQLClient:
           $prCursor: String
         ) {{
           rateLimit {{
+            cost
+            limit
             remaining
             resetAt
           }}
@@ -248,6 +319,8 @@ class GitHubGraphQLClient:
           $commitCursor: String
         ) {{
           rateLimit {{
+            cost
+            limit
             remaining
             resetAt
           }}
@@ -290,6 +363,8 @@ class GitHubGraphQLClient:
           $reviewCursor: String
         ) {{
           rateLimit {{
+            cost
+            limit
             remaining
             resetAt
           }}
@@ -329,6 +404,8 @@ class GitHubGraphQLClient:
           $commentCursor: String
         ) {{
           rateLimit {{
+            cost
+            limit
             remaining
             resetAt
           }}
@@ -368,6 +445,8 @@ class GitHubGraphQLClient:
           $threadCursor: String
         ) {{
           rateLimit {{
+            cost
+            limit
             remaining
             resetAt
           }}
@@ -395,3 +474,65 @@ class GitHubGraphQLClient:
 
         return self._make_graphql_request(query, variables)
 
+    def max_nested_items_per_query(self, requested: int) -> int:
+        """
+        Clamp the number of nested pages combined into one query to GitHub's limits.
+
+        Args:
+            requested: Desired number of (PR, nested type) pages per query
+
+        Returns:
+            Number of pages that fits the alias and node limits
+        """
+        node_limited = self.MAX_NODES_PER_QUERY // max(self.batch_size, 1)
+        return max(1, min(requested, self.MAX_NESTED_ALIASES_PER_QUERY, node_limited))
+
+    async def get_more_nested_for_prs(self, items: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the next nested page for many PRs in a single aliased GraphQL query.
+
+        Each item becomes an aliased node() lookup (n0, n1, ...) selecting one nested
+        connection after its cursor, so one round-trip (and usually one rate limit
+        point) replaces one request per PR and nested type.
+
+        Args:
+            items: List of dicts with pr_node_id, nested_type and nested_cursor
+
+        Returns:
+            GraphQL response with data.n<i> entries in the same order as items, or None if failed
+        """
+        variable_defs = []
+        selections = []
+        variables = {}
+
+        for index, item in enumerate(items):
+            connection_field, node_selection = self.NESTED_CONNECTIONS[item['nested_type']]
+            variable_defs.append(f"$id{index}: ID!, $cursor{index}: String")
+            variables[f'id{index}'] = item['pr_node_id']
+            variables[f'cursor{index}'] = item.get('nested_cursor')
+            selections.append(f"""
+          n{index}: node(id: $id{index}) {{
+            ... on PullRequest {{
+              {connection_field}(first: {self.batch_size}, after: $cursor{index}) {{
+                pageInfo {{
+                  endCursor
+                  hasNextPage
+                }}
+                nodes {{{node_selection}
+                }}
+              }}
+            }}
+          }}""")
+
+        query = f"""
+        query getMoreNestedForPrs({', '.join(variable_defs)}) {{
+          rateLimit {{
+            cost
+            limit
+            remaining
+            resetAt
+          }}{''.join(selections)}
+        }}
+        """
+
+        return self._make_graphql_request(query, variables)
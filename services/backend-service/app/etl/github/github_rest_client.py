@@ -9,7 +9,9 @@ import requests
 import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from app.core.config import get_settings
 from app.core.logging_config import get_logger
+from app.etl.workers.rate_limit_governor import get_rate_limit_governor, parse_reset_timestamp
 
 logger = get_logger(__name__)
 
@@ -32,10 +34,15 @@ class GitHubRestClient:
             token: GitHub personal access token
         """
         self.token = token
-        self.base_url = "https://api.github.com"
+        self.base_url = get_settings().GITHUB_API_URL.rstrip('/')
         self.rate_limit_remaining = 5000
         self.rate_limit_reset = None
 
+        # Shared rate budgets for this token (core and search are separate GitHub buckets)
+        self.rate_governor = get_rate_limit_governor()
+        self.rate_limit_key = self.rate_governor.github_key(token, 'core')
+        self.search_rate_limit_key = self.rate_governor.github_key(token, 'search')
+
         self.session = requests.Session()
         self.session.headers.update({
             'Authorization': f'Bearer {token}',
@@ -48,12 +55,25 @@ class GitHubRestClient:
         if 'X-RateLimit-Remaining' in response.headers:
             self.rate_limit_remaining = int(response.headers['X-RateLimit-Remaining'])
             self.rate_limit_reset = response.headers.get('X-RateLimit-Reset')
+            self.rate_governor.record(
+                self.rate_limit_key,
+                remaining=self.rate_limit_remaining,
+                limit=response.headers.get('X-RateLimit-Limit'),
+                reset_at=parse_reset_timestamp(self.rate_limit_reset)
+            )
             logger.debug(f"REST API rate limit updated: {self.rate_limit_remaining} requests remaining")
 
     def is_rate_limited(self) -> bool:
         """Check if we have hit the rate limit."""
         return self.rate_limit_remaining <= 0
 
+    def _can_wait_for_reset(self) -> bool:
+        """Check if the rate limit window resets soon enough for the governor to wait it out."""
+        reset_at = parse_reset_timestamp(self.rate_limit_reset)
+        if reset_at is None:
+            return False
+        return reset_at - time.time() <= self.rate_governor.max_wait_seconds
+
     def _make_request(self, endpoint: str, params: Dict[str, Any] = None, max_retries: int = 3) -> Optional[Dict[str, Any]]:
         """
         Make a REST API request with retry logic.
@@ -70,13 +90,16 @@ class GitHubRestClient:
         
         for attempt in range(max_retries):
             try:
-                if self.is_rate_limited():
+                if self.is_rate_limited() and not self._can_wait_for_reset():
                     logger.warning(f"REST API rate limit reached: {self.rate_limit_remaining} requests remaining")
                     raise GitHubRateLimitException(
                         f"GitHub REST API rate limit exceeded",
                         reset_at=self.rate_limit_reset
                     )
 
+                # Pace against the shared budget (waits until reset when exhausted)
+                self.rate_governor.acquire(self.rate_limit_key)
+
                 logger.debug(f"Making GitHub REST request (attempt {attempt + 1}): {endpoint}")
                 response = self.session.get(url, params=params, timeout=30)
 
@@ -275,7 +298,7 @@ class GitHubRestClient:
 
                     logger.info(f"🔍 [GITHUB SEARCH] Batch {i}/{len(pattern_batches)}: Query = {query}, Pushed = {start_date}..{end_date}")
 
-                    endpoint = "https://api.github.com/search/repositories"
+                    endpoint = f"{self.base_url}/search/repositories"
                     params = {
                         "q": query,
                         "pushed": f"{start_date}..{end_date}",
@@ -299,6 +322,8 @@ class GitHubRestClient:
                         page = 1
 
                         while True:
+                            self.rate_governor.acquire(self.search_rate_limit_key)
+
                             if next_url:
                                 # Use the next URL from Link header
                                 logger.debug(f"🔍 [GITHUB SEARCH] Using next URL from Link header: {next_url[:100]}...")
@@ -310,6 +335,12 @@ class GitHubRestClient:
                                 response = client.get(endpoint, params=current_params, headers=headers, timeout=30.0)
 
                             logger.info(f"🔍 [GITHUB SEARCH] Response status: {response.status_code}")
+                            self.rate_governor.record(
+                                self.search_rate_limit_key,
+                                remaining=response.headers.get('X-RateLimit-Remaining'),
+                                limit=response.headers.get('X-RateLimit-Limit'),
+                                reset_at=parse_reset_timestamp(response.headers.get('X-RateLimit-Reset'))
+                            )
 
                             # Check for rate limit (403 or 429)
                             if response.status_code in (403, 429):
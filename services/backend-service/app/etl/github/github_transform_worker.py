@@ -5,6 +5,7 @@ Handles all GitHub message types:
 - github_repositories: Process GitHub repositories
 - github_prs: Process GitHub PRs with nested data (commits, reviews, comments)
 - github_prs_nested: Process nested pagination for PRs
+- github_prs_nested_batch: Process batched nested pagination for many PRs
 - github_prs_commits_reviews_comments: Legacy message type (routes to github_prs)
 """
 
@@ -145,6 +146,8 @@ class GitHubTransformHandler:
                 return await self._process_github_prs(raw_data_id, tenant_id, integration_id, job_id, message)
             elif message_type == 'github_prs_nested':
                 return await self._process_github_prs_nested(raw_data_id, tenant_id, integration_id, job_id, message)
+            elif message_type == 'github_prs_nested_batch':
+                return await self._process_github_prs_nested_batch(raw_data_id, tenant_id, integration_id, job_id, message)
             else:
                 logger.warning(f"Unknown GitHub message type: {message_type}")
                 return False
@@ -203,7 +206,7 @@ class GitHubTransformHandler:
 
             return True
 
-        elif message_type in ('github_prs', 'github_prs_nested', 'github_prs_commits_reviews_comments'):
+        elif message_type in ('github_prs', 'github_prs_nested', 'github_prs_nested_batch', 'github_prs_commits_reviews_comments'):
             logger.debug(f"🎯 [COMPLETION] Processing {message_type} completion message (rate_limited={rate_limited})")
             self.queue_manager.publish_embedding_job(
                 tenant_id=tenant_id,
@@ -430,6 +433,8 @@ class GitHubTransformHandler:
             incoming_last_item = message.get('last_item', False) if message else False
             token = message.get('token') if message else None
 
+            embedding_queue = self.queue_manager.get_tenant_queue_name(tenant_id, 'embedding') if repos_to_queue else None
+
             for i, repo_info in enumerate(repos_to_queue):
                 # 🔑 Forward flags from message (don't recalculate based on loop position)
                 # Since each message contains only 1 repo, we use the incoming flags directly
@@ -450,7 +455,8 @@ class GitHubTransformHandler:
                     first_item=repo_first_item,
                     last_item=repo_last_item,
                     last_job_item=repo_last_job_item,
-                    token=token  # 🔑 Include token in message
+                    token=token,  # 🔑 Include token in message
+                    queue_name=embedding_queue
                 )
 
                 logger.debug(f"Queued repo {repo_info['full_name']} for embedding (first={repo_first_item}, last={repo_last_item}, job_end={repo_last_job_item})")
@@ -539,7 +545,12 @@ class GitHubTransformHandler:
                 # Type 2 messages have 'nested_type' and 'data' instead of 'pr_data'
                 if raw_json.get('nested_type'):
                     logger.debug(f"🔄 Routing to _process_github_prs_nested for {raw_json.get('nested_type')}")
-                    return self._process_github_prs_nested(raw_data_id, tenant_id, integration_id, job_id, message)
+                    return await self._process_github_prs_nested(raw_data_id, tenant_id, integration_id, job_id, message)
+
+                # Batched Type 2 messages carry 'nested_batch' with pages for many PRs
+                if raw_json.get('nested_batch') is not None:
+                    logger.debug(f"🔄 Routing to _process_github_prs_nested_batch ({len(raw_json['nested_batch'])} connections)")
+                    return await self._process_github_prs_nested_batch(raw_data_id, tenant_id, integration_id, job_id, message)
 
                 # 🔑 Initialize entities_to_queue_after_commit (will be set if conditions met)
                 entities_to_queue_after_commit = None
@@ -764,14 +775,7 @@ class GitHubTransformHandler:
 
                 # Insert nested data based on type
                 nested_data = raw_json.get('data', [])
-                if nested_type == 'commits':
-                    self._insert_commits(db, nested_data, pr_db_id, tenant_id, integration_id)
-                elif nested_type == 'reviews':
-                    self._insert_reviews(db, nested_data, pr_db_id, tenant_id, integration_id)
-                elif nested_type == 'comments':
-                    self._insert_comments(db, nested_data, pr_db_id, tenant_id, integration_id)
-                elif nested_type == 'review_threads':
-                    self._insert_review_threads(db, nested_data, pr_db_id, tenant_id, integration_id)
+                self._insert_nested_data(db, nested_type, nested_data, pr_db_id, tenant_id, integration_id)
 
                 logger.debug(f"✅ Inserted {len(nested_data)} {nested_type} for PR {pr_id}")
 
@@ -795,35 +799,7 @@ class GitHubTransformHandler:
                 logger.debug(f"📤 Queuing nested entities for PR {pr_id} to embedding ({nested_type})")
 
                 # 🔑 Build list of nested entities to queue
-                entities_to_queue = []
-
-                # Map nested type to table name
-                table_name_map = {
-                    'commits': 'prs_commits',
-                    'reviews': 'prs_reviews',
-                    'comments': 'prs_comments',
-                    'review_threads': 'prs_comments'  # Review threads are stored as comments
-                }
-
-                table_name = table_name_map.get(nested_type)
-                if table_name:
-                    if nested_type == 'review_threads':
-                        # For review threads, extract comment IDs from inside each thread
-                        for thread_data in nested_data:
-                            for comment_data in thread_data.get('comments', {}).get('nodes', []):
-                                comment_external_id = comment_data.get('id')
-                                if comment_external_id:
-                                    entities_to_queue.append({'table_name': table_name, 'external_id': comment_external_id})
-                    else:
-                        # For commits, reviews, comments - extract directly from data array
-                        for entity_data in nested_data:
-                            if nested_type == 'commits':
-                                external_id = entity_data.get('commit', {}).get('oid')
-                            else:
-                                external_id = entity_data.get('id')
-
-                            if external_id:
-                                entities_to_queue.append({'table_name': table_name, 'external_id': external_id})
+                entities_to_queue = self._collect_nested_entities(nested_type, nested_data)
 
                 db.commit()
                 logger.debug(f"✅ [GITHUB] Processed nested {nested_type} data and marked raw_data_id={raw_data_id} as completed")
@@ -860,6 +836,178 @@ class GitHubTransformHandler:
             logger.error(f"Full traceback: {traceback.format_exc()}")
             return False
 
+    async def _process_github_prs_nested_batch(
+        self, raw_data_id: int, tenant_id: int, integration_id: int,
+        job_id: int = None, message: Dict[str, Any] = None
+    ) -> bool:
+        """
+        Process batched GitHub nested data (one page of nested data for many PRs).
+
+        Flow:
+        - Resolve all PR ids in one query
+        - Insert each connection's nested data for its PR
+        - Queue every inserted entity to embedding in one pass (after commit)
+
+        Args:
+            raw_data_id: ID of raw extraction data
+            tenant_id: Tenant ID
+            integration_id: Integration ID
+            job_id: ETL job ID
+            message: Original message with flags and metadata
+
+        Returns:
+            True if processing succeeded, False otherwise
+        """
+        try:
+            from app.core.database import get_database
+            database = get_database()
+
+            with database.get_write_session_context() as db:
+                raw_data_query = text("""
+                    SELECT raw_data FROM raw_extraction_data WHERE id = :raw_data_id
+                """)
+                result = db.execute(raw_data_query, {'raw_data_id': raw_data_id}).fetchone()
+
+                if not result:
+                    logger.error(f"Raw data {raw_data_id} not found")
+                    return False
+
+                import json
+                raw_json = json.loads(result[0]) if isinstance(result[0], str) else result[0]
+                nested_batch = raw_json.get('nested_batch', [])
+
+                logger.debug(f"📝 [NESTED BATCH] Processing {len(nested_batch)} nested connections")
+
+                # Lookup all PRs of the batch in one query
+                pr_external_ids = list({entry['pr_id'] for entry in nested_batch})
+                pr_id_map = {}
+                if pr_external_ids:
+                    pr_lookup_query = text("""
+                        SELECT external_id, id FROM prs
+                        WHERE external_id = ANY(:external_ids) AND tenant_id = :tenant_id
+                    """)
+                    pr_id_map = {
+                        row[0]: row[1] for row in db.execute(pr_lookup_query, {
+                            'external_ids': pr_external_ids,
+                            'tenant_id': tenant_id
+                        }).fetchall()
+                    }
+
+                entities_to_queue = []
+                for entry in nested_batch:
+                    pr_id = entry['pr_id']
+                    nested_type = entry['nested_type']
+                    nested_data = entry.get('data', [])
+
+                    pr_db_id = pr_id_map.get(pr_id)
+                    if not pr_db_id:
+                        logger.warning(f"PR {pr_id} not found in database - skipping {nested_type}")
+                        continue
+
+                    self._insert_nested_data(db, nested_type, nested_data, pr_db_id, tenant_id, integration_id)
+                    entities_to_queue.extend(self._collect_nested_entities(nested_type, nested_data))
+
+                # Mark raw data as completed
+                from app.core.utils import DateTimeHelper
+                now = DateTimeHelper.now_default()
+
+                update_query = text("""
+                    UPDATE raw_extraction_data
+                    SET status = 'completed',
+                        last_updated_at = :now,
+                        error_details = NULL
+                    WHERE id = :raw_data_id
+                """)
+                db.execute(update_query, {'raw_data_id': raw_data_id, 'now': now})
+
+                db.commit()
+                logger.debug(f"✅ [GITHUB] Processed nested batch and marked raw_data_id={raw_data_id} as completed")
+
+            # 🔑 Queue to embedding AFTER commit so entities are visible in database
+            last_item_flag = message.get('last_item', False) if message else False
+            if entities_to_queue:
+                self._queue_github_nested_entities_for_embedding(
+                    tenant_id=tenant_id,
+                    pr_external_id=None,
+                    job_id=job_id,
+                    integration_id=integration_id,
+                    provider=message.get('provider', 'github') if message else 'github',
+                    first_item=message.get('first_item', False) if message else False,
+                    last_item=last_item_flag,
+                    last_job_item=message.get('last_job_item', False) if message else False,
+                    message=message,
+                    entities_to_queue=entities_to_queue,
+                    token=message.get('token') if message else None
+                )
+
+                # 🔑 Send transform worker "finished" status when last_item=True
+                if last_item_flag and job_id:
+                    await self._send_worker_status("transform", tenant_id, job_id, "finished", "github_prs_commits_reviews_comments")
+                    logger.debug(f"✅ [GITHUB] Transform step marked as finished for github_prs_nested_batch")
+            elif last_item_flag:
+                # 🔑 Nothing to embed on the final batch - forward completion so the job still finishes
+                return await self._handle_completion_message('github_prs_nested_batch', message)
+
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ [GITHUB] Error processing github_prs_nested_batch: {e}")
+            import traceback
+            logger.error(f"Full traceback: {traceback.format_exc()}")
+            return False
+
+    def _insert_nested_data(self, db, nested_type: str, nested_data: list, pr_db_id: int, tenant_id: int, integration_id: int):
+        """Insert one page of nested data for a PR based on its nested type."""
+        if nested_type == 'commits':
+            self._insert_commits(db, nested_data, pr_db_id, tenant_id, integration_id)
+        elif nested_type == 'reviews':
+            self._insert_reviews(db, nested_data, pr_db_id, tenant_id, integration_id)
+        elif nested_type == 'comments':
+            self._insert_comments(db, nested_data, pr_db_id, tenant_id, integration_id)
+        elif nested_type == 'review_threads':
+            self._insert_review_threads(db, nested_data, pr_db_id, tenant_id, integration_id)
+
+    def _collect_nested_entities(self, nested_type: str, nested_data: list) -> List[Dict[str, Any]]:
+        """
+        Build the embedding queue entries for one page of nested data.
+
+        Returns:
+            List of dicts with 'table_name' and 'external_id'
+        """
+        entities_to_queue = []
+
+        # Map nested type to table name
+        table_name_map = {
+            'commits': 'prs_commits',
+            'reviews': 'prs_reviews',
+            'comments': 'prs_comments',
+            'review_threads': 'prs_comments'  # Review threads are stored as comments
+        }
+
+        table_name = table_name_map.get(nested_type)
+        if not table_name:
+            return entities_to_queue
+
+        if nested_type == 'review_threads':
+            # For review threads, extract comment IDs from inside each thread
+            for thread_data in nested_data:
+                for comment_data in thread_data.get('comments', {}).get('nodes', []):
+                    comment_external_id = comment_data.get('id')
+                    if comment_external_id:
+                        entities_to_queue.append({'table_name': table_name, 'external_id': comment_external_id})
+        else:
+            # For commits, reviews, comments - extract directly from data array
+            for entity_data in nested_data:
+                if nested_type == 'commits':
+                    external_id = entity_data.get('commit', {}).get('oid')
+                else:
+                    external_id = entity_data.get('id')
+
+                if external_id:
+                    entities_to_queue.append({'table_name': table_name, 'external_id': external_id})
+
+        return entities_to_queue
+
     def _insert_pr(self, db, pr_data: dict, tenant_id: int, integration_id: int, repository_id: int = None, repo_external_id: str = None) -> int:
         """
         Insert or update a PR in the prs table.
@@ -1221,6 +1369,8 @@ class GitHubTransformHandler:
 
             logger.debug(f"📤 Queuing {len(entities_to_queue)} GitHub entities for embedding (first_item={first_item}, last_item={last_item}, last_job_item={last_job_item})")
 
+            embedding_queue = self.queue_manager.get_tenant_queue_name(tenant_id, 'embedding')
+
             for i, entity in enumerate(entities_to_queue):
                 table_name = entity.get('table_name')
                 external_id = entity.get('external_id')
@@ -1249,7 +1399,8 @@ class GitHubTransformHandler:
                     last_item=entity_last_item,  # Only last entity has last_item=true
                     last_job_item=entity_last_job_item,  # Only last entity signals job completion
                     step_type='github_prs_commits_reviews_comments',  # 🔑 ETL step name for status tracking
-                    token=token  # 🔑 Include token in message
+                    token=token,  # 🔑 Include token in message
+                    queue_name=embedding_queue
                 )
 
             logger.debug(f"📤 Queued {len(entities_to_queue)} GitHub entities for embedding")
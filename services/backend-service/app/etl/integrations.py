@@ -14,6 +14,7 @@ from app.auth.auth_middleware import require_authentication
 from app.core.database import get_database
 from app.models.unified_models import Integration, User
 from app.core.config import AppConfig
+from app.core.credential_cache import get_credential_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -198,6 +199,9 @@ async def update_integration(
 
             session.commit()
 
+            # Drop cached credentials/clients so workers pick up the new settings
+            get_credential_cache().invalidate(integration_id)
+
             return {"message": "Integration updated successfully"}
 
     except HTTPException:
@@ -232,6 +236,8 @@ async def delete_integration(
             session.delete(integration)
             session.commit()
 
+            get_credential_cache().invalidate(integration_id)
+
             return {"message": "Integration deleted successfully"}
 
     except HTTPException:
@@ -300,6 +306,8 @@ async def toggle_integration_active(
             integration.last_updated_at = DateTimeHelper.now_default()
             session.commit()
 
+            get_credential_cache().invalidate(integration_id)
+
             action = "activated" if new_active_status else "deactivated"
             logger.info(f"Integration {integration.provider} (ID: {integration_id}) {action}")
 
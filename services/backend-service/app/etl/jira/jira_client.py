@@ -3,10 +3,12 @@ Jira API Client for ETL Backend Service
 Handles Jira API interactions for custom fields discovery and other ETL operations
 """
 
+import time
 import requests
 from typing import List, Dict, Any, Optional
 from app.core.logging_config import get_logger
 from app.core.config import AppConfig
+from app.etl.workers.rate_limit_governor import get_rate_limit_governor, parse_reset_timestamp
 
 logger = get_logger(__name__)
 
@@ -26,6 +28,61 @@ class JiraAPIClient:
         self.username = username
         self.token = token
         self.base_url = base_url.rstrip('/')
+
+        # Shared rate budget for this Jira site (paces requests across worker threads/processes)
+        self.rate_governor = get_rate_limit_governor()
+        self.rate_limit_key = self.rate_governor.jira_key(self.base_url)
+
+    def _request(self, method: str, url: str, max_rate_limit_retries: int = 3, **kwargs) -> requests.Response:
+        """
+        Send a request through the shared rate budget for this Jira site.
+
+        Records the budget reported in X-RateLimit-* headers and, on HTTP 429,
+        backs off for Retry-After seconds before retrying. A Retry-After longer
+        than RATE_LIMIT_MAX_WAIT_SECONDS is not waited for: the 429 is returned
+        so the job can be marked RATE_LIMITED.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            max_rate_limit_retries: Maximum retries on HTTP 429
+            **kwargs: Passed through to requests.request
+
+        Returns:
+            requests.Response (the last response if retries are exhausted)
+        """
+        backoff = 0.0
+        for attempt in range(max_rate_limit_retries + 1):
+            waited = self.rate_governor.acquire(self.rate_limit_key)
+            if backoff > waited:
+                time.sleep(backoff - waited)  # Governor did not pace (e.g. shared budget unavailable)
+            response = requests.request(method, url, **kwargs)
+
+            self.rate_governor.record(
+                self.rate_limit_key,
+                remaining=response.headers.get('X-RateLimit-Remaining'),
+                limit=response.headers.get('X-RateLimit-Limit'),
+                reset_at=parse_reset_timestamp(response.headers.get('X-RateLimit-Reset'))
+            )
+
+            if response.status_code != 429 or attempt == max_rate_limit_retries:
+                return response
+
+            try:
+                retry_after = float(response.headers.get('Retry-After', 2 ** attempt))
+            except ValueError:
+                retry_after = float(2 ** attempt)
+            self.rate_governor.record_exhausted(self.rate_limit_key, retry_after)
+
+            if retry_after > self.rate_governor.max_wait_seconds:
+                logger.warning(f"Jira rate limit hit (429) - Retry-After {retry_after:.0f}s exceeds max wait "
+                               f"{self.rate_governor.max_wait_seconds}s, not retrying")
+                return response
+
+            logger.warning(f"Jira rate limit hit (429) - backing off {retry_after:.0f}s (attempt {attempt + 1}/{max_rate_limit_retries})")
+            backoff = retry_after
+
+        return response
     
     def get_createmeta(self, project_keys: List[str], issue_type_names: Optional[List[str]] = None, expand: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -55,8 +112,8 @@ class JiraAPIClient:
             
             logger.info(f"Requesting createmeta for projects: {project_keys}")
             
-            response = requests.get(
-                url,
+            response = self._request(
+                'GET', url,
                 auth=(self.username, self.token),
                 params=params,
                 headers={
@@ -100,8 +157,8 @@ class JiraAPIClient:
 
             logger.info(f"Requesting field info for: {field_id}")
 
-            response = requests.get(
-                url,
+            response = self._request(
+                'GET', url,
                 auth=(self.username, self.token),
                 params=params,
                 headers={
@@ -168,8 +225,8 @@ class JiraAPIClient:
 
             logger.info(f"Fetching projects with keys: {project_keys or 'ALL'}")
 
-            response = requests.get(
-                url,
+            response = self._request(
+                'GET', url,
                 auth=(self.username, self.token),
                 params=params,
                 headers=headers,
@@ -245,8 +302,8 @@ class JiraAPIClient:
         try:
             url = f"{self.base_url}/rest/api/3/project/{project_key}/statuses"
 
-            response = requests.get(
-                url,
+            response = self._request(
+                'GET', url,
                 auth=(self.username, self.token),
                 headers={'Accept': 'application/json'},
                 timeout=30
@@ -320,8 +377,8 @@ class JiraAPIClient:
 
             logger.debug(f"Searching issues with JQL: {jql} (nextPageToken={'present' if next_page_token else 'none'}, maxResults={max_results})")
 
-            response = requests.post(
-                url,
+            response = self._request(
+                'POST', url,
                 auth=(self.username, self.token),
                 json=request_body,
                 headers={
@@ -377,8 +434,8 @@ class JiraAPIClient:
 
                 logger.debug(f"Fetching development details for issue {issue_external_id} (attempt {attempt + 1}/{max_retries})")
 
-                response = requests.get(
-                    url,
+                response = self._request(
+                    'GET', url,
                     auth=(self.username, self.token),
                     params=params,
                     headers={'Accept': 'application/json'},
@@ -445,8 +502,8 @@ class JiraAPIClient:
 
             logger.debug(f"Fetching sprint report for board_id={board_id}, sprint_id={sprint_id}")
 
-            response = requests.get(
-                url,
+            response = self._request(
+                'GET', url,
                 auth=(self.username, self.token),
                 params=params,
                 headers={
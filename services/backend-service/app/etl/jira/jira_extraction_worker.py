@@ -20,12 +20,12 @@ Uses dependency injection to receive WorkerStatusManager for sending status upda
 """
 
 import json
-import pika
 from typing import Dict, Any, Optional, Tuple
 from sqlalchemy import text
 
 from app.core.logging_config import get_logger
 from app.core.database import get_database
+from app.core.credential_cache import get_credential_cache
 from app.etl.jira.jira_client import JiraAPIClient
 from app.etl.workers.queue_manager import QueueManager
 
@@ -114,47 +114,31 @@ class JiraExtractionWorker:
             Tuple of (integration_data dict, JiraAPIClient instance) or (None, None) if failed
         """
         try:
-            database = get_database()
-            with database.get_read_session_context() as db:
-                query = text("""
-                    SELECT id, provider, base_url, username, password, active, settings
-                    FROM integrations
-                    WHERE id = :integration_id AND tenant_id = :tenant_id
-                """)
-                result = db.execute(query, {
-                    'integration_id': integration_id,
-                    'tenant_id': tenant_id
-                }).fetchone()
-
-                if not result:
-                    logger.error(f"Integration {integration_id} not found for tenant {tenant_id}")
-                    return None, None
-
-                integration_data = {
-                    'id': result[0],
-                    'provider': result[1],
-                    'base_url': result[2],
-                    'username': result[3],
-                    'password': result[4],
-                    'active': result[5],
-                    'settings': result[6]  # JSONB field with projects list
-                }
-
-            # Decrypt password if needed
-            from app.core.config import AppConfig
-            password = integration_data['password']
-            if password:
-                try:
-                    key = AppConfig.load_key()
-                    password = AppConfig.decrypt_token(password, key)
-                except Exception as e:
-                    logger.warning(f"Failed to decrypt password, using as-is: {e}")
+            # 🔑 Integration and decrypted token are cached per process (invalidated on integration updates)
+            credential_cache = get_credential_cache()
+            integration = credential_cache.get_integration(tenant_id, integration_id)
+
+            if not integration:
+                logger.error(f"Integration {integration_id} not found for tenant {tenant_id}")
+                return None, None
+
+            integration_data = {
+                'id': integration.id,
+                'provider': integration.provider,
+                'base_url': integration.base_url,
+                'username': integration.username,
+                'active': integration.active,
+                'settings': integration.settings  # JSONB field with projects list
+            }
 
-            # Create Jira client with username, token, base_url
-            jira_client = JiraAPIClient(
-                username=integration_data['username'],
-                token=password,
-                base_url=integration_data['base_url']
+            # Reuse the Jira client built for this integration
+            jira_client = credential_cache.get_client(
+                integration, 'jira',
+                lambda: JiraAPIClient(
+                    username=integration.username,
+                    token=integration.token,
+                    base_url=integration.base_url
+                )
             )
 
             return integration_data, jira_client
@@ -457,6 +441,8 @@ class JiraExtractionWorker:
 
             # Step 2: Queue all projects to transform using shared channel
             logger.debug(f"Publishing {len(raw_data_ids)} messages to transform queue")
+            # Resolve the tenant's tier queue once for the whole batch
+            tier_queue = queue_manager.get_tenant_queue_name(tenant_id, 'transform')
             with queue_manager.get_channel() as channel:
                 for i, (project_key, raw_data_id) in enumerate(zip(project_keys_processed, raw_data_ids)):
                     is_first = (i == 0)
@@ -481,18 +467,7 @@ class JiraExtractionWorker:
                     }
 
                     # Publish using shared channel
-                    tier = queue_manager._get_tenant_tier(tenant_id)
-                    tier_queue = queue_manager.get_tier_queue_name(tier, 'transform')
-
-                    channel.basic_publish(
-                        exchange='',
-                        routing_key=tier_queue,
-                        body=json.dumps(message),
-                        properties=pika.BasicProperties(
-                            delivery_mode=2,
-                            content_type='application/json'
-                        )
-                    )
+                    queue_manager.publish_on_channel(channel, tier_queue, message)
 
                     # Log progress every 10 projects
                     if (i + 1) % 10 == 0 or (i + 1) == len(raw_data_ids):
@@ -756,6 +731,8 @@ class JiraExtractionWorker:
 
             # Step 2: Queue all issues to transform using shared channel
             logger.debug(f"Publishing {len(raw_data_ids)} messages to transform queue")
+            # Resolve the tenant's tier queue once for the whole batch
+            tier_queue = queue_manager.get_tenant_queue_name(tenant_id, 'transform')
             with queue_manager.get_channel() as channel:
                 for i, (issue_key, raw_data_id) in enumerate(zip(issue_keys_processed, raw_data_ids)):
                     is_first = (i == 0)
@@ -786,18 +763,7 @@ class JiraExtractionWorker:
                     }
 
                     # Publish using shared channel
-                    tier = queue_manager._get_tenant_tier(tenant_id)
-                    tier_queue = queue_manager.get_tier_queue_name(tier, 'transform')
-
-                    channel.basic_publish(
-                        exchange='',
-                        routing_key=tier_queue,
-                        body=json.dumps(message),
-                        properties=pika.BasicProperties(
-                            delivery_mode=2,
-                            content_type='application/json'
-                        )
-                    )
+                    queue_manager.publish_on_channel(channel, tier_queue, message)
 
                     # Log progress every 100 issues
                     if (i + 1) % 100 == 0 or (i + 1) == len(raw_data_ids):
@@ -889,6 +855,9 @@ class JiraExtractionWorker:
                 logger.info(f"✅ All remaining steps marked as finished and job marked as FINISHED (no dev_status or sprint_reports to process)")
                 queue_order = []
 
+            # Resolve the tenant's tier queue once for all dev_status and sprint messages
+            extraction_queue = queue_manager.get_tenant_queue_name(tenant_id, 'extraction')
+
             # Execute queuing based on determined order
             for step_type, gets_last_job_item in queue_order:
                 if step_type == 'dev':
@@ -921,18 +890,7 @@ class JiraExtractionWorker:
                             }
 
                             # Publish using shared channel
-                            tier = queue_manager._get_tenant_tier(tenant_id)
-                            tier_queue = queue_manager.get_tier_queue_name(tier, 'extraction')
-
-                            channel.basic_publish(
-                                exchange='',
-                                routing_key=tier_queue,
-                                body=json.dumps(dev_message),
-                                properties=pika.BasicProperties(
-                                    delivery_mode=2,
-                                    content_type='application/json'
-                                )
-                            )
+                            queue_manager.publish_on_channel(channel, extraction_queue, dev_message)
 
                             # Log progress every 50 issues
                             if (i + 1) % 50 == 0 or (i + 1) == dev_count:
@@ -968,18 +926,7 @@ class JiraExtractionWorker:
                             }
 
                             # Publish using shared channel
-                            tier = queue_manager._get_tenant_tier(tenant_id)
-                            tier_queue = queue_manager.get_tier_queue_name(tier, 'extraction')
-
-                            channel.basic_publish(
-                                exchange='',
-                                routing_key=tier_queue,
-                                body=json.dumps(sprint_message),
-                                properties=pika.BasicProperties(
-                                    delivery_mode=2,
-                                    content_type='application/json'
-                                )
-                            )
+                            queue_manager.publish_on_channel(channel, extraction_queue, sprint_message)
 
                             # Log progress every 20 sprints
                             if (i + 1) % 20 == 0 or (i + 1) == sprint_count:
@@ -359,9 +359,6 @@ class JiraTransformHandler:
             has_projects = bool(projects_to_insert or projects_to_update)
             has_wits = bool(wits_to_insert or wits_to_update)
 
-            import pika
-            import json
-
             # 🔧 FIX: Check for entities that need embedding but weren't inserted/updated
             # This handles the case where entities exist in DB but not in qdrant_vectors (first run scenario)
             all_projects = projects_to_insert + projects_to_update if has_projects else []
@@ -380,6 +377,9 @@ class JiraTransformHandler:
                 total_entities = len(all_projects) + len(all_wits)
                 logger.info(f"🔄 [PROJECTS/WITS] Queuing {len(all_projects)} projects + {len(all_wits)} WITs = {total_entities} entities to embedding using shared channel")
 
+                # Resolve the tenant's tier queue once for the whole batch
+                tier_queue = self.queue_manager.get_tenant_queue_name(tenant_id, 'embedding')
+
                 with self.queue_manager.get_channel() as channel:
                     entity_index = 0
 
@@ -406,18 +406,7 @@ class JiraTransformHandler:
                         }
 
                         # Publish using shared channel
-                        tier = self.queue_manager._get_tenant_tier(tenant_id)
-                        tier_queue = self.queue_manager.get_tier_queue_name(tier, 'embedding')
-
-                        channel.basic_publish(
-                            exchange='',
-                            routing_key=tier_queue,
-                            body=json.dumps(message),
-                            properties=pika.BasicProperties(
-                                delivery_mode=2,
-                                content_type='application/json'
-                            )
-                        )
+                        self.queue_manager.publish_on_channel(channel, tier_queue, message)
 
                         if i == 0:
                             logger.info(f"📤 [PROJECTS] Queued project {i+1}/{len(all_projects)}: external_id={project.get('external_id')}, first={is_first}")
@@ -447,18 +436,7 @@ class JiraTransformHandler:
                         }
 
                         # Publish using shared channel
-                        tier = self.queue_manager._get_tenant_tier(tenant_id)
-                        tier_queue = self.queue_manager.get_tier_queue_name(tier, 'embedding')
-
-                        channel.basic_publish(
-                            exchange='',
-                            routing_key=tier_queue,
-                            body=json.dumps(message),
-                            properties=pika.BasicProperties(
-                                delivery_mode=2,
-                                content_type='application/json'
-                            )
-                        )
+                        self.queue_manager.publish_on_channel(channel, tier_queue, message)
 
                         if i == len(all_wits) - 1:
                             logger.info(f"📤 [WITS] Queued WIT {i+1}/{len(all_wits)}: external_id={wit.get('external_id')}, last={is_last}")
@@ -2223,8 +2201,8 @@ class JiraTransformHandler:
                 logger.debug(f"Transform completed, queuing {table_name} for embedding")
 
             # 🚀 PERFORMANCE: Use shared channel for batch publishing (same pattern as extraction worker)
-            import pika
-            import json
+            # Resolve the tenant's tier queue once for the whole batch
+            tier_queue = self.queue_manager.get_tenant_queue_name(tenant_id, 'embedding')
 
             with self.queue_manager.get_channel() as channel:
                 for idx, entity in enumerate(entities):
@@ -2266,18 +2244,7 @@ class JiraTransformHandler:
                     }
 
                     # Publish using shared channel
-                    tier = self.queue_manager._get_tenant_tier(tenant_id)
-                    tier_queue = self.queue_manager.get_tier_queue_name(tier, 'embedding')
-
-                    channel.basic_publish(
-                        exchange='',
-                        routing_key=tier_queue,
-                        body=json.dumps(message),
-                        properties=pika.BasicProperties(
-                            delivery_mode=2,
-                            content_type='application/json'
-                        )
-                    )
+                    self.queue_manager.publish_on_channel(channel, tier_queue, message)
 
                     queued_count += 1
 
@@ -3373,20 +3340,9 @@ class JiraTransformHandler:
                 changelogs_by_work_item[work_item_id] = []
             changelogs_by_work_item[work_item_id].append(changelog)
 
-        # Get status categories map (status_id -> category)
-        status_categories = {}
-        reverse_statuses_map = {v: k for k, v in statuses_map.items()}  # internal_id -> external_id
-
-        statuses_query = text("""
-            SELECT id, external_id, category
-            FROM statuses
-            WHERE integration_id = :integration_id AND tenant_id = :tenant_id
-        """)
-        statuses_result = db.execute(statuses_query, {
-            'integration_id': integration_id,
-            'tenant_id': tenant_id
-        }).fetchall()
-        status_categories = {row[0]: row[2].lower() if row[2] else None for row in statuses_result}
+        # Get status categories map (status_id -> category, status mappings override Jira's statusCategory)
+        from app.etl.jira.jira_workflow_metrics import load_status_categories
+        status_categories = load_status_categories(db, tenant_id, integration_id)
 
         # Calculate metrics for each work item
         work_items_to_update = []
@@ -0,0 +1,516 @@
+"""
+Jira Workflow Metrics Engine - Columnar computation of changelog-derived work item metrics.
+
+Computes the same metrics as JiraTransformHandler._calculate_enhanced_workflow_metrics
+(first/last commitment, start and completion dates, transition counts, time in
+category, cycle/lead time, complexity, rework and direct completion) for many
+work items at once with NumPy, instead of sorting and looping over each work
+item's changelogs in Python.
+
+Used by recompute_tenant_workflow_metrics() to refresh metrics for every work
+item of a tenant (e.g. after status mappings change) without a full re-sync.
+Changelogs are streamed from the database in chunks ordered by work item and
+results are written back with one set-based UPDATE per chunk.
+
+recompute_workflow_metrics_sql() is the server-side alternative: the same
+metrics are aggregated inside PostgreSQL and applied with a single
+UPDATE work_items ... FROM (aggregate), so no changelog row leaves the database.
+
+Both take a status's category from its active status mapping (matched by
+name, as the transform links statuses to mappings) and fall back to Jira's
+statusCategory, so editing a mapping's category changes the metrics.
+
+run_workflow_metrics_recompute() is what the API schedules: the recompute,
+then the DORA lead-time facts refresh (they copy the recomputed lead times)
+and a data generation bump, so cached dashboards are not served stale.
+"""
+
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import text
+
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+# Category codes used in the columnar computation (0 = unknown/other category)
+_CATEGORY_CODES = {
+    'to do': 1,
+    'in progress': 2,
+    'done': 3
+}
+_TODO, _IN_PROGRESS, _DONE = 1, 2, 3
+
+_INT64_MAX = np.iinfo(np.int64).max
+_INT64_MIN = np.iinfo(np.int64).min
+_NAT = np.datetime64('NaT', 'us').view(np.int64)
+
+# work_items columns written by the engine (same as the transform worker's bulk update)
+WORKFLOW_METRIC_COLUMNS = [
+    'work_first_committed_at',
+    'work_first_started_at',
+    'work_last_started_at',
+    'work_first_completed_at',
+    'work_last_completed_at',
+    'total_work_starts',
+    'total_completions',
+    'total_backlog_returns',
+    'total_work_time_seconds',
+    'total_review_time_seconds',
+    'total_cycle_time_seconds',
+    'total_lead_time_seconds',
+    'workflow_complexity_score',
+    'rework_indicator',
+    'direct_completion'
+]
+
+# PostgreSQL array types used to unnest each metric column in the bulk UPDATE
+_COLUMN_SQL_TYPES = {
+    'id': 'integer[]',
+    'work_first_committed_at': 'timestamp[]',
+    'work_first_started_at': 'timestamp[]',
+    'work_last_started_at': 'timestamp[]',
+    'work_first_completed_at': 'timestamp[]',
+    'work_last_completed_at': 'timestamp[]',
+    'total_work_starts': 'integer[]',
+    'total_completions': 'integer[]',
+    'total_backlog_returns': 'integer[]',
+    'total_work_time_seconds': 'double precision[]',
+    'total_review_time_seconds': 'double precision[]',
+    'total_cycle_time_seconds': 'double precision[]',
+    'total_lead_time_seconds': 'double precision[]',
+    'workflow_complexity_score': 'integer[]',
+    'rework_indicator': 'boolean[]',
+    'direct_completion': 'boolean[]'
+}
+
+
+def build_status_categories_sql(by_integration: bool = False) -> str:
+    """
+    Build the query for the effective workflow category of each status.
+
+    The category of the status's active mapping (statuses_mappings.status_from =
+    statuses.original_name in the same integration) wins over the statusCategory
+    Jira reported (statuses.category). With several active mappings for a name
+    the newest one is used.
+
+    Args:
+        by_integration: Also filter statuses by :integration_id
+
+    Returns:
+        SQL text selecting (id, category) with :tenant_id (and :integration_id) parameters
+    """
+    integration_filter = "AND s.integration_id = :integration_id" if by_integration else ""
+
+    return f"""
+        SELECT DISTINCT ON (s.id) s.id, COALESCE(m.status_category, s.category) AS category
+        FROM statuses s
+        LEFT JOIN statuses_mappings m
+            ON m.tenant_id = s.tenant_id
+            AND m.integration_id = s.integration_id
+            AND m.status_from = s.original_name
+            AND m.active = TRUE
+        WHERE s.tenant_id = :tenant_id {integration_filter}
+        ORDER BY s.id, m.id DESC
+    """
+
+
+def load_status_categories(db, tenant_id: int, integration_id: Optional[int] = None) -> Dict[int, Optional[str]]:
+    """
+    Effective category of each status (see build_status_categories_sql()).
+
+    Returns:
+        Dict mapping status_id to lowercase category ('to do', 'in progress', 'done') or None
+    """
+    query = text(build_status_categories_sql(by_integration=integration_id is not None))
+    rows = db.execute(query, {'tenant_id': tenant_id, 'integration_id': integration_id}).fetchall()
+    return {row[0]: row[1].lower() if row[1] else None for row in rows}
+
+
+def compute_workflow_metrics(
+    work_item_ids: Sequence[int],
+    transition_dates: Sequence[Any],
+    to_status_ids: Sequence[Optional[int]],
+    time_in_status_seconds: Sequence[Optional[float]],
+    status_categories: Dict[int, Optional[str]]
+) -> Dict[str, np.ndarray]:
+    """
+    Compute workflow metrics for all work items in a set of changelog rows.
+
+    Rows may be in any order. Changelogs without a transition date or target
+    status are ignored for milestones and counts but still count towards the
+    number of changelogs used by direct_completion (same as the per-item function).
+
+    Args:
+        work_item_ids: Work item id of each changelog row
+        transition_dates: transition_change_date of each row (naive datetimes or None)
+        to_status_ids: to_status_id of each row
+        time_in_status_seconds: time_in_status_seconds of each row
+        status_categories: Dict mapping status_id to category ('to do', 'in progress', 'done')
+
+    Returns:
+        Dict with 'work_item_id' and one array per column in WORKFLOW_METRIC_COLUMNS.
+        Date columns are datetime64[us] arrays with NaT where the milestone is missing.
+    """
+    row_count = len(work_item_ids)
+    item_ids = np.asarray(work_item_ids, dtype=np.int64)
+    dates = np.array(transition_dates, dtype='datetime64[us]') if row_count else np.array([], dtype='datetime64[us]')
+    status_ids = np.fromiter((s or 0 for s in to_status_ids), dtype=np.int64, count=row_count)
+    times = np.fromiter((t or 0.0 for t in time_in_status_seconds), dtype=np.float64, count=row_count)
+
+    # Map each row's target status to a category code
+    codes = np.zeros(row_count, dtype=np.int8)
+    if status_categories and row_count:
+        known_ids = np.array(sorted(status_categories.keys()), dtype=np.int64)
+        known_codes = np.array(
+            [_CATEGORY_CODES.get((status_categories[s] or '').lower(), 0) for s in known_ids],
+            dtype=np.int8
+        )
+        positions = np.clip(np.searchsorted(known_ids, status_ids), 0, len(known_ids) - 1)
+        matched = known_ids[positions] == status_ids
+        codes = np.where(matched, known_codes[positions], 0).astype(np.int8)
+
+    # Rows without a date or target status are skipped (but still counted per work item)
+    valid = ~np.isnat(dates) & (status_ids != 0)
+    codes = np.where(valid, codes, 0)
+
+    unique_ids, group = np.unique(item_ids, return_inverse=True)
+    group_count = len(unique_ids)
+    changelog_counts = np.bincount(group, minlength=group_count)
+    date_values = dates.view(np.int64)
+
+    def _count(code: int) -> np.ndarray:
+        return np.bincount(group[codes == code], minlength=group_count)
+
+    def _time_sum(code: int) -> np.ndarray:
+        return np.bincount(group, weights=np.where(codes == code, times, 0.0), minlength=group_count)
+
+    def _first_last(code: int):
+        mask = codes == code
+        first = np.full(group_count, _INT64_MAX, dtype=np.int64)
+        last = np.full(group_count, _INT64_MIN, dtype=np.int64)
+        np.minimum.at(first, group[mask], date_values[mask])
+        np.maximum.at(last, group[mask], date_values[mask])
+        present = np.bincount(group[mask], minlength=group_count) > 0
+        first_dates = np.where(present, first, _NAT).view('datetime64[us]')
+        last_dates = np.where(present, last, _NAT).view('datetime64[us]')
+        return first_dates, last_dates, present
+
+    backlog_returns = _count(_TODO)
+    work_starts = _count(_IN_PROGRESS)
+    completions = _count(_DONE)
+
+    first_committed, _, has_committed = _first_last(_TODO)
+    first_started, last_started, has_started = _first_last(_IN_PROGRESS)
+    first_completed, last_completed, has_completed = _first_last(_DONE)
+
+    # Cycle time (first start to last completion) and lead time (first commitment to last completion)
+    cycle_time = np.where(
+        has_started & has_completed,
+        (last_completed.view(np.int64) - first_started.view(np.int64)) / 1e6,
+        0.0
+    )
+    lead_time = np.where(
+        has_committed & has_completed,
+        (last_completed.view(np.int64) - first_committed.view(np.int64)) / 1e6,
+        0.0
+    )
+
+    return {
+        'work_item_id': unique_ids,
+        'work_first_committed_at': first_committed,
+        'work_first_started_at': first_started,
+        'work_last_started_at': last_started,
+        'work_first_completed_at': first_completed,
+        'work_last_completed_at': last_completed,
+        'total_work_starts': work_starts,
+        'total_completions': completions,
+        'total_backlog_returns': backlog_returns,
+        'total_work_time_seconds': _time_sum(_IN_PROGRESS),
+        'total_review_time_seconds': _time_sum(_TODO),
+        'total_cycle_time_seconds': cycle_time,
+        'total_lead_time_seconds': lead_time,
+        'workflow_complexity_score': backlog_returns * 2 + np.maximum(0, completions - 1),
+        'rework_indicator': work_starts > 1,
+        'direct_completion': (changelog_counts == 1) & (completions == 1) & (work_starts == 0)
+    }
+
+
+def _to_python_column(values: np.ndarray) -> List[Any]:
+    """Convert a metrics column to Python values (NaT -> None) for the database driver."""
+    if np.issubdtype(values.dtype, np.datetime64):
+        return [None if np.isnat(v) else v.item() for v in values]
+    return values.tolist()
+
+
+def workflow_metrics_to_rows(metrics: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """
+    Convert columnar metrics into per-work-item dicts (same keys as the transform worker's bulk update).
+
+    Returns:
+        List of dicts with 'id' and every column in WORKFLOW_METRIC_COLUMNS
+    """
+    columns = {'id': metrics['work_item_id'].tolist()}
+    for column in WORKFLOW_METRIC_COLUMNS:
+        columns[column] = _to_python_column(metrics[column])
+    return [dict(zip(columns.keys(), values)) for values in zip(*columns.values())]
+
+
+def write_workflow_metrics(db, tenant_id: int, metrics: Dict[str, np.ndarray], updated_at) -> int:
+    """
+    Write computed metrics to work_items with a single set-based UPDATE.
+
+    Args:
+        db: Write session
+        tenant_id: Tenant ID (guards the update)
+        metrics: Result of compute_workflow_metrics()
+        updated_at: Value for last_updated_at
+
+    Returns:
+        Number of work items updated
+    """
+    if len(metrics['work_item_id']) == 0:
+        return 0
+
+    columns = ['id'] + WORKFLOW_METRIC_COLUMNS
+    params = {'tenant_id': tenant_id, 'updated_at': updated_at, 'id': metrics['work_item_id'].tolist()}
+    for column in WORKFLOW_METRIC_COLUMNS:
+        params[column] = _to_python_column(metrics[column])
+
+    unnest_args = ', '.join(f"CAST(:{c} AS {_COLUMN_SQL_TYPES[c]})" for c in columns)
+    set_clause = ',\n            '.join(f"{c} = m.{c}" for c in WORKFLOW_METRIC_COLUMNS)
+
+    update_query = text(f"""
+        UPDATE work_items AS w SET
+            {set_clause},
+            last_updated_at = :updated_at
+        FROM unnest({unnest_args}) AS m({', '.join(columns)})
+        WHERE w.id = m.id AND w.tenant_id = :tenant_id
+    """)
+    result = db.execute(update_query, params)
+    return result.rowcount
+
+
+def recompute_tenant_workflow_metrics(
+    tenant_id: int,
+    integration_id: Optional[int] = None,
+    chunk_size: int = 100000
+) -> Dict[str, Any]:
+    """
+    Recompute workflow metrics for every work item of a tenant from its stored changelogs.
+
+    Changelogs are streamed ordered by work item, so each chunk holds complete
+    changelog histories (the rows of the last work item in a chunk are carried
+    over to the next one). Each chunk is computed with compute_workflow_metrics()
+    and written with one UPDATE.
+
+    Args:
+        tenant_id: Tenant ID
+        integration_id: Optional integration ID to limit the recompute
+        chunk_size: Changelog rows fetched per chunk
+
+    Returns:
+        Dictionary with changelogs_processed and work_items_updated counts
+    """
+    from app.core.database import get_database
+    from app.core.utils import DateTimeHelper
+
+    database = get_database()
+    integration_filter = "AND integration_id = :integration_id" if integration_id else ""
+    params = {'tenant_id': tenant_id, 'integration_id': integration_id}
+
+    with database.get_primary_read_session_context() as db:
+        status_categories = load_status_categories(db, tenant_id, integration_id)
+
+    logger.info(f"🔄 Recomputing workflow metrics for tenant {tenant_id} (integration={integration_id or 'all'}, {len(status_categories)} statuses)")
+
+    changelogs_processed = 0
+    work_items_updated = 0
+    updated_at = DateTimeHelper.now_default()
+
+    def _flush(rows: List[tuple]) -> None:
+        nonlocal work_items_updated
+        if not rows:
+            return
+        item_ids, dates, status_ids, times = zip(*rows)
+        metrics = compute_workflow_metrics(item_ids, dates, status_ids, times, status_categories)
+        with database.get_write_session_context() as write_db:
+            work_items_updated += write_workflow_metrics(write_db, tenant_id, metrics, updated_at)
+            write_db.commit()
+
+    with database.get_primary_read_session_context() as db:
+        changelogs_query = text(f"""
+            SELECT work_item_id, transition_change_date, to_status_id, time_in_status_seconds
+            FROM changelogs
+            WHERE tenant_id = :tenant_id AND active = TRUE {integration_filter}
+            ORDER BY work_item_id
+        """)
+        result = db.execute(
+            changelogs_query.execution_options(stream_results=True, yield_per=chunk_size),
+            params
+        )
+
+        carry: List[tuple] = []
+        for partition in result.partitions(chunk_size):
+            rows = carry + [tuple(row) for row in partition]
+            changelogs_processed += len(partition)
+
+            # Keep the last work item's rows for the next chunk (its history may continue)
+            last_item_id = rows[-1][0]
+            split = len(rows)
+            while split > 0 and rows[split - 1][0] == last_item_id:
+                split -= 1
+
+            carry = rows[split:]
+            _flush(rows[:split])
+
+        _flush(carry)
+
+    logger.info(f"✅ Recomputed workflow metrics for tenant {tenant_id}: {changelogs_processed} changelogs, {work_items_updated} work items")
+    return {
+        'changelogs_processed': changelogs_processed,
+        'work_items_updated': work_items_updated
+    }
+
+
+def build_workflow_metrics_update_sql(by_integration: bool = False) -> str:
+    """
+    Build the set-based UPDATE that recomputes workflow metrics inside PostgreSQL.
+
+    Mirrors compute_workflow_metrics(): changelogs without a transition date or
+    target status only count towards the number of changelogs, categories come
+    from build_status_categories_sql(), and missing milestones leave cycle/lead time at 0.
+
+    Args:
+        by_integration: Also filter changelogs by :integration_id
+
+    Returns:
+        SQL text with :tenant_id, :updated_at (and :integration_id) parameters
+    """
+    integration_filter = "AND c.integration_id = :integration_id" if by_integration else ""
+
+    return f"""
+        WITH status_categories AS ({build_status_categories_sql(by_integration)}),
+        categorized AS (
+            SELECT
+                c.work_item_id,
+                c.transition_change_date AS transition_date,
+                CASE
+                    WHEN c.transition_change_date IS NOT NULL AND c.to_status_id IS NOT NULL
+                    THEN LOWER(s.category)
+                END AS category,
+                COALESCE(c.time_in_status_seconds, 0) AS time_in_status
+            FROM changelogs c
+            LEFT JOIN status_categories s ON s.id = c.to_status_id
+            WHERE c.tenant_id = :tenant_id AND c.active = TRUE {integration_filter}
+        ),
+        aggregated AS (
+            SELECT
+                work_item_id,
+                COUNT(*) AS changelog_count,
+                COUNT(*) FILTER (WHERE category = 'to do') AS backlog_returns,
+                COUNT(*) FILTER (WHERE category = 'in progress') AS work_starts,
+                COUNT(*) FILTER (WHERE category = 'done') AS completions,
+                MIN(transition_date) FILTER (WHERE category = 'to do') AS first_committed,
+                MIN(transition_date) FILTER (WHERE category = 'in progress') AS first_started,
+                MAX(transition_date) FILTER (WHERE category = 'in progress') AS last_started,
+                MIN(transition_date) FILTER (WHERE category = 'done') AS first_completed,
+                MAX(transition_date) FILTER (WHERE category = 'done') AS last_completed,
+                COALESCE(SUM(time_in_status) FILTER (WHERE category = 'in progress'), 0) AS work_time,
+                COALESCE(SUM(time_in_status) FILTER (WHERE category = 'to do'), 0) AS review_time
+            FROM categorized
+            GROUP BY work_item_id
+        )
+        UPDATE work_items AS w SET
+            work_first_committed_at = a.first_committed,
+            work_first_started_at = a.first_started,
+            work_last_started_at = a.last_started,
+            work_first_completed_at = a.first_completed,
+            work_last_completed_at = a.last_completed,
+            total_work_starts = a.work_starts,
+            total_completions = a.completions,
+            total_backlog_returns = a.backlog_returns,
+            total_work_time_seconds = a.work_time,
+            total_review_time_seconds = a.review_time,
+            total_cycle_time_seconds = COALESCE(EXTRACT(EPOCH FROM (a.last_completed - a.first_started))::double precision, 0),
+            total_lead_time_seconds = COALESCE(EXTRACT(EPOCH FROM (a.last_completed - a.first_committed))::double precision, 0),
+            workflow_complexity_score = a.backlog_returns * 2 + GREATEST(0, a.completions - 1),
+            rework_indicator = a.work_starts > 1,
+            direct_completion = (a.changelog_count = 1 AND a.completions = 1 AND a.work_starts = 0),
+            last_updated_at = :updated_at
+        FROM aggregated a
+        WHERE w.id = a.work_item_id AND w.tenant_id = :tenant_id
+    """
+
+
+def recompute_workflow_metrics_sql(
+    tenant_id: int,
+    integration_id: Optional[int] = None,
+    db=None
+) -> Dict[str, Any]:
+    """
+    Recompute workflow metrics for a tenant (or one integration) with a single UPDATE.
+
+    Args:
+        tenant_id: Tenant ID
+        integration_id: Optional integration ID to limit the recompute
+        db: Optional write session (a new one is opened and committed if not given)
+
+    Returns:
+        Dictionary with work_items_updated count
+    """
+    from app.core.utils import DateTimeHelper
+
+    update_query = text(build_workflow_metrics_update_sql(by_integration=integration_id is not None))
+    params = {
+        'tenant_id': tenant_id,
+        'integration_id': integration_id,
+        'updated_at': DateTimeHelper.now_default()
+    }
+
+    if db is not None:
+        work_items_updated = db.execute(update_query, params).rowcount
+    else:
+        from app.core.database import get_database
+        with get_database().get_write_session_context() as write_db:
+            work_items_updated = write_db.execute(update_query, params).rowcount
+            write_db.commit()
+
+    logger.info(f"✅ Recomputed workflow metrics in SQL for tenant {tenant_id} (integration={integration_id or 'all'}): {work_items_updated} work items")
+    return {'work_items_updated': work_items_updated}
+
+
+def run_workflow_metrics_recompute(
+    tenant_id: int,
+    integration_id: Optional[int] = None,
+    method: str = 'sql'
+) -> Dict[str, Any]:
+    """
+    Recompute workflow metrics and publish them to the DORA facts and dashboard caches.
+
+    Args:
+        tenant_id: Tenant ID
+        integration_id: Optional integration ID to limit the recompute
+        method: 'sql' (recompute_workflow_metrics_sql) or 'columnar' (recompute_tenant_workflow_metrics)
+
+    Returns:
+        Result of the recompute
+    """
+    from app.core.response_cache import bump_data_generation
+    from app.services.dora_lead_time_facts_service import refresh_dora_lead_time_facts
+
+    if method == 'sql':
+        result = recompute_workflow_metrics_sql(tenant_id, integration_id)
+    else:
+        result = recompute_tenant_workflow_metrics(tenant_id, integration_id)
+
+    try:
+        refresh_dora_lead_time_facts(tenant_id)
+    except Exception as e:
+        logger.error(f"❌ Error refreshing DORA lead-time facts for tenant {tenant_id}: {e}")
+
+    # Dashboards cached for the previous data generation are stale now
+    bump_data_generation(tenant_id)
+    return result
@@ -718,13 +718,18 @@ async def run_job_now(
         except Exception as e:
             logger.warning(f"⚠️ Failed to send WebSocket update for job {job_id}: {e}")
 
+        # Manual runs are queued ahead of scheduled backfills (fair scheduling priority)
+        from app.etl.workers.fair_scheduler import message_priority, PRIORITY_HIGH
+        trigger_priority = PRIORITY_HIGH if auth_type == "user" else None
+
         # Queue job for extraction instead of executing directly
         if job_name.lower() == 'jira':
             logger.info(f"🚀 Queuing Jira extraction job for background processing (integration {integration_id})")
 
             # Queue the job for extraction
             # Queue the job for extraction (raises HTTPException if workers not running)
-            await _queue_jira_extraction_job(tenant_id, integration_id, job_id)
+            with message_priority(trigger_priority):
+                await _queue_jira_extraction_job(tenant_id, integration_id, job_id)
 
             # Return HTTP 202 Accepted for non-blocking response
             return JobActionResponse(
@@ -737,7 +742,8 @@ async def run_job_now(
             logger.info(f"🚀 Queuing GitHub extraction job for background processing (integration {integration_id})")
 
             # Queue the job for extraction (raises HTTPException if workers not running)
-            await _queue_github_extraction_job(tenant_id, integration_id, job_id)
+            with message_priority(trigger_priority):
+                await _queue_github_extraction_job(tenant_id, integration_id, job_id)
 
             # Return HTTP 202 Accepted for non-blocking response
             return JobActionResponse(
@@ -1180,6 +1186,34 @@ async def _queue_github_extraction_job(tenant_id: int, integration_id: int, job_
                             tier_queue = queue_manager.get_tier_queue_name(tier, 'extraction')
                             queue_manager._publish_message(tier_queue, message)
 
+                        elif node_type == 'nested_batch':
+                            # Resume batched nested extraction (many PRs in one query)
+                            nested_batch = checkpoint_data.get('nested_batch', [])
+                            logger.info(f"📥 Resuming batched nested extraction for {full_name} ({len(nested_batch)} connections)")
+
+                            message = {
+                                'tenant_id': tenant_id,
+                                'integration_id': integration_id,
+                                'job_id': job_id,
+                                'type': 'github_prs_commits_reviews_comments',
+                                'provider': 'github',
+                                'owner': owner,
+                                'repo_name': repo_name,
+                                'full_name': full_name,
+                                'nested_batch': nested_batch,
+                                'first_item': is_first,
+                                'last_item': False,
+                                'last_job_item': False,
+                                'last_repo': is_last,
+                                'last_pr_last_nested': is_last,  # Assume last nested for simplicity
+                                'token': job_token,
+                                'old_last_sync_date': job.last_sync_date.strftime('%Y-%m-%d %H:%M:%S') if job.last_sync_date else None
+                            }
+
+                            tier = queue_manager._get_tenant_tier(tenant_id)
+                            tier_queue = queue_manager.get_tier_queue_name(tier, 'extraction')
+                            queue_manager._publish_message(tier_queue, message)
+
                     logger.info(f"✅ Queued {len(checkpoints)} checkpoint recovery messages")
                     return True
 
@@ -1745,7 +1779,7 @@ async def check_remaining_messages(
 
         logger.info(f"🔍 Checking {embedding_queue} for messages with token {token}")
 
-        has_remaining = queue_manager.check_messages_with_token(embedding_queue, token)
+        has_remaining = queue_manager.has_pending_messages(embedding_queue, token, tenant_id=tenant_id)
 
         logger.info(f"✅ Queue check complete for job {job_id}: has_remaining_messages={has_remaining}")
 
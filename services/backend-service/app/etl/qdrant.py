@@ -6,11 +6,12 @@ Handles Qdrant vector database operations
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy import func
+from sqlalchemy import func, select
 import logging
 
 from app.auth.auth_middleware import require_authentication
-from app.core.database import get_database
+from app.core.async_database import get_async_database
+from app.core.response_cache import cached_response
 from app.models.unified_models import (
     User, WorkItem, Changelog, Project, Status, Wit,
     WitHierarchy, WitMapping, StatusMapping, Workflow,
@@ -100,12 +101,13 @@ class QdrantDashboardResponse(BaseModel):
 
 
 @router.get("/qdrant/dashboard", response_model=QdrantDashboardResponse)
+@cached_response("qdrant.dashboard", ttl_seconds=15)  # Shows vectorization progress while jobs run
 async def get_qdrant_dashboard(
     user: User = Depends(require_authentication)
 ):
     """Get Qdrant dashboard data with real database counts and vectorization status"""
     try:
-        database = get_database()
+        database = get_async_database()
         tenant_id = user.tenant_id
 
         # Initialize Qdrant client to get actual collection data
@@ -167,21 +169,21 @@ async def get_qdrant_dashboard(
 
         logger.info(f"📊 Final qdrant_collections map: {qdrant_collections}")
 
-        with database.get_read_session_context() as session:
+        async with database.get_read_session_context() as session:
             # Helper function to get count and vectorized count for a table
-            def get_entity_stats(model, name: str, table_name: str) -> EntityStats:
+            async def get_entity_stats(model, name: str, table_name: str) -> EntityStats:
                 try:
                     # Get database count
-                    db_count = session.query(func.count(model.id)).filter(
+                    db_count = await session.scalar(select(func.count(model.id)).where(
                         model.tenant_id == tenant_id
-                    ).scalar() or 0
+                    )) or 0
 
                     # Query qdrant_vectors table for tracking count
-                    vectorized_count = session.query(func.count(QdrantVector.id)).filter(
+                    vectorized_count = await session.scalar(select(func.count(QdrantVector.id)).where(
                         QdrantVector.tenant_id == tenant_id,
                         QdrantVector.table_name == table_name,
                         QdrantVector.active == True
-                    ).scalar() or 0
+                    )) or 0
 
                     # Get actual Qdrant collection data if available
                     qdrant_info = qdrant_collections.get(table_name, {})
@@ -216,34 +218,34 @@ async def get_qdrant_dashboard(
 
             # Jira entities
             jira_entities = [
-                get_entity_stats(WorkItem, "Work Items", "work_items"),
-                get_entity_stats(Changelog, "Changelogs", "changelogs"),
-                get_entity_stats(Project, "Projects", "projects"),
-                get_entity_stats(Status, "Statuses", "statuses"),
-                get_entity_stats(Wit, "Work Item Types", "wits"),
-                get_entity_stats(WitHierarchy, "WIT Hierarchies", "wits_hierarchies"),
-                get_entity_stats(WitMapping, "WIT Mappings", "wits_mappings"),
-                get_entity_stats(WorkItemPrLink, "Work Item PR Links", "work_items_prs_links"),
-                get_entity_stats(StatusMapping, "Status Mappings", "statuses_mappings"),
-                get_entity_stats(Workflow, "Workflows", "workflows"),
-                get_entity_stats(Sprint, "Sprints", "sprints"),
+                await get_entity_stats(WorkItem, "Work Items", "work_items"),
+                await get_entity_stats(Changelog, "Changelogs", "changelogs"),
+                await get_entity_stats(Project, "Projects", "projects"),
+                await get_entity_stats(Status, "Statuses", "statuses"),
+                await get_entity_stats(Wit, "Work Item Types", "wits"),
+                await get_entity_stats(WitHierarchy, "WIT Hierarchies", "wits_hierarchies"),
+                await get_entity_stats(WitMapping, "WIT Mappings", "wits_mappings"),
+                await get_entity_stats(WorkItemPrLink, "Work Item PR Links", "work_items_prs_links"),
+                await get_entity_stats(StatusMapping, "Status Mappings", "statuses_mappings"),
+                await get_entity_stats(Workflow, "Workflows", "workflows"),
+                await get_entity_stats(Sprint, "Sprints", "sprints"),
             ]
 
             # GitHub entities
             github_entities = [
-                get_entity_stats(Pr, "Pull Requests", "prs"),
-                get_entity_stats(PrComment, "PR Comments", "prs_comments"),
-                get_entity_stats(PrReview, "PR Reviews", "prs_reviews"),
-                get_entity_stats(PrCommit, "PR Commits", "prs_commits"),
-                get_entity_stats(Repository, "Repositories", "repositories"),
+                await get_entity_stats(Pr, "Pull Requests", "prs"),
+                await get_entity_stats(PrComment, "PR Comments", "prs_comments"),
+                await get_entity_stats(PrReview, "PR Reviews", "prs_reviews"),
+                await get_entity_stats(PrCommit, "PR Commits", "prs_commits"),
+                await get_entity_stats(Repository, "Repositories", "repositories"),
             ]
 
             # Portfolio Management entities (not yet implemented in ETL)
             portfolio_entities = [
-                get_entity_stats(Program, "Programs (Not Implemented)", "programs"),
-                get_entity_stats(Portfolio, "Portfolios (Not Implemented)", "portfolios"),
-                get_entity_stats(Risk, "Risks (Not Implemented)", "risks"),
-                get_entity_stats(Dependency, "Dependencies (Not Implemented)", "dependencies"),
+                await get_entity_stats(Program, "Programs (Not Implemented)", "programs"),
+                await get_entity_stats(Portfolio, "Portfolios (Not Implemented)", "portfolios"),
+                await get_entity_stats(Risk, "Risks (Not Implemented)", "risks"),
+                await get_entity_stats(Dependency, "Dependencies (Not Implemented)", "dependencies"),
             ]
 
             # Create integration groups
@@ -4,12 +4,13 @@ Handles status mappings and workflows
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 
 from app.auth.auth_middleware import require_authentication
 from app.core.database import get_database
 from app.models.unified_models import Status, StatusMapping, Workflow, Integration, User, QdrantVector
+from app.etl.jira.jira_workflow_metrics import run_workflow_metrics_recompute
 
 router = APIRouter()
 
@@ -203,6 +204,7 @@ async def get_workflows(
 @router.post("/status-mappings", response_model=StatusMappingResponse)
 async def create_status_mapping(
     mapping_data: StatusMappingCreateRequest,
+    background_tasks: BackgroundTasks,
     user: User = Depends(require_authentication)
 ):
     """Create a new status mapping"""
@@ -251,6 +253,9 @@ async def create_status_mapping(
                     integration_name = integration.provider
                     integration_logo = integration.logo_filename
 
+            # Refresh workflow metrics once the new mapping is committed
+            background_tasks.add_task(run_workflow_metrics_recompute, user.tenant_id, new_mapping.integration_id)
+
             return StatusMappingResponse(
                 id=new_mapping.id,  # type: ignore
                 status_from=new_mapping.status_from,  # type: ignore
@@ -334,6 +339,7 @@ async def create_workflow(
 async def update_status_mapping(
     mapping_id: int,
     mapping_data: StatusMappingUpdateRequest,
+    background_tasks: BackgroundTasks,
     user: User = Depends(require_authentication)
 ):
     """Update a status mapping"""
@@ -354,6 +360,8 @@ async def update_status_mapping(
                     detail="Status mapping not found"
                 )
 
+            previous_integration_id = mapping.integration_id
+
             # Update fields if provided
             if mapping_data.status_from is not None:
                 mapping.status_from = mapping_data.status_from  # type: ignore
@@ -381,6 +389,11 @@ async def update_status_mapping(
             mapping.last_updated_at = DateTimeHelper.now_default()
             session.commit()
 
+            # Refresh workflow metrics affected by the mapping change (statuses take the mapping's category)
+            background_tasks.add_task(run_workflow_metrics_recompute, user.tenant_id, mapping.integration_id)
+            if previous_integration_id != mapping.integration_id:
+                background_tasks.add_task(run_workflow_metrics_recompute, user.tenant_id, previous_integration_id)
+
             # Get workflow and integration info for response
             workflow = session.query(Workflow).filter(
                 Workflow.id == mapping.workflow_id
@@ -493,6 +506,7 @@ async def update_workflow(
 @router.delete("/status-mappings/{mapping_id}")
 async def delete_status_mapping(
     mapping_id: int,
+    background_tasks: BackgroundTasks,
     user: User = Depends(require_authentication)
 ):
     """Delete a status mapping"""
@@ -511,6 +525,9 @@ async def delete_status_mapping(
                     detail="Status mapping not found"
                 )
 
+            # Refresh workflow metrics after the mapping is removed
+            background_tasks.add_task(run_workflow_metrics_recompute, user.tenant_id, mapping.integration_id)
+
             # Check for dependent statuses
             dependent_statuses = session.query(Status).filter(
                 Status.status_mapping_id == mapping_id,
@@ -585,3 +602,26 @@ async def delete_workflow(
             status_code=500,
             detail=f"Failed to delete workflow: {str(e)}"
         )
+
+
+@router.post("/workflow-metrics/recompute", status_code=202)
+async def recompute_workflow_metrics(
+    background_tasks: BackgroundTasks,
+    integration_id: Optional[int] = Query(None, description="Limit the recompute to one integration"),
+    method: str = Query("sql", pattern="^(sql|columnar)$", description="sql: single UPDATE inside PostgreSQL, columnar: streamed NumPy engine"),
+    user: User = Depends(require_authentication)
+):
+    """
+    Recompute changelog-derived workflow metrics for all work items of the tenant.
+
+    Runs in the background; metrics are rebuilt from stored changelogs without a re-sync,
+    then the DORA lead-time facts are refreshed and cached dashboards invalidated.
+    """
+    background_tasks.add_task(run_workflow_metrics_recompute, user.tenant_id, integration_id, method)
+
+    return {
+        "success": True,
+        "message": "Workflow metrics recompute started",
+        "integration_id": integration_id,
+        "method": method
+    }
@@ -5,7 +5,12 @@ Generic worker infrastructure for ETL pipeline:
 - base_worker.py: Base class for all workers
 - bulk_operations.py: Bulk database operations utility
 - worker_manager.py: Worker lifecycle management
+- run.py: Standalone multi-process worker runtime (python -m app.etl.workers.run)
+- worker_registry.py: Heartbeats from standalone runtimes for the status APIs
 - queue_manager.py: RabbitMQ queue management
+- inflight_tracker.py: Per-job-token counters of unfinished messages (job drain checks)
+- fair_scheduler.py: Weighted fair consumption across tenants sharing a tier queue
+- rate_limit_governor.py: Shared rate budget pacing for GitHub/Jira API clients
 - extraction_worker_router.py: Routes extraction messages to provider workers
 - transform_worker_router.py: Routes transform messages to provider workers
 - embedding_worker_router.py: Routes embedding messages to provider workers
@@ -8,6 +8,7 @@ error handling, message acknowledgment, and shared ETL communication utilities.
 import warnings
 import json
 import asyncio
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Callable
 from contextlib import contextmanager
@@ -19,8 +20,12 @@ warnings.filterwarnings("ignore", message=".*Event loop is closed.*", category=R
 warnings.filterwarnings("ignore", message=".*coroutine.*was never awaited.*", category=RuntimeWarning)
 
 from app.etl.workers.queue_manager import QueueManager
+from app.etl.workers.fair_scheduler import get_fair_scheduler, is_tier_queue, message_priority
+from app.etl.workers.inflight_tracker import get_inflight_tracker
 from app.etl.workers.worker_status_manager import WorkerStatusManager
+from app.core.config import get_settings
 from app.core.database import get_database
+from app.core.metrics import MESSAGE_DURATION, QUEUE_WAIT, queue_labels
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -51,6 +56,11 @@ class BaseWorker(ABC):
         self.status_manager = WorkerStatusManager()  # 🔑 Composition instead of inheritance
         self.running = False
 
+        # Throughput counters (sampled by WorkerAutoscaler)
+        self.messages_processed = 0
+        self.busy_seconds = 0.0
+        self.processing = False  # True while a message is in flight (used when draining)
+
         logger.info(f"Initialized {self.__class__.__name__} for queue: {queue_name}")
     
     @abstractmethod
@@ -74,6 +84,12 @@ class BaseWorker(ABC):
         logger.info(f"🚀 [WORKER-DEBUG] Starting {self.__class__.__name__} consumer for queue: {self.queue_name}")
         self.running = True
 
+        # Fair scheduling: pick across per-tenant sub-queues instead of the shared FIFO
+        scheduler = None
+        if get_settings().ETL_FAIR_SCHEDULING_ENABLED and is_tier_queue(self.queue_name):
+            scheduler = get_fair_scheduler(self.queue_name)
+            scheduler.register_worker()
+
         try:
             # Use polling approach for graceful shutdown
             import time
@@ -86,10 +102,20 @@ class BaseWorker(ABC):
                     #     logger.info(f"🔄 [WORKER-DEBUG] {self.__class__.__name__} still polling queue {self.queue_name} (poll #{poll_count})")
 
                     # Try to get a message with timeout
-                    message = self.queue_manager.get_single_message(self.queue_name, timeout=1.0)
+                    if scheduler:
+                        message = scheduler.next_message()
+                    else:
+                        message = self.queue_manager.get_single_message(self.queue_name, timeout=1.0)
                     if message:
                         logger.info(f"📨 [WORKER-DEBUG] {self.__class__.__name__} received message from {self.queue_name}: {message}")
-                        self._handle_message(message)
+                        try:
+                            # Messages published while handling this one inherit its priority
+                            with message_priority(message.get('priority')):
+                                self._handle_message(message)
+                        finally:
+                            get_inflight_tracker().record_done(message, self.queue_name)
+                            if scheduler:
+                                scheduler.complete(message)
                     else:
                         # No message available, sleep briefly
                         time.sleep(0.1)
@@ -103,6 +129,9 @@ class BaseWorker(ABC):
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__} consumer: {e}")
             raise
+        finally:
+            if scheduler:
+                scheduler.unregister_worker()
 
         logger.info(f"{self.__class__.__name__} consumer stopped")
     
@@ -118,6 +147,13 @@ class BaseWorker(ABC):
         Args:
             message: Message data from queue
         """
+        started_at = time.monotonic()
+        worker_type = self.__class__.__name__
+        tier = queue_labels(self.queue_name)[1]
+        if 'enqueued_at' in message:
+            QUEUE_WAIT.observe(max(time.time() - message['enqueued_at'], 0.0), worker_type, tier)
+        status = 'error'
+        self.processing = True
         try:
             logger.debug(f"Processing message: {message}")
 
@@ -163,6 +199,7 @@ class BaseWorker(ABC):
                         warnings.filterwarnings("ignore", category=RuntimeWarning)
                         loop.close()
 
+            status = 'success' if success else 'failure'
             if success:
                 logger.debug(f"Message processed successfully: {message.get('type', 'unknown')}")
             else:
@@ -173,6 +210,12 @@ class BaseWorker(ABC):
             logger.error(f"Error processing message in {self.__class__.__name__}: {e}")
             logger.error(f"Message data: {message}")
             # Message will be requeued due to auto_ack=False
+        finally:
+            elapsed = time.monotonic() - started_at
+            self.messages_processed += 1
+            self.busy_seconds += elapsed
+            self.processing = False
+            MESSAGE_DURATION.observe(elapsed, worker_type, tier, message.get('type') or 'unknown', status)
     
     @contextmanager
     def get_db_session(self):
@@ -3,13 +3,17 @@ Bulk database operations for transform workers.
 
 Provides optimized bulk insert and update operations using raw SQL
 for maximum performance, based on the old ETL service implementation.
+Rows and durations are exported as pulse_etl_bulk_* metrics per table.
 """
 
 import logging
 import json
+import time
 from typing import List, Dict, Any
 from sqlalchemy import text
 
+from app.core.metrics import BULK_ROWS, BULK_WRITE_DURATION
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,6 +38,7 @@ class BulkOperations:
         """
         if not data_list:
             return
+        started = time.perf_counter()
 
         # Get column names from the first record
         columns = list(data_list[0].keys())
@@ -128,6 +133,8 @@ class BulkOperations:
             if batch_num % 5 == 0 or batch_num == total_batches:
                 logger.info(f"[OK] BULK inserted batch {batch_num}/{total_batches} ({len(batch)} {table_name})")
 
+        BULK_ROWS.inc('insert', table_name, amount=len(data_list))
+        BULK_WRITE_DURATION.observe(time.perf_counter() - started, 'insert', table_name)
         logger.info(f"[COMPLETE] Completed bulk insert of {len(data_list)} {table_name} records")
     
     @staticmethod
@@ -143,6 +150,7 @@ class BulkOperations:
         """
         if not data_list:
             return
+        started = time.perf_counter()
 
         # JSONB columns that need JSON serialization
         jsonb_columns = {'custom_fields_overflow', 'settings', 'metadata', 'raw_data', 'sprints'}
@@ -192,6 +200,8 @@ class BulkOperations:
             if batch_num % 5 == 0 or batch_num == total_batches:
                 logger.info(f"[OK] BULK updated batch {batch_num}/{total_batches} ({len(batch)} {table_name})")
 
+        BULK_ROWS.inc('update', table_name, amount=len(data_list))
+        BULK_WRITE_DURATION.observe(time.perf_counter() - started, 'update', table_name)
         logger.info(f"[COMPLETE] Completed bulk update of {len(data_list)} {table_name} records")
     
     @staticmethod
@@ -207,6 +217,7 @@ class BulkOperations:
         """
         if not relationships:
             return
+        started = time.perf_counter()
         
         # Determine column names based on table
         if table_name == 'projects_wits':
@@ -259,4 +270,6 @@ class BulkOperations:
             if batch_num % 5 == 0 or batch_num == total_batches:
                 logger.info(f"[OK] BULK inserted batch {batch_num}/{total_batches} ({len(batch)} {table_name})")
         
+        BULK_ROWS.inc('insert', table_name, amount=len(relationships))
+        BULK_WRITE_DURATION.observe(time.perf_counter() - started, 'insert', table_name)
         logger.info(f"[COMPLETE] Completed bulk insert of {len(relationships)} {table_name} relationships")
@@ -0,0 +1,344 @@
+"""
+Fair Scheduler - Weighted fair consumption across tenants sharing a tier queue.
+
+With ETL_FAIR_SCHEDULING_ENABLED, messages for tier queues are published to
+per-tenant, per-priority sub-queues instead of the shared FIFO queue:
+
+    transform_queue_premium.t12.high    incremental syncs, manual runs
+    transform_queue_premium.t12.bulk    backfills (no last_sync_date)
+
+Workers no longer read one FIFO. Each FairScheduler (one per tier queue per
+process) picks the next sub-queue with stride scheduling: every dispatch
+advances that sub-queue's pass by 1/weight (high priority weighs
+ETL_FAIR_HIGH_PRIORITY_WEIGHT, bulk weighs 1), and the smallest pass goes
+next. A tenant with a 100k-message backfill therefore gets the same share as
+a tenant with 10 incremental messages, not 100k turns first.
+
+Each tenant may occupy at most ETL_FAIR_MAX_INFLIGHT_SHARE of this process's
+workers for a queue, unless no other tenant has work waiting. The shared tier
+queue is still drained as one more flow, so messages published before the
+switch (or by processes with fairness off) are not stranded.
+
+Priority propagates through the pipeline: a worker handling a message runs
+with that message's priority as the default for everything it publishes.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+from app.etl.workers.message_codec import decode_message
+
+logger = get_logger(__name__)
+
+PRIORITY_HIGH = 'high'
+PRIORITY_BULK = 'bulk'
+PRIORITIES = (PRIORITY_HIGH, PRIORITY_BULK)
+
+_TIER_QUEUE_PATTERN = re.compile(r'^(extraction|transform|embedding)_queue_[a-z]+$')
+
+# Priority of the message being processed by the current worker (inherited by messages it publishes)
+_current_priority: ContextVar[Optional[str]] = ContextVar('etl_message_priority', default=None)
+
+
+# ============ NAMING AND PRIORITY ============
+
+def is_tier_queue(queue_name: str) -> bool:
+    """True for shared tier queues such as 'transform_queue_premium'."""
+    return bool(_TIER_QUEUE_PATTERN.match(queue_name))
+
+
+def tenant_queue_name(base_queue: str, tenant_id: int, priority: str) -> str:
+    """Sub-queue of a tier queue for one tenant and priority."""
+    return f"{base_queue}.t{tenant_id}.{priority}"
+
+
+def tenant_queue_names(base_queue: str, tenant_id: int) -> List[str]:
+    """All sub-queues of a tier queue for one tenant."""
+    return [tenant_queue_name(base_queue, tenant_id, priority) for priority in PRIORITIES]
+
+
+def resolve_priority(message: Dict[str, Any]) -> str:
+    """
+    Priority of a message being published.
+
+    Explicit 'priority' in the message wins, then the priority of the message
+    currently being processed, then incremental (has old_last_sync_date) = high,
+    otherwise bulk.
+    """
+    explicit = message.get('priority')
+    if explicit in PRIORITIES:
+        return explicit
+    inherited = _current_priority.get()
+    if inherited in PRIORITIES:
+        return inherited
+    return PRIORITY_HIGH if message.get('old_last_sync_date') else PRIORITY_BULK
+
+
+@contextmanager
+def message_priority(priority: Optional[str]):
+    """Run a block with a default priority for every message it publishes."""
+    token = _current_priority.set(priority if priority in PRIORITIES else None)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+# ============ METRICS ============
+
+@dataclass
+class TenantWaitStats:
+    """Queue wait times (publish -> dequeue) for one tenant."""
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    recent: deque = field(default_factory=lambda: deque(maxlen=500))
+
+    def record(self, wait_seconds: float):
+        self.count += 1
+        self.total_seconds += wait_seconds
+        self.max_seconds = max(self.max_seconds, wait_seconds)
+        self.recent.append(wait_seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        recent = sorted(self.recent)
+        return {
+            'messages': self.count,
+            'avg_wait_seconds': round(self.total_seconds / self.count, 3) if self.count else 0.0,
+            'p95_wait_seconds': round(recent[min(len(recent) - 1, int(len(recent) * 0.95))], 3) if recent else 0.0,
+            'max_wait_seconds': round(self.max_seconds, 3)
+        }
+
+
+# ============ SCHEDULER ============
+
+class FairScheduler:
+    """
+    Picks the next message for the workers of one tier queue in this process.
+
+    Sub-queue depths are refreshed at most every ETL_FAIR_REFRESH_SECONDS;
+    an empty basic_get on a sub-queue marks it empty until the next refresh.
+    """
+
+    def __init__(self, base_queue: str, queue_manager=None):
+        """
+        Args:
+            base_queue: Shared tier queue (e.g. 'transform_queue_premium')
+            queue_manager: QueueManager for channels and tenant lists (default: new instance)
+        """
+        from app.etl.workers.queue_manager import QueueManager
+
+        settings = get_settings()
+        self.base_queue = base_queue
+        self.tier = base_queue.rsplit('_', 1)[-1]
+        self.queue_manager = queue_manager or QueueManager()
+        self.high_weight = max(1, settings.ETL_FAIR_HIGH_PRIORITY_WEIGHT)
+        self.max_inflight_share = settings.ETL_FAIR_MAX_INFLIGHT_SHARE
+        self.refresh_seconds = settings.ETL_FAIR_REFRESH_SECONDS
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._depths: Dict[str, int] = {}  # sub-queue -> ready messages at last refresh
+        self._flows: Dict[str, Tuple[Optional[int], str]] = {}  # sub-queue -> (tenant_id, priority)
+        self._refreshed_at = 0.0
+        self._pass: Dict[str, float] = {}  # sub-queue -> stride scheduling pass
+        self._inflight: Dict[int, int] = {}  # tenant_id -> messages being processed
+        self._workers = 0
+        self._wait_stats: Dict[int, TenantWaitStats] = {}
+
+    # ============ WORKER REGISTRATION ============
+
+    def register_worker(self):
+        with self._lock:
+            self._workers += 1
+
+    def unregister_worker(self):
+        with self._lock:
+            self._workers = max(0, self._workers - 1)
+
+    @property
+    def inflight_cap(self) -> int:
+        """Max messages one tenant may have in flight in this process."""
+        return max(1, int(self.max_inflight_share * max(1, self._workers)))
+
+    # ============ SELECTION ============
+
+    def _weight(self, priority: str) -> int:
+        return self.high_weight if priority == PRIORITY_HIGH else 1
+
+    def _refresh(self, channel):
+        """Re-read the depth of the shared queue and every tenant sub-queue of this tier."""
+        from app.etl.workers.queue_manager import get_queue_depths
+
+        flows = {self.base_queue: (None, PRIORITY_BULK)}
+        for tenant_id in self.queue_manager.get_tier_tenant_ids(self.tier):
+            for priority in PRIORITIES:
+                flows[tenant_queue_name(self.base_queue, tenant_id, priority)] = (tenant_id, priority)
+
+        # Passive: sub-queues are declared by publishers, not created empty for every tenant
+        depths = get_queue_depths(channel, flows)
+
+        with self._lock:
+            self._flows = flows
+            self._depths = depths
+            self._refreshed_at = time.monotonic()
+
+    def order_candidates(self) -> List[str]:
+        """
+        Sub-queues with waiting messages, best first.
+
+        Tenants below their in-flight cap come before capped ones; within
+        each group the smallest stride pass wins (ties: high priority, then
+        lower tenant id).
+        """
+        with self._lock:
+            active = [queue for queue, depth in self._depths.items() if depth > 0]
+            if not active:
+                return []
+            virtual_time = min(self._pass.get(queue, 0.0) for queue in active)
+            cap = self.inflight_cap
+
+            def sort_key(queue):
+                tenant_id, priority = self._flows[queue]
+                capped = tenant_id is not None and self._inflight.get(tenant_id, 0) >= cap
+                return (
+                    capped,
+                    max(self._pass.get(queue, virtual_time), virtual_time),
+                    priority != PRIORITY_HIGH,
+                    tenant_id if tenant_id is not None else -1
+                )
+
+            return sorted(active, key=sort_key)
+
+    def _dispatched(self, queue_name: str, message: Dict[str, Any]):
+        with self._lock:
+            tenant_id, priority = self._flows.get(queue_name, (None, PRIORITY_BULK))
+            active = [queue for queue, depth in self._depths.items() if depth > 0]
+            virtual_time = min((self._pass.get(queue, 0.0) for queue in active), default=0.0)
+            self._pass[queue_name] = max(self._pass.get(queue_name, virtual_time), virtual_time) + 1.0 / self._weight(priority)
+            self._depths[queue_name] = max(0, self._depths.get(queue_name, 1) - 1)
+
+            message_tenant = message.get('tenant_id')
+            if message_tenant is not None:
+                self._inflight[message_tenant] = self._inflight.get(message_tenant, 0) + 1
+                enqueued_at = message.get('enqueued_at')
+                if enqueued_at:
+                    self._wait_stats.setdefault(message_tenant, TenantWaitStats()).record(max(0.0, time.time() - enqueued_at))
+
+    def next_message(self) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the next message by weighted fair order.
+
+        Returns:
+            Message dict, or None if every sub-queue is empty
+        """
+        try:
+            with self.queue_manager.get_channel() as channel:
+                if time.monotonic() - self._refreshed_at >= self.refresh_seconds and self._refresh_lock.acquire(blocking=False):
+                    try:
+                        self._refresh(channel)
+                    finally:
+                        self._refresh_lock.release()
+
+                for queue_name in self.order_candidates():
+                    method_frame, header_frame, body = channel.basic_get(queue=queue_name, auto_ack=False)
+                    if not method_frame:
+                        with self._lock:
+                            self._depths[queue_name] = 0
+                        continue
+
+                    try:
+                        message = decode_message(body, header_frame)
+                    except Exception as e:
+                        self.queue_manager.reject_undecodable(channel, queue_name, method_frame, header_frame, body, e)
+                        continue
+
+                    channel.basic_ack(delivery_tag=method_frame.delivery_tag)
+                    self._dispatched(queue_name, message)
+                    return message
+
+        except Exception as e:
+            logger.error(f"Error getting fair-scheduled message for {self.base_queue}: {e}")
+        return None
+
+    def complete(self, message: Dict[str, Any]):
+        """Release a tenant's in-flight slot after its message was processed."""
+        tenant_id = message.get('tenant_id')
+        if tenant_id is None:
+            return
+        with self._lock:
+            remaining = self._inflight.get(tenant_id, 0) - 1
+            if remaining > 0:
+                self._inflight[tenant_id] = remaining
+            else:
+                self._inflight.pop(tenant_id, None)
+
+    # ============ STATUS ============
+
+    def get_status(self, tenant_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Scheduler state and wait-time metrics.
+
+        Args:
+            tenant_id: Only include this tenant's per-tenant metrics (others are aggregated)
+        """
+        with self._lock:
+            known_tenants = set(self._wait_stats) | set(self._inflight) | {
+                flow_tenant for flow_tenant, _ in self._flows.values() if flow_tenant is not None
+            }
+            tenants = {
+                tid: {
+                    **self._wait_stats.get(tid, TenantWaitStats()).to_dict(),
+                    'in_flight': self._inflight.get(tid, 0),
+                    'queued': sum(self._depths.get(queue, 0) for queue in tenant_queue_names(self.base_queue, tid))
+                }
+                for tid in sorted(known_tenants)
+                if tenant_id is None or tid == tenant_id
+            }
+            overall = TenantWaitStats()
+            for stats in self._wait_stats.values():
+                for wait in stats.recent:
+                    overall.record(wait)
+
+            return {
+                'queue': self.base_queue,
+                'workers': self._workers,
+                'inflight_cap_per_tenant': self.inflight_cap,
+                'active_tenants': len({self._flows[q][0] for q, d in self._depths.items() if d > 0 and self._flows[q][0] is not None}),
+                'shared_queue_depth': self._depths.get(self.base_queue, 0),
+                'overall': overall.to_dict(),
+                'tenants': tenants
+            }
+
+
+# Global schedulers (one per tier queue in this process)
+_fair_schedulers: Dict[str, FairScheduler] = {}
+_fair_schedulers_lock = threading.Lock()
+
+
+def get_fair_scheduler(base_queue: str) -> FairScheduler:
+    """Get the process-wide scheduler for a tier queue"""
+    with _fair_schedulers_lock:
+        scheduler = _fair_schedulers.get(base_queue)
+        if scheduler is None:
+            scheduler = FairScheduler(base_queue)
+            _fair_schedulers[base_queue] = scheduler
+        return scheduler
+
+
+def get_fair_scheduler_status(tenant_id: Optional[int] = None) -> Dict[str, Any]:
+    """Status of every scheduler in this process (for /workers/status)"""
+    with _fair_schedulers_lock:
+        schedulers = list(_fair_schedulers.values())
+    return {
+        'enabled': get_settings().ETL_FAIR_SCHEDULING_ENABLED,
+        'queues': {scheduler.base_queue: scheduler.get_status(tenant_id) for scheduler in schedulers}
+    }
@@ -0,0 +1,157 @@
+"""
+In-flight Tracker - Per-job-token counters of unfinished ETL messages.
+
+Every message published to a tier queue with a job token increments a Redis
+counter for (token, queue type); the worker that consumes it decrements the
+counter once the message has been processed. "Does this job still have work
+in the transform queue?" is then one hash read instead of peeking through the
+queue with basic_get + nack, which reorders the queue and costs O(depth).
+
+The gate is "messages queued or being processed": counters include messages
+being processed, not only those waiting, so a job is only considered drained
+when its last message has finished.
+
+Counters live in one hash per token and expire ETL_INFLIGHT_TTL_SECONDS after
+the last publish or ack. Each update is one Lua script (increment, clamp at
+zero, stamp the change time, refresh the TTL), so concurrent workers never
+see or leave a negative count. A count lost to a crashed worker or an expired
+message would otherwise block the job until the TTL: a non-zero count that
+has not changed for ETL_INFLIGHT_STALE_SECONDS is reported as untracked, and
+callers fall back to the queue check (QueueManager.check_messages_with_token),
+as they do without Redis.
+"""
+
+import re
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_QUEUE_TYPE_PATTERN = re.compile(r'^(extraction|transform|embedding)_queue_')
+
+# Atomic counter update. KEYS[1] = token hash key
+# ARGV = queue_type, delta, ttl_seconds, now
+# Returns the new count (never below zero: acks of messages published before
+# tracking was enabled would otherwise leave negative counts)
+_CHANGE_SCRIPT = """
+local count = redis.call('HINCRBY', KEYS[1], ARGV[1], ARGV[2])
+if count < 0 then
+  redis.call('HSET', KEYS[1], ARGV[1], 0)
+  count = 0
+end
+redis.call('HSET', KEYS[1], ARGV[1] .. ':changed_at', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return count
+"""
+
+
+def get_queue_type(queue_name: str) -> Optional[str]:
+    """Queue type of a tier queue or one of its sub-queues (None for other queues)."""
+    match = _QUEUE_TYPE_PATTERN.match(queue_name)
+    return match.group(1) if match else None
+
+
+class InflightTracker:
+    """
+    Redis-backed in-flight message counters keyed by job token.
+
+    Key layout: pulse:etl_inflight:{token} -> hash {queue_type: count,
+    "{queue_type}:changed_at": epoch seconds of the last update}
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.ttl_seconds = self.settings.ETL_INFLIGHT_TTL_SECONDS
+        self.stale_seconds = self.settings.ETL_INFLIGHT_STALE_SECONDS
+        self.key_prefix = "pulse:etl_inflight:"
+        self.redis_client = None
+        self._change_script = None
+        self._initialize_redis()
+
+    def _initialize_redis(self):
+        """Initialize Redis connection for in-flight counters"""
+        try:
+            if self.settings.REDIS_URL:
+                import redis
+                self.redis_client = redis.from_url(
+                    self.settings.REDIS_URL,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                    socket_timeout=5
+                )
+                self.redis_client.ping()
+                self._change_script = self.redis_client.register_script(_CHANGE_SCRIPT)
+            else:
+                logger.warning("⚠️ Redis URL not configured, in-flight job tracking disabled")
+        except Exception as e:
+            logger.warning(f"⚠️ Redis not available for in-flight job tracking, falling back to queue peeking: {e}")
+            self.redis_client = None
+            self._change_script = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.redis_client is not None
+
+    def _change(self, message: Dict[str, Any], queue_name: str, delta: int):
+        token = message.get('token')
+        queue_type = get_queue_type(queue_name)
+        if self.redis_client is None or not token or not queue_type:
+            return
+        key = f"{self.key_prefix}{token}"
+        try:
+            self._change_script(keys=[key], args=[queue_type, delta, self.ttl_seconds, time.time()])
+        except Exception as e:
+            logger.warning(f"Failed to update in-flight count for token {token} ({queue_type}): {e}")
+
+    def record_published(self, message: Dict[str, Any], queue_name: str):
+        """Count a message published to queue_name as in flight for its job token."""
+        self._change(message, queue_name, 1)
+
+    def record_done(self, message: Dict[str, Any], queue_name: str):
+        """Release a message once it has been processed (or failed to publish)."""
+        self._change(message, queue_name, -1)
+
+    def get_pending(self, token: str, queue_type: str) -> Optional[int]:
+        """
+        Number of unfinished messages for a job token in one queue type.
+
+        Returns:
+            int count, or None if the token is not tracked (Redis unavailable,
+            job started before tracking, counters expired) or its non-zero
+            count is stale: caller should fall back
+        """
+        if self.redis_client is None:
+            return None
+        try:
+            counts = self.redis_client.hgetall(f"{self.key_prefix}{token}")
+            if not counts:
+                return None
+            count = max(0, int(counts.get(queue_type, 0)))
+            changed_at = float(counts.get(f"{queue_type}:changed_at", 0))
+            if count > 0 and time.time() - changed_at > self.stale_seconds:
+                logger.info(f"In-flight count {count} for token {token} ({queue_type}) unchanged "
+                            f"for over {self.stale_seconds}s, checking the queue instead")
+                return None
+            return count
+        except Exception as e:
+            logger.warning(f"Failed to read in-flight count for token {token} ({queue_type}): {e}")
+            return None
+
+
+# Global in-flight tracker instance
+_inflight_tracker: Optional[InflightTracker] = None
+_inflight_tracker_lock = threading.Lock()
+
+
+def get_inflight_tracker() -> InflightTracker:
+    """Get the global in-flight tracker instance"""
+    global _inflight_tracker
+    if _inflight_tracker is None:
+        with _inflight_tracker_lock:
+            if _inflight_tracker is None:
+                _inflight_tracker = InflightTracker()
+    return _inflight_tracker
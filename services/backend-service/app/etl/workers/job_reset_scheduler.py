@@ -138,7 +138,7 @@ async def reset_check_task(job_id: int, tenant_id: int):
 
             # If status is 'finished', check if there are still messages in queue
             if extraction_status == 'finished':
-                extraction_messages = queue_manager.check_messages_with_token(extraction_queue_name, token)
+                extraction_messages = queue_manager.has_pending_messages(extraction_queue_name, token, tenant_id=tenant_id)
                 if extraction_messages:
                     all_steps_finished = False
                     logger.info(f"   ⏳ Step '{step_name}' extraction has messages in {extraction_queue_name} (status={extraction_status})")
@@ -155,7 +155,7 @@ async def reset_check_task(job_id: int, tenant_id: int):
 
             # If status is 'finished', check if there are still messages in queue
             if transform_status == 'finished':
-                transform_messages = queue_manager.check_messages_with_token(transform_queue_name, token)
+                transform_messages = queue_manager.has_pending_messages(transform_queue_name, token, tenant_id=tenant_id)
                 if transform_messages:
                     all_steps_finished = False
                     logger.info(f"   ⏳ Step '{step_name}' transform has messages in {transform_queue_name} (status={transform_status})")
@@ -172,7 +172,7 @@ async def reset_check_task(job_id: int, tenant_id: int):
 
             # If status is 'finished', check if there are still messages in queue
             if embedding_status == 'finished':
-                embedding_messages = queue_manager.check_messages_with_token(embedding_queue_name, token)
+                embedding_messages = queue_manager.has_pending_messages(embedding_queue_name, token, tenant_id=tenant_id)
                 if embedding_messages:
                     all_steps_finished = False
                     logger.info(f"   ⏳ Step '{step_name}' embedding has messages in {embedding_queue_name} (status={embedding_status})")
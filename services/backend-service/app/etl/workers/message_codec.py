@@ -0,0 +1,227 @@
+"""
+Message Codecs - Serialization of ETL queue messages.
+
+Publishers encode with the codec selected by ETL_MESSAGE_CODEC and label the
+body with the AMQP content_type (plus content_encoding when compressed).
+Consumers decode by those headers, not by their own setting, so messages of
+every codec can share a queue during a rollout: deploy the new consumers
+first (with any codec setting), then switch ETL_MESSAGE_CODEC on publishers.
+Messages without headers are read as JSON.
+
+Codecs:
+- json: stdlib json, content_type application/json (the original format)
+- orjson: also application/json, written by orjson (faster, no whitespace),
+  so any JSON consumer reads it. Requires orjson
+- msgpack: application/x-msgpack. Requires msgpack. Integer dict keys stay
+  integers (JSON turns them into strings)
+
+Bodies of at least ETL_MESSAGE_COMPRESSION_THRESHOLD_BYTES are compressed
+with zstd (content_encoding 'zstd', requires zstandard) when that saves space.
+
+A publisher whose codec or compression package is missing falls back to json
+or no compression with a warning. A consumer that receives a message it
+cannot decode raises MessageCodecError; the message is then rejected without
+requeue (see QueueManager.reject_undecodable). The job token also travels in
+the x-etl-token header, so the in-flight count of a rejected message is
+still released.
+
+See scripts/benchmark_message_codecs.py for bytes and encode/decode time per
+message type.
+"""
+
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pika
+
+from app.core.config import get_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+JSON_CONTENT_TYPE = 'application/json'
+MSGPACK_CONTENT_TYPE = 'application/x-msgpack'
+ZSTD_ENCODING = 'zstd'
+TOKEN_HEADER = 'x-etl-token'  # Job token, readable without decoding the body
+
+
+class MessageCodecError(ValueError):
+    """A message body that cannot be encoded or decoded with the available codecs."""
+
+
+@dataclass(frozen=True)
+class MessageCodec:
+    name: str
+    content_type: str
+    dumps: Callable[[Any], bytes]
+
+
+def _json_dumps(message: Any) -> bytes:
+    return json.dumps(message).encode('utf-8')
+
+
+def _json_loads(body: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN written by json.dumps, which orjson rejects
+    return json.loads(body)
+
+
+def _orjson_dumps(message: Any) -> bytes:
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _msgpack_dumps(message: Any) -> bytes:
+    return msgpack.packb(message, use_bin_type=True)
+
+
+def _msgpack_loads(body: bytes) -> Any:
+    if msgpack is None:
+        raise MessageCodecError("msgpack message received but msgpack is not installed")
+    return msgpack.unpackb(body, raw=False, strict_map_key=False)
+
+
+CODECS: Dict[str, MessageCodec] = {'json': MessageCodec('json', JSON_CONTENT_TYPE, _json_dumps)}
+if orjson is not None:
+    CODECS['orjson'] = MessageCodec('orjson', JSON_CONTENT_TYPE, _orjson_dumps)
+if msgpack is not None:
+    CODECS['msgpack'] = MessageCodec('msgpack', MSGPACK_CONTENT_TYPE, _msgpack_dumps)
+
+# Decoders by content_type (registered regardless of what this process publishes)
+_DECODERS: Dict[str, Callable[[bytes], Any]] = {
+    JSON_CONTENT_TYPE: _json_loads,
+    MSGPACK_CONTENT_TYPE: _msgpack_loads,
+}
+
+_zstd_contexts = threading.local()  # zstandard (de)compressors are not thread-safe
+
+
+def _zstd_compressor(level: int):
+    compressors = getattr(_zstd_contexts, 'compressors', None)
+    if compressors is None:
+        compressors = _zstd_contexts.compressors = {}
+    if level not in compressors:
+        compressors[level] = zstandard.ZstdCompressor(level=level)
+    return compressors[level]
+
+
+def _zstd_decompress(body: bytes) -> bytes:
+    if zstandard is None:
+        raise MessageCodecError("zstd-compressed message received but zstandard is not installed")
+    decompressor = getattr(_zstd_contexts, 'decompressor', None)
+    if decompressor is None:
+        decompressor = _zstd_contexts.decompressor = zstandard.ZstdDecompressor()
+    return decompressor.decompress(body)
+
+
+class MessageEncoder:
+    """Encodes messages with one codec and optional zstd compression of large bodies."""
+
+    def __init__(self, codec: Optional[str] = None, compression_threshold: Optional[int] = None,
+                 zstd_level: Optional[int] = None):
+        """
+        Args:
+            codec: 'json', 'orjson' or 'msgpack' (default: ETL_MESSAGE_CODEC)
+            compression_threshold: Compress bodies of at least this many bytes, 0 = never
+                (default: ETL_MESSAGE_COMPRESSION_THRESHOLD_BYTES)
+            zstd_level: zstd compression level (default: ETL_MESSAGE_ZSTD_LEVEL)
+        """
+        settings = get_settings()
+        codec = codec or settings.ETL_MESSAGE_CODEC
+        if codec not in CODECS:
+            logger.warning(f"Message codec '{codec}' is not available, publishing JSON")
+            codec = 'json'
+        self.codec = CODECS[codec]
+
+        self.compression_threshold = (compression_threshold if compression_threshold is not None
+                                      else settings.ETL_MESSAGE_COMPRESSION_THRESHOLD_BYTES)
+        if self.compression_threshold > 0 and zstandard is None:
+            logger.warning("zstandard is not installed, publishing messages uncompressed")
+            self.compression_threshold = 0
+        self.zstd_level = zstd_level if zstd_level is not None else settings.ETL_MESSAGE_ZSTD_LEVEL
+
+    def encode_body(self, message: Dict[str, Any]) -> Tuple[bytes, str, Optional[str]]:
+        """Body, content_type and content_encoding (None when uncompressed) of a message."""
+        try:
+            body = self.codec.dumps(message)
+        except TypeError as e:
+            raise MessageCodecError(f"Message is not serializable with {self.codec.name}: {e}") from e
+
+        if self.compression_threshold and len(body) >= self.compression_threshold:
+            compressed = _zstd_compressor(self.zstd_level).compress(body)
+            if len(compressed) < len(body):
+                return compressed, self.codec.content_type, ZSTD_ENCODING
+        return body, self.codec.content_type, None
+
+    def encode(self, message: Dict[str, Any]) -> Tuple[bytes, pika.BasicProperties]:
+        """Body and persistent-delivery properties to publish a message with."""
+        body, content_type, content_encoding = self.encode_body(message)
+        token = message.get('token')
+        return body, pika.BasicProperties(
+            delivery_mode=2,  # Make message persistent
+            content_type=content_type,
+            content_encoding=content_encoding,
+            headers={TOKEN_HEADER: token} if token else None
+        )
+
+
+def decode_message(body: bytes, properties: Any = None) -> Dict[str, Any]:
+    """
+    Decode a message body by its AMQP content_type/content_encoding.
+
+    Args:
+        body: Message body
+        properties: pika.BasicProperties of the delivery (header frame); None or unset headers mean JSON
+
+    Returns:
+        Message dict
+
+    Raises:
+        MessageCodecError: Unknown content type or encoding, or a codec that is not installed
+    """
+    content_type = getattr(properties, 'content_type', None) or JSON_CONTENT_TYPE
+    content_encoding = getattr(properties, 'content_encoding', None)
+
+    if content_encoding == ZSTD_ENCODING:
+        body = _zstd_decompress(body)
+    elif content_encoding not in (None, '', 'identity'):
+        raise MessageCodecError(f"Unsupported message content encoding: {content_encoding}")
+
+    loads = _DECODERS.get(content_type.split(';', 1)[0].strip())
+    if loads is None:
+        raise MessageCodecError(f"Unsupported message content type: {content_type}")
+    return loads(body)
+
+
+# Global message encoder instance
+_message_encoder: Optional[MessageEncoder] = None
+_message_encoder_lock = threading.Lock()
+
+
+def get_message_encoder() -> MessageEncoder:
+    """Get the global message encoder instance"""
+    global _message_encoder
+    if _message_encoder is None:
+        with _message_encoder_lock:
+            if _message_encoder is None:
+                _message_encoder = MessageEncoder()
+    return _message_encoder
@@ -4,14 +4,75 @@ Handles RabbitMQ connectivity, queue topology, and message publishing/consuming.
 """
 
 import pika
-import json
 import logging
-from typing import Dict, Any, Optional, Callable
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional, Callable
 from contextlib import contextmanager
 import os
 
+from app.core.metrics import QUEUE_PUBLISH_DURATION, queue_labels
+from app.etl.workers.inflight_tracker import get_inflight_tracker, get_queue_type
+from app.etl.workers.message_codec import TOKEN_HEADER, decode_message, get_message_encoder
+
 logger = logging.getLogger(__name__)
 
+# Arguments every ETL queue is declared with (tier queues and per-tenant sub-queues)
+QUEUE_ARGUMENTS = {'x-message-ttl': 86400000}  # 24 hours TTL
+
+# Tenant tier routing table shared by every QueueManager instance in this process.
+# Loaded for all tenants at once and refreshed after TENANT_TIER_CACHE_TTL_SECONDS.
+_tenant_tiers: Dict[int, str] = {}
+_unknown_tenant_ids: set = set()  # Requested but missing from the table (default tier until the next reload)
+_tenant_tiers_loaded_at: float = 0.0
+_tenant_tiers_lock = threading.Lock()
+
+# Per-tenant sub-queues already declared by this process (see route_message)
+_declared_tenant_queues: set = set()
+
+
+def invalidate_tenant_tiers():
+    """Drop the cached tenant tier routing table so the next publish reloads it."""
+    global _tenant_tiers_loaded_at
+    with _tenant_tiers_lock:
+        _tenant_tiers.clear()
+        _unknown_tenant_ids.clear()
+        _tenant_tiers_loaded_at = 0.0
+    logger.info("Tenant tier routing table invalidated")
+
+
+def get_queue_depths(channel, queue_names: Iterable[str]) -> Dict[str, int]:
+    """
+    Message counts of queues, read with passive declares so no queue is created.
+
+    A queue that does not exist (e.g. a tenant sub-queue nothing was published
+    to yet) counts as empty. The broker closes a channel whose passive declare
+    fails, so the declares run on their own channel of the caller's connection
+    and continue on a fresh one after each missing queue.
+
+    Args:
+        channel: Open channel (only its connection is used)
+        queue_names: Queues to read
+
+    Returns:
+        Dict of queue name -> message count
+    """
+    depths = {}
+    probe = channel.connection.channel()
+    try:
+        for queue_name in queue_names:
+            try:
+                depths[queue_name] = probe.queue_declare(queue=queue_name, passive=True).method.message_count
+            except pika.exceptions.ChannelClosedByBroker as e:
+                if e.reply_code != 404:
+                    raise
+                depths[queue_name] = 0
+                probe = channel.connection.channel()
+    finally:
+        if probe.is_open:
+            probe.close()
+    return depths
+
 
 class QueueManager:
     """
@@ -136,7 +197,7 @@ class QueueManager:
                     channel.queue_declare(
                         queue=queue_name,
                         durable=True,  # Survive broker restart
-                        arguments={'x-message-ttl': 86400000}  # 24 hours TTL
+                        arguments=QUEUE_ARGUMENTS
                     )
                     logger.info(f"Queue declared: {queue_name}")
                     queue_count += 1
@@ -161,7 +222,11 @@ class QueueManager:
 
     def _get_tenant_tier(self, tenant_id: int) -> str:
         """
-        Get tier for a specific tenant.
+        Get tier for a specific tenant from the cached routing table.
+
+        The table holds every tenant's tier and is reloaded with a single query
+        when it expires or when an unknown tenant is requested. A tenant still
+        missing after the reload gets the default tier until the table expires.
 
         Args:
             tenant_id: Tenant ID
@@ -169,22 +234,92 @@ class QueueManager:
         Returns:
             str: Tenant tier ('free', 'basic', 'premium', 'enterprise')
         """
-        try:
-            from app.core.database import get_database
-            from app.models.unified_models import Tenant
+        from app.core.config import get_settings
 
-            database = get_database()
-            with database.get_read_session_context() as session:
-                tenant = session.query(Tenant).filter(Tenant.id == tenant_id).first()
-                if tenant:
-                    return tenant.tier
-                else:
-                    logger.warning(f"Tenant {tenant_id} not found, defaulting to 'premium' tier")
-                    return 'premium'
+        ttl_seconds = get_settings().TENANT_TIER_CACHE_TTL_SECONDS
+        with _tenant_tiers_lock:
+            is_fresh = time.time() - _tenant_tiers_loaded_at < ttl_seconds
+            if is_fresh and tenant_id in _tenant_tiers:
+                return _tenant_tiers[tenant_id]
+            if is_fresh and tenant_id in _unknown_tenant_ids:
+                return 'premium'
+
+        try:
+            tiers = self._reload_tenant_tiers()
         except Exception as e:
             logger.error(f"Failed to get tenant tier for tenant {tenant_id}: {e}")
-            return 'premium'  # Fallback to premium tier
-    
+            with _tenant_tiers_lock:
+                return _tenant_tiers.get(tenant_id, 'premium')  # Stale tier, or fallback to premium
+
+        if tenant_id not in tiers:
+            logger.warning(f"Tenant {tenant_id} not found, defaulting to 'premium' tier")
+            with _tenant_tiers_lock:
+                _unknown_tenant_ids.add(tenant_id)
+            return 'premium'
+        return tiers[tenant_id]
+
+    def get_tier_tenant_ids(self, tier: str) -> List[int]:
+        """
+        Get the IDs of all tenants routed to a tier, from the cached routing table.
+
+        Args:
+            tier: Tenant tier
+
+        Returns:
+            List[int]: Sorted tenant IDs (stale table if the database is unavailable)
+        """
+        from app.core.config import get_settings
+
+        ttl_seconds = get_settings().TENANT_TIER_CACHE_TTL_SECONDS
+        with _tenant_tiers_lock:
+            tiers = dict(_tenant_tiers)
+            is_fresh = time.time() - _tenant_tiers_loaded_at < ttl_seconds
+
+        if not is_fresh:
+            try:
+                tiers = self._reload_tenant_tiers()
+            except Exception as e:
+                logger.error(f"Failed to load tenants for tier {tier}: {e}")
+
+        return sorted(tenant_id for tenant_id, tenant_tier in tiers.items() if tenant_tier == tier)
+
+    def _reload_tenant_tiers(self) -> Dict[int, str]:
+        """Reload the routing table from the database and return it."""
+        global _tenant_tiers_loaded_at
+
+        tiers = self._load_tenant_tiers()
+        with _tenant_tiers_lock:
+            _tenant_tiers.clear()
+            _tenant_tiers.update(tiers)
+            _unknown_tenant_ids.clear()
+            _tenant_tiers_loaded_at = time.time()
+        return tiers
+
+    def _load_tenant_tiers(self) -> Dict[int, str]:
+        """Load the tier of every tenant from the database."""
+        from app.core.database import get_database
+        from app.models.unified_models import Tenant
+
+        database = get_database()
+        with database.get_read_session_context() as session:
+            return {tenant_id: tier for tenant_id, tier in session.query(Tenant.id, Tenant.tier).all()}
+
+    def get_tenant_queue_name(self, tenant_id: int, queue_type: str = 'transform') -> str:
+        """
+        Get the tier-based queue name for a tenant.
+
+        Batch publishers resolve this once and pass it as queue_name to the
+        publish_* methods instead of resolving the tier per message.
+
+        Args:
+            tenant_id: Tenant ID
+            queue_type: Type of queue ('extraction', 'transform', 'embedding')
+
+        Returns:
+            str: Tier-based queue name (e.g., 'embedding_queue_premium')
+        """
+        return self.get_tier_queue_name(self._get_tenant_tier(tenant_id), queue_type)
+
     def publish_transform_job(
         self,
         tenant_id: int,
@@ -201,8 +336,8 @@ class QueueManager:
         last_repo: bool = False,
         last_pr_last_nested: bool = False,  # 🔑 For nested extraction: true ONLY for last nested type of last PR
         token: str = None,  # 🔑 Job execution token
-        rate_limited: bool = False  # 🔑 True if rate limit was hit
-
+        rate_limited: bool = False,  # 🔑 True if rate limit was hit
+        queue_name: Optional[str] = None  # Pre-resolved tier queue (batch publishers)
     ) -> bool:
         """
         Publish a transform job to the tier-based transform queue.
@@ -223,6 +358,7 @@ class QueueManager:
             last_pr_last_nested: For nested extraction only - true ONLY for last nested type of last PR (GitHub only)
             token: Job execution token for tracking messages through pipeline
             rate_limited: True if rate limit was hit (signals RATE_LIMITED status instead of FINISHED)
+            queue_name: Tier queue from get_tenant_queue_name() (default: resolved from tenant tier)
 
         Returns:
             bool: True if published successfully
@@ -248,9 +384,8 @@ class QueueManager:
             'last_pr_last_nested': last_pr_last_nested  # 🔑 For nested extraction completion tracking
         }
 
-        # Get tenant tier and route to tier-based queue
-        tier = self._get_tenant_tier(tenant_id)
-        tier_queue = self.get_tier_queue_name(tier, 'transform')
+        # Route to the tenant's tier-based queue (resolved once per batch when queue_name is given)
+        tier_queue = queue_name or self.get_tenant_queue_name(tenant_id, 'transform')
 
         return self._publish_message(tier_queue, message)
 
@@ -269,7 +404,8 @@ class QueueManager:
         last_job_item: bool = False,
         last_repo: bool = False,
         last_pr_last_nested: bool = False,  # 🔑 For nested extraction: true ONLY for last nested type of last PR
-        token: str = None  # 🔑 Job execution token
+        token: str = None,  # 🔑 Job execution token
+        queue_name: Optional[str] = None  # Pre-resolved tier queue (batch publishers)
     ) -> bool:
         """
         Publish an extraction job to the tier-based extraction queue.
@@ -289,6 +425,7 @@ class QueueManager:
             last_repo: True if this is the last repository (GitHub only)
             last_pr_last_nested: For nested extraction only - true ONLY for last nested type of last PR (GitHub only)
             token: Job execution token for tracking messages through the pipeline
+            queue_name: Tier queue from get_tenant_queue_name() (default: resolved from tenant tier)
 
         Returns:
             bool: True if published successfully
@@ -319,9 +456,8 @@ class QueueManager:
         message['last_item'] = last_item
         message['last_job_item'] = last_job_item
 
-        # Get tenant tier and route to tier-based queue
-        tier = self._get_tenant_tier(tenant_id)
-        tier_queue = self.get_tier_queue_name(tier, 'extraction')
+        # Route to the tenant's tier-based queue (resolved once per batch when queue_name is given)
+        tier_queue = queue_name or self.get_tenant_queue_name(tenant_id, 'extraction')
 
         return self._publish_message(tier_queue, message)
 
@@ -340,7 +476,8 @@ class QueueManager:
         last_job_item: bool = False,
         step_type: str = None,
         token: str = None,  # 🔑 Job execution token
-        rate_limited: bool = False  # 🔑 True if rate limit was hit
+        rate_limited: bool = False,  # 🔑 True if rate limit was hit
+        queue_name: Optional[str] = None  # Pre-resolved tier queue (batch publishers)
     ) -> bool:
         """
         Publish an individual entity embedding job to the tier-based embedding queue.
@@ -360,6 +497,7 @@ class QueueManager:
             step_type: ETL step type for status tracking
             token: Job execution token for tracking messages through pipeline
             rate_limited: True if rate limit was hit (signals RATE_LIMITED status instead of FINISHED)
+            queue_name: Tier queue from get_tenant_queue_name() (default: resolved from tenant tier)
 
         Returns:
             bool: True if published successfully
@@ -383,9 +521,8 @@ class QueueManager:
             'external_id': external_id
         }
 
-        # Get tenant tier and route to tier-based queue
-        tier = self._get_tenant_tier(tenant_id)
-        tier_queue = self.get_tier_queue_name(tier, 'embedding')
+        # Route to the tenant's tier-based queue (resolved once per batch when queue_name is given)
+        tier_queue = queue_name or self.get_tenant_queue_name(tenant_id, 'embedding')
 
         return self._publish_message(tier_queue, message)
 
@@ -411,8 +548,7 @@ class QueueManager:
         }
 
         # Get the appropriate tier queue for this tenant
-        tier = self._get_tenant_tier(tenant_id)
-        tier_queue = self.get_tier_queue_name(tier, 'embedding')
+        tier_queue = self.get_tenant_queue_name(tenant_id, 'embedding')
 
         return self._publish_message(tier_queue, message)
 
@@ -440,23 +576,86 @@ class QueueManager:
         Returns:
             bool: True if published successfully
         """
+        routing_key = None
+        started = time.perf_counter()
         try:
             with self.get_channel() as channel:
-                channel.basic_publish(
-                    exchange='',
-                    routing_key=queue_name,
-                    body=json.dumps(message),
-                    properties=pika.BasicProperties(
-                        delivery_mode=2,  # Make message persistent
-                        content_type='application/json'
-                    )
-                )
+                routing_key = self.route_message(channel, queue_name, message)
+                self._basic_publish(channel, routing_key, message)
+            QUEUE_PUBLISH_DURATION.observe(time.perf_counter() - started, *queue_labels(queue_name), 'ok')
             logger.info(f"Message published to {queue_name}: {message}")
             return True
         except Exception as e:
+            QUEUE_PUBLISH_DURATION.observe(time.perf_counter() - started, *queue_labels(queue_name), 'error')
             logger.error(f"Failed to publish message to {queue_name}: {e}")
+            if routing_key is not None:
+                get_inflight_tracker().record_done(message, queue_name)  # Counted by route_message but never sent
             return False
 
+    def publish_on_channel(self, channel, queue_name: str, message: Dict[str, Any]) -> str:
+        """
+        Route, encode and publish a message on a channel the caller already holds (batch publishers).
+
+        Args:
+            channel: Open channel from get_channel()
+            queue_name: Target queue (e.g. 'transform_queue_premium')
+            message: Message dictionary (updated in place by route_message)
+
+        Returns:
+            str: Routing key the message was published with
+        """
+        routing_key = self.route_message(channel, queue_name, message)
+        try:
+            self._basic_publish(channel, routing_key, message)
+        except Exception:
+            get_inflight_tracker().record_done(message, queue_name)  # Counted by route_message but never sent
+            raise
+        return routing_key
+
+    def _basic_publish(self, channel, routing_key: str, message: Dict[str, Any]):
+        """Publish an already routed message, encoded with the configured codec (see message_codec.py)."""
+        body, properties = get_message_encoder().encode(message)
+        channel.basic_publish(exchange='', routing_key=routing_key, body=body, properties=properties)
+
+    def route_message(self, channel, queue_name: str, message: Dict[str, Any]) -> str:
+        """
+        Get the routing key for a message about to be published on a channel.
+
+        Stamps 'enqueued_at' (for queue wait metrics) and, for tenant messages
+        on tier queues, 'priority'. With ETL_FAIR_SCHEDULING_ENABLED such
+        messages go to the tenant's priority sub-queue (declared on first use)
+        instead of the shared tier queue, see fair_scheduler.py. Messages with
+        a job token are counted as in flight for that token (inflight_tracker.py).
+
+        Batch publishers holding a channel should use publish_on_channel,
+        which routes, encodes and publishes in that order.
+
+        Args:
+            channel: Channel the message will be published on
+            queue_name: Target queue (e.g. 'transform_queue_premium')
+            message: Message dictionary (updated in place)
+
+        Returns:
+            str: Routing key to publish with
+        """
+        from app.core.config import get_settings
+        from app.etl.workers.fair_scheduler import is_tier_queue, resolve_priority, tenant_queue_name
+
+        message['enqueued_at'] = time.time()
+        routing_key = queue_name
+        tenant_id = message.get('tenant_id')
+        if tenant_id is not None and is_tier_queue(queue_name):
+            message['priority'] = resolve_priority(message)
+            if get_settings().ETL_FAIR_SCHEDULING_ENABLED:
+                routing_key = tenant_queue_name(queue_name, tenant_id, message['priority'])
+                if routing_key not in _declared_tenant_queues:
+                    channel.queue_declare(queue=routing_key, durable=True, arguments=QUEUE_ARGUMENTS)
+                    _declared_tenant_queues.add(routing_key)
+
+        # Counted last, so a failed declare leaves nothing to release
+        get_inflight_tracker().record_published(message, queue_name)
+        return routing_key
+
     def get_single_message(self, queue_name: str, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
         """
         Get a single message from the queue with timeout.
@@ -474,14 +673,12 @@ class QueueManager:
 
                 if method_frame:
                     try:
-                        message = json.loads(body)
+                        message = decode_message(body, header_frame)
                         # Acknowledge the message
                         channel.basic_ack(delivery_tag=method_frame.delivery_tag)
                         return message
                     except Exception as e:
-                        logger.error(f"Error parsing message: {e}")
-                        # Reject and requeue the message
-                        channel.basic_nack(delivery_tag=method_frame.delivery_tag, requeue=True)
+                        self.reject_undecodable(channel, queue_name, method_frame, header_frame, body, e)
                         return None
                 else:
                     return None
@@ -490,12 +687,44 @@ class QueueManager:
             logger.error(f"Error getting message from {queue_name}: {e}")
             return None
 
-    def get_queue_stats(self, queue_name: str) -> Optional[Dict[str, int]]:
+    def reject_undecodable(self, channel, queue_name: str, method_frame, header_frame, body: bytes, error: Exception):
+        """
+        Drop a message that cannot be decoded instead of requeueing it.
+
+        A requeued message goes back to the head of the queue and is fetched
+        again right away, so one bad message would block the queue. The
+        payload metadata is logged so it can be traced to its publisher, and
+        the in-flight count is released by the token header, as the body is
+        unreadable.
+
+        Args:
+            channel: Channel the message was fetched on
+            queue_name: Queue the message was fetched from
+            method_frame: Delivery of the message
+            header_frame: Properties of the message (may be None)
+            body: Raw message body
+            error: Decode error
+        """
+        headers = getattr(header_frame, 'headers', None) or {}
+        token = headers.get(TOKEN_HEADER)
+        logger.error(
+            f"Rejecting undecodable message from {queue_name} (delivery_tag={method_frame.delivery_tag}, "
+            f"content_type={getattr(header_frame, 'content_type', None)}, "
+            f"content_encoding={getattr(header_frame, 'content_encoding', None)}, "
+            f"bytes={len(body or b'')}, token={token}): {error}"
+        )
+        channel.basic_nack(delivery_tag=method_frame.delivery_tag, requeue=False)
+        if token:
+            get_inflight_tracker().record_done({'token': token}, queue_name)
+
+    def get_queue_stats(self, queue_name: str, include_tenant_queues: bool = False) -> Optional[Dict[str, int]]:
         """
         Get statistics for a queue.
 
         Args:
             queue_name: Name of the queue
+            include_tenant_queues: Also count messages waiting in the per-tenant
+                sub-queues of a tier queue (fair scheduling)
 
         Returns:
             Dict with message_count and consumer_count, or None if error
@@ -503,15 +732,59 @@ class QueueManager:
         try:
             with self.get_channel() as channel:
                 method = channel.queue_declare(queue=queue_name, passive=True)
-                return {
+                stats = {
                     'message_count': method.method.message_count,
                     'consumer_count': method.method.consumer_count
                 }
+                if include_tenant_queues:
+                    sub_queues = self._get_tenant_sub_queues(queue_name)
+                    stats['message_count'] += sum(get_queue_depths(channel, sub_queues).values())
+                return stats
         except Exception as e:
             logger.error(f"Failed to get queue stats for {queue_name}: {e}")
             return None
 
-    def check_messages_with_token(self, queue_name: str, token: str, max_peek: int = 100) -> bool:
+    def _get_tenant_sub_queues(self, queue_name: str, tenant_id: Optional[int] = None) -> List[str]:
+        """Per-tenant sub-queues of a tier queue (empty unless fair scheduling is enabled)."""
+        from app.core.config import get_settings
+        from app.etl.workers.fair_scheduler import is_tier_queue, tenant_queue_names
+
+        if not get_settings().ETL_FAIR_SCHEDULING_ENABLED or not is_tier_queue(queue_name):
+            return []
+        tenant_ids = [tenant_id] if tenant_id is not None else self.get_tier_tenant_ids(queue_name.rsplit('_', 1)[-1])
+        return [sub_queue for tid in tenant_ids for sub_queue in tenant_queue_names(queue_name, tid)]
+
+    def has_pending_messages(self, queue_name: str, token: str, tenant_id: Optional[int] = None) -> bool:
+        """
+        Check if a job still has unfinished messages in a tier queue.
+
+        Reads the job token's in-flight counter (queued + being processed) in
+        constant time. Falls back to peeking through the queue with
+        check_messages_with_token when the token is not tracked or its count
+        has not changed for ETL_INFLIGHT_STALE_SECONDS (a lost ack).
+
+        Args:
+            queue_name: Tier queue (e.g. 'embedding_queue_premium')
+            token: Job execution token
+            tenant_id: Tenant of the job (to peek its sub-queues in the fallback)
+
+        Returns:
+            bool: True if messages for the token are queued or being processed
+        """
+        queue_type = get_queue_type(queue_name)
+        pending = get_inflight_tracker().get_pending(token, queue_type) if queue_type else None
+        if pending is not None:
+            logger.info(f"{pending} in-flight messages for token {token} in {queue_name}")
+            return pending > 0
+        return self.check_messages_with_token(queue_name, token, tenant_id=tenant_id)
+
+    def check_messages_with_token(
+        self,
+        queue_name: str,
+        token: str,
+        max_peek: int = 100,
+        tenant_id: Optional[int] = None
+    ) -> bool:
         """
         Check if there are any messages in the queue with the given token.
 
@@ -521,10 +794,17 @@ class QueueManager:
             queue_name: Name of the queue to check
             token: Token to search for in messages
             max_peek: Maximum number of messages to peek at (default: 100)
+            tenant_id: Also check this tenant's sub-queues of a tier queue (fair scheduling)
 
         Returns:
             bool: True if any message with the token is found, False otherwise
         """
+        if tenant_id is not None:
+            return any(
+                self.check_messages_with_token(name, token, max_peek)
+                for name in [queue_name] + self._get_tenant_sub_queues(queue_name, tenant_id)
+            )
+
         try:
             with self.get_channel() as channel:
                 peeked_count = 0
@@ -539,7 +819,7 @@ class QueueManager:
                         return False
 
                     try:
-                        message = json.loads(body)
+                        message = decode_message(body, header_frame)
                         message_token = message.get('token')
 
                         # Immediately requeue the message (put it back)
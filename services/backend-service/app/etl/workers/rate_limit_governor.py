@@ -0,0 +1,321 @@
+"""
+Rate Limit Governor - Shared rate budget pacing for external API clients.
+
+Tracks the quota reported by provider APIs (GitHub GraphQL/REST, Jira) per
+credential and paces outgoing requests so extraction slows down smoothly as
+the budget runs low instead of hitting the hard limit and failing the job.
+
+Budgets are keyed per GitHub token and per Jira site:
+- github:<token hash>           GraphQL points
+- github:<token hash>:core      REST core requests
+- github:<token hash>:search    REST search requests
+- jira:<site host>              Jira Cloud request budget
+
+State is kept in-process (shared by all worker threads) or in Redis when
+RATE_LIMIT_USE_REDIS is enabled, so multiple worker processes share one budget.
+"""
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+# Atomic reservation of a request slot in Redis. Mirrors RateLimitGovernor._reserve_local.
+# KEYS[1] = budget hash key
+# ARGV = now, cost, reserve_fraction, pacing_threshold
+# Returns the delay in milliseconds before the caller may send its request.
+_RESERVE_SCRIPT = """
+local data = redis.call('HMGET', KEYS[1], 'remaining', 'limit', 'reset_at', 'next_allowed_at')
+if not data[1] or not data[3] then
+  return 0
+end
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local remaining = tonumber(data[1])
+local limit = tonumber(data[2]) or remaining
+local reset_at = tonumber(data[3])
+local next_allowed_at = tonumber(data[4]) or now
+if reset_at <= now then
+  redis.call('DEL', KEYS[1])
+  return 0
+end
+local usable = remaining - math.floor(limit * tonumber(ARGV[3]))
+if usable < cost then
+  local reset_slot = math.max(reset_at, next_allowed_at)
+  redis.call('HSET', KEYS[1], 'next_allowed_at', reset_slot)
+  return math.floor((reset_slot - now) * 1000)
+end
+local slot = now
+local interval = 0
+if remaining < limit * tonumber(ARGV[4]) then
+  interval = (reset_at - now) * cost / usable
+  slot = math.max(now, next_allowed_at)
+end
+redis.call('HSET', KEYS[1], 'remaining', remaining - cost, 'next_allowed_at', slot + interval)
+return math.floor((slot - now) * 1000)
+"""
+
+
+@dataclass
+class RateBudget:
+    """Last known quota for a single rate limit key."""
+    remaining: int
+    limit: int
+    reset_at: float  # epoch seconds
+    next_allowed_at: float = 0.0
+
+
+class RateLimitGovernor:
+    """
+    Paces API requests from the quota reported in provider responses.
+
+    Clients call acquire() before each request and record() after it. While
+    the remaining budget is above RATE_LIMIT_PACING_THRESHOLD of the limit,
+    acquire() returns immediately. Below it, requests are spread evenly over
+    the time left until the reset. When the budget (minus a small reserve) is
+    exhausted, callers wait for the reset as long as the wait is shorter than
+    RATE_LIMIT_MAX_WAIT_SECONDS; longer waits are left to the existing
+    rate limit handling (checkpoint + RATE_LIMITED job status).
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.max_wait_seconds = self.settings.RATE_LIMIT_MAX_WAIT_SECONDS
+        self.reserve_fraction = self.settings.RATE_LIMIT_RESERVE_FRACTION
+        self.pacing_threshold = self.settings.RATE_LIMIT_PACING_THRESHOLD
+        self.key_prefix = "pulse:ratelimit:"
+
+        self._budgets: Dict[str, RateBudget] = {}
+        self._lock = threading.Lock()
+        self.redis_client = None
+        self._reserve_script = None
+
+        if self.settings.RATE_LIMIT_USE_REDIS:
+            self._initialize_redis()
+
+    def _initialize_redis(self):
+        """Initialize Redis connection for cross-process budgets"""
+        try:
+            if self.settings.REDIS_URL:
+                import redis
+                self.redis_client = redis.from_url(
+                    self.settings.REDIS_URL,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                    socket_timeout=5
+                )
+                self.redis_client.ping()
+                self._reserve_script = self.redis_client.register_script(_RESERVE_SCRIPT)
+                logger.info(f"✅ Rate limit governor using Redis: {self.settings.REDIS_URL}")
+            else:
+                logger.warning("⚠️ Redis URL not configured, rate limit governor is process-local")
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize Redis for rate limit governor, using process-local budgets: {e}")
+            self.redis_client = None
+            self._reserve_script = None
+
+    # ============ KEY HELPERS ============
+
+    @staticmethod
+    def github_key(token: str, resource: Optional[str] = None) -> str:
+        """Build the budget key for a GitHub token (never stores the token itself)."""
+        token_hash = hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+        return f"github:{token_hash}:{resource}" if resource else f"github:{token_hash}"
+
+    @staticmethod
+    def jira_key(base_url: str) -> str:
+        """Build the budget key for a Jira site."""
+        host = urlparse(base_url).netloc or base_url
+        return f"jira:{host.lower()}"
+
+    # ============ PACING ============
+
+    def acquire(self, key: str, cost: int = 1) -> float:
+        """
+        Wait until a request costing `cost` units may be sent for `key`.
+
+        Args:
+            key: Rate limit key (see github_key / jira_key)
+            cost: Expected cost of the request (GraphQL points or 1 for REST)
+
+        Returns:
+            float: Seconds waited (0.0 if the request was not delayed)
+        """
+        try:
+            if self.redis_client is not None:
+                delay = self._reserve_redis(key, cost)
+            else:
+                delay = self._reserve_local(key, cost)
+        except Exception as e:
+            logger.debug(f"Rate limit reservation failed for {key} (not pacing): {e}")
+            return 0.0
+
+        if delay <= 0:
+            return 0.0
+
+        if delay > self.max_wait_seconds:
+            logger.warning(
+                f"⏸️ Rate budget for {key} exhausted; reset in {delay:.0f}s exceeds max wait "
+                f"{self.max_wait_seconds}s - not pacing"
+            )
+            return 0.0
+
+        if delay >= 5:
+            logger.info(f"⏳ Pacing {key}: waiting {delay:.1f}s for rate budget")
+        time.sleep(delay)
+        return delay
+
+    def _reserve_local(self, key: str, cost: int) -> float:
+        """Reserve a request slot in the process-local budget."""
+        now = time.time()
+        with self._lock:
+            budget = self._budgets.get(key)
+            if budget is None:
+                return 0.0
+
+            if budget.reset_at <= now:
+                # Window rolled over - wait for the next response to tell us the new budget
+                del self._budgets[key]
+                return 0.0
+
+            usable = budget.remaining - int(budget.limit * self.reserve_fraction)
+
+            if usable < cost:
+                # Exhausted - everyone waits for the window to reset
+                budget.next_allowed_at = max(budget.reset_at, budget.next_allowed_at)
+                return budget.next_allowed_at - now
+
+            slot = now
+            interval = 0.0
+            if budget.remaining < budget.limit * self.pacing_threshold:
+                # Running low - spread the remaining budget evenly until the reset
+                interval = (budget.reset_at - now) * cost / usable
+                slot = max(now, budget.next_allowed_at)
+
+            budget.next_allowed_at = slot + interval
+            budget.remaining -= cost
+            return slot - now
+
+    def _reserve_redis(self, key: str, cost: int) -> float:
+        """Reserve a request slot in the shared Redis budget."""
+        delay_ms = self._reserve_script(
+            keys=[f"{self.key_prefix}{key}"],
+            args=[time.time(), cost, self.reserve_fraction, self.pacing_threshold]
+        )
+        return int(delay_ms) / 1000.0
+
+    # ============ RECORDING ============
+
+    def record(self, key: str, remaining: Optional[int], limit: Optional[int], reset_at: Optional[float]):
+        """
+        Record the quota reported by a provider response.
+
+        Args:
+            key: Rate limit key
+            remaining: Remaining requests/points in the current window
+            limit: Total requests/points per window (defaults to remaining if unknown)
+            reset_at: Epoch seconds when the window resets
+        """
+        if remaining is None or reset_at is None:
+            return
+
+        remaining = int(remaining)
+        limit = int(limit) if limit else remaining
+
+        try:
+            if self.redis_client is not None:
+                redis_key = f"{self.key_prefix}{key}"
+                self.redis_client.hset(redis_key, mapping={
+                    'remaining': remaining,
+                    'limit': limit,
+                    'reset_at': reset_at
+                })
+                self.redis_client.expireat(redis_key, int(reset_at) + 60)
+            else:
+                with self._lock:
+                    budget = self._budgets.get(key)
+                    next_allowed_at = budget.next_allowed_at if budget else 0.0
+                    self._budgets[key] = RateBudget(
+                        remaining=remaining,
+                        limit=limit,
+                        reset_at=float(reset_at),
+                        next_allowed_at=next_allowed_at
+                    )
+        except Exception as e:
+            logger.debug(f"Failed to record rate budget for {key}: {e}")
+
+    def record_exhausted(self, key: str, retry_after_seconds: float):
+        """Record that the provider rejected a request and asked us to back off."""
+        self.record(key, remaining=0, limit=None, reset_at=time.time() + retry_after_seconds)
+
+    def get_budget(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the last known budget for a key.
+
+        Returns:
+            Dict with remaining, limit and reset_at (ISO), or None if unknown
+        """
+        try:
+            if self.redis_client is not None:
+                data = self.redis_client.hgetall(f"{self.key_prefix}{key}")
+                if not data:
+                    return None
+                remaining, limit, reset_at = int(float(data['remaining'])), int(data['limit']), float(data['reset_at'])
+            else:
+                with self._lock:
+                    budget = self._budgets.get(key)
+                    if budget is None:
+                        return None
+                    remaining, limit, reset_at = budget.remaining, budget.limit, budget.reset_at
+
+            return {
+                'remaining': remaining,
+                'limit': limit,
+                'reset_at': datetime.utcfromtimestamp(reset_at).isoformat() + 'Z'
+            }
+        except Exception as e:
+            logger.debug(f"Failed to read rate budget for {key}: {e}")
+            return None
+
+
+def parse_reset_timestamp(value: Any) -> Optional[float]:
+    """
+    Parse a provider reset value into epoch seconds.
+
+    Accepts epoch seconds (GitHub REST X-RateLimit-Reset) or ISO-8601 strings
+    (GitHub GraphQL resetAt, Jira X-RateLimit-Reset).
+    """
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+# Global governor instance
+_rate_limit_governor: Optional[RateLimitGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_rate_limit_governor() -> RateLimitGovernor:
+    """Get the global rate limit governor instance"""
+    global _rate_limit_governor
+    if _rate_limit_governor is None:
+        with _governor_lock:
+            if _rate_limit_governor is None:
+                _rate_limit_governor = RateLimitGovernor()
+    return _rate_limit_governor
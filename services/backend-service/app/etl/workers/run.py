@@ -0,0 +1,271 @@
+"""
+Standalone ETL worker runtime.
+
+Runs extraction, transform and embedding workers as separate OS processes
+instead of daemon threads inside the FastAPI process, so CPU-bound transform
+and embedding work no longer competes with API requests for the GIL.
+
+Usage (from services/backend-service):
+    python -m app.etl.workers.run                      # counts from system_settings
+    python -m app.etl.workers.run --transform 8 --embedding 2
+    python -m app.etl.workers.run --queue-types transform,embedding
+
+Run the API with ETL_IN_PROCESS_WORKERS=false so it starts no workers of its own.
+
+Shutdown: SIGTERM/SIGINT stops every worker from taking new messages, lets
+in-flight messages finish for up to --drain-timeout seconds, then kills what
+is left. Worker processes that die unexpectedly are restarted.
+
+Status: the supervisor publishes a heartbeat with every process's state to
+Redis (see worker_registry.py), which /workers/status and /queues/status read.
+
+Metrics: with ETL_WORKER_METRICS_PORT set, each worker process serves its own
+Prometheus /metrics (app/core/metrics.py) on that port plus its slot number
+(0 for the first configured worker), so scrape the whole port range. The
+servers bind ETL_WORKER_METRICS_HOST (127.0.0.1 by default) and require
+METRICS_BEARER_TOKEN when it is set, like the API's /metrics.
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+QUEUE_TYPES = ['extraction', 'transform', 'embedding']
+
+
+def _run_worker_process(queue_type: str, tier: str, worker_number: int, metrics_port: int = 0):
+    """
+    Entry point of one worker process.
+
+    SIGTERM/SIGINT only stop the consume loop; the message being processed
+    finishes before start_consuming() returns.
+    """
+    setup_logging()
+    from app.etl.workers.worker_manager import WorkerManager
+
+    if metrics_port:
+        from app.core.metrics import serve_metrics
+        serve_metrics(metrics_port)
+
+    worker = WorkerManager.create_worker(queue_type, tier, worker_number)
+
+    def _stop(signum, frame):
+        logger.info(f"🛑 {queue_type} worker {worker_number} (pid {os.getpid()}) draining after signal {signum}")
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    logger.info(f"🏃 {queue_type} worker {worker_number} started (pid {os.getpid()}, queue: {worker.queue_name})")
+    worker.start_consuming()
+    logger.info(f"✅ {queue_type} worker {worker_number} stopped (pid {os.getpid()})")
+
+
+class WorkerProcessSupervisor:
+    """
+    Starts, monitors and drains worker processes for one tier.
+
+    One process is started per worker (spawned, not forked, so no database or
+    RabbitMQ connections are inherited). Dead processes are restarted while
+    the supervisor is running.
+    """
+
+    def __init__(self, tier: str, worker_counts: Dict[str, int], drain_timeout: float, heartbeat_interval: float = 5.0):
+        """
+        Args:
+            tier: Tier whose queues the workers consume from
+            worker_counts: Number of processes per queue type
+            drain_timeout: Seconds to wait for in-flight messages on shutdown
+            heartbeat_interval: Seconds between health checks and heartbeats
+        """
+        self.tier = tier
+        self.worker_counts = worker_counts
+        self.drain_timeout = drain_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.runtime_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.started_at = time.time()
+        self.stopping = False
+
+        self._context = multiprocessing.get_context('spawn')
+        self.processes: Dict[str, multiprocessing.Process] = {}  # worker_key -> process
+        self.restarts: Dict[str, int] = {}  # worker_key -> restart count
+        self._registry = None
+
+    @property
+    def registry(self):
+        if self._registry is None:
+            from app.etl.workers.worker_registry import get_worker_registry
+            self._registry = get_worker_registry()
+        return self._registry
+
+    def _worker_keys(self) -> List[tuple]:
+        return [
+            (f"{queue_type}_{self.tier}_worker_{worker_number}", queue_type, worker_number)
+            for queue_type in QUEUE_TYPES
+            for worker_number in range(self.worker_counts.get(queue_type, 0))
+        ]
+
+    def _metrics_port(self, worker_key: str) -> int:
+        """Port of a worker process's /metrics (0 when ETL_WORKER_METRICS_PORT is off)."""
+        base_port = get_settings().ETL_WORKER_METRICS_PORT
+        if base_port <= 0:
+            return 0
+        return base_port + [key for key, _, _ in self._worker_keys()].index(worker_key)
+
+    def _start_process(self, worker_key: str, queue_type: str, worker_number: int):
+        process = self._context.Process(
+            target=_run_worker_process,
+            args=(queue_type, self.tier, worker_number, self._metrics_port(worker_key)),
+            name=f"Worker-{worker_key}",
+            daemon=False
+        )
+        process.start()
+        self.processes[worker_key] = process
+
+    def start(self):
+        """Set up queues and start one process per configured worker."""
+        from app.etl.workers.queue_manager import QueueManager
+        QueueManager().setup_queues()
+
+        for worker_key, queue_type, worker_number in self._worker_keys():
+            self._start_process(worker_key, queue_type, worker_number)
+            self.restarts.setdefault(worker_key, 0)
+
+        logger.info(f"✅ Started {len(self.processes)} {self.tier} worker processes: {self.worker_counts}")
+
+    def check_processes(self):
+        """Restart worker processes that exited while the runtime is running."""
+        if self.stopping:
+            return
+        for worker_key, queue_type, worker_number in self._worker_keys():
+            process = self.processes.get(worker_key)
+            if process is not None and not process.is_alive():
+                logger.warning(f"⚠️ Worker {worker_key} (pid {process.pid}) exited with code {process.exitcode}, restarting")
+                self.restarts[worker_key] = self.restarts.get(worker_key, 0) + 1
+                self._start_process(worker_key, queue_type, worker_number)
+
+    def get_status(self) -> Dict:
+        """Runtime status as published to the worker registry."""
+        processes = []
+        for worker_key, queue_type, worker_number in self._worker_keys():
+            process = self.processes.get(worker_key)
+            processes.append({
+                'worker_key': worker_key,
+                'queue_type': queue_type,
+                'worker_number': worker_number,
+                'pid': process.pid if process else None,
+                'alive': bool(process and process.is_alive()),
+                'restarts': self.restarts.get(worker_key, 0)
+            })
+
+        return {
+            'runtime_id': self.runtime_id,
+            'tier': self.tier,
+            'started_at': self.started_at,
+            'last_heartbeat': time.time(),
+            'draining': self.stopping,
+            'processes': processes
+        }
+
+    def request_stop(self, signum=None, frame=None):
+        """Signal handler: stop restarting workers and start draining."""
+        if not self.stopping:
+            logger.info(f"🛑 Received signal {signum}, draining {len(self.processes)} worker processes...")
+        self.stopping = True
+
+    def drain(self):
+        """Send SIGTERM to every worker, wait up to drain_timeout, then kill leftovers."""
+        self.stopping = True
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()  # SIGTERM -> worker.stop(), in-flight message finishes
+
+        deadline = time.time() + self.drain_timeout
+        for worker_key, process in self.processes.items():
+            process.join(timeout=max(0.0, deadline - time.time()))
+            if process.is_alive():
+                logger.warning(f"⚠️ Worker {worker_key} (pid {process.pid}) did not drain in {self.drain_timeout}s, killing")
+                process.kill()
+                process.join(timeout=5.0)
+
+        self.registry.remove(self.runtime_id)
+        logger.info("✅ All worker processes stopped")
+
+    def run(self):
+        """Start workers and supervise them until SIGTERM/SIGINT."""
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+        self.start()
+        try:
+            while not self.stopping:
+                self.check_processes()
+                self.registry.publish_heartbeat(self.runtime_id, self.get_status())
+                time.sleep(self.heartbeat_interval)
+        finally:
+            self.registry.publish_heartbeat(self.runtime_id, self.get_status())
+            self.drain()
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run ETL worker pools as separate processes")
+    parser.add_argument("--tier", default="premium", help="Tier whose queues to consume (default: premium)")
+    parser.add_argument("--queue-types", default=",".join(QUEUE_TYPES),
+                        help="Comma-separated queue types to run (default: extraction,transform,embedding)")
+    for queue_type in QUEUE_TYPES:
+        parser.add_argument(f"--{queue_type}", type=int, default=None,
+                            help=f"Number of {queue_type} processes (default: from system_settings)")
+    parser.add_argument("--drain-timeout", type=float, default=None,
+                        help="Seconds to let in-flight messages finish on shutdown (default: ETL_WORKER_DRAIN_TIMEOUT_SECONDS)")
+    return parser.parse_args(argv)
+
+
+def resolve_worker_counts(args: argparse.Namespace, configured_counts: Dict[str, int]) -> Dict[str, int]:
+    """
+    Combine CLI counts with the configured pool sizes.
+
+    Queue types not listed in --queue-types get zero processes; explicit
+    --extraction/--transform/--embedding values override system_settings.
+    """
+    enabled = {queue_type.strip() for queue_type in args.queue_types.split(",") if queue_type.strip()}
+    unknown = enabled - set(QUEUE_TYPES)
+    if unknown:
+        raise ValueError(f"Invalid queue types: {', '.join(sorted(unknown))}")
+
+    counts = {}
+    for queue_type in QUEUE_TYPES:
+        explicit = getattr(args, queue_type)
+        if queue_type not in enabled:
+            counts[queue_type] = 0
+        elif explicit is not None:
+            counts[queue_type] = max(0, explicit)
+        else:
+            counts[queue_type] = configured_counts.get(queue_type, 0)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    setup_logging()
+    args = _parse_args(argv)
+
+    from app.etl.workers.worker_manager import WorkerManager
+    counts = resolve_worker_counts(args, WorkerManager().get_premium_worker_config())
+
+    drain_timeout = args.drain_timeout if args.drain_timeout is not None else get_settings().ETL_WORKER_DRAIN_TIMEOUT_SECONDS
+    supervisor = WorkerProcessSupervisor(args.tier, counts, drain_timeout)
+    supervisor.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Worker Autoscaler - Queue-depth driven sizing of the in-process worker pools.
+
+Every ETL_AUTOSCALE_INTERVAL_SECONDS the autoscaler samples each tier queue
+(QueueManager.get_queue_stats) and the pool's throughput (messages processed
+per busy second since the last sample), then sizes the pool so the backlog
+drains within ETL_AUTOSCALE_TARGET_DRAIN_SECONDS:
+
+    desired = ceil(backlog / (throughput_per_worker * target_drain_seconds))
+
+bounded by ETL_AUTOSCALE_MIN_WORKERS / ETL_AUTOSCALE_MAX_WORKERS per pool and
+by the database connection budget shared by all pools (the same budget
+/workers/db-capacity reports). Scale-ups apply immediately; scale-downs go one
+worker at a time after ETL_AUTOSCALE_COOLDOWN_SECONDS without a scale-up, and
+stopped workers finish their in-flight message before exiting.
+
+Only the in-process pools are scaled; standalone runtimes (app.etl.workers.run)
+keep their configured process counts.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+QUEUE_TYPES = ['extraction', 'transform', 'embedding']
+
+
+@dataclass
+class ScalingDecision:
+    """One autoscaler decision and the inputs it was based on."""
+    queue_type: str
+    current_workers: int
+    target_workers: int
+    action: str  # 'scale_up', 'scale_down' or 'hold'
+    reason: str
+    message_count: int
+    consumer_count: int
+    busy_workers: int
+    throughput_per_worker: Optional[float]  # messages/second, None before the first full interval
+    min_workers: int
+    max_workers: int
+    capacity_limit: int  # max workers this pool may have given the other pools and DB budget
+    decided_at: float
+
+
+class WorkerAutoscaler:
+    """
+    Periodically resizes extraction, transform and embedding pools.
+
+    decide() is a pure function of its inputs; run_once() samples the queues,
+    decides and applies through WorkerManager.scale_queue_type_workers().
+    """
+
+    def __init__(self, worker_manager, queue_manager=None):
+        """
+        Args:
+            worker_manager: WorkerManager whose in-process pools are scaled
+            queue_manager: QueueManager used for queue depth (default: new instance)
+        """
+        from app.etl.workers.queue_manager import QueueManager
+
+        settings = get_settings()
+        self.worker_manager = worker_manager
+        self.queue_manager = queue_manager or QueueManager()
+        self.interval_seconds = settings.ETL_AUTOSCALE_INTERVAL_SECONDS
+        self.min_workers = settings.ETL_AUTOSCALE_MIN_WORKERS
+        self.max_workers = settings.ETL_AUTOSCALE_MAX_WORKERS
+        self.target_drain_seconds = settings.ETL_AUTOSCALE_TARGET_DRAIN_SECONDS
+        self.cooldown_seconds = settings.ETL_AUTOSCALE_COOLDOWN_SECONDS
+
+        self.decisions: Dict[str, ScalingDecision] = {}
+        self._last_sample: Dict[str, tuple] = {}  # queue_type -> (messages_processed, busy_seconds)
+        self._last_scale_up: Dict[str, float] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ============ DECISION ============
+
+    def decide(
+        self,
+        queue_type: str,
+        current_workers: int,
+        message_count: int,
+        throughput_per_worker: Optional[float],
+        capacity_limit: int,
+        now: float,
+        consumer_count: int = 0,
+        busy_workers: int = 0
+    ) -> ScalingDecision:
+        """
+        Decide the target size of one pool.
+
+        Args:
+            queue_type: Pool being sized
+            current_workers: Workers currently in the pool
+            message_count: Messages ready in the queue
+            throughput_per_worker: Measured messages/second per worker (None if unknown)
+            capacity_limit: Max workers for this pool within the connection budget
+            now: Current time (for cooldown)
+
+        Returns:
+            ScalingDecision with target_workers and the inputs used
+        """
+        upper = max(self.min_workers, min(self.max_workers, capacity_limit))
+
+        if message_count > 0 and throughput_per_worker:
+            desired = math.ceil(message_count / (throughput_per_worker * self.target_drain_seconds))
+            reason = f"{message_count} queued at {throughput_per_worker:.2f} msg/s per worker"
+        elif message_count > 0:
+            # No throughput measured yet (idle pool or first sample): grow one step at a time
+            desired = current_workers + 1
+            reason = f"{message_count} queued, throughput unknown"
+        else:
+            desired = self.min_workers
+            reason = "queue empty"
+
+        desired = max(self.min_workers, min(upper, desired))
+
+        if desired > current_workers:
+            action = 'scale_up'
+            self._last_scale_up[queue_type] = now
+        elif desired < current_workers:
+            if now - self._last_scale_up.get(queue_type, 0.0) < self.cooldown_seconds:
+                desired, action = current_workers, 'hold'
+                reason += " (scale-down cooldown)"
+            else:
+                desired, action = current_workers - 1, 'scale_down'
+        else:
+            action = 'hold'
+
+        if current_workers > upper and action != 'scale_down':
+            # Budget shrank below the current size: give workers back regardless of cooldown
+            desired, action, reason = current_workers - 1, 'scale_down', f"over capacity limit {upper}"
+
+        return ScalingDecision(
+            queue_type=queue_type,
+            current_workers=current_workers,
+            target_workers=desired,
+            action=action,
+            reason=reason,
+            message_count=message_count,
+            consumer_count=consumer_count,
+            busy_workers=busy_workers,
+            throughput_per_worker=throughput_per_worker,
+            min_workers=self.min_workers,
+            max_workers=self.max_workers,
+            capacity_limit=capacity_limit,
+            decided_at=now
+        )
+
+    # ============ SAMPLING ============
+
+    def _measure_throughput(self, queue_type: str) -> Optional[float]:
+        """
+        Messages per second one worker handles while busy, since the previous sample.
+
+        Uses busy time rather than wall time so idle workers do not make the
+        pool look slower than it is.
+        """
+        processed, busy_seconds = self.worker_manager.get_pool_counters(queue_type)
+        previous = self._last_sample.get(queue_type)
+        self._last_sample[queue_type] = (processed, busy_seconds)
+
+        if previous is None:
+            return None
+        delta_messages = processed - previous[0]
+        delta_busy = busy_seconds - previous[1]
+        if delta_messages <= 0 or delta_busy <= 0:
+            return None
+        return delta_messages / delta_busy
+
+    def run_once(self) -> Dict[str, ScalingDecision]:
+        """Sample every queue, decide and apply the new pool sizes."""
+        if not self.worker_manager.running:
+            return self.decisions  # Pools stopped from /workers/action: do not bring them back
+
+        now = time.time()
+        tier = 'premium'
+        pools = self.worker_manager.tier_workers.get(tier, {})
+        sizes = {queue_type: len(pools.get(queue_type, [])) for queue_type in QUEUE_TYPES}
+        max_total = self.worker_manager.get_worker_capacity()['max_recommended_workers']
+
+        for queue_type in QUEUE_TYPES:
+            stats = self.queue_manager.get_queue_stats(
+                self.queue_manager.get_tier_queue_name(tier, queue_type), include_tenant_queues=True
+            )
+            if stats is None:
+                continue  # RabbitMQ unavailable: keep the pool as is
+
+            current = sizes[queue_type]
+            capacity_limit = max_total - sum(size for other, size in sizes.items() if other != queue_type)
+            decision = self.decide(
+                queue_type=queue_type,
+                current_workers=current,
+                message_count=stats['message_count'],
+                throughput_per_worker=self._measure_throughput(queue_type),
+                capacity_limit=capacity_limit,
+                now=now,
+                consumer_count=stats['consumer_count'],
+                busy_workers=self.worker_manager.get_busy_worker_count(queue_type)
+            )
+
+            if decision.target_workers != current:
+                logger.info(f"⚖️ Autoscaler {queue_type}: {current} -> {decision.target_workers} ({decision.reason})")
+                sizes[queue_type] = self.worker_manager.scale_queue_type_workers(queue_type, decision.target_workers)
+            self.decisions[queue_type] = decision
+
+        return self.decisions
+
+    # ============ LIFECYCLE ============
+
+    def start(self):
+        """Start the autoscaling loop in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="WorkerAutoscaler")
+        self._thread.start()
+        logger.info(f"✅ Worker autoscaler started (every {self.interval_seconds}s, {self.min_workers}-{self.max_workers} workers per pool)")
+
+    def stop(self):
+        """Stop the autoscaling loop."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"❌ Worker autoscaler iteration failed: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Autoscaler settings and the latest decision per pool (for /workers/status)."""
+        return {
+            'enabled': bool(self._thread and self._thread.is_alive()),
+            'interval_seconds': self.interval_seconds,
+            'target_drain_seconds': self.target_drain_seconds,
+            'cooldown_seconds': self.cooldown_seconds,
+            'draining_workers': sum(1 for thread in list(self.worker_manager.draining_threads.values()) if thread.is_alive()),
+            'decisions': {queue_type: asdict(decision) for queue_type, decision in self.decisions.items()}
+        }
+
+
+# Global autoscaler instance
+_worker_autoscaler: Optional[WorkerAutoscaler] = None
+_worker_autoscaler_lock = threading.Lock()
+
+
+def get_worker_autoscaler() -> WorkerAutoscaler:
+    """Get the global worker autoscaler instance (bound to the global WorkerManager)"""
+    global _worker_autoscaler
+    if _worker_autoscaler is None:
+        with _worker_autoscaler_lock:
+            if _worker_autoscaler is None:
+                from app.etl.workers.worker_manager import get_worker_manager
+                _worker_autoscaler = WorkerAutoscaler(get_worker_manager())
+    return _worker_autoscaler
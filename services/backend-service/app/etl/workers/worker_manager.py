@@ -49,6 +49,9 @@ class WorkerManager:
         self.tier_workers: Dict[str, Dict[str, List[object]]] = {}  # tier -> {worker_type -> [workers]}
         self.executor = ThreadPoolExecutor(max_workers=100)
         self.running = False
+        self.draining_threads: Dict[str, threading.Thread] = {}  # worker_key -> thread finishing its last message
+        self._retired_counters: Dict[str, tuple] = {}  # queue_type -> (messages, busy_seconds) of removed workers
+        self._scale_lock = threading.Lock()
 
         logger.info("WorkerManager initialized with SHARED WORKER POOL architecture")
 
@@ -324,32 +327,10 @@ class WorkerManager:
             # Initialize worker list for this type
             self.tier_workers[tier][queue_type] = []
 
-            # Start workers based on queue type
-            if queue_type == 'extraction':
-                for worker_num in range(worker_count):
-                    worker = ExtractionWorker(
-                        queue_name=tier_queue,
-                        worker_number=worker_num,
-                        tenant_ids=None
-                    )
-                    worker_key = f"extraction_{tier}_worker_{worker_num}"
-                    self._start_worker_thread(worker_key, worker, tier, queue_type)
-
-            elif queue_type == 'transform':
-                for worker_num in range(worker_count):
-                    worker = TransformWorker(
-                        queue_name=tier_queue,
-                        worker_number=worker_num,
-                        tenant_ids=None
-                    )
-                    worker_key = f"transform_{tier}_worker_{worker_num}"
-                    self._start_worker_thread(worker_key, worker, tier, queue_type)
-
-            elif queue_type == 'embedding':
-                for worker_num in range(worker_count):
-                    worker = EmbeddingWorker(tier=tier)
-                    worker_key = f"embedding_{tier}_worker_{worker_num}"
-                    self._start_worker_thread(worker_key, worker, tier, queue_type)
+            for worker_num in range(worker_count):
+                worker = self.create_worker(queue_type, tier, worker_num)
+                worker_key = f"{queue_type}_{tier}_worker_{worker_num}"
+                self._start_worker_thread(worker_key, worker, tier, queue_type)
 
             logger.info(f"   ✅ Started {worker_count} {tier} {queue_type} workers (queue: {tier_queue})")
             return True
@@ -431,6 +412,122 @@ class WorkerManager:
         self.stop_queue_type_workers(queue_type)
         return self.start_queue_type_workers(queue_type)
 
+    def scale_queue_type_workers(self, queue_type: str, target_count: int) -> int:
+        """
+        Grow or shrink one in-process worker pool without a restart.
+
+        Scale-up starts workers with the next worker numbers. Scale-down stops
+        the highest-numbered workers; each finishes the message it is
+        processing before its thread exits, so no fetched message is lost.
+
+        Args:
+            queue_type: Type of queue ('extraction', 'transform', or 'embedding')
+            target_count: Desired number of workers (>= 0)
+
+        Returns:
+            int: Number of workers in the pool after scaling
+        """
+        tier = 'premium'
+        with self._scale_lock:
+            pool = self.tier_workers.setdefault(tier, {}).setdefault(queue_type, [])
+            current_count = len(pool)
+            target_count = max(0, target_count)
+
+            for worker_num in range(current_count, target_count):
+                worker = self.create_worker(queue_type, tier, worker_num)
+                self._start_worker_thread(f"{queue_type}_{tier}_worker_{worker_num}", worker, tier, queue_type)
+
+            for worker_num in range(current_count - 1, target_count - 1, -1):
+                worker_key = f"{queue_type}_{tier}_worker_{worker_num}"
+                worker = pool.pop()
+                worker.stop()  # Non-blocking: the thread exits after its in-flight message
+                retired_processed, retired_busy = self._retired_counters.get(queue_type, (0, 0.0))
+                self._retired_counters[queue_type] = (
+                    retired_processed + getattr(worker, 'messages_processed', 0),
+                    retired_busy + getattr(worker, 'busy_seconds', 0.0)
+                )
+                self.workers.pop(worker_key, None)
+                thread = self.worker_threads.pop(worker_key, None)
+                if thread and thread.is_alive():
+                    self.draining_threads[f"{worker_key}#{id(worker)}"] = thread
+
+            # Forget drained threads
+            for key, thread in list(self.draining_threads.items()):
+                if not thread.is_alive():
+                    self.draining_threads.pop(key, None)
+
+            if target_count != current_count:
+                logger.info(f"⚖️ Scaled {tier} {queue_type} workers: {current_count} -> {target_count}")
+            return len(pool)
+
+    def get_pool_counters(self, queue_type: str) -> tuple:
+        """
+        Throughput counters of one pool, including workers removed by scale-down.
+
+        Returns:
+            tuple: (messages_processed, busy_seconds)
+        """
+        workers = self.tier_workers.get('premium', {}).get(queue_type, [])
+        retired_processed, retired_busy = self._retired_counters.get(queue_type, (0, 0.0))
+        return (
+            retired_processed + sum(getattr(w, 'messages_processed', 0) for w in workers),
+            retired_busy + sum(getattr(w, 'busy_seconds', 0.0) for w in workers)
+        )
+
+    def get_busy_worker_count(self, queue_type: str) -> int:
+        """Number of workers in a pool currently processing a message."""
+        workers = self.tier_workers.get('premium', {}).get(queue_type, [])
+        return sum(1 for w in workers if getattr(w, 'processing', False))
+
+    @staticmethod
+    def get_worker_capacity() -> Dict[str, int]:
+        """
+        Database connection budget for workers.
+
+        Each worker holds at most one pooled connection at a time, so the total
+        worker count across all pools is bounded by the pool size minus
+        connections reserved for the UI, with a 20% buffer.
+
+        Returns:
+            Dict with total_connections, reserved_for_ui, available_for_workers, max_recommended_workers
+        """
+        from app.core.config import get_settings
+
+        settings = get_settings()
+        total_connections = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        reserved_for_ui = 20
+        available_for_workers = total_connections - reserved_for_ui
+        return {
+            'total_connections': total_connections,
+            'reserved_for_ui': reserved_for_ui,
+            'available_for_workers': available_for_workers,
+            'max_recommended_workers': int(available_for_workers * 0.8)
+        }
+
+    @staticmethod
+    def create_worker(queue_type: str, tier: str, worker_number: int) -> object:
+        """
+        Create a worker router for one queue type.
+
+        Used by the in-process pools and by the standalone runtime (app.etl.workers.run).
+
+        Args:
+            queue_type: Type of queue ('extraction', 'transform', or 'embedding')
+            tier: Tier name (e.g., 'premium')
+            worker_number: Worker number within the pool
+
+        Returns:
+            Worker instance (not started)
+        """
+        tier_queue = QueueManager().get_tier_queue_name(tier, queue_type)
+        if queue_type == 'extraction':
+            return ExtractionWorker(queue_name=tier_queue, worker_number=worker_number, tenant_ids=None)
+        if queue_type == 'transform':
+            return TransformWorker(queue_name=tier_queue, worker_number=worker_number, tenant_ids=None)
+        if queue_type == 'embedding':
+            return EmbeddingWorker(tier=tier)
+        raise ValueError(f"Invalid queue type: {queue_type}")
+
     def _start_worker_thread(self, worker_key: str, worker: object, tier: str, queue_type: str):
         """
         Helper method to start a worker in a thread and track it.
@@ -548,8 +645,44 @@ class WorkerManager:
                         'thread_alive': thread.is_alive() if thread else False
                     })
 
+        self._add_standalone_worker_status(status)
         return status
 
+    def _add_standalone_worker_status(self, status: Dict):
+        """
+        Add worker processes reported by standalone runtimes (app.etl.workers.run).
+
+        Each process is listed as an instance of its tier/type pool with its
+        runtime id and pid, so /workers/status shows in-process threads and
+        external processes side by side.
+        """
+        from app.etl.workers.worker_registry import get_worker_registry
+
+        for runtime in get_worker_registry().get_runtimes():
+            tier = runtime.get('tier')
+            for process in runtime.get('processes', []):
+                worker_type = process.get('queue_type')
+                status_key = f"{tier}_{worker_type}"
+                pool = status['workers'].setdefault(status_key, {
+                    'tier': tier,
+                    'type': worker_type,
+                    'count': 0,
+                    'instances': []
+                })
+                pool['count'] += 1
+                pool['instances'].append({
+                    'worker_key': process.get('worker_key'),
+                    'worker_number': process.get('worker_number'),
+                    'worker_running': process.get('alive', False),
+                    'thread_alive': process.get('alive', False),
+                    'runtime_id': runtime.get('runtime_id'),
+                    'pid': process.get('pid'),
+                    'restarts': process.get('restarts', 0),
+                    'last_heartbeat': runtime.get('last_heartbeat')
+                })
+                if process.get('alive'):
+                    status['running'] = True
+
     def get_tier_config(self) -> Dict[str, Dict[str, int]]:
         """
         Get worker pool configuration for all tiers.
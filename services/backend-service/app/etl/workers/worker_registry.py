@@ -0,0 +1,120 @@
+"""
+Worker Registry - Heartbeats from standalone ETL worker runtimes.
+
+Worker processes started with `python -m app.etl.workers.run` do not live in
+the API process, so WorkerManager cannot see their threads. Each runtime
+supervisor publishes a heartbeat to Redis every few seconds, and the
+/workers/status and /queues/status admin APIs read them back from here.
+
+Heartbeats expire after ETL_WORKER_HEARTBEAT_TTL_SECONDS, so a runtime that
+crashes or loses its host simply drops out of the status output.
+"""
+
+import json
+import threading
+from typing import Dict, Any, List, Optional
+
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class WorkerRegistry:
+    """
+    Redis-backed registry of standalone worker runtimes.
+
+    Without Redis the registry is empty: heartbeats are dropped and no
+    external runtimes are reported.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.ttl_seconds = self.settings.ETL_WORKER_HEARTBEAT_TTL_SECONDS
+        self.key_prefix = "pulse:etl_workers:"
+        self.redis_client = None
+        self._initialize_redis()
+
+    def _initialize_redis(self):
+        """Initialize Redis connection for worker heartbeats"""
+        try:
+            if self.settings.REDIS_URL:
+                import redis
+                self.redis_client = redis.from_url(
+                    self.settings.REDIS_URL,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                    socket_timeout=5
+                )
+                self.redis_client.ping()
+            else:
+                logger.warning("⚠️ Redis URL not configured, standalone worker status is not reported")
+        except Exception as e:
+            logger.warning(f"⚠️ Redis not available for worker registry, standalone worker status is not reported: {e}")
+            self.redis_client = None
+
+    def publish_heartbeat(self, runtime_id: str, status: Dict[str, Any]):
+        """
+        Store the current status of one worker runtime.
+
+        Args:
+            runtime_id: Unique runtime identifier (host:pid of the supervisor)
+            status: Runtime status (tier, processes, timestamps)
+        """
+        if self.redis_client is None:
+            return
+        try:
+            self.redis_client.set(f"{self.key_prefix}{runtime_id}", json.dumps(status), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to publish worker heartbeat for {runtime_id}: {e}")
+
+    def remove(self, runtime_id: str):
+        """Remove a runtime immediately (on clean shutdown)."""
+        if self.redis_client is None:
+            return
+        try:
+            self.redis_client.delete(f"{self.key_prefix}{runtime_id}")
+        except Exception as e:
+            logger.warning(f"Failed to remove worker heartbeat for {runtime_id}: {e}")
+
+    def get_runtimes(self) -> List[Dict[str, Any]]:
+        """
+        Get the status of every live worker runtime.
+
+        Returns:
+            List of runtime status dicts as published by publish_heartbeat()
+        """
+        if self.redis_client is None:
+            return []
+        try:
+            keys = list(self.redis_client.scan_iter(match=f"{self.key_prefix}*"))
+            if not keys:
+                return []
+            return [json.loads(value) for value in self.redis_client.mget(keys) if value]
+        except Exception as e:
+            logger.warning(f"Failed to read worker heartbeats: {e}")
+            return []
+
+    def count_processes(self, tier: str, queue_type: str) -> int:
+        """Count live standalone worker processes consuming a tier queue."""
+        return sum(
+            1
+            for runtime in self.get_runtimes() if runtime.get('tier') == tier
+            for process in runtime.get('processes', [])
+            if process.get('queue_type') == queue_type and process.get('alive')
+        )
+
+
+# Global worker registry instance
+_worker_registry: Optional[WorkerRegistry] = None
+_worker_registry_lock = threading.Lock()
+
+
+def get_worker_registry() -> WorkerRegistry:
+    """Get the global worker registry instance"""
+    global _worker_registry
+    if _worker_registry is None:
+        with _worker_registry_lock:
+            if _worker_registry is None:
+                _worker_registry = WorkerRegistry()
+    return _worker_registry
@@ -66,7 +66,8 @@ class WorkerStatusManager:
                     logger.warning(f"⚠️ No step_type provided for job {job_id}, skipping database update")
             
             # Now read the updated status and send via WebSocket
-            with self.database.get_read_session_context() as read_session:
+            # (replica only once it has replayed this write, otherwise primary)
+            with self.database.get_read_session_context(min_lsn=write_session.info.get('commit_lsn')) as read_session:
                 result = read_session.execute(
                     text('SELECT status FROM etl_jobs WHERE id = :job_id'),
                     {'job_id': job_id}
@@ -89,6 +90,21 @@ class WorkerStatusManager:
         except Exception as e:
             logger.error(f"Error sending WebSocket status: {e}")
 
+    async def _refresh_dora_lead_time_facts(self, tenant_id: int):
+        """
+        Incrementally refresh dora_lead_time_facts for the tenant.
+
+        Runs in a worker thread with its own write transaction; a failure is logged
+        and never prevents the job from completing (the next job catches up).
+        """
+        import asyncio
+        from app.services.dora_lead_time_facts_service import refresh_dora_lead_time_facts
+
+        try:
+            await asyncio.to_thread(refresh_dora_lead_time_facts, tenant_id)
+        except Exception as e:
+            logger.error(f"❌ Error refreshing DORA lead-time facts for tenant {tenant_id}: {e}")
+
     async def complete_etl_job(self, job_id: int, tenant_id: int, last_sync_date: str = None, rate_limited: bool = False):
         """
         Complete the ETL job by updating its status to FINISHED or RATE_LIMITED and sending WebSocket notification.
@@ -103,8 +119,10 @@ class WorkerStatusManager:
         4. For RATE_LIMITED: Calculate and set next_run (15 min retry)
         5. For FINISHED: next_run will be calculated when job resets to READY
         6. Clear error_message and reset retry_count
-        7. Send WebSocket notification with complete job status
-        8. UI will automatically reset to READY after a few seconds (FINISHED only)
+        7. Incrementally refresh the tenant's DORA lead-time facts
+        8. Bump the tenant's data generation (invalidates cached dashboard responses)
+        9. Send WebSocket notification with complete job status
+        10. UI will automatically reset to READY after a few seconds (FINISHED only)
 
         Args:
             job_id: ETL job ID
@@ -210,8 +228,15 @@ class WorkerStatusManager:
                     if last_sync_date:
                         logger.info(f"   last_sync_date: {last_sync_date}")
 
+            # Refresh the DORA lead-time facts with the data this job loaded (before notifying the UI)
+            await self._refresh_dora_lead_time_facts(tenant_id)
+
+            # Dashboards cached for the previous data generation are stale now
+            from app.core.response_cache import bump_data_generation
+            bump_data_generation(tenant_id)
+
             # Send WebSocket notification with updated job status
-            with self.database.get_read_session_context() as read_session:
+            with self.database.get_read_session_context(min_lsn=session.info.get('commit_lsn')) as read_session:
                 result = read_session.execute(
                     text('SELECT status FROM etl_jobs WHERE id = :job_id'),
                     {'job_id': job_id}
@@ -24,11 +24,12 @@ from app.core.logging_config import setup_logging, get_logger
 from app.core.utils import DateTimeHelper
 from app.core.middleware import (
     ErrorHandlingMiddleware, SecurityMiddleware, SecurityValidationMiddleware,
-    RateLimitingMiddleware, HealthCheckMiddleware
+    RateLimitingMiddleware, HealthCheckMiddleware, MetricsMiddleware
 )
 from app.core.client_logging_middleware import TenantLoggingMiddleware
 # Import Backend Service API routers
 from app.api.health import router as health_router
+from app.api.metrics_routes import router as metrics_router
 
 from app.api.auth_routes import router as auth_router
 from app.api.admin_routes import router as admin_router
@@ -77,7 +78,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
 
     # Routes that don't require authentication
     PUBLIC_ROUTES = {
-        "/", "/login", "/health", "/healthz", "/redoc", "/openapi.json",
+        "/", "/login", "/health", "/healthz", "/metrics", "/redoc", "/openapi.json",
         "/logout", "/auth/login", "/auth/validate"
     }
 
@@ -223,20 +224,36 @@ async def lifespan(_: FastAPI):
             logger.error(f"❌ Error initializing Qdrant collections: {e}")
             logger.warning("Qdrant collections not initialized - embedding may have race conditions")
 
-        # Start ETL workers
+        # Load and warm local embedding models once, before workers and requests need them
+        try:
+            from app.ai.embedding_inference_service import warm_up_local_embedding_models
+            warmed_models = await warm_up_local_embedding_models()
+            if warmed_models:
+                logger.info(f"✅ Embedding models warmed up: {', '.join(warmed_models)}")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to warm up embedding models: {e}")
+
+        # Start ETL workers (skipped when they run in the standalone runtime: python -m app.etl.workers.run)
         logger.info("🔍 [DEBUG] About to start ETL workers...")
         try:
-            logger.info("🔍 [DEBUG] Importing worker_manager...")
-            from app.etl.workers.worker_manager import get_worker_manager
-            logger.info("🔍 [DEBUG] Getting worker manager instance...")
-            worker_manager = get_worker_manager()
-            logger.info("🔍 [DEBUG] Calling start_all_workers()...")
-            success = worker_manager.start_all_workers()
-            logger.info(f"🔍 [DEBUG] start_all_workers() returned: {success}")
-            if success:
-                logger.info("✅ ETL workers started successfully")
+            from app.core.config import get_settings
+            if not get_settings().ETL_IN_PROCESS_WORKERS:
+                logger.info("ℹ️ ETL_IN_PROCESS_WORKERS=false - workers run in the standalone worker runtime")
             else:
-                logger.warning("⚠️ Failed to start ETL workers - ETL functionality will be limited")
+                logger.info("🔍 [DEBUG] Importing worker_manager...")
+                from app.etl.workers.worker_manager import get_worker_manager
+                logger.info("🔍 [DEBUG] Getting worker manager instance...")
+                worker_manager = get_worker_manager()
+                logger.info("🔍 [DEBUG] Calling start_all_workers()...")
+                success = worker_manager.start_all_workers()
+                logger.info(f"🔍 [DEBUG] start_all_workers() returned: {success}")
+                if success:
+                    logger.info("✅ ETL workers started successfully")
+                    if get_settings().ETL_AUTOSCALE_ENABLED:
+                        from app.etl.workers.worker_autoscaler import get_worker_autoscaler
+                        get_worker_autoscaler().start()
+                else:
+                    logger.warning("⚠️ Failed to start ETL workers - ETL functionality will be limited")
         except Exception as e:
             logger.error(f"❌ Error starting ETL workers: {e}")
             import traceback
@@ -303,6 +320,8 @@ async def lifespan(_: FastAPI):
             try:
                 if worker_manager:
                     print("[INFO] Stopping ETL workers...")
+                    from app.etl.workers.worker_autoscaler import get_worker_autoscaler
+                    get_worker_autoscaler().stop()
                     worker_manager.stop_all_workers()
                     print("[INFO] ETL workers stopped")
                 else:
@@ -327,6 +346,14 @@ async def lifespan(_: FastAPI):
             except Exception:
                 pass
 
+            # Stop embedding batching threads
+            try:
+                from app.ai.embedding_inference_service import get_embedding_inference_service
+                get_embedding_inference_service().shutdown()
+                print("[INFO] Embedding inference service stopped")
+            except Exception as e:
+                print(f"[WARNING] Error stopping embedding inference service: {e}")
+
             # Close HTTP client connections
             try:
                 print("[INFO] Closing HTTP client connections...")
@@ -341,6 +368,10 @@ async def lifespan(_: FastAPI):
                 print("[INFO] Closing database connections...")
                 database = get_database()
                 database.close_connections()
+                from app.core.async_database import close_async_database
+                await close_async_database()
+                from app.core.replica_lag_monitor import stop_replica_lag_monitor
+                stop_replica_lag_monitor()
                 print("[INFO] Database connections closed")
             except Exception as e:
                 print(f"[WARNING] Error closing database connections: {e}")
@@ -447,11 +478,17 @@ app.add_middleware(TenantLoggingMiddleware)  # Tenant-aware logging
 app.add_middleware(SecurityMiddleware)
 app.add_middleware(SecurityValidationMiddleware)
 app.add_middleware(HealthCheckMiddleware)
+
+# Request latency metrics (outermost, so every middleware's time is included)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 from app.api.dora_routes import router as dora_router
 
 
 # Include Backend Service API routes
 app.include_router(health_router, prefix="/api/v1", tags=["Health"])
+app.include_router(metrics_router, tags=["Health"])
 
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["Authentication API"])
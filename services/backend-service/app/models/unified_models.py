@@ -1246,6 +1246,51 @@ class DoraMetricInsight(Base):
     created_at = Column(DateTime, quote=False, name="created_at", default=DateTimeHelper.now_default)
 
 
+class DoraLeadTimeFact(Base):
+    """
+    Precomputed DORA lead-time rows: done, level-0 Story/Tech Enhancement work items
+    with a merged PR and positive lead time (all joined records active).
+
+    Refreshed per tenant at the end of each ETL job (see DoraLeadTimeFactsService),
+    so the DORA endpoints read one indexed table instead of a seven-way join.
+    """
+    __tablename__ = 'dora_lead_time_facts'
+    __table_args__ = {'quote': False}
+
+    work_item_id = Column(Integer, ForeignKey('work_items.id', ondelete='CASCADE'), primary_key=True, quote=False, name="work_item_id")
+    tenant_id = Column(Integer, ForeignKey('tenants.id'), nullable=False, quote=False, name="tenant_id")
+    issue_key = Column(String, quote=False, name="issue_key")
+    project_key = Column(String, quote=False, name="project_key")
+    team = Column(String, quote=False, name="team")
+    wit_from = Column(String, quote=False, name="wit_from")
+    wit_to = Column(String, quote=False, name="wit_to")
+    status_to = Column(String, quote=False, name="status_to")
+    story_points = Column(Float, quote=False, name="story_points")
+    priority = Column(String, quote=False, name="priority")
+    assignee = Column(String, quote=False, name="assignee")
+    issue_created_at = Column(DateTime, quote=False, name="issue_created_at")
+    issue_updated_at = Column(DateTime, quote=False, name="issue_updated_at")
+    work_last_completed_at = Column(DateTime, nullable=False, quote=False, name="work_last_completed_at")
+    total_lead_time_seconds = Column(Float, nullable=False, quote=False, name="total_lead_time_seconds")
+    aha_epic_url = Column(String, quote=False, name="aha_epic_url")  # custom_field_01
+    aha_initiative = Column(String, quote=False, name="aha_initiative")  # custom_field_02
+    aha_project_code = Column(String, quote=False, name="aha_project_code")  # custom_field_03
+    project_code = Column(String, quote=False, name="project_code")  # custom_field_04
+    aha_milestone = Column(String, quote=False, name="aha_milestone")  # custom_field_05
+    refreshed_at = Column(DateTime, nullable=False, quote=False, name="refreshed_at", default=DateTimeHelper.now_default)
+
+
+class DoraLeadTimeFactsRefresh(Base):
+    """Per-tenant watermark of the last dora_lead_time_facts refresh."""
+    __tablename__ = 'dora_lead_time_facts_refreshes'
+    __table_args__ = {'quote': False}
+
+    tenant_id = Column(Integer, ForeignKey('tenants.id'), primary_key=True, quote=False, name="tenant_id")
+    last_refreshed_at = Column(DateTime, nullable=False, quote=False, name="last_refreshed_at")
+    last_full_refresh_at = Column(DateTime, nullable=True, quote=False, name="last_full_refresh_at")
+    rows_refreshed = Column(Integer, nullable=False, default=0, quote=False, name="rows_refreshed")
+
+
 # Color Management Tables
 # These tables manage client-specific color schemas and accessibility variants
 
@@ -0,0 +1,177 @@
+"""
+DORA lead-time fact table refresh.
+
+dora_lead_time_facts holds exactly the rows the DORA lead-time endpoints used to
+build on every request with a seven-way join (work_items, projects, statuses,
+statuses_mappings, wits, wits_mappings, wits_hierarchies) and an EXISTS over
+merged work_items_prs_links. It is refreshed per tenant when an ETL job
+completes:
+
+- incremental: only work items whose row or PR links changed since the last
+  refresh are deleted and re-derived
+- full: when a mapping/dimension table (projects, statuses, wits and their
+  mappings/hierarchies) changed, or on the first refresh of a tenant, every
+  fact row of the tenant is rebuilt
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.utils import DateTimeHelper
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Rows committed by concurrent transactions may carry a last_updated_at slightly
+# older than our watermark: look back a little further than the last refresh
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+FACT_COLUMNS = """
+    work_item_id, tenant_id, issue_key, project_key, team, wit_from, wit_to, status_to,
+    story_points, priority, assignee, issue_created_at, issue_updated_at,
+    work_last_completed_at, total_lead_time_seconds,
+    aha_epic_url, aha_initiative, aha_project_code, project_code, aha_milestone, refreshed_at
+"""
+
+# Same filters as the original DORA endpoint query
+FACT_SELECT = """
+    SELECT
+        i.id, i.tenant_id, i.key, p.key, i.team, im.wit_from, im.wit_to, sm.status_to,
+        i.story_points, i.priority, i.assignee, i.created, i.updated,
+        i.work_last_completed_at, i.total_lead_time_seconds,
+        i.custom_field_01, i.custom_field_02, i.custom_field_03, i.custom_field_04, i.custom_field_05,
+        :refreshed_at
+    FROM
+        work_items i
+    INNER JOIN projects p               ON i.project_id = p.id
+    INNER JOIN statuses s               ON i.status_id = s.id
+    INNER JOIN statuses_mappings sm     ON s.status_mapping_id = sm.id
+    INNER JOIN wits it                  ON i.wit_id = it.id
+    INNER JOIN wits_mappings im         ON it.wits_mapping_id = im.id
+    INNER JOIN wits_hierarchies ih      ON im.wits_hierarchy_id = ih.id
+    WHERE
+        sm.status_to = 'Done'
+        AND ih.level_number = 0
+        AND im.wit_to IN ('Story', 'Tech Enhancement')
+        AND i.total_lead_time_seconds > 0
+        AND i.work_last_completed_at IS NOT NULL
+        AND i.tenant_id = :tenant_id
+        AND EXISTS (
+            SELECT 1
+            FROM work_items_prs_links jprl
+            WHERE jprl.work_item_id = i.id
+              AND jprl.pr_status = 'MERGED'
+              AND jprl.active = true
+        )
+        AND i.active = true
+        AND p.active = true
+        AND s.active = true
+        AND sm.active = true
+        AND it.active = true
+        AND im.active = true
+        AND ih.active = true
+"""
+
+# Work items whose own row or PR links changed since the watermark
+CHANGED_WORK_ITEMS = """
+    SELECT id FROM work_items
+    WHERE tenant_id = :tenant_id AND last_updated_at >= :since
+    UNION
+    SELECT work_item_id FROM work_items_prs_links
+    WHERE tenant_id = :tenant_id AND last_updated_at >= :since
+"""
+
+# Namespace (first key) of the per-tenant advisory lock serializing refreshes: a Jira
+# and a GitHub job finishing together would otherwise insert the same fact rows
+REFRESH_LOCK_NAMESPACE = 20401
+
+# Changes to these tables can move many work items in or out of the fact set
+DIMENSION_TABLES = ('projects', 'statuses', 'statuses_mappings', 'wits', 'wits_mappings', 'wits_hierarchies')
+
+
+class DoraLeadTimeFactsService:
+    """Refreshes dora_lead_time_facts for one tenant."""
+
+    def _get_watermark(self, session: Session, tenant_id: int) -> Optional[datetime]:
+        return session.execute(
+            text("SELECT last_refreshed_at FROM dora_lead_time_facts_refreshes WHERE tenant_id = :tenant_id"),
+            {'tenant_id': tenant_id}
+        ).scalar()
+
+    def _dimensions_changed(self, session: Session, tenant_id: int, since: datetime) -> bool:
+        checks = " OR ".join(
+            f"EXISTS (SELECT 1 FROM {table} WHERE tenant_id = :tenant_id AND last_updated_at >= :since)"
+            for table in DIMENSION_TABLES
+        )
+        return bool(session.execute(text(f"SELECT {checks}"), {'tenant_id': tenant_id, 'since': since}).scalar())
+
+    def refresh_tenant(self, session: Session, tenant_id: int, full: bool = False) -> Dict[str, Any]:
+        """
+        Refresh the tenant's fact rows in the caller's transaction.
+
+        Concurrent refreshes of the same tenant wait for each other on a
+        transaction-level advisory lock (released when the caller commits).
+
+        Args:
+            session: Write session (caller commits)
+            tenant_id: Tenant ID
+            full: Rebuild every fact row of the tenant
+
+        Returns:
+            Dictionary with mode, rows_deleted and rows_inserted
+        """
+        session.execute(
+            text("SELECT pg_advisory_xact_lock(:namespace, :tenant_id)"),
+            {'namespace': REFRESH_LOCK_NAMESPACE, 'tenant_id': tenant_id}
+        )
+
+        refreshed_at = DateTimeHelper.now_default()
+        watermark = self._get_watermark(session, tenant_id)
+        since = watermark - WATERMARK_OVERLAP if watermark else None
+
+        if not full and (since is None or self._dimensions_changed(session, tenant_id, since)):
+            full = True
+
+        params = {'tenant_id': tenant_id, 'refreshed_at': refreshed_at}
+        if full:
+            deleted = session.execute(
+                text("DELETE FROM dora_lead_time_facts WHERE tenant_id = :tenant_id"), params
+            ).rowcount
+            inserted = session.execute(
+                text(f"INSERT INTO dora_lead_time_facts ({FACT_COLUMNS}) {FACT_SELECT}"), params
+            ).rowcount
+        else:
+            params['since'] = since
+            deleted = session.execute(text(f"""
+                DELETE FROM dora_lead_time_facts
+                WHERE tenant_id = :tenant_id AND work_item_id IN ({CHANGED_WORK_ITEMS})
+            """), params).rowcount
+            inserted = session.execute(text(f"""
+                INSERT INTO dora_lead_time_facts ({FACT_COLUMNS})
+                {FACT_SELECT}
+                AND i.id IN ({CHANGED_WORK_ITEMS})
+            """), params).rowcount
+
+        session.execute(text("""
+            INSERT INTO dora_lead_time_facts_refreshes (tenant_id, last_refreshed_at, last_full_refresh_at, rows_refreshed)
+            VALUES (:tenant_id, :refreshed_at, CASE WHEN :full THEN CAST(:refreshed_at AS timestamp) END, :rows)
+            ON CONFLICT (tenant_id) DO UPDATE SET
+                last_refreshed_at = EXCLUDED.last_refreshed_at,
+                last_full_refresh_at = COALESCE(EXCLUDED.last_full_refresh_at, dora_lead_time_facts_refreshes.last_full_refresh_at),
+                rows_refreshed = EXCLUDED.rows_refreshed
+        """), {'tenant_id': tenant_id, 'refreshed_at': refreshed_at, 'full': full, 'rows': inserted})
+
+        mode = 'full' if full else 'incremental'
+        logger.info(f"📊 DORA lead-time facts refreshed for tenant {tenant_id} ({mode}): -{deleted} +{inserted}")
+        return {'mode': mode, 'rows_deleted': deleted, 'rows_inserted': inserted}
+
+
+def refresh_dora_lead_time_facts(tenant_id: int, full: bool = False) -> Dict[str, Any]:
+    """Refresh a tenant's DORA lead-time facts in its own write transaction."""
+    from app.core.database import get_database
+
+    with get_database().get_write_session_context() as session:
+        return DoraLeadTimeFactsService().refresh_tenant(session, tenant_id, full=full)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Async Database Benchmark
+Description: Compares sync (DatabaseRouter) and async (AsyncDatabaseRouter) database access
+from async FastAPI routes under a mix of slow and fast requests.
+
+Each mode mounts two routes on a throwaway FastAPI app:
+- /slow runs SELECT pg_sleep(--slow-seconds), standing in for an analytics query
+- /fast runs SELECT 1, standing in for a list/lookup endpoint
+
+With the sync router the query blocks the event loop, so fast requests queue
+behind every slow one. With the async router they complete while slow queries
+are still waiting on PostgreSQL.
+
+Usage (uses the backend service .env for the database connection):
+    python scripts/benchmark_async_db.py --requests 200 --rate 50 --slow-ratio 0.2
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import statistics
+
+# Add the backend service to the path to access database configuration
+script_dir = os.path.dirname(__file__)
+backend_service_dir = os.path.join(script_dir, '..')
+sys.path.append(backend_service_dir)
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import text
+
+
+def build_app(mode: str, slow_seconds: float) -> FastAPI:
+    """Build an app whose routes query the database through the sync or async router."""
+    app = FastAPI()
+
+    if mode == 'sync':
+        from app.core.database import get_database
+        database = get_database()
+
+        @app.get("/slow")
+        async def slow():
+            with database.get_read_session_context() as session:
+                session.execute(text("SELECT pg_sleep(:s)"), {'s': slow_seconds})
+            return {'ok': True}
+
+        @app.get("/fast")
+        async def fast():
+            with database.get_read_session_context() as session:
+                return {'value': session.execute(text("SELECT 1")).scalar()}
+    else:
+        from app.core.async_database import get_async_database
+        database = get_async_database()
+
+        @app.get("/slow")
+        async def slow():
+            async with database.get_read_session_context() as session:
+                await session.execute(text("SELECT pg_sleep(:s)"), {'s': slow_seconds})
+            return {'ok': True}
+
+        @app.get("/fast")
+        async def fast():
+            async with database.get_read_session_context() as session:
+                return {'value': (await session.execute(text("SELECT 1"))).scalar()}
+
+    return app
+
+
+async def run_mode(mode: str, args) -> dict:
+    """Send args.requests requests arriving at args.rate per second and collect latencies."""
+    app = build_app(mode, args.slow_seconds)
+    rng = random.Random(args.seed)
+    paths = ['/slow' if rng.random() < args.slow_ratio else '/fast' for _ in range(args.requests)]
+    latencies = {'/slow': [], '/fast': []}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        await client.get("/fast")  # Warm up the connection pool
+
+        async def request(index: int, path: str):
+            # Open-loop arrivals: latency counts from the scheduled arrival, so time
+            # spent waiting for a blocked event loop is included
+            arrival = started + index / args.rate
+            await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies[path].append(time.perf_counter() - arrival)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(request(index, path) for index, path in enumerate(paths)))
+        elapsed = time.perf_counter() - started
+
+    fast = sorted(latencies['/fast']) or [0.0]
+    return {
+        'mode': mode,
+        'elapsed': elapsed,
+        'throughput': args.requests / elapsed,
+        'slow_count': len(latencies['/slow']),
+        'fast_count': len(latencies['/fast']),
+        'fast_p50_ms': statistics.median(fast) * 1000,
+        'fast_p95_ms': fast[min(len(fast) - 1, int(len(fast) * 0.95))] * 1000
+    }
+
+
+async def main(args):
+    results = []
+    for mode in args.modes:
+        results.append(await run_mode(mode, args))
+
+    if 'async' in args.modes:
+        from app.core.async_database import close_async_database
+        await close_async_database()
+
+    print(f"{args.requests} requests at {args.rate:g}/s, "
+          f"{args.slow_ratio:.0%} slow ({args.slow_seconds}s)")
+    print(f"{'mode':<6} {'elapsed(s)':>10} {'req/s':>8} {'fast p50(ms)':>13} {'fast p95(ms)':>13}")
+    for result in results:
+        print(f"{result['mode']:<6} {result['elapsed']:>10.2f} {result['throughput']:>8.1f} "
+              f"{result['fast_p50_ms']:>13.1f} {result['fast_p95_ms']:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async database access from async routes")
+    parser.add_argument("--requests", type=int, default=200, help="Total number of requests per mode")
+    parser.add_argument("--rate", type=float, default=50.0, help="Request arrival rate (requests per second)")
+    parser.add_argument("--slow-ratio", type=float, default=0.2, help="Fraction of requests hitting the slow route")
+    parser.add_argument("--slow-seconds", type=float, default=0.5, help="pg_sleep duration of a slow request")
+    parser.add_argument("--modes", nargs='+', choices=['sync', 'async'], default=['sync', 'async'])
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the slow/fast request mix")
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Embedding Backend Benchmark
+Description: Compares CPU throughput (texts/second) of the local embedding backends
+and reports the embedding drift of the quantized backend.
+
+- torch: the full-precision SentenceTransformers model
+- onnx_int8: the same model exported to ONNX with dynamic int8 quantization
+  (exported on first use into EMBEDDING_ONNX_CACHE_DIR)
+
+Texts are synthetic work item / pull request titles and descriptions of mixed
+length. Each backend encodes them --rounds times after one warm-up round; the
+best round is reported. Parity is the row-wise cosine similarity between the
+two backends' embeddings of the same texts (drift = 1 - lowest similarity).
+
+Requires sentence-transformers[onnx].
+
+Usage:
+    python scripts/benchmark_embedding_backends.py --model models/sentence-transformers/all-mpnet-base-v2 --texts 512
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+# Add the backend service to the path to access the inference service
+script_dir = os.path.dirname(__file__)
+backend_service_dir = os.path.join(script_dir, '..')
+sys.path.append(backend_service_dir)
+
+from app.ai.embedding_inference_service import (
+    EmbeddingInferenceService, INFERENCE_BACKENDS, ONNX_INT8_BACKEND, TORCH_BACKEND
+)
+
+SUBJECTS = ['login page', 'payment API', 'ETL job', 'DORA dashboard', 'webhook handler', 'user settings',
+            'search index', 'deployment pipeline', 'Jira sync', 'GitHub integration']
+ACTIONS = ['fails intermittently', 'is slow under load', 'returns a 500 error', 'needs pagination',
+           'should support SSO', 'times out after 30 seconds', 'shows stale data', 'leaks connections']
+DETAILS = ['Steps to reproduce are in the linked ticket.', 'Observed in production since the last release.',
+           'Customers in the EU region are affected.', 'Add tests covering the retry path.',
+           'The root cause looks like a missing index.', 'Follow-up from the incident review.']
+
+
+def build_texts(count: int, seed: int) -> list:
+    """Synthetic titles (short) and descriptions (longer) in a fixed mix."""
+    rng = random.Random(seed)
+    texts = []
+    for index in range(count):
+        text = f"{rng.choice(SUBJECTS).capitalize()} {rng.choice(ACTIONS)}"
+        if index % 3 == 0:
+            text += ". " + " ".join(rng.sample(DETAILS, rng.randint(2, len(DETAILS))))
+        texts.append(text)
+    return texts
+
+
+def measure(model, texts: list, batch_size: int, rounds: int) -> float:
+    """Best-of-rounds texts/second of model.encode (after one warm-up round)."""
+    model.encode(texts[:batch_size], batch_size=batch_size, convert_to_numpy=True)
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+        best = min(best, time.perf_counter() - started)
+    return len(texts) / best
+
+
+async def main(args):
+    texts = build_texts(args.texts, args.seed)
+    service = EmbeddingInferenceService(max_batch_size=args.batch_size)
+
+    try:
+        results = []
+        for backend in args.backends:
+            started = time.perf_counter()
+            batcher = await service.load(args.model, backend)
+            load_seconds = time.perf_counter() - started
+            throughput = measure(batcher.model, texts, args.batch_size, args.rounds)
+            results.append((backend, load_seconds, throughput))
+
+        parity = None
+        if TORCH_BACKEND in args.backends and ONNX_INT8_BACKEND in args.backends:
+            parity = await service.compare_backends(args.model, texts, ONNX_INT8_BACKEND, TORCH_BACKEND)
+    finally:
+        service.shutdown()
+
+    print(f"{args.model}: {args.texts} texts, batch size {args.batch_size}, best of {args.rounds} rounds")
+    print(f"{'backend':<10} {'load(s)':>8} {'texts/s':>10} {'speedup':>8}")
+    baseline = results[0][2]
+    for backend, load_seconds, throughput in results:
+        print(f"{backend:<10} {load_seconds:>8.1f} {throughput:>10.1f} {throughput / baseline:>7.2f}x")
+
+    if parity:
+        print(f"parity {parity['backend']} vs {parity['reference']}: mean cosine {parity['mean_cosine']:.5f}, "
+              f"min cosine {parity['min_cosine']:.5f}, drift {parity['drift']:.5f}")
+        if parity['drift'] > args.max_drift:
+            print(f"WARNING: drift exceeds --max-drift {args.max_drift}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark torch vs ONNX int8 embedding backends on CPU")
+    parser.add_argument("--model", default="all-mpnet-base-v2", help="SentenceTransformers model name or path")
+    parser.add_argument("--texts", type=int, default=512, help="Number of texts to encode per round")
+    parser.add_argument("--batch-size", type=int, default=32, help="Encode batch size")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed rounds per backend (best is reported)")
+    parser.add_argument("--backends", nargs='+', choices=INFERENCE_BACKENDS, default=list(INFERENCE_BACKENDS))
+    parser.add_argument("--max-drift", type=float, default=0.02, help="Exit with 1 when parity drift exceeds this")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic texts")
+
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+ETL Pipeline Benchmark
+Description: Measures end-to-end ETL throughput (messages/s, rows/s) and per-stage
+latency percentiles without real Jira/GitHub tenants.
+
+- A synthetic dataset (scripts/etl_benchmark/payloads.py) of --issues issues with
+  --changelogs changelog entries each, sprint reports, and --prs pull requests
+  with commits, reviews and comments
+- Local fake Jira and GitHub servers (scripts/etl_benchmark/fake_servers.py)
+  serve it; the Jira integration is pointed at the fake server for this process
+  only, and GITHUB_API_URL at the fake GitHub server
+- The given jobs are set RUNNING and queued like run_job_now does, then worker
+  threads per stage drive extraction -> transform -> embedding until the queues
+  drain (scripts/etl_benchmark/pipeline.py)
+
+By default RabbitMQ, Qdrant and the embedding providers are replaced by
+in-process stand-ins (scripts/etl_benchmark/stand_ins.py); --broker rabbitmq,
+--vector-store qdrant and --embeddings real use the services configured in .env
+instead (e.g. local containers). PostgreSQL is always the configured database.
+
+Prerequisites (use a dedicated benchmark tenant, its rows are written to):
+- Jira and/or GitHub integrations with an ETL job each (any credentials; the
+  GitHub integration needs an organization setting)
+- Jira custom field mappings for development and sprints fields using
+  customfield_10000 and customfield_10021 (the .env.example defaults), so dev
+  status and sprint reports are extracted
+- No standalone workers consuming the same queues when using --broker rabbitmq
+
+Note: Jira issue extraction reads the first search page only (100 issues), so
+larger --issues values show up as fewer rows than generated.
+
+Usage:
+    python scripts/benchmark_etl_pipeline.py --tenant-id 2 --jira-integration-id 5 --jira-job-id 7 --issues 100
+    python scripts/benchmark_etl_pipeline.py --tenant-id 2 --github-integration-id 6 --github-job-id 8 --prs 200 --workers 4
+"""
+
+import os
+import sys
+import asyncio
+import argparse
+
+# Add the backend service to the path to access workers and the benchmark harness
+script_dir = os.path.dirname(__file__)
+backend_service_dir = os.path.join(script_dir, '..')
+sys.path.append(backend_service_dir)
+
+from scripts.etl_benchmark.fake_servers import FakeGitHubServer, FakeJiraServer
+from scripts.etl_benchmark.payloads import generate_dataset
+from scripts.etl_benchmark.pipeline import STAGES, PipelineBenchmark, mark_job_running
+from scripts.etl_benchmark.stand_ins import StandIns
+
+
+def point_jira_integration(tenant_id: int, integration_id: int, base_url: str, project_keys: list):
+    """Make this process's Jira clients for the integration call the fake server for the synthetic projects."""
+    from app.core.credential_cache import get_credential_cache
+
+    credential_cache = get_credential_cache()
+    credential_cache.ttl_seconds = float('inf')  # Keep the override for the whole run
+    integration = credential_cache.get_integration(tenant_id, integration_id)
+    if integration is None:
+        raise SystemExit(f"Integration {integration_id} not found for tenant {tenant_id}")
+    integration.base_url = base_url
+    integration.settings = {**integration.settings, 'projects': project_keys}
+    integration.clients.clear()
+
+
+def start_jobs(args):
+    """Set the benchmark jobs RUNNING and publish their first extraction messages."""
+    from app.etl.jobs import _queue_github_extraction_job, _queue_jira_extraction_job
+
+    if args.jira_job_id:
+        mark_job_running(args.tenant_id, args.jira_job_id)
+        asyncio.run(_queue_jira_extraction_job(args.tenant_id, args.jira_integration_id, args.jira_job_id))
+    if args.github_job_id:
+        mark_job_running(args.tenant_id, args.github_job_id)
+        asyncio.run(_queue_github_extraction_job(args.tenant_id, args.github_integration_id, args.github_job_id))
+
+
+def print_report(report, dataset, servers):
+    print("generated: " + ", ".join(f"{count} {kind}" for kind, count in dataset.counts().items()))
+    print("fake API requests: " + ", ".join(
+        f"{route}={count}" for server in servers for route, count in sorted(server.requests.items())))
+    print()
+    print(f"{'stage':<11} {'msgs':>6} {'busy(s)':>8} {'wait p50':>9} {'wait p95':>9} "
+          f"{'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8} {'max(ms)':>8}")
+    for stage in STAGES:
+        s = report.stages[stage]
+        print(f"{stage:<11} {int(s['messages']):>6} {s['busy_seconds']:>8.2f} {s['wait_p50']:>8.2f}s {s['wait_p95']:>8.2f}s "
+              f"{s['p50'] * 1000:>8.1f} {s['p95'] * 1000:>8.1f} {s['p99'] * 1000:>8.1f} {s['max'] * 1000:>8.1f}")
+    print()
+    print("rows: " + ", ".join(f"{table}={count}" for table, count in report.rows.items() if count))
+    print(f"wall time {report.wall_seconds:.2f}s: {report.messages} messages ({report.messages_per_second:.1f} msgs/s), "
+          f"{sum(report.rows.values())} rows ({report.rows_per_second:.1f} rows/s)")
+
+
+def main(args):
+    if not (args.jira_job_id or args.github_job_id):
+        raise SystemExit("Give --jira-job-id and/or --github-job-id")
+    if args.jira_job_id and not args.jira_integration_id:
+        raise SystemExit("--jira-job-id requires --jira-integration-id")
+    if args.github_job_id and not args.github_integration_id:
+        raise SystemExit("--github-job-id requires --github-integration-id")
+
+    from app.core.config import get_settings
+
+    dataset = generate_dataset(
+        issues=args.issues, changelogs_per_issue=args.changelogs, pull_requests=args.prs,
+        commits_per_pr=args.commits, reviews_per_pr=args.reviews, comments_per_pr=args.comments,
+        sprints=args.sprints, projects=args.projects, repositories=args.repositories, seed=args.seed
+    )
+    stand_ins = StandIns(
+        broker=args.broker == 'memory', vector_store=args.vector_store == 'memory', embeddings=args.embeddings == 'fake',
+        embedding_latency_ms=args.embedding_latency_ms
+    )
+
+    with FakeJiraServer(dataset, latency_ms=args.api_latency_ms) as jira, \
+            FakeGitHubServer(dataset, latency_ms=args.api_latency_ms) as github, stand_ins:
+        get_settings().GITHUB_API_URL = github.url
+        if args.jira_job_id:
+            point_jira_integration(args.tenant_id, args.jira_integration_id, jira.url, dataset.project_keys)
+
+        benchmark = PipelineBenchmark(args.tenant_id, workers_per_stage=args.workers, idle_seconds=args.idle_seconds,
+                                      max_seconds=args.max_seconds)
+        report = benchmark.run(lambda: start_jobs(args))
+        print_report(report, dataset, [jira, github])
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the ETL pipeline against fake Jira/GitHub servers")
+    parser.add_argument("--tenant-id", type=int, required=True, help="Benchmark tenant")
+    parser.add_argument("--jira-integration-id", type=int, help="Jira integration of the benchmark tenant")
+    parser.add_argument("--jira-job-id", type=int, help="Jira ETL job to run")
+    parser.add_argument("--github-integration-id", type=int, help="GitHub integration of the benchmark tenant")
+    parser.add_argument("--github-job-id", type=int, help="GitHub ETL job to run")
+
+    parser.add_argument("--issues", type=int, default=100, help="Jira issues")
+    parser.add_argument("--changelogs", type=int, default=5, help="Changelog entries per issue")
+    parser.add_argument("--projects", type=int, default=2, help="Jira projects")
+    parser.add_argument("--sprints", type=int, default=4, help="Closed sprints per project")
+    parser.add_argument("--prs", type=int, default=50, help="Pull requests")
+    parser.add_argument("--commits", type=int, default=3, help="Commits per pull request")
+    parser.add_argument("--reviews", type=int, default=2, help="Reviews per pull request")
+    parser.add_argument("--comments", type=int, default=2, help="Comments per pull request")
+    parser.add_argument("--repositories", type=int, default=5, help="GitHub repositories")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic dataset")
+
+    parser.add_argument("--api-latency-ms", type=float, default=0.0, help="Delay added to every fake API response")
+    parser.add_argument("--broker", choices=['memory', 'rabbitmq'], default='memory')
+    parser.add_argument("--vector-store", choices=['memory', 'qdrant'], default='memory')
+    parser.add_argument("--embeddings", choices=['fake', 'real'], default='fake',
+                        help="fake: deterministic vectors; real: the tenant's configured embedding providers")
+    parser.add_argument("--embedding-latency-ms", type=float, default=0.0, help="Delay per fake embedding call")
+    parser.add_argument("--workers", type=int, default=1, help="Worker threads per stage")
+    parser.add_argument("--idle-seconds", type=float, default=3.0, help="Stop after the queues stayed empty this long")
+    parser.add_argument("--max-seconds", type=float, default=None, help="Stop after this long regardless")
+
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+ETL Message Codec Benchmark
+Description: Compares bytes on the wire and encode/decode CPU time per message
+for the ETL message codecs (see app/etl/workers/message_codec.py).
+
+Messages mirror what the publishers send, including the enqueued_at and
+priority fields stamped by QueueManager.route_message:
+- extraction: a jira_dev_status job (issue id/key plus job flags)
+- transform: a raw_data_id reference plus job and GitHub boundary flags
+- embedding: a table_name/external_id entity reference plus job flags
+- github_pr_page: the next PR page of a repository (owner, name, cursor)
+- nested_batch: a github_prs_nested extraction carrying --nested-items cursors
+
+Each codec is measured uncompressed and, when zstandard is installed, with
+zstd compression of bodies of at least --compression-threshold bytes. Codecs
+whose package is not installed (orjson, msgpack) are listed and skipped.
+
+Usage:
+    python scripts/benchmark_message_codecs.py --iterations 20000 --compression-threshold 512
+"""
+
+import os
+import sys
+import time
+import base64
+import argparse
+from types import SimpleNamespace
+
+# Add the backend service to the path to access the message codecs
+script_dir = os.path.dirname(__file__)
+backend_service_dir = os.path.join(script_dir, '..')
+sys.path.append(backend_service_dir)
+
+from app.etl.workers.message_codec import CODECS, MessageEncoder, decode_message, zstandard
+
+ALL_CODECS = ('json', 'orjson', 'msgpack')
+
+
+def _job_fields(message_type: str, provider: str) -> dict:
+    return {
+        'tenant_id': 12,
+        'integration_id': 34,
+        'job_id': 5678,
+        'type': message_type,
+        'provider': provider,
+        'first_item': False,
+        'last_item': False,
+        'old_last_sync_date': '2026-05-01T00:00:00',
+        'new_last_sync_date': '2026-06-01T12:00:00',
+        'last_job_item': False,
+        'token': '6f1c2d3e-4b5a-4c6d-8e9f-0a1b2c3d4e5f',
+    }
+
+
+def _routing_fields() -> dict:
+    return {'enqueued_at': 1780315200.123456, 'priority': 'normal'}
+
+
+def _cursor(index: int) -> str:
+    return base64.b64encode(f"cursor:v2:{index:08d}:cHJfY29tbWl0cw==".encode()).decode()
+
+
+def build_messages(nested_items: int) -> dict:
+    """One representative message per type."""
+    extraction = {
+        **_job_fields('jira_dev_status', 'jira'),
+        'issue_id': '10482', 'issue_key': 'PULSE-482',
+        'last_repo': False, 'last_pr_last_nested': False,
+        **_routing_fields(),
+    }
+    transform = {
+        **_job_fields('github_prs', 'github'),
+        'rate_limited': False, 'raw_data_id': 982341,
+        'last_repo': False, 'last_pr_last_nested': False,
+        **_routing_fields(),
+    }
+    embedding = {
+        **_job_fields('jira_issues', 'jira'),
+        'rate_limited': False, 'table_name': 'work_items', 'external_id': '10482',
+        **_routing_fields(),
+    }
+    pr_page = {
+        **_job_fields('github_prs_commits_reviews_comments', 'github'),
+        'owner': 'pulse-labs', 'repo_name': 'pulse-platform', 'full_name': 'pulse-labs/pulse-platform',
+        'pr_cursor': _cursor(0), 'last_repo': True, 'last_pr_last_nested': False,
+        **_routing_fields(),
+    }
+    nested_types = ('commits', 'reviews', 'comments', 'review_threads')
+    nested_batch = {
+        **_job_fields('github_prs_commits_reviews_comments', 'github'),
+        'owner': 'pulse-labs', 'repo_name': 'pulse-platform', 'full_name': 'pulse-labs/pulse-platform',
+        'nested_batch': [
+            {'pr_node_id': f"PR_kwDOAbCdEf{index // 2:06d}", 'nested_type': nested_types[index % len(nested_types)],
+             'nested_cursor': _cursor(index)}
+            for index in range(nested_items)
+        ],
+        'last_repo': False, 'last_pr_last_nested': False,
+        **_routing_fields(),
+    }
+    return {
+        'extraction': extraction,
+        'transform': transform,
+        'embedding': embedding,
+        'github_pr_page': pr_page,
+        'nested_batch': nested_batch,
+    }
+
+
+def measure(encoder: MessageEncoder, message: dict, iterations: int) -> dict:
+    """Average body bytes and encode/decode microseconds per message."""
+    body, content_type, content_encoding = encoder.encode_body(message)
+    properties = SimpleNamespace(content_type=content_type, content_encoding=content_encoding)
+    assert decode_message(body, properties) == message, f"{encoder.codec.name} round trip changed the message"
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        encoder.encode_body(message)
+    encode_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        decode_message(body, properties)
+    decode_seconds = time.perf_counter() - started
+
+    return {
+        'bytes': len(body),
+        'compressed': content_encoding is not None,
+        'encode_us': encode_seconds / iterations * 1e6,
+        'decode_us': decode_seconds / iterations * 1e6,
+    }
+
+
+def run_benchmark(codecs, iterations: int, compression_threshold: int, nested_items: int, zstd_level: int = 3) -> list:
+    """Results per message type, codec and compression, json uncompressed first for each message type."""
+    variants = [(codec, 0) for codec in codecs]
+    if compression_threshold > 0 and zstandard is not None:
+        variants += [(codec, compression_threshold) for codec in codecs]
+    encoders = {variant: MessageEncoder(codec=variant[0], compression_threshold=variant[1], zstd_level=zstd_level)
+                for variant in variants}
+
+    results = []
+    for message_type, message in build_messages(nested_items).items():
+        for (codec, threshold), encoder in encoders.items():
+            result = measure(encoder, message, iterations)
+            results.append({'message_type': message_type, 'codec': codec, 'zstd': threshold > 0, **result})
+    return results
+
+
+def main(args):
+    codecs = [codec for codec in args.codecs if codec in CODECS]
+    missing = [codec for codec in args.codecs if codec not in CODECS]
+    if missing:
+        print(f"Skipping codecs that are not installed: {', '.join(missing)}")
+    if args.compression_threshold > 0 and zstandard is None:
+        print("Skipping zstd compression: zstandard is not installed")
+
+    results = run_benchmark(codecs, args.iterations, args.compression_threshold, args.nested_items, args.zstd_level)
+
+    print(f"{args.iterations} iterations per message, zstd threshold {args.compression_threshold} bytes, "
+          f"{args.nested_items} nested_batch items")
+    print(f"{'message':<16} {'codec':<12} {'bytes':>7} {'vs json':>8} {'encode(us)':>11} {'decode(us)':>11}")
+    baselines = {}
+    for result in results:
+        name = result['codec'] + ('+zstd' if result['zstd'] else '')
+        baseline = baselines.setdefault(result['message_type'], result['bytes'])
+        note = '' if result['compressed'] or not result['zstd'] else '  (below threshold or no gain)'
+        print(f"{result['message_type']:<16} {name:<12} {result['bytes']:>7} {result['bytes'] / baseline:>7.2f}x "
+              f"{result['encode_us']:>11.2f} {result['decode_us']:>11.2f}{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ETL message codecs: bytes and encode/decode CPU")
+    parser.add_argument("--codecs", nargs='+', choices=ALL_CODECS, default=list(ALL_CODECS))
+    parser.add_argument("--iterations", type=int, default=10000, help="Encodes and decodes per message and codec")
+    parser.add_argument("--compression-threshold", type=int, default=512,
+                        help="Also measure zstd for bodies of at least this many bytes (0 = skip)")
+    parser.add_argument("--zstd-level", type=int, default=3, help="zstd compression level")
+    parser.add_argument("--nested-items", type=int, default=60, help="Cursors in the nested_batch message")
+
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1 @@
+# ETL Pipeline Benchmark Harness
@@ -0,0 +1,282 @@
+"""
+Local fake Jira and GitHub HTTP servers for the ETL pipeline benchmark.
+
+Both serve a SyntheticDataset (payloads.py) on 127.0.0.1 from a background
+thread, implementing only the endpoints the extraction clients call, with the
+real APIs' pagination:
+
+- FakeJiraServer: project search, project statuses, field search, createmeta,
+  JQL search (nextPageToken pages), dev-status detail and sprint reports
+- FakeGitHubServer: repository search (Link header pages) and the GraphQL
+  queries of GitHubGraphQLClient (PR pages with nested connections, and the
+  per-PR / aliased multi-PR nested page queries)
+
+latency_ms adds a fixed delay to every response to stand in for network and
+API time. Rate limit headers and rateLimit fields always report a full budget.
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from scripts.etl_benchmark.payloads import (
+    DEVELOPMENT_FIELD_ID, SPRINTS_FIELD_ID, STORY_POINTS_FIELD_ID, SyntheticDataset
+)
+
+RATE_LIMIT = 5000
+
+
+class FakeAPIServer:
+    """Threaded HTTP server serving a dataset; subclasses implement handle()."""
+
+    def __init__(self, dataset: SyntheticDataset, port: int = 0, latency_ms: float = 0.0):
+        self.dataset = dataset
+        self.latency = latency_ms / 1000.0
+        self.requests: Dict[str, int] = {}  # route -> request count
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeAPIServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]],
+               body: Any) -> Tuple[int, Any, Dict[str, str]]:
+        """Return (status, JSON-serializable body, extra headers) for a request."""
+        raise NotImplementedError
+
+    def _count(self, route: str):
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real APIs
+
+            def _dispatch(self, method: str):
+                parsed = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                if server.latency:
+                    time.sleep(server.latency)
+                try:
+                    status, payload, headers = server.handle(method, parsed.path, parse_qs(parsed.query), body)
+                except Exception as e:
+                    status, payload, headers = 500, {'message': str(e)}, {}
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+            def log_message(self, format, *args):
+                pass  # Request logging would dominate the benchmark's output
+
+        return Handler
+
+
+def _first(query: Dict[str, List[str]], name: str, default: Optional[str] = None) -> Optional[str]:
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def _page(items: List[Any], cursor: Optional[str], size: int) -> Dict[str, Any]:
+    """GraphQL connection page; cursors are offsets into the full list."""
+    start = int(cursor) if cursor else 0
+    end = start + size
+    return {
+        'pageInfo': {'endCursor': str(min(end, len(items))), 'hasNextPage': end < len(items)},
+        'nodes': items[start:end],
+    }
+
+
+class FakeJiraServer(FakeAPIServer):
+    """Jira Cloud REST API (v3 / latest, dev-status, greenhopper) over a dataset."""
+
+    STATUSES_PATH = re.compile(r'^/rest/api/3/project/([^/]+)/statuses$')
+    PROJECT_FILTER = re.compile(r'project\s+IN\s*\(([^)]*)\)', re.IGNORECASE)
+
+    def handle(self, method, path, query, body):
+        dataset = self.dataset
+
+        if path == '/rest/api/3/project/search':
+            self._count('project_search')
+            keys = query.get('keys')
+            projects = [p for p in dataset.projects if not keys or p['key'] in keys]
+            return 200, {'startAt': 0, 'maxResults': len(projects), 'total': len(projects),
+                         'isLast': True, 'values': projects}, {}
+
+        match = self.STATUSES_PATH.match(path)
+        if match:
+            self._count('project_statuses')
+            if match.group(1) not in dataset.statuses:
+                return 404, {'errorMessages': [f"No project could be found with key '{match.group(1)}'."]}, {}
+            return 200, dataset.statuses[match.group(1)], {}
+
+        if path == '/rest/api/3/field/search':
+            self._count('field_search')
+            fields = [
+                {'id': DEVELOPMENT_FIELD_ID, 'name': 'Development', 'schema': {'type': 'any', 'custom': 'dev'}},
+                {'id': SPRINTS_FIELD_ID, 'name': 'Sprint', 'schema': {'type': 'array', 'items': 'json'}},
+                {'id': STORY_POINTS_FIELD_ID, 'name': 'Story Points', 'schema': {'type': 'number'}},
+            ]
+            wanted = query.get('id')
+            fields = [f for f in fields if not wanted or f['id'] in wanted]
+            return 200, {'startAt': 0, 'maxResults': 50, 'total': len(fields), 'isLast': True, 'values': fields}, {}
+
+        if path == '/rest/api/3/issue/createmeta':
+            self._count('createmeta')
+            keys = (_first(query, 'projectKeys') or '').split(',')
+            return 200, {'projects': [{
+                'id': project['id'], 'key': project['key'], 'name': project['name'],
+                'issuetypes': [{**issue_type, 'fields': {
+                    STORY_POINTS_FIELD_ID: {'required': False, 'name': 'Story Points', 'key': STORY_POINTS_FIELD_ID,
+                                            'schema': {'type': 'number', 'customId': 10024}},
+                }} for issue_type in project['issueTypes']],
+            } for project in dataset.projects if project['key'] in keys]}, {}
+
+        if path == '/rest/api/latest/search/jql' and method == 'POST':
+            self._count('search_jql')
+            body = body or {}
+            match = self.PROJECT_FILTER.search(body.get('jql', ''))
+            keys = {key.strip().strip('"\'') for key in match.group(1).split(',')} if match else None
+            issues = [i for i in dataset.issues if keys is None or i['fields']['project']['key'] in keys]
+            start = int(body.get('nextPageToken') or 0)
+            end = start + min(int(body.get('maxResults', 50)), 100)
+            result = {'issues': issues[start:end], 'isLast': end >= len(issues)}
+            if end < len(issues):
+                result['nextPageToken'] = str(end)
+            return 200, result, {}
+
+        if path == '/rest/dev-status/latest/issue/detail':
+            self._count('dev_status')
+            return 200, dataset.dev_status.get(_first(query, 'issueId'), {'errors': [], 'detail': []}), {}
+
+        if path == '/rest/greenhopper/1.0/rapid/charts/sprintreport':
+            self._count('sprint_report')
+            key = (int(_first(query, 'rapidViewId', 0)), int(_first(query, 'sprintId', 0)))
+            if key not in dataset.sprint_reports:
+                return 404, {'errorMessages': ['Sprint not found']}, {}
+            return 200, dataset.sprint_reports[key], {}
+
+        return 404, {'errorMessages': [f"Not implemented by the fake Jira server: {method} {path}"]}, {}
+
+
+class FakeGitHubServer(FakeAPIServer):
+    """GitHub REST search and GraphQL API over a dataset (point GITHUB_API_URL at url)."""
+
+    PAGE_SIZE = re.compile(r'(\w+)\(first:\s*(\d+)')
+    ALIASED_NODE = re.compile(r'(n\d+):\s*node\(id:\s*\$(id\d+)\)\s*\{\s*\.\.\.\s*on\s+PullRequest\s*\{\s*(\w+)\(first:\s*(\d+),'
+                              r'\s*after:\s*\$(cursor\d+)\)')
+    SINGLE_NESTED = {
+        'getMoreCommitsForPr': ('commits', 'commitCursor'),
+        'getMoreReviewsForPr': ('reviews', 'reviewCursor'),
+        'getMoreCommentsForPr': ('comments', 'commentCursor'),
+        'getMoreReviewThreadsForPr': ('reviewThreads', 'threadCursor'),
+    }
+
+    def _rate_limit(self) -> Dict[str, Any]:
+        reset_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() + 3600))
+        return {'cost': 1, 'limit': RATE_LIMIT, 'remaining': RATE_LIMIT, 'resetAt': reset_at}
+
+    def _rate_limit_headers(self) -> Dict[str, str]:
+        return {'X-RateLimit-Limit': str(RATE_LIMIT), 'X-RateLimit-Remaining': str(RATE_LIMIT),
+                'X-RateLimit-Reset': str(int(time.time()) + 3600)}
+
+    def handle(self, method, path, query, body):
+        if path == '/search/repositories':
+            self._count('search_repositories')
+            per_page = int(_first(query, 'per_page', 30))
+            page = int(_first(query, 'page', 1))
+            repositories = self.dataset.repositories
+            items = repositories[(page - 1) * per_page:page * per_page]
+            headers = self._rate_limit_headers()
+            if page * per_page < len(repositories):
+                next_query = {name: values[0] for name, values in query.items()}
+                next_query['page'] = page + 1
+                headers['Link'] = f'<{self.url}{path}?{urlencode(next_query)}>; rel="next"'
+            return 200, {'total_count': len(repositories), 'incomplete_results': False, 'items': items}, headers
+
+        if path == '/graphql' and method == 'POST':
+            return 200, self._graphql(body.get('query', ''), body.get('variables') or {}), {}
+
+        return 404, {'message': 'Not Found'}, self._rate_limit_headers()
+
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        page_sizes = {name: int(size) for name, size in self.PAGE_SIZE.findall(query)}
+        data: Dict[str, Any] = {'rateLimit': self._rate_limit()}
+
+        if 'getPrBatchWithDetails' in query:
+            self._count('graphql_prs')
+            full_name = f"{variables.get('owner')}/{variables.get('repoName')}"
+            prs = self.dataset.pull_requests.get(full_name)
+            if prs is None:
+                return {'data': {**data, 'repository': None},
+                        'errors': [{'type': 'NOT_FOUND', 'message': f"Could not resolve to a Repository '{full_name}'."}]}
+            pr_page = _page(prs, variables.get('prCursor'), page_sizes.get('pullRequests', 50))
+            pr_page['nodes'] = [self._pr_with_first_pages(pr, page_sizes) for pr in pr_page['nodes']]
+            data['repository'] = {'pullRequests': pr_page}
+            return {'data': data}
+
+        prs = self.dataset.pull_request_by_node_id()
+        for operation, (connection, cursor_variable) in self.SINGLE_NESTED.items():
+            if operation in query:
+                self._count('graphql_nested')
+                pr = prs.get(variables.get('prNodeId'))
+                data['node'] = None if pr is None else {
+                    connection: _page(pr[connection]['nodes'], variables.get(cursor_variable), page_sizes.get(connection, 50))
+                }
+                return {'data': data}
+
+        if 'getMoreNestedForPrs' in query:
+            self._count('graphql_nested_batch')
+            for alias, id_variable, connection, size, cursor_variable in self.ALIASED_NODE.findall(query):
+                pr = prs.get(variables.get(id_variable))
+                data[alias] = None if pr is None else {
+                    connection: _page(pr[connection]['nodes'], variables.get(cursor_variable), int(size))
+                }
+            return {'data': data}
+
+        return {'errors': [{'message': 'Query not implemented by the fake GitHub server'}]}
+
+    @staticmethod
+    def _pr_with_first_pages(pr: Dict[str, Any], page_sizes: Dict[str, int]) -> Dict[str, Any]:
+        node = dict(pr)
+        for connection in ('commits', 'reviews', 'comments', 'reviewThreads'):
+            node[connection] = _page(pr[connection]['nodes'], None, page_sizes.get(connection, 50))
+        return node
@@ -0,0 +1,344 @@
+"""
+Synthetic Jira and GitHub payloads for the ETL pipeline benchmark.
+
+generate_dataset() builds a deterministic (seeded) dataset in the shapes the
+extraction clients receive from the real APIs:
+
+- Jira: projects with issue types, project statuses, issues with changelog
+  histories (status transitions), development status (linked pull requests)
+  and sprint reports
+- GitHub: repositories (search API items) and pull requests as GraphQL nodes
+  with their commits, reviews, comments and review threads
+
+The fake servers in fake_servers.py serve a dataset with the APIs' pagination.
+Issues carry the development and sprints custom fields under the ids the
+benchmark tenant maps them to (JIRA_DEVELOPMENT_FIELD_ID / JIRA_SPRINTS_FIELD_ID
+defaults), so dev status and sprint report extraction are triggered.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+DEVELOPMENT_FIELD_ID = 'customfield_10000'
+SPRINTS_FIELD_ID = 'customfield_10021'
+STORY_POINTS_FIELD_ID = 'customfield_10024'
+
+ISSUE_TYPES = [('10001', 'Story'), ('10002', 'Bug'), ('10003', 'Task')]
+WORKFLOW = [('1', 'To Do', 'new'), ('3', 'In Progress', 'indeterminate'), ('10100', 'Code Review', 'indeterminate'),
+            ('10101', 'QA', 'indeterminate'), ('10002', 'Done', 'done')]
+PRIORITIES = ['Highest', 'High', 'Medium', 'Low']
+PEOPLE = ['Ana Souza', 'Bruno Lima', 'Carla Mendes', 'Diego Rocha', 'Elisa Prado', 'Fabio Nunes']
+SUBJECTS = ['login page', 'payment API', 'ETL job', 'DORA dashboard', 'webhook handler', 'user settings',
+            'search index', 'deployment pipeline', 'Jira sync', 'GitHub integration']
+ACTIONS = ['fails intermittently', 'is slow under load', 'returns a 500 error', 'needs pagination',
+           'should support SSO', 'times out after 30 seconds', 'shows stale data', 'leaks connections']
+REVIEW_STATES = ['APPROVED', 'COMMENTED', 'CHANGES_REQUESTED']
+
+
+@dataclass
+class SyntheticDataset:
+    """Jira and GitHub API payloads of one synthetic tenant."""
+    organization: str
+    projects: List[Dict[str, Any]] = field(default_factory=list)
+    statuses: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)  # project key -> issue types
+    issues: List[Dict[str, Any]] = field(default_factory=list)
+    dev_status: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # issue id -> dev-status detail
+    sprint_reports: Dict[Tuple[int, int], Dict[str, Any]] = field(default_factory=dict)  # (board, sprint)
+    repositories: List[Dict[str, Any]] = field(default_factory=list)
+    pull_requests: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)  # repo full name -> PR nodes
+
+    @property
+    def project_keys(self) -> List[str]:
+        return [project['key'] for project in self.projects]
+
+    def pull_request_by_node_id(self) -> Dict[str, Dict[str, Any]]:
+        return {pr['id']: pr for prs in self.pull_requests.values() for pr in prs}
+
+    def counts(self) -> Dict[str, int]:
+        """Number of generated source records per kind."""
+        prs = [pr for prs in self.pull_requests.values() for pr in prs]
+        return {
+            'projects': len(self.projects),
+            'issues': len(self.issues),
+            'changelogs': sum(len(issue['changelog']['histories']) for issue in self.issues),
+            'dev_status': len(self.dev_status),
+            'sprint_reports': len(self.sprint_reports),
+            'repositories': len(self.repositories),
+            'pull_requests': len(prs),
+            'commits': sum(len(pr['commits']['nodes']) for pr in prs),
+            'reviews': sum(len(pr['reviews']['nodes']) for pr in prs),
+            'comments': sum(len(pr['comments']['nodes']) for pr in prs),
+        }
+
+
+def _jira_time(value: datetime) -> str:
+    """Jira REST timestamp format (2024-01-15T10:30:00.000+0000)."""
+    return value.strftime('%Y-%m-%dT%H:%M:%S.000+0000')
+
+
+def _github_time(value: datetime) -> str:
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _jira_user(name: str) -> Dict[str, str]:
+    return {'accountId': f"acc-{PEOPLE.index(name)}", 'displayName': name}
+
+
+def _estimate_sum(members: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sprint report estimate sum of the given sprint members' story points."""
+    total = sum(member['points'] for member in members)
+    return {'value': total, 'text': str(total)}
+
+
+def generate_dataset(issues: int = 100, changelogs_per_issue: int = 5, pull_requests: int = 50,
+                     commits_per_pr: int = 3, reviews_per_pr: int = 2, comments_per_pr: int = 2,
+                     sprints: int = 4, projects: int = 2, repositories: int = 5, linked_issue_ratio: float = 0.5,
+                     organization: str = 'pulse-benchmark', seed: int = 42,
+                     now: datetime = None) -> SyntheticDataset:
+    """
+    Build a synthetic dataset.
+
+    Args:
+        issues: Jira issues, spread round-robin over the projects
+        changelogs_per_issue: Changelog histories (status transitions) per issue
+        pull_requests: GitHub pull requests, spread round-robin over the repositories
+        commits_per_pr, reviews_per_pr, comments_per_pr: Nested items per pull request
+        sprints: Closed sprints on one board per project (issues are assigned round-robin)
+        projects, repositories: Number of Jira projects and GitHub repositories
+        linked_issue_ratio: Share of issues with a linked pull request (development field and dev status)
+        organization: GitHub organization owning the repositories
+        seed: Random seed (same arguments and seed give the same dataset)
+        now: Reference time; all activity lies in the 180 days before it
+
+    Returns:
+        SyntheticDataset
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc).replace(microsecond=0)
+    dataset = SyntheticDataset(organization=organization)
+
+    # ---- GitHub repositories and pull requests (first, so Jira dev status can link to them)
+    for index in range(repositories):
+        name = f"service-{index + 1:03d}"
+        created = now - timedelta(days=720 - index)
+        dataset.repositories.append({
+            'id': 500000 + index,
+            'node_id': f"R_bench{index}",
+            'name': name,
+            'full_name': f"{organization}/{name}",
+            'owner': {'login': organization, 'type': 'Organization'},
+            'private': True,
+            'visibility': 'private',
+            'description': f"Synthetic {rng.choice(SUBJECTS)} service",
+            'fork': False,
+            'archived': False,
+            'disabled': False,
+            'is_template': False,
+            'language': rng.choice(['Python', 'TypeScript', 'Go', 'Java']),
+            'default_branch': 'main',
+            'topics': [],
+            'license': None,
+            'size': rng.randint(100, 50000),
+            'stargazers_count': rng.randint(0, 50),
+            'forks_count': rng.randint(0, 10),
+            'open_issues_count': rng.randint(0, 30),
+            'has_issues': True,
+            'has_projects': False,
+            'has_wiki': False,
+            'has_pages': False,
+            'has_downloads': True,
+            'has_discussions': False,
+            'allow_forking': False,
+            'web_commit_signoff_required': False,
+            'created_at': _github_time(created),
+            'updated_at': _github_time(now - timedelta(days=index)),
+            'pushed_at': _github_time(now - timedelta(days=index)),
+        })
+        dataset.pull_requests[f"{organization}/{name}"] = []
+
+    pr_numbers = {repo['full_name']: 0 for repo in dataset.repositories}
+    all_prs = []
+    for index in range(pull_requests if repositories else 0):
+        repo = dataset.repositories[index % repositories]
+        pr_numbers[repo['full_name']] += 1
+        number = pr_numbers[repo['full_name']]
+        created = now - timedelta(days=rng.randint(2, 180), minutes=rng.randint(0, 1440))
+        merged = created + timedelta(hours=rng.randint(1, 96))
+        state = 'MERGED' if merged < now and rng.random() < 0.8 else 'OPEN'
+        author = rng.choice(PEOPLE)
+        login = author.lower().replace(' ', '.')
+        title = f"{rng.choice(SUBJECTS).capitalize()} {rng.choice(ACTIONS)}"
+
+        commits = []
+        for commit_index in range(commits_per_pr):
+            committed = created + timedelta(minutes=10 * commit_index)
+            commits.append({'commit': {
+                'oid': f"{index:08x}{commit_index:032x}",
+                'message': f"{title} (part {commit_index + 1})",
+                'author': {'name': author, 'email': f"{login}@example.com", 'date': _github_time(committed)},
+            }})
+        reviews = [{
+            'id': f"PRR_bench{index}_{review_index}",
+            'state': REVIEW_STATES[review_index % len(REVIEW_STATES)],
+            'author': {'login': rng.choice(PEOPLE).lower().replace(' ', '.')},
+            'createdAt': _github_time(created + timedelta(hours=1 + review_index)),
+            'submittedAt': _github_time(created + timedelta(hours=1 + review_index)),
+        } for review_index in range(reviews_per_pr)]
+        comments = [{
+            'id': f"IC_bench{index}_{comment_index}",
+            'body': f"Looks good, but please check the {rng.choice(SUBJECTS)} path.",
+            'author': {'login': rng.choice(PEOPLE).lower().replace(' ', '.')},
+            'createdAt': _github_time(created + timedelta(hours=2 + comment_index)),
+        } for comment_index in range(comments_per_pr)]
+
+        pr = {
+            'id': f"PR_bench{index}",
+            'number': number,
+            'title': title,
+            'body': f"Fixes the case where the {rng.choice(SUBJECTS)} {rng.choice(ACTIONS)}.",
+            'state': state,
+            'createdAt': _github_time(created),
+            'updatedAt': _github_time(merged if state == 'MERGED' else created),
+            'mergedAt': _github_time(merged) if state == 'MERGED' else None,
+            'closedAt': _github_time(merged) if state == 'MERGED' else None,
+            'author': {'login': login},
+            'baseRefName': 'main',
+            'headRefName': f"feature/bench-{index}",
+            'additions': rng.randint(1, 800),
+            'deletions': rng.randint(0, 400),
+            'changedFiles': rng.randint(1, 40),
+            'commits': {'nodes': commits},
+            'reviews': {'nodes': reviews},
+            'comments': {'nodes': comments},
+            'reviewThreads': {'nodes': [{'id': f"PRRT_bench{index}", 'isResolved': True}] if reviews_per_pr else []},
+        }
+        dataset.pull_requests[repo['full_name']].append(pr)
+        all_prs.append((repo, pr))
+
+    # ---- Jira projects, statuses and sprints
+    sprint_ids = {}
+    for index in range(projects):
+        key = f"BEN{chr(ord('A') + index % 26)}{index // 26 or ''}"
+        project_id = str(20000 + index)
+        dataset.projects.append({
+            'id': project_id,
+            'key': key,
+            'name': f"Benchmark Project {index + 1}",
+            'projectTypeKey': 'software',
+            'issueTypes': [{'id': type_id, 'name': type_name, 'subtask': False, 'hierarchyLevel': 0}
+                           for type_id, type_name in ISSUE_TYPES],
+        })
+        dataset.statuses[key] = [{
+            'id': type_id,
+            'name': type_name,
+            'subtask': False,
+            'statuses': [{'id': status_id, 'name': status_name,
+                          'statusCategory': {'key': category, 'name': status_name}}
+                         for status_id, status_name, category in WORKFLOW],
+        } for type_id, type_name in ISSUE_TYPES]
+
+        board_id = 100 + index
+        sprint_ids[key] = []
+        for sprint_index in range(sprints):
+            sprint_id = 1000 * (index + 1) + sprint_index
+            start = now - timedelta(days=14 * (sprints - sprint_index) + 7)
+            sprint_ids[key].append((board_id, {
+                'id': sprint_id, 'boardId': board_id, 'name': f"{key} Sprint {sprint_index + 1}", 'state': 'closed',
+                'startDate': start.isoformat(), 'endDate': (start + timedelta(days=14)).isoformat(),
+                'completeDate': (start + timedelta(days=14)).isoformat(),
+            }))
+
+    # ---- Jira issues with changelogs, dev status and sprint membership
+    sprint_members: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+    for index in range(issues if projects else 0):
+        project = dataset.projects[index % projects]
+        type_id, type_name = ISSUE_TYPES[index % len(ISSUE_TYPES)]
+        issue_id = str(300000 + index)
+        created = now - timedelta(days=rng.randint(20, 180), minutes=rng.randint(0, 1440))
+
+        histories = []
+        current = created
+        for change_index in range(changelogs_per_issue):
+            current += timedelta(hours=rng.randint(1, 72))
+            from_status = WORKFLOW[change_index % len(WORKFLOW)]
+            to_status = WORKFLOW[(change_index + 1) % len(WORKFLOW)]
+            histories.append({
+                'id': f"{issue_id}{change_index:04d}",
+                'created': _jira_time(current),
+                'author': _jira_user(rng.choice(PEOPLE)),
+                'items': [{'field': 'status', 'fieldtype': 'jira', 'from': from_status[0],
+                           'fromString': from_status[1], 'to': to_status[0], 'toString': to_status[1]}],
+            })
+        final_status = WORKFLOW[changelogs_per_issue % len(WORKFLOW)]
+
+        fields = {
+            'summary': f"{rng.choice(SUBJECTS).capitalize()} {rng.choice(ACTIONS)}",
+            'description': f"Synthetic issue {index + 1} generated for the ETL pipeline benchmark.",
+            'project': {'id': project['id'], 'key': project['key'], 'name': project['name']},
+            'issuetype': {'id': type_id, 'name': type_name, 'subtask': False},
+            'status': {'id': final_status[0], 'name': final_status[1],
+                       'statusCategory': {'key': final_status[2]}},
+            'priority': {'name': rng.choice(PRIORITIES)},
+            'resolution': {'name': 'Done'} if final_status[2] == 'done' else None,
+            'assignee': _jira_user(rng.choice(PEOPLE)),
+            'reporter': _jira_user(rng.choice(PEOPLE)),
+            'labels': ['benchmark'],
+            'created': _jira_time(created),
+            'updated': _jira_time(current),
+            STORY_POINTS_FIELD_ID: float(rng.choice([1, 2, 3, 5, 8])),
+        }
+
+        if all_prs and rng.random() < linked_issue_ratio:
+            repo, pr = all_prs[index % len(all_prs)]
+            fields[DEVELOPMENT_FIELD_ID] = '{pullrequest={dataType=pullrequest, state=MERGED, stateCount=1}}'
+            dataset.dev_status[issue_id] = {'errors': [], 'detail': [{'pullRequests': [{
+                'id': f"#{pr['number']}",
+                'name': pr['title'],
+                'url': f"https://github.com/{repo['full_name']}/pull/{pr['number']}",
+                'repositoryId': str(repo['id']),
+                'repositoryName': repo['full_name'],
+                'status': 'MERGED' if pr['state'] == 'MERGED' else 'OPEN',
+                'source': {'branch': pr['headRefName']},
+                'destination': {'branch': pr['baseRefName']},
+                'lastUpdate': pr['updatedAt'],
+            }]}]}
+
+        if sprint_ids.get(project['key']):
+            board_id, sprint = sprint_ids[project['key']][index // projects % sprints]
+            fields[SPRINTS_FIELD_ID] = [sprint]
+            sprint_members.setdefault((board_id, sprint['id']), []).append(
+                {'id': int(issue_id), 'key': f"{project['key']}-{index // projects + 1}",
+                 'done': final_status[2] == 'done', 'points': fields[STORY_POINTS_FIELD_ID]})
+
+        dataset.issues.append({
+            'id': issue_id,
+            'key': f"{project['key']}-{index // projects + 1}",
+            'fields': fields,
+            'changelog': {'startAt': 0, 'maxResults': len(histories), 'total': len(histories),
+                          'histories': histories},
+        })
+
+    for project in dataset.projects:
+        for board_id, sprint in sprint_ids[project['key']]:
+            members = sprint_members.get((board_id, sprint['id']), [])
+            completed = [member for member in members if member['done']]
+            not_completed = [member for member in members if not member['done']]
+
+            dataset.sprint_reports[(board_id, sprint['id'])] = {
+                'contents': {
+                    'completedIssues': [{'id': item['id'], 'key': item['key']} for item in completed],
+                    'issuesNotCompletedInCurrentSprint': [{'id': item['id'], 'key': item['key']} for item in not_completed],
+                    'puntedIssues': [],
+                    'issueKeysAddedDuringSprint': {},
+                    'completedIssuesEstimateSum': _estimate_sum(completed),
+                    'issuesNotCompletedEstimateSum': _estimate_sum(not_completed),
+                    'puntedIssuesEstimateSum': {'value': 0, 'text': '0'},
+                    'allIssuesEstimateSum': _estimate_sum(members),
+                },
+                'sprint': {**sprint, 'goal': ''},
+                'lastUserToClose': PEOPLE[0],
+            }
+
+    return dataset
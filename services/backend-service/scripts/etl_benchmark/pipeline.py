@@ -0,0 +1,230 @@
+"""
+Drives queued ETL jobs through extraction -> transform -> embedding and times them.
+
+PipelineBenchmark runs worker threads per stage that consume the tenant's tier
+queues the way BaseWorker.start_consuming does (get_single_message, then
+_handle_message under the message's priority, then record_done), against
+whatever broker QueueManager talks to: RabbitMQ, or the InMemoryBroker when
+StandIns is installed. It stops once every queue stayed empty with no message
+in flight for idle_seconds.
+
+Per stage it records how long each message waited in the queue (from the
+'enqueued_at' stamp set by route_message) and how long processing took.
+Rows are counted in the tenant's ETL target tables by created_at /
+last_updated_at since the start of the run, so re-runs that update existing
+rows still count them.
+"""
+
+import math
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+STAGES = ('extraction', 'transform', 'embedding')
+
+# ETL target tables counted as written rows (all have tenant_id, created_at, last_updated_at)
+ROW_TABLES = ('work_items', 'changelogs', 'sprints', 'work_items_sprints', 'work_items_prs_links',
+              'repositories', 'prs', 'prs_commits', 'prs_reviews', 'prs_comments', 'qdrant_vectors')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+@dataclass
+class StageStats:
+    """Queue wait and processing time of every message one stage handled."""
+    waits: List[float] = field(default_factory=list)
+    latencies: List[float] = field(default_factory=list)
+
+    def record(self, wait_seconds: float, processing_seconds: float):
+        self.waits.append(max(wait_seconds, 0.0))
+        self.latencies.append(processing_seconds)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'messages': len(self.latencies),
+            'busy_seconds': sum(self.latencies),
+            'wait_p50': percentile(self.waits, 50),
+            'wait_p95': percentile(self.waits, 95),
+            'p50': percentile(self.latencies, 50),
+            'p95': percentile(self.latencies, 95),
+            'p99': percentile(self.latencies, 99),
+            'max': max(self.latencies, default=0.0),
+        }
+
+
+@dataclass
+class BenchmarkReport:
+    """Throughput and per-stage latency of one benchmark run."""
+    wall_seconds: float
+    stages: Dict[str, Dict[str, float]]
+    rows: Dict[str, int]
+
+    @property
+    def messages(self) -> int:
+        return sum(int(stage['messages']) for stage in self.stages.values())
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return sum(self.rows.values()) / self.wall_seconds if self.wall_seconds else 0.0
+
+
+def count_rows(tenant_id: int, since) -> Dict[str, int]:
+    """Rows of each ROW_TABLES table created or updated for a tenant since a (naive, default tz) time."""
+    from app.core.database import get_database
+
+    counts = {}
+    with get_database().get_read_session_context() as session:
+        for table in ROW_TABLES:
+            counts[table] = session.execute(text(f"""
+                SELECT COUNT(*) FROM {table}
+                WHERE tenant_id = :tenant_id AND (created_at >= :since OR last_updated_at >= :since)
+            """), {'tenant_id': tenant_id, 'since': since}).scalar() or 0
+    return counts
+
+
+def mark_job_running(tenant_id: int, job_id: int) -> str:
+    """Set a job RUNNING with a new execution token, as run_job_now does (without its checks)."""
+    from app.core.database import get_database
+    from app.core.utils import DateTimeHelper
+
+    token = str(uuid.uuid4())
+    now = DateTimeHelper.now_default()
+    with get_database().get_write_session_context() as session:
+        session.execute(text("""
+            UPDATE etl_jobs
+            SET status = jsonb_set(jsonb_set(status, ARRAY['overall'], to_jsonb('RUNNING'::text)),
+                                   ARRAY['token'], to_jsonb(CAST(:token AS text))),
+                last_run_started_at = :now,
+                last_updated_at = :now,
+                error_message = NULL
+            WHERE id = :job_id AND tenant_id = :tenant_id
+        """), {'token': token, 'now': now, 'job_id': job_id, 'tenant_id': tenant_id})
+        session.commit()
+    return token
+
+
+class PipelineBenchmark:
+    """Consumes one tenant's extraction, transform and embedding queues until they drain."""
+
+    def __init__(self, tenant_id: int, workers_per_stage: int = 1, idle_seconds: float = 3.0,
+                 max_seconds: Optional[float] = None, queue_manager=None):
+        from app.core.config import get_settings
+        from app.etl.workers.fair_scheduler import tenant_queue_names
+        from app.etl.workers.queue_manager import QueueManager
+
+        self.tenant_id = tenant_id
+        self.workers_per_stage = workers_per_stage
+        self.idle_seconds = idle_seconds
+        self.max_seconds = max_seconds
+        self.queue_manager = queue_manager or QueueManager()
+        self.tier = self.queue_manager._get_tenant_tier(tenant_id)
+
+        self.queues: Dict[str, List[str]] = {}
+        for stage in STAGES:
+            base_queue = self.queue_manager.get_tier_queue_name(self.tier, stage)
+            sub_queues = tenant_queue_names(base_queue, tenant_id) if get_settings().ETL_FAIR_SCHEDULING_ENABLED else []
+            self.queues[stage] = [*sub_queues, base_queue]
+
+        self.stats = {stage: StageStats() for stage in STAGES}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._active = 0
+        self._last_activity = 0.0
+
+    def _create_worker(self, stage: str, number: int):
+        if stage == 'extraction':
+            from app.etl.workers.extraction_worker_router import ExtractionWorker
+            return ExtractionWorker(queue_name=self.queues[stage][-1], worker_number=number)
+        if stage == 'transform':
+            from app.etl.workers.transform_worker_router import TransformWorker
+            return TransformWorker(queue_name=self.queues[stage][-1], worker_number=number)
+        from app.etl.workers.embedding_worker_router import EmbeddingWorker
+        return EmbeddingWorker(tier=self.tier)
+
+    def _next_message(self, stage: str):
+        for queue_name in self.queues[stage]:
+            message = self.queue_manager.get_single_message(queue_name, timeout=0.1)
+            if message:
+                return queue_name, message
+        return None, None
+
+    def _consume(self, stage: str, number: int):
+        from app.etl.workers.fair_scheduler import message_priority
+        from app.etl.workers.inflight_tracker import get_inflight_tracker
+
+        worker = self._create_worker(stage, number)
+        while not self._stop.is_set():
+            with self._lock:
+                self._active += 1  # Counted before polling so a message being fetched keeps the run alive
+            queue_name, message = self._next_message(stage)
+
+            if message is None:
+                with self._lock:
+                    self._active -= 1
+                    if self._active == 0 and time.monotonic() - self._last_activity >= self.idle_seconds:
+                        self._stop.set()
+                time.sleep(0.05)
+                continue
+
+            wait = time.time() - message.get('enqueued_at', time.time())
+            started = time.perf_counter()
+            try:
+                with message_priority(message.get('priority')):
+                    worker._handle_message(message)
+            finally:
+                get_inflight_tracker().record_done(message, queue_name)
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.stats[stage].record(wait, elapsed)
+                    self._active -= 1
+                    self._last_activity = time.monotonic()
+
+    def run(self, start_jobs: Callable[[], None]) -> BenchmarkReport:
+        """
+        Queue the jobs with start_jobs(), then process messages until the pipeline drains.
+
+        Args:
+            start_jobs: Publishes the first extraction message of each job
+
+        Returns:
+            BenchmarkReport (wall time ends at the last processed message)
+        """
+        from app.core.utils import DateTimeHelper
+
+        since = DateTimeHelper.now_default()
+        started = time.monotonic()
+        self._last_activity = started
+        start_jobs()
+
+        threads = [threading.Thread(target=self._consume, args=(stage, number), name=f"bench-{stage}-{number}",
+                                    daemon=True)
+                   for stage in STAGES for number in range(self.workers_per_stage)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            if self.max_seconds and time.monotonic() - started > self.max_seconds:
+                self._stop.set()
+            time.sleep(0.1)
+        for thread in threads:
+            thread.join()
+
+        return BenchmarkReport(
+            wall_seconds=self._last_activity - started,
+            stages={stage: stats.summary() for stage, stats in self.stats.items()},
+            rows=count_rows(self.tenant_id, since)
+        )
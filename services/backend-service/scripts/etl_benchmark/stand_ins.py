@@ -0,0 +1,236 @@
+"""
+In-process stand-ins for the ETL pipeline's external services.
+
+- InMemoryBroker replaces RabbitMQ behind QueueManager.get_channel(), so every
+  publish path (publish_* helpers and workers calling channel.basic_publish
+  with route_message) and get_single_message() work unchanged
+- An in-memory Qdrant (qdrant-client local mode) replaces the Qdrant server
+  behind PulseQdrantClient.initialize(), shared by all clients of the process
+- Deterministic embeddings replace HybridProviderManager's providers: each text
+  gets a unit vector seeded by its hash, optionally after a fixed delay that
+  stands in for model time
+
+StandIns installs any combination of them for the duration of a with block.
+PostgreSQL is always the real database: the workers' transforms are SQL.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import pika
+
+EMBEDDING_DIMENSIONS = 384
+
+
+class InMemoryChannel:
+    """The subset of pika's BlockingChannel used by QueueManager and the workers."""
+
+    def __init__(self, broker: 'InMemoryBroker'):
+        self.broker = broker
+        self.is_open = True
+        self.connection = SimpleNamespace(channel=lambda: InMemoryChannel(broker))
+
+    def queue_declare(self, queue: str, durable: bool = False, arguments: Optional[Dict[str, Any]] = None,
+                      passive: bool = False):
+        if passive and not self.broker.exists(queue):
+            self.is_open = False  # As RabbitMQ does after a failed passive declare
+            raise pika.exceptions.ChannelClosedByBroker(404, f"NOT_FOUND - no queue '{queue}'")
+        return SimpleNamespace(method=SimpleNamespace(
+            queue=queue, message_count=self.broker.declare(queue), consumer_count=0
+        ))
+
+    def basic_publish(self, exchange: str, routing_key: str, body, properties=None):
+        self.broker.publish(routing_key, body, properties)
+
+    def basic_get(self, queue: str, auto_ack: bool = False):
+        delivery = self.broker.get(queue, auto_ack)
+        if delivery is None:
+            return None, None, None
+        delivery_tag, body, properties = delivery
+        return SimpleNamespace(delivery_tag=delivery_tag, routing_key=queue), properties, body
+
+    def basic_ack(self, delivery_tag: int):
+        self.broker.ack(delivery_tag)
+
+    def basic_nack(self, delivery_tag: int, requeue: bool = True):
+        self.broker.nack(delivery_tag, requeue)
+
+    def close(self):
+        self.is_open = False
+
+
+class InMemoryBroker:
+    """Named FIFO queues of (body, properties) with unacked-message tracking, shared by all threads."""
+
+    def __init__(self):
+        self._queues: Dict[str, Deque[Tuple[bytes, Any]]] = {}
+        self._unacked: Dict[int, Tuple[str, Tuple[bytes, Any]]] = {}
+        self._next_tag = 0
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def declare(self, queue: str) -> int:
+        with self._lock:
+            return len(self._queues.setdefault(queue, deque()))
+
+    def exists(self, queue: str) -> bool:
+        with self._lock:
+            return queue in self._queues
+
+    def publish(self, queue: str, body, properties=None):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        with self._lock:
+            self._queues.setdefault(queue, deque()).append((body, properties))
+            self.published += 1
+
+    def get(self, queue: str, auto_ack: bool = False) -> Optional[Tuple[int, bytes, Any]]:
+        with self._lock:
+            messages = self._queues.get(queue)
+            if not messages:
+                return None
+            delivery = messages.popleft()
+            self._next_tag += 1
+            if not auto_ack:
+                self._unacked[self._next_tag] = (queue, delivery)
+            return (self._next_tag, *delivery)
+
+    def ack(self, delivery_tag: int):
+        with self._lock:
+            self._unacked.pop(delivery_tag, None)
+
+    def nack(self, delivery_tag: int, requeue: bool = True):
+        with self._lock:
+            queue, delivery = self._unacked.pop(delivery_tag, (None, None))
+            if requeue and queue is not None:
+                self._queues[queue].appendleft(delivery)
+
+    def depth(self, queue: str) -> int:
+        with self._lock:
+            return len(self._queues.get(queue, ()))
+
+    def depths(self) -> Dict[str, int]:
+        with self._lock:
+            return {queue: len(messages) for queue, messages in self._queues.items() if messages}
+
+    def peek(self, queue: str) -> List[Dict[str, Any]]:
+        """Decoded messages waiting in a queue (oldest first)."""
+        from app.etl.workers.message_codec import decode_message
+
+        with self._lock:
+            deliveries = list(self._queues.get(queue, ()))
+        return [decode_message(body, properties) for body, properties in deliveries]
+
+    @contextmanager
+    def get_channel(self, queue_manager=None):
+        """Drop-in for QueueManager.get_channel (installed as the method)."""
+        channel = InMemoryChannel(self)
+        try:
+            yield channel
+        finally:
+            channel.close()
+
+
+def deterministic_embedding(text: str, dimensions: int = EMBEDDING_DIMENSIONS) -> List[float]:
+    """Unit vector seeded by the text's hash (same text, same vector)."""
+    rng = random.Random(hashlib.sha256(text.encode('utf-8')).digest())
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+class StandIns:
+    """
+    Installs the stand-ins by patching the classes the workers instantiate.
+
+    Usage:
+        with StandIns(broker=True, vector_store=True, embeddings=True) as stand_ins:
+            ...  # stand_ins.broker is the InMemoryBroker (None when broker=False)
+    """
+
+    def __init__(self, broker: bool = True, vector_store: bool = True, embeddings: bool = True,
+                 embedding_dimensions: int = EMBEDDING_DIMENSIONS, embedding_latency_ms: float = 0.0):
+        self.broker = InMemoryBroker() if broker else None
+        self.use_vector_store = vector_store
+        self.use_embeddings = embeddings
+        self.embedding_dimensions = embedding_dimensions
+        self.embedding_latency = embedding_latency_ms / 1000.0
+        self.embedded_texts = 0
+        self.qdrant = None
+        self._patches: List[Tuple[Any, str, Any]] = []
+
+    def _patch(self, owner, name: str, replacement):
+        self._patches.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, replacement)
+
+    def install(self) -> 'StandIns':
+        if self.broker is not None:
+            from app.etl.workers.queue_manager import QueueManager
+            broker = self.broker
+            self._patch(QueueManager, 'get_channel', lambda queue_manager: broker.get_channel(queue_manager))
+
+        if self.use_vector_store:
+            from qdrant_client import QdrantClient
+            from app.ai.qdrant_client import PulseQdrantClient
+            self.qdrant = QdrantClient(location=':memory:')
+            qdrant = self.qdrant
+
+            async def initialize(client) -> bool:
+                client.client = qdrant
+                client.connected = True
+                return True
+
+            self._patch(PulseQdrantClient, 'initialize', initialize)
+
+        if self.use_embeddings:
+            from app.ai.hybrid_provider_manager import HybridProviderManager, ProviderResponse
+            stand_ins = self
+
+            async def initialize_providers(manager, tenant_id: int) -> bool:
+                manager.providers = {'benchmark': None}
+                return True
+
+            async def generate_embeddings(manager, texts: List[str], tenant_id: int,
+                                          preferred_provider: str = "auto") -> ProviderResponse:
+                started = time.time()
+                if stand_ins.embedding_latency:
+                    await asyncio.sleep(stand_ins.embedding_latency)
+                stand_ins.embedded_texts += len(texts)
+                return ProviderResponse(
+                    success=bool(texts),
+                    data=[deterministic_embedding(text, stand_ins.embedding_dimensions) for text in texts],
+                    provider_used='benchmark',
+                    cost=0.0,
+                    processing_time=time.time() - started,
+                    error=None if texts else "No texts provided"
+                )
+
+            async def cleanup(manager):
+                pass
+
+            self._patch(HybridProviderManager, 'initialize_providers', initialize_providers)
+            self._patch(HybridProviderManager, 'generate_embeddings', generate_embeddings)
+            self._patch(HybridProviderManager, 'cleanup', cleanup)
+
+        return self
+
+    def uninstall(self):
+        while self._patches:
+            owner, name, original = self._patches.pop()
+            setattr(owner, name, original)
+        if self.qdrant is not None:
+            self.qdrant.close()
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Migration 0006: DORA Lead Time Facts
+Description: Creates the precomputed DORA lead-time fact table read by the DORA metrics endpoints
+Author: Pulse Platform Team
+Date: 2026-10-18
+
+This migration creates:
+- dora_lead_time_facts: one row per done, level-0 Story/Tech Enhancement work item with a
+  merged PR (the rows the DORA endpoints used to rebuild with a seven-way join per request)
+- dora_lead_time_facts_refreshes: per-tenant refresh watermark
+- Indexes on the fact table filter columns
+- last_updated_at indexes used to find changed work items and PR links for incremental refresh
+- Initial backfill for all tenants
+
+The table is kept up to date by DoraLeadTimeFactsService at the end of each ETL job.
+"""
+
+import os
+import sys
+import argparse
+import psycopg2
+from datetime import datetime
+
+# Add the backend service to the path to access database configuration
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+def get_database_connection():
+    """Get database connection using backend service configuration."""
+    try:
+        from app.core.config import Settings
+        config = Settings()
+
+        connection = psycopg2.connect(
+            host=config.POSTGRES_HOST,
+            port=config.POSTGRES_PORT,
+            database=config.POSTGRES_DATABASE,
+            user=config.POSTGRES_USER,
+            password=config.POSTGRES_PASSWORD
+        )
+        return connection
+    except Exception as e:
+        print(f"❌ Error connecting to database: {e}")
+        raise
+
+def apply(connection):
+    """Apply the DORA lead time facts migration."""
+    print("📋 Starting Migration 0006: DORA Lead Time Facts")
+    print("=" * 80)
+
+    cursor = connection.cursor()
+
+    print("\n📊 Creating dora_lead_time_facts table...")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS dora_lead_time_facts (
+            work_item_id INTEGER PRIMARY KEY REFERENCES work_items(id) ON DELETE CASCADE,
+            tenant_id INTEGER NOT NULL REFERENCES tenants(id),
+
+            -- Work item attributes used for filtering and display
+            issue_key VARCHAR,
+            project_key VARCHAR,
+            team VARCHAR,
+            wit_from VARCHAR,
+            wit_to VARCHAR,
+            status_to VARCHAR,
+            story_points DOUBLE PRECISION,
+            priority VARCHAR,
+            assignee VARCHAR,
+            issue_created_at TIMESTAMP,
+            issue_updated_at TIMESTAMP,
+
+            -- Lead time
+            work_last_completed_at TIMESTAMP NOT NULL,
+            total_lead_time_seconds DOUBLE PRECISION NOT NULL,
+
+            -- Aha! custom fields (custom_field_01..05)
+            aha_epic_url VARCHAR,
+            aha_initiative VARCHAR,
+            aha_project_code VARCHAR,
+            project_code VARCHAR,
+            aha_milestone VARCHAR,
+
+            refreshed_at TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+    """)
+
+    print("📊 Creating dora_lead_time_facts_refreshes table...")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS dora_lead_time_facts_refreshes (
+            tenant_id INTEGER PRIMARY KEY REFERENCES tenants(id),
+            last_refreshed_at TIMESTAMP NOT NULL,
+            last_full_refresh_at TIMESTAMP,
+            rows_refreshed INTEGER NOT NULL DEFAULT 0
+        );
+    """)
+
+    print("\n📊 Creating indexes...")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_dora_lead_time_facts_completed ON dora_lead_time_facts(tenant_id, work_last_completed_at DESC);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_dora_lead_time_facts_team ON dora_lead_time_facts(tenant_id, team);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_dora_lead_time_facts_project_key ON dora_lead_time_facts(tenant_id, project_key);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_dora_lead_time_facts_wit_to ON dora_lead_time_facts(tenant_id, wit_to);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_dora_lead_time_facts_aha_initiative ON dora_lead_time_facts(tenant_id, aha_initiative);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_dora_lead_time_facts_aha_project_code ON dora_lead_time_facts(tenant_id, aha_project_code);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_dora_lead_time_facts_aha_milestone ON dora_lead_time_facts(tenant_id, aha_milestone);")
+
+    # Incremental refresh looks up rows changed since the last refresh
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_items_tenant_last_updated ON work_items(tenant_id, last_updated_at);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_items_prs_links_tenant_last_updated ON work_items_prs_links(tenant_id, last_updated_at);")
+    print("✅ All indexes created")
+
+    print("\n📊 Backfilling dora_lead_time_facts for all tenants...")
+    now = datetime.now()
+    cursor.execute("""
+        INSERT INTO dora_lead_time_facts (
+            work_item_id, tenant_id, issue_key, project_key, team, wit_from, wit_to, status_to,
+            story_points, priority, assignee, issue_created_at, issue_updated_at,
+            work_last_completed_at, total_lead_time_seconds,
+            aha_epic_url, aha_initiative, aha_project_code, project_code, aha_milestone, refreshed_at
+        )
+        SELECT
+            i.id, i.tenant_id, i.key, p.key, i.team, im.wit_from, im.wit_to, sm.status_to,
+            i.story_points, i.priority, i.assignee, i.created, i.updated,
+            i.work_last_completed_at, i.total_lead_time_seconds,
+            i.custom_field_01, i.custom_field_02, i.custom_field_03, i.custom_field_04, i.custom_field_05,
+            %(now)s
+        FROM
+            work_items i
+        INNER JOIN projects p               ON i.project_id = p.id
+        INNER JOIN statuses s               ON i.status_id = s.id
+        INNER JOIN statuses_mappings sm     ON s.status_mapping_id = sm.id
+        INNER JOIN wits it                  ON i.wit_id = it.id
+        INNER JOIN wits_mappings im         ON it.wits_mapping_id = im.id
+        INNER JOIN wits_hierarchies ih      ON im.wits_hierarchy_id = ih.id
+        WHERE
+            sm.status_to = 'Done'
+            AND ih.level_number = 0
+            AND im.wit_to IN ('Story', 'Tech Enhancement')
+            AND i.total_lead_time_seconds > 0
+            AND i.work_last_completed_at IS NOT NULL
+            AND EXISTS (
+                SELECT 1
+                FROM work_items_prs_links jprl
+                WHERE jprl.work_item_id = i.id
+                  AND jprl.pr_status = 'MERGED'
+                  AND jprl.active = true
+            )
+            AND i.active = true
+            AND p.active = true
+            AND s.active = true
+            AND sm.active = true
+            AND it.active = true
+            AND im.active = true
+            AND ih.active = true
+        ON CONFLICT (work_item_id) DO NOTHING;
+    """, {'now': now})
+    print(f"✅ Backfilled {cursor.rowcount} fact rows")
+
+    cursor.execute("""
+        INSERT INTO dora_lead_time_facts_refreshes (tenant_id, last_refreshed_at, last_full_refresh_at, rows_refreshed)
+        SELECT t.id, %(now)s, %(now)s, COUNT(f.work_item_id)
+        FROM tenants t
+        LEFT JOIN dora_lead_time_facts f ON f.tenant_id = t.id
+        GROUP BY t.id
+        ON CONFLICT (tenant_id) DO NOTHING;
+    """, {'now': now})
+
+    print("\n" + "=" * 80)
+    print("✅ Migration 0006 completed successfully!")
+    print("=" * 80)
+
+def rollback(connection):
+    """Rollback the DORA lead time facts migration."""
+    print("📋 Rolling back Migration 0006: DORA Lead Time Facts")
+    print("=" * 80)
+
+    cursor = connection.cursor()
+
+    cursor.execute("DROP INDEX IF EXISTS idx_work_items_tenant_last_updated;")
+    cursor.execute("DROP INDEX IF EXISTS idx_work_items_prs_links_tenant_last_updated;")
+
+    for table in ['dora_lead_time_facts_refreshes', 'dora_lead_time_facts']:
+        print(f"🗑️  Dropping table: {table}")
+        cursor.execute(f"DROP TABLE IF EXISTS {table} CASCADE;")
+
+    print("\n" + "=" * 80)
+    print("✅ Migration 0006 rollback completed successfully!")
+    print("=" * 80)
+
+def main():
+    """Main migration execution function."""
+    parser = argparse.ArgumentParser(description='Migration 0006: DORA Lead Time Facts')
+    parser.add_argument('--rollback', action='store_true', help='Rollback the migration')
+    args = parser.parse_args()
+
+    connection = None
+    try:
+        connection = get_database_connection()
+
+        if args.rollback:
+            rollback(connection)
+        else:
+            apply(connection)
+
+        connection.commit()
+
+    except Exception as e:
+        if connection:
+            connection.rollback()
+        print(f"\n❌ Migration failed: {e}")
+        raise
+    finally:
+        if connection:
+            connection.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Migration 0007: Keyset Pagination Indexes
+Description: Composite tenant-scoped indexes matching the keyset (cursor) order of the list endpoints
+Author: Pulse Platform Team
+Date: 2026-10-18
+
+This migration creates:
+- idx_work_items_tenant_created_id: GET /api/work_items (newest first)
+- idx_work_items_tenant_project_created_id: GET /api/projects/{id}/issues (newest first)
+- idx_prs_tenant_pr_created_id: GET /api/pull-requests (newest first)
+- idx_projects_tenant_name_id: GET /api/projects (by name)
+
+Nullable timestamps are indexed as COALESCE(column, '0001-01-01 00:00:00'::timestamp),
+the exact expression app/core/pagination.py sorts and compares on.
+"""
+
+import os
+import sys
+import argparse
+import psycopg2
+
+# Add the backend service to the path to access database configuration
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+def get_database_connection():
+    """Get database connection using backend service configuration."""
+    try:
+        from app.core.config import Settings
+        config = Settings()
+
+        connection = psycopg2.connect(
+            host=config.POSTGRES_HOST,
+            port=config.POSTGRES_PORT,
+            database=config.POSTGRES_DATABASE,
+            user=config.POSTGRES_USER,
+            password=config.POSTGRES_PASSWORD
+        )
+        return connection
+    except Exception as e:
+        print(f"❌ Error connecting to database: {e}")
+        raise
+
+# (index name, table, columns)
+INDEXES = [
+    ('idx_work_items_tenant_created_id', 'work_items',
+     "tenant_id, COALESCE(created_at, '0001-01-01 00:00:00'::timestamp), id"),
+    ('idx_work_items_tenant_project_created_id', 'work_items',
+     "tenant_id, project_id, COALESCE(created_at, '0001-01-01 00:00:00'::timestamp), id"),
+    ('idx_prs_tenant_pr_created_id', 'prs',
+     "tenant_id, COALESCE(pr_created_at, '0001-01-01 00:00:00'::timestamp), id"),
+    ('idx_projects_tenant_name_id', 'projects', "tenant_id, name, id"),
+]
+
+def apply(connection):
+    """Apply the keyset pagination indexes migration."""
+    print("📋 Starting Migration 0007: Keyset Pagination Indexes")
+    print("=" * 80)
+
+    cursor = connection.cursor()
+
+    print("\n📊 Creating composite pagination indexes...")
+    for name, table, columns in INDEXES:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns});")
+        print(f"✅ {name}")
+
+    # Refresh planner statistics for the new expression indexes
+    for table in sorted({table for _, table, _ in INDEXES}):
+        cursor.execute(f"ANALYZE {table};")
+
+    print("\n" + "=" * 80)
+    print("✅ Migration 0007 completed successfully!")
+    print("=" * 80)
+
+def rollback(connection):
+    """Rollback the keyset pagination indexes migration."""
+    print("📋 Rolling back Migration 0007: Keyset Pagination Indexes")
+    print("=" * 80)
+
+    cursor = connection.cursor()
+
+    for name, _, _ in INDEXES:
+        print(f"🗑️  Dropping index: {name}")
+        cursor.execute(f"DROP INDEX IF EXISTS {name};")
+
+    print("\n" + "=" * 80)
+    print("✅ Migration 0007 rollback completed successfully!")
+    print("=" * 80)
+
+def main():
+    """Main migration execution function."""
+    parser = argparse.ArgumentParser(description='Migration 0007: Keyset Pagination Indexes')
+    parser.add_argument('--rollback', action='store_true', help='Rollback the migration')
+    args = parser.parse_args()
+
+    connection = None
+    try:
+        connection = get_database_connection()
+
+        if args.rollback:
+            rollback(connection)
+        else:
+            apply(connection)
+
+        connection.commit()
+
+    except Exception as e:
+        if connection:
+            connection.rollback()
+        print(f"\n❌ Migration failed: {e}")
+        raise
+    finally:
+        if connection:
+            connection.close()
+
+if __name__ == "__main__":
+    main()
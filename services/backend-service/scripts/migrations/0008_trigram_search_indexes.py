@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Migration 0008: Trigram Search Indexes
+Description: pg_trgm GIN indexes for substring (ILIKE '%term%') filters of the list and DORA endpoints
+Author: Pulse Platform Team
+Date: 2026-10-18
+
+This migration creates:
+- pg_trgm extension
+- One GIN (column gin_trgm_ops) index per searchable column listed in
+  app/core/text_search.py TRIGRAM_INDEXED_COLUMNS:
+  - work_items.assignee
+  - prs.user_name
+  - repositories.name
+  - projects.name, projects.key
+  - dora_lead_time_facts team/project_key/priority/assignee and the Aha! fields
+
+The trigram index finds candidate rows across tenants; PostgreSQL combines it
+with the existing tenant_id indexes (BitmapAnd) for tenant-scoped searches.
+"""
+
+import os
+import sys
+import argparse
+import psycopg2
+
+# Add the backend service to the path to access database configuration
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+def get_database_connection():
+    """Get database connection using backend service configuration."""
+    try:
+        from app.core.config import Settings
+        config = Settings()
+
+        connection = psycopg2.connect(
+            host=config.POSTGRES_HOST,
+            port=config.POSTGRES_PORT,
+            database=config.POSTGRES_DATABASE,
+            user=config.POSTGRES_USER,
+            password=config.POSTGRES_PASSWORD
+        )
+        return connection
+    except Exception as e:
+        print(f"❌ Error connecting to database: {e}")
+        raise
+
+# (table, column) pairs; index names follow app/core/text_search.py trigram_index_name()
+TRIGRAM_COLUMNS = [
+    ('work_items', 'assignee'),
+    ('prs', 'user_name'),
+    ('repositories', 'name'),
+    ('projects', 'name'),
+    ('projects', 'key'),
+    ('dora_lead_time_facts', 'team'),
+    ('dora_lead_time_facts', 'project_key'),
+    ('dora_lead_time_facts', 'priority'),
+    ('dora_lead_time_facts', 'assignee'),
+    ('dora_lead_time_facts', 'aha_initiative'),
+    ('dora_lead_time_facts', 'aha_project_code'),
+    ('dora_lead_time_facts', 'project_code'),
+    ('dora_lead_time_facts', 'aha_milestone'),
+]
+
+def apply(connection):
+    """Apply the trigram search indexes migration."""
+    print("📋 Starting Migration 0008: Trigram Search Indexes")
+    print("=" * 80)
+
+    cursor = connection.cursor()
+
+    print("\n📦 Enabling pg_trgm extension...")
+    cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    print("✅ pg_trgm enabled")
+
+    print("\n📊 Creating trigram GIN indexes...")
+    for table, column in TRIGRAM_COLUMNS:
+        name = f"idx_{table}_{column}_trgm"
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops);")
+        print(f"✅ {name}")
+
+    print("\n" + "=" * 80)
+    print("✅ Migration 0008 completed successfully!")
+    print("=" * 80)
+
+def rollback(connection):
+    """Rollback the trigram search indexes migration."""
+    print("📋 Rolling back Migration 0008: Trigram Search Indexes")
+    print("=" * 80)
+
+    cursor = connection.cursor()
+
+    for table, column in TRIGRAM_COLUMNS:
+        name = f"idx_{table}_{column}_trgm"
+        print(f"🗑️  Dropping index: {name}")
+        cursor.execute(f"DROP INDEX IF EXISTS {name};")
+
+    # pg_trgm is left installed: other objects may depend on it
+
+    print("\n" + "=" * 80)
+    print("✅ Migration 0008 rollback completed successfully!")
+    print("=" * 80)
+
+def main():
+    """Main migration execution function."""
+    parser = argparse.ArgumentParser(description='Migration 0008: Trigram Search Indexes')
+    parser.add_argument('--rollback', action='store_true', help='Rollback the migration')
+    args = parser.parse_args()
+
+    connection = None
+    try:
+        connection = get_database_connection()
+
+        if args.rollback:
+            rollback(connection)
+        else:
+            apply(connection)
+
+        connection.commit()
+
+    except Exception as e:
+        if connection:
+            connection.rollback()
+        print(f"\n❌ Migration failed: {e}")
+        raise
+    finally:
+        if connection:
+            connection.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Test the async database router and routes migrated to it.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.async_database import AsyncDatabaseRouter
+from app.core.config import get_settings
+
+
+def _make_router(use_replica: bool):
+    """Router with mocked engines and session factories"""
+    primary_session, replica_session = AsyncMock(name='primary'), AsyncMock(name='replica')
+    factories = iter([MagicMock(return_value=primary_session), MagicMock(return_value=replica_session)])
+
+    settings = get_settings()
+    with patch('app.core.async_database.create_async_engine', return_value=MagicMock()), \
+            patch('app.core.async_database.async_sessionmaker', side_effect=lambda *args, **kwargs: next(factories)), \
+            patch.object(AsyncDatabaseRouter, '_setup_pgvector_event_listener'), \
+            patch('app.core.async_database.get_replica_lag_monitor', return_value=None), \
+            patch.object(settings, 'USE_READ_REPLICA', use_replica), \
+            patch.object(settings, 'POSTGRES_REPLICA_HOST', 'replica-host' if use_replica else None):
+        router = AsyncDatabaseRouter()
+    router.settings = MagicMock(USE_READ_REPLICA=use_replica, REPLICA_FALLBACK_ENABLED=True)
+    return router, primary_session, replica_session
+
+
+async def _read_session(router):
+    async with router.get_read_session_context() as session:
+        return session
+
+
+class FakeAsyncSession:
+    """Records statements and returns canned results in order"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return self.results.pop(0)
+
+    async def scalar(self, statement):
+        self.statements.append(statement)
+        return self.results.pop(0)
+
+    def compiled(self):
+        return [str(statement.compile(dialect=postgresql.dialect())) for statement in self.statements]
+
+
+class TestAsyncDatabaseRouter:
+    """Test read routing and replica fallback"""
+
+    def test_reads_use_replica_when_configured(self):
+        """Test that reads go to the replica and sessions are closed"""
+        router, primary_session, replica_session = _make_router(use_replica=True)
+
+        session = asyncio.run(_read_session(router))
+
+        assert session is replica_session
+        replica_session.close.assert_awaited_once()
+        primary_session.close.assert_not_awaited()
+
+    def test_failed_replica_falls_back_and_backs_off(self):
+        """Test fallback to primary and no replica retry within a minute"""
+        router, primary_session, replica_session = _make_router(use_replica=True)
+        replica_session.connection.side_effect = ConnectionError("replica down")
+
+        first = asyncio.run(_read_session(router))
+        replica_session.connection.side_effect = None
+        second = asyncio.run(_read_session(router))
+
+        assert first is primary_session and second is primary_session
+        assert router.replica_available is False
+
+        router.last_health_check -= timedelta(seconds=61)
+        assert asyncio.run(_read_session(router)) is replica_session
+
+    def test_primary_only_without_replica(self):
+        """Test that without a replica every read uses primary"""
+        router, primary_session, _ = _make_router(use_replica=False)
+
+        assert asyncio.run(_read_session(router)) is primary_session
+
+    def test_write_session_commits_or_rolls_back(self):
+        """Test commit on success and rollback on error"""
+        router, primary_session, _ = _make_router(use_replica=False)
+
+        async def write(fail):
+            async with router.get_write_session_context():
+                if fail:
+                    raise ValueError("boom")
+
+        asyncio.run(write(False))
+        try:
+            asyncio.run(write(True))
+        except ValueError:
+            pass
+
+        primary_session.commit.assert_awaited_once()
+        primary_session.rollback.assert_awaited_once()
+
+    def test_commit_lsn_failure_does_not_roll_back_commit(self):
+        """Test that a failed LSN read after commit is logged, not raised"""
+        router, primary_session, _ = _make_router(use_replica=True)
+        primary_session.info = {}
+        primary_session.scalar.side_effect = ConnectionError("connection dropped")
+
+        async def write():
+            async with router.get_write_session_context():
+                pass
+
+        asyncio.run(write())
+
+        primary_session.commit.assert_awaited_once()
+        primary_session.rollback.assert_not_awaited()
+        assert 'commit_lsn' not in primary_session.info
+
+
+class TestMigratedRoutes:
+    """Test routes that now await their queries"""
+
+    def test_lead_time_trend_aggregates_weeks(self):
+        """Test weekly buckets aggregated in SQL and fetched on an analytics session"""
+        from app.api import dora_routes
+
+        week = datetime(2025, 1, 6)
+        result = MagicMock()
+        result.fetchall.return_value = [
+            SimpleNamespace(period_start=week, issue_count=3, avg_lead_time_days=5.0, median_lead_time_days=4.0),
+        ]
+        session = FakeAsyncSession([result])
+        database = MagicMock()
+        database.get_analytics_session_context.return_value.__aenter__.return_value = session
+
+        with patch.object(dora_routes, 'get_async_database', return_value=database):
+            response = asyncio.run(dora_routes.lead_time_trend(
+                team=None, project_key=None, wit_to=None, aha_initiative=None,
+                aha_project_code=None, aha_milestone=None, user=SimpleNamespace(tenant_id=1)
+            ))
+
+        assert response['trend_data'] == [{
+            'week': week.isoformat(), 'week_label': 'Jan 06, 2025',
+            'value': 4.0, 'avg_value': 5.0, 'issue_count': 3
+        }]
+
+    def test_work_item_stats_queries(self):
+        """Test that the stats route issues count and grouped queries through the async session"""
+        from app.api import issues
+
+        grouped = MagicMock()
+        grouped.all.return_value = [SimpleNamespace(status_name='Done', count=3)]
+        by_priority = MagicMock()
+        by_priority.all.return_value = [SimpleNamespace(priority='High', count=3)]
+        session = FakeAsyncSession([3, grouped, by_priority])
+
+        response = asyncio.run(issues.get_work_items_stats(tenant_id=1, db=session, user=SimpleNamespace(tenant_id=1)))
+
+        assert response['total_issues'] == 3
+        assert response['status_breakdown'] == [{'status': 'Done', 'count': 3}]
+        sql = session.compiled()
+        assert 'count(work_items.id)' in sql[0]
+        assert 'GROUP BY work_items.priority' in sql[2]
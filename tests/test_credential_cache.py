@@ -0,0 +1,136 @@
+"""
+Test the process-level integration credential cache.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from app.core.config import AppConfig
+from app.core.credential_cache import CredentialCache, CachedIntegration
+
+
+def _make_entry(integration_id=1, tenant_id=1, token='secret'):
+    return CachedIntegration(
+        id=integration_id,
+        tenant_id=tenant_id,
+        provider='GitHub',
+        type='Data',
+        base_url=None,
+        username=None,
+        token=token,
+        settings={},
+        active=True
+    )
+
+
+class TestCredentialCache:
+    """Test caching, expiry and invalidation"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.cache = CredentialCache(ttl_seconds=300)
+
+    def test_integration_loaded_once_within_ttl(self):
+        """Test that repeated lookups do not hit the database"""
+        with patch.object(self.cache, '_load_integration', return_value=_make_entry()) as mock_load:
+            first = self.cache.get_integration(1, 1)
+            second = self.cache.get_integration(1, 1)
+
+        assert first is second
+        assert mock_load.call_count == 1
+
+    def test_expired_entry_is_reloaded(self):
+        """Test that entries older than the TTL are loaded again"""
+        self.cache.ttl_seconds = 0
+        with patch.object(self.cache, '_load_integration', side_effect=[_make_entry(), _make_entry()]) as mock_load:
+            self.cache.get_integration(1, 1)
+            self.cache.get_integration(1, 1)
+
+        assert mock_load.call_count == 2
+
+    def test_entry_not_shared_across_tenants(self):
+        """Test that a cached integration is not returned for another tenant"""
+        with patch.object(self.cache, '_load_integration', side_effect=[_make_entry(tenant_id=1), None]):
+            assert self.cache.get_integration(1, 1) is not None
+            assert self.cache.get_integration(2, 1) is None
+
+    def test_invalidate_drops_clients(self):
+        """Test that invalidation forces a new integration and client"""
+        with patch.object(self.cache, '_load_integration', side_effect=[_make_entry(token='old'), _make_entry(token='new')]):
+            entry = self.cache.get_integration(1, 1)
+            client = self.cache.get_client(entry, 'github_graphql', lambda: object())
+            assert self.cache.get_client(entry, 'github_graphql', lambda: object()) is client
+
+            self.cache.invalidate(1)
+            entry = self.cache.get_integration(1, 1)
+
+        assert entry.token == 'new'
+        assert self.cache.get_client(entry, 'github_graphql', lambda: object()) is not client
+
+    def test_clients_not_shared_across_threads(self):
+        """Test that each worker thread gets its own client (sessions and rate limit state are not thread-safe)"""
+        entry = _make_entry()
+        client = self.cache.get_client(entry, 'github_graphql', object)
+        other_thread = {}
+
+        def build():
+            other_thread['client'] = self.cache.get_client(entry, 'github_graphql', object)
+            other_thread['again'] = self.cache.get_client(entry, 'github_graphql', object)
+
+        thread = threading.Thread(target=build)
+        thread.start()
+        thread.join()
+
+        assert self.cache.get_client(entry, 'github_graphql', object) is client
+        assert other_thread['client'] is other_thread['again']
+        assert other_thread['client'] is not client
+
+    def _load_with_password(self, password):
+        row = SimpleNamespace(id=1, tenant_id=1, provider='GitHub', type='Data', base_url=None, username=None,
+                              password=password, settings={}, active=True)
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = row
+        database = MagicMock()
+        database.get_read_session_context.return_value.__enter__.return_value = db
+
+        with patch('app.core.database.get_database', return_value=database):
+            return self.cache.get_integration(1, 1)
+
+    def test_undecryptable_token_is_not_returned(self):
+        """Test that a Fernet token that fails to decrypt is treated as missing, not passed on as ciphertext"""
+        from cryptography.fernet import Fernet
+        foreign_token = Fernet(Fernet.generate_key()).encrypt(b'token').decode()
+
+        entry = self._load_with_password(foreign_token)
+
+        assert entry is not None and entry.token is None
+        assert self.cache.decrypt(1, foreign_token) is None
+
+    def test_plaintext_token_still_loads(self):
+        """Test that tokens stored in plaintext (seed migrations without encryption) are used as is"""
+        entry = self._load_with_password('ghp_plaintext_seed_token')
+
+        assert entry.token == 'ghp_plaintext_seed_token'
+        assert self.cache.decrypt(2, 'ghp_plaintext_seed_token') == 'ghp_plaintext_seed_token'
+
+    def test_decrypt_reuses_result_until_ciphertext_changes(self):
+        """Test that decryption is cached per integration and encrypted value"""
+        key = AppConfig.load_key()
+        encrypted_a = AppConfig.encrypt_token('token-a', key)
+        encrypted_b = AppConfig.encrypt_token('token-b', key)
+
+        with patch('app.core.credential_cache.AppConfig.decrypt_token', wraps=AppConfig.decrypt_token) as mock_decrypt:
+            assert self.cache.decrypt(7, encrypted_a) == 'token-a'
+            assert self.cache.decrypt(7, encrypted_a) == 'token-a'
+            assert self.cache.decrypt(7, encrypted_b) == 'token-b'
+
+        assert mock_decrypt.call_count == 2
+        assert self.cache.decrypt(7, None) is None
+
+    def test_token_not_in_repr(self):
+        """Test that decrypted tokens are not leaked through repr/logging"""
+        assert 'secret' not in repr(_make_entry(token='secret'))
@@ -0,0 +1,225 @@
+"""
+Test the DORA lead-time fact table refresh and the routes reading from it.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.dora_lead_time_facts_service import (
+    DoraLeadTimeFactsService, REFRESH_LOCK_NAMESPACE, WATERMARK_OVERLAP
+)
+
+
+class FakeSession:
+    """Records statements and returns canned scalars/rowcounts"""
+
+    def __init__(self, watermark=None, dimensions_changed=False):
+        self.watermark = watermark
+        self.dimensions_changed = dimensions_changed
+        self.calls = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.calls.append((sql, params))
+        result = MagicMock()
+        if 'SELECT last_refreshed_at' in sql:
+            result.scalar.return_value = self.watermark
+        elif sql.startswith('SELECT EXISTS'):
+            result.scalar.return_value = self.dimensions_changed
+        result.rowcount = 3
+        return result
+
+    def statements(self, prefix):
+        return [(sql, params) for sql, params in self.calls if sql.strip().startswith(prefix)]
+
+
+class TestDoraLeadTimeFactsService:
+    """Test full vs incremental refresh selection"""
+
+    def test_first_refresh_is_full(self):
+        """Test that a tenant without a watermark gets a full rebuild"""
+        session = FakeSession(watermark=None)
+
+        result = DoraLeadTimeFactsService().refresh_tenant(session, 1)
+
+        assert result['mode'] == 'full'
+        delete_sql, _ = session.statements('DELETE')[0]
+        assert 'work_item_id IN' not in delete_sql
+        insert_sql, params = session.statements('INSERT INTO dora_lead_time_facts ')[0]
+        assert "sm.status_to = 'Done'" in insert_sql
+        assert "jprl.pr_status = 'MERGED'" in insert_sql
+        assert params['tenant_id'] == 1
+
+    def test_incremental_refresh_limits_to_changed_work_items(self):
+        """Test that only work items changed since the watermark (minus overlap) are re-derived"""
+        watermark = datetime(2025, 1, 6, 12, 0)
+        session = FakeSession(watermark=watermark)
+
+        result = DoraLeadTimeFactsService().refresh_tenant(session, 1)
+
+        assert result == {'mode': 'incremental', 'rows_deleted': 3, 'rows_inserted': 3}
+        delete_sql, params = session.statements('DELETE')[0]
+        assert 'work_items_prs_links' in delete_sql
+        assert params['since'] == watermark - WATERMARK_OVERLAP
+        insert_sql, _ = session.statements('INSERT INTO dora_lead_time_facts ')[0]
+        assert 'AND i.id IN' in insert_sql
+
+    def test_dimension_change_forces_full_refresh(self):
+        """Test that a changed mapping table rebuilds the tenant"""
+        session = FakeSession(watermark=datetime(2025, 1, 6), dimensions_changed=True)
+
+        result = DoraLeadTimeFactsService().refresh_tenant(session, 1)
+
+        assert result['mode'] == 'full'
+        dimension_sql, _ = session.statements('SELECT EXISTS')[0]
+        assert 'statuses_mappings' in dimension_sql and 'wits_hierarchies' in dimension_sql
+
+    def test_refresh_state_is_upserted(self):
+        """Test that the watermark row is written with the refresh mode"""
+        session = FakeSession(watermark=None)
+
+        DoraLeadTimeFactsService().refresh_tenant(session, 7)
+
+        upsert_sql, params = session.statements('INSERT INTO dora_lead_time_facts_refreshes')[0]
+        assert 'ON CONFLICT (tenant_id)' in upsert_sql
+        assert params['tenant_id'] == 7 and params['full'] is True
+
+    def test_refresh_takes_tenant_lock_first(self):
+        """Test that concurrent refreshes of a tenant are serialized before the watermark is read"""
+        session = FakeSession(watermark=datetime(2025, 1, 6))
+
+        DoraLeadTimeFactsService().refresh_tenant(session, 7)
+
+        lock_sql, params = session.calls[0]
+        assert 'pg_advisory_xact_lock' in lock_sql
+        assert params == {'namespace': REFRESH_LOCK_NAMESPACE, 'tenant_id': 7}
+
+
+class FakeAsyncSession:
+    """Records statements and returns canned results in order"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return self.results.pop(0)
+
+    def compiled(self):
+        return [str(statement.compile(dialect=postgresql.dialect())) for statement in self.statements]
+
+
+def _database(session):
+    database = MagicMock()
+    database.get_analytics_session_context.return_value.__aenter__.return_value = session
+    return database
+
+
+class TestDoraRoutesReadFacts:
+    """Test that the lead-time endpoints query dora_lead_time_facts only"""
+
+    def _trend(self, session, **kwargs):
+        from app.api import dora_routes
+
+        params = dict(team=None, project_key=None, wit_to=None, aha_initiative=None,
+                      aha_project_code=None, aha_milestone=None, bucket='week', percentiles=None)
+        params.update(kwargs)
+        with patch.object(dora_routes, 'get_async_database', return_value=_database(session)):
+            return asyncio.run(dora_routes.lead_time_trend(user=SimpleNamespace(tenant_id=1), **params))
+
+    def test_lead_time_trend_aggregates_in_sql(self):
+        """Test grouping, median and requested percentiles are pushed into the query"""
+        month = datetime(2025, 1, 1)
+        result = MagicMock()
+        result.fetchall.return_value = [
+            SimpleNamespace(period_start=month, issue_count=10, avg_lead_time_days=3.25,
+                            median_lead_time_days=2.5, p75=4.04, p90=7.96),
+        ]
+        session = FakeAsyncSession([result])
+
+        response = self._trend(session, bucket='month', percentiles='90,75')
+
+        assert response['bucket'] == 'month'
+        assert response['percentiles'] == [75, 90]
+        assert response['trend_data'] == [{
+            'week': month.isoformat(), 'week_label': 'Jan 01, 2025', 'value': 2.5,
+            'avg_value': 3.2, 'issue_count': 10, 'p75': 4.0, 'p90': 8.0
+        }]
+        sql = session.compiled()[0]
+        assert 'FROM dora_lead_time_facts' in sql
+        assert sql.count('WITHIN GROUP (ORDER BY') == 3
+        assert 'GROUP BY date_trunc' in sql
+
+    def test_lead_time_trend_rejects_invalid_parameters(self):
+        """Test unknown bucket sizes and out-of-range percentiles are client errors"""
+        from fastapi import HTTPException
+
+        for kwargs in ({'bucket': 'day'}, {'percentiles': '100'}, {'percentiles': 'p90'}):
+            session = FakeAsyncSession([])
+            try:
+                self._trend(session, **kwargs)
+                raise AssertionError(f"Expected HTTPException for {kwargs}")
+            except HTTPException as e:
+                assert e.status_code == 400
+            assert session.statements == []
+
+    def test_lead_time_metrics(self):
+        """Test metrics rows and filters come from the fact table"""
+        from app.api import dora_routes
+
+        completed = datetime(2025, 1, 8)
+        row = SimpleNamespace(
+            month=datetime(2025, 1, 1), week=datetime(2025, 1, 6), work_last_completed_at=completed,
+            completion_year=2025, completion_quarter=1, lead_time_bucket='≤ 1 week', issue_id=42,
+            issue_key='P-42', project_key='P', team='A', wit_from='Story', wit_to='Story', status_to='Done',
+            story_points=3, priority='High', assignee='dev', issue_created_at=completed - timedelta(days=2),
+            issue_updated_at=completed, total_lead_time_seconds=172800.0, lead_time_hours=48.0,
+            lead_time_days=2.0, aha_epic_url=None, aha_initiative='Growth', aha_project_code=None,
+            project_code=None, aha_milestone=None, tenant_id=1
+        )
+        result = MagicMock()
+        result.all.return_value = [row]
+        session = FakeAsyncSession([result])
+
+        with patch.object(dora_routes, 'get_async_database', return_value=_database(session)):
+            response = asyncio.run(dora_routes.lead_time_metrics(
+                start_date=None, end_date=None, team='A', project_key=None, issue_type='Story',
+                priority=None, assignee=None, aha_initiative=None, project_code=None,
+                user=SimpleNamespace(tenant_id=1)
+            ))
+
+        assert response['issues'][0]['issue_id'] == 42
+        assert response['summary']['total_items'] == 1
+        sql = session.compiled()[0]
+        assert 'FROM dora_lead_time_facts' in sql
+        assert 'work_items' not in sql
+        assert 'DISTINCT' not in sql
+
+    def test_filter_options(self):
+        """Test distinct filter values are read from the fact table"""
+        from app.api import dora_routes
+
+        result = MagicMock()
+        result.fetchall.return_value = [
+            SimpleNamespace(team='B', project_key='P', wit_to='Story', aha_initiative=None,
+                            aha_project_code='X', aha_milestone=None),
+            SimpleNamespace(team='A', project_key='P', wit_to='Tech Enhancement', aha_initiative='Growth',
+                            aha_project_code=None, aha_milestone='M1'),
+        ]
+        session = FakeAsyncSession([result])
+
+        with patch.object(dora_routes, 'get_async_database', return_value=_database(session)):
+            response = asyncio.run(dora_routes.get_filter_options(user=SimpleNamespace(tenant_id=1)))
+
+        assert response['filter_options']['team'] == ['A', 'B']
+        assert response['filter_options']['wit_to'] == ['Story', 'Tech Enhancement']
+        sql = session.compiled()[0]
+        assert 'SELECT DISTINCT' in sql and 'FROM dora_lead_time_facts' in sql
@@ -0,0 +1,215 @@
+"""
+Test the process-shared, dynamically batched embedding inference service.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.ai.embedding_inference_service import EmbeddingInferenceService, cosine_similarities
+
+
+class FakeModel:
+    """Embeds each text as [len(text), call number] and records batch sizes"""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.batches = []
+
+    def encode(self, texts, convert_to_numpy=True, batch_size=32):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("CUDA out of memory")
+        self.batches.append(len(texts))
+        return np.array([[len(text), len(self.batches)] for text in texts], dtype=np.float32)
+
+
+def _service(model, **kwargs):
+    loads = []
+
+    def loader(model_name, backend):
+        loads.append((model_name, backend))
+        time.sleep(0.05)
+        return model(backend) if callable(model) else model
+
+    service = EmbeddingInferenceService(model_loader=loader, **kwargs)
+    return service, loads
+
+
+class TestBatching:
+    """Test request coalescing"""
+
+    def test_concurrent_requests_share_batches(self):
+        """Test concurrent single-text requests are encoded together and get their own rows back"""
+        model = FakeModel(delay=0.01)
+        service, _ = _service(model, max_batch_size=64, max_wait_ms=50)
+
+        async def run():
+            return await asyncio.gather(*(service.encode('mpnet', ['x' * n]) for n in range(1, 21)))
+
+        try:
+            results = asyncio.run(run())
+        finally:
+            service.shutdown()
+
+        assert [int(result[0][0]) for result in results] == list(range(1, 21))
+        assert sum(model.batches) == 20
+        assert len(model.batches) < 5
+        assert service.get_stats() == {}  # Shut down services report no models
+
+    def test_batches_are_capped_at_max_batch_size(self):
+        """Test queued requests beyond max_batch_size go to the next batch"""
+        model = FakeModel(delay=0.02)
+        service, _ = _service(model, max_batch_size=4, max_wait_ms=50)
+
+        async def run():
+            return await asyncio.gather(*(service.encode('mpnet', ['a', 'b']) for _ in range(6)))
+
+        try:
+            results = asyncio.run(run())
+            stats = service.get_stats()['mpnet:torch']
+        finally:
+            service.shutdown()
+
+        assert all(result.shape == (2, 2) for result in results)
+        assert max(model.batches) == 4
+        assert stats['requests'] == 6 and stats['texts'] == 12
+        assert stats['batch_size']['count'] == len(model.batches)
+        assert stats['encode_time']['count'] == len(model.batches)
+
+    def test_requests_from_other_threads_and_loops(self):
+        """Test worker threads with their own event loops share one batcher"""
+        model = FakeModel(delay=0.01)
+        service, loads = _service(model, max_batch_size=64, max_wait_ms=50)
+        results = []
+
+        def worker():
+            results.append(asyncio.run(service.encode('mpnet', ['text'])))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            service.shutdown()
+
+        assert loads == [('mpnet', 'torch')]
+        assert len(results) == 8
+        assert sum(model.batches) == 8 and len(model.batches) < 8
+
+    def test_encode_failure_reaches_every_caller(self):
+        """Test a failed batch raises in each waiting request"""
+        service, _ = _service(FakeModel(fail=True), max_batch_size=8, max_wait_ms=20)
+
+        async def run():
+            return await asyncio.gather(service.encode('mpnet', ['a']), service.encode('mpnet', ['b']),
+                                        return_exceptions=True)
+
+        try:
+            results = asyncio.run(run())
+            stats = service.get_stats()['mpnet:torch']
+        finally:
+            service.shutdown()
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert stats['failures'] == 2
+
+
+class TestModelLoading:
+    """Test models are loaded once and warmed up"""
+
+    def test_warm_up_loads_each_model_once(self):
+        """Test warm-up loads every model once and later requests reuse it"""
+        model = FakeModel()
+        service, loads = _service(model, max_batch_size=8, max_wait_ms=0)
+
+        async def run():
+            warmed = await service.warm_up([('mpnet', 'torch'), ('minilm', 'torch')])
+            await asyncio.gather(service.encode('mpnet', ['a']), service.encode('mpnet', ['b']))
+            return warmed
+
+        try:
+            assert asyncio.run(run()) == ['mpnet:torch', 'minilm:torch']
+        finally:
+            service.shutdown()
+
+        assert sorted(loads) == [('minilm', 'torch'), ('mpnet', 'torch')]
+
+    def test_failed_load_raises(self):
+        """Test a model that cannot be loaded surfaces the error and is not warmed"""
+        def loader(model_name, backend):
+            raise OSError(f"{model_name} not found")
+
+        service = EmbeddingInferenceService(model_loader=loader, max_batch_size=8, max_wait_ms=0)
+
+        with pytest.raises(OSError):
+            asyncio.run(service.encode('missing', ['a']))
+        assert asyncio.run(service.warm_up([('missing', 'torch')])) == []
+
+
+class TestBackends:
+    """Test per-backend models and the parity check"""
+
+    def test_backends_are_loaded_and_batched_separately(self):
+        """Test the same model on two backends gets two models and never shares a batch"""
+        models = {'torch': FakeModel(), 'onnx_int8': FakeModel()}
+        service, loads = _service(lambda backend: models[backend], max_batch_size=8, max_wait_ms=20)
+
+        async def run():
+            await asyncio.gather(service.encode('mpnet', ['a'], 'torch'), service.encode('mpnet', ['b'], 'onnx_int8'))
+
+        try:
+            asyncio.run(run())
+            assert set(service.get_stats()) == {'mpnet:torch', 'mpnet:onnx_int8'}
+        finally:
+            service.shutdown()
+
+        assert sorted(loads) == [('mpnet', 'onnx_int8'), ('mpnet', 'torch')]
+        assert models['torch'].batches == [1] and models['onnx_int8'].batches == [1]
+
+    def test_unknown_backend_is_rejected(self):
+        """Test an unsupported backend fails before any model is loaded"""
+        service, loads = _service(FakeModel(), max_batch_size=8, max_wait_ms=0)
+
+        with pytest.raises(ValueError):
+            asyncio.run(service.encode('mpnet', ['a'], 'tensorrt'))
+        assert loads == []
+
+    def test_compare_backends_reports_drift(self):
+        """Test parity reports mean/min cosine similarity and drift against the reference"""
+        class RotatingModel:
+            """Second embedding axis scaled per backend, so only the direction differs"""
+
+            def __init__(self, scale):
+                self.scale = scale
+
+            def encode(self, texts, convert_to_numpy=True, batch_size=32):
+                return np.array([[1.0, self.scale * len(text)] for text in texts])
+
+        models = {'torch': RotatingModel(0.0), 'onnx_int8': RotatingModel(1.0)}
+        service, _ = _service(lambda backend: models[backend], max_batch_size=8, max_wait_ms=0)
+
+        try:
+            parity = asyncio.run(service.compare_backends('mpnet', ['', 'a']))
+        finally:
+            service.shutdown()
+
+        assert parity['texts'] == 2
+        assert parity['min_cosine'] == pytest.approx(2 ** -0.5)
+        assert parity['mean_cosine'] == pytest.approx((1 + 2 ** -0.5) / 2)
+        assert parity['drift'] == pytest.approx(1 - 2 ** -0.5)
+
+    def test_cosine_similarities(self):
+        """Test identical rows score 1 and orthogonal rows score 0"""
+        similarities = cosine_similarities(np.array([[1.0, 0.0], [0.0, 2.0]]), np.array([[3.0, 0.0], [1.0, 0.0]]))
+
+        assert similarities.tolist() == pytest.approx([1.0, 0.0])
@@ -0,0 +1,206 @@
+"""
+Test the ETL pipeline benchmark harness: synthetic payloads, fake Jira/GitHub servers and stand-ins.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from scripts.etl_benchmark.fake_servers import FakeGitHubServer, FakeJiraServer
+from scripts.etl_benchmark.payloads import DEVELOPMENT_FIELD_ID, SPRINTS_FIELD_ID, generate_dataset
+from scripts.etl_benchmark.pipeline import StageStats, percentile
+from scripts.etl_benchmark.stand_ins import StandIns, deterministic_embedding
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def dataset():
+    return generate_dataset(issues=30, changelogs_per_issue=4, pull_requests=12, commits_per_pr=7,
+                            reviews_per_pr=3, comments_per_pr=2, sprints=2, projects=2, repositories=3,
+                            linked_issue_ratio=1.0, seed=7, now=NOW)
+
+
+class TestSyntheticPayloads:
+    """Test the generated dataset"""
+
+    def test_counts_match_arguments(self, dataset):
+        """Test every requested record is generated"""
+        assert dataset.counts() == {
+            'projects': 2, 'issues': 30, 'changelogs': 120, 'dev_status': 30, 'sprint_reports': 4,
+            'repositories': 3, 'pull_requests': 12, 'commits': 84, 'reviews': 36, 'comments': 24,
+        }
+
+    def test_same_seed_same_dataset(self, dataset):
+        """Test generation is deterministic for a seed and reference time"""
+        again = generate_dataset(issues=30, changelogs_per_issue=4, pull_requests=12, commits_per_pr=7,
+                                 reviews_per_pr=3, comments_per_pr=2, sprints=2, projects=2, repositories=3,
+                                 linked_issue_ratio=1.0, seed=7, now=NOW)
+
+        assert again.issues == dataset.issues
+        assert again.pull_requests == dataset.pull_requests
+
+    def test_issues_reference_sprints_and_pull_requests(self, dataset):
+        """Test custom fields point at generated sprint reports and dev status links at generated PRs"""
+        pr_urls = {f"https://github.com/{full_name}/pull/{pr['number']}"
+                   for full_name, prs in dataset.pull_requests.items() for pr in prs}
+
+        for issue in dataset.issues:
+            sprint = issue['fields'][SPRINTS_FIELD_ID][0]
+            assert (sprint['boardId'], sprint['id']) in dataset.sprint_reports
+            assert issue['fields'][DEVELOPMENT_FIELD_ID]
+            assert dataset.dev_status[issue['id']]['detail'][0]['pullRequests'][0]['url'] in pr_urls
+
+        members = sum(len(report['contents']['completedIssues']) +
+                      len(report['contents']['issuesNotCompletedInCurrentSprint'])
+                      for report in dataset.sprint_reports.values())
+        assert members == 30
+
+
+class TestFakeJiraServer:
+    """Test the fake Jira server through the real JiraAPIClient"""
+
+    def test_search_pages_and_project_filter(self, dataset):
+        """Test JQL search pages with nextPageToken and honours the project filter"""
+        from app.etl.jira.jira_client import JiraAPIClient
+
+        with FakeJiraServer(dataset) as server:
+            client = JiraAPIClient('bench@example.com', 'token', server.url)
+            key = dataset.project_keys[0]
+            first = client.search_issues(f"project IN ({key}) ORDER BY updated ASC", max_results=10)
+            second = client.search_issues(f"project IN ({key})", next_page_token=first['nextPageToken'],
+                                          max_results=10)
+
+            assert len(first['issues']) == 10 and not first['isLast']
+            assert len(second['issues']) == 5 and second['isLast'] and 'nextPageToken' not in second
+            assert {issue['fields']['project']['key'] for issue in first['issues'] + second['issues']} == {key}
+            assert server.requests == {'search_jql': 2}
+
+    def test_projects_statuses_dev_status_and_sprint_reports(self, dataset):
+        """Test the other extraction endpoints return the dataset's payloads"""
+        from app.etl.jira.jira_client import JiraAPIClient
+
+        issue = dataset.issues[0]
+        sprint = issue['fields'][SPRINTS_FIELD_ID][0]
+
+        with FakeJiraServer(dataset) as server:
+            client = JiraAPIClient('bench@example.com', 'token', server.url)
+
+            assert [p['key'] for p in client.get_projects(expand='issueTypes')] == dataset.project_keys
+            assert client.get_project_statuses(dataset.project_keys[1]) == dataset.statuses[dataset.project_keys[1]]
+            assert client.get_project_statuses('MISSING') == []
+            assert client.get_dev_status(issue['id']) == dataset.dev_status[issue['id']]
+            assert client.get_sprint_report(sprint['boardId'], sprint['id']) == \
+                dataset.sprint_reports[(sprint['boardId'], sprint['id'])]
+
+
+class TestFakeGitHubServer:
+    """Test the fake GitHub server through the real GitHub clients"""
+
+    @pytest.fixture
+    def github_url(self, dataset, monkeypatch):
+        from app.core.config import get_settings
+
+        with FakeGitHubServer(dataset) as server:
+            monkeypatch.setattr(get_settings(), 'GITHUB_API_URL', server.url)
+            yield server
+
+    def test_repository_search_follows_link_pages(self, dataset, github_url):
+        """Test search results are paged with Link headers and accumulated by the REST client"""
+        from app.etl.github.github_rest_client import GitHubRestClient
+
+        many = generate_dataset(repositories=130, pull_requests=0, issues=0, now=NOW)
+        github_url.dataset = many
+        repositories = GitHubRestClient('token').search_repositories(many.organization, '2024-01-01', '2026-06-01')
+
+        assert [repo['full_name'] for repo in repositories] == [repo['full_name'] for repo in many.repositories]
+        assert github_url.requests == {'search_repositories': 2}
+
+    def test_pull_request_pages_with_nested_pages(self, dataset, github_url):
+        """Test PR pages carry first nested pages and the nested queries continue them"""
+        from app.etl.github.github_graphql_client import GitHubGraphQLClient
+
+        client = GitHubGraphQLClient('token', batch_size=5)
+        owner, name = dataset.repositories[0]['full_name'].split('/')
+
+        async def run():
+            first = await client.get_pull_requests_with_details(owner, name)
+            connection = first['data']['repository']['pullRequests']
+            second = await client.get_pull_requests_with_details(owner, name, connection['pageInfo']['endCursor'])
+            pr = connection['nodes'][0]
+            commits = await client.get_more_commits_for_pr(pr['id'], pr['commits']['pageInfo']['endCursor'])
+            batch = await client.get_more_nested_for_prs([
+                {'pr_node_id': pr['id'], 'nested_type': 'commits', 'nested_cursor': '5'},
+                {'pr_node_id': pr['id'], 'nested_type': 'reviews', 'nested_cursor': None},
+            ])
+            return connection, second['data']['repository']['pullRequests'], pr, commits, batch
+
+        connection, second, pr, commits, batch = asyncio.run(run())
+
+        assert len(connection['nodes']) == 4 and not connection['pageInfo']['hasNextPage']
+        assert second['nodes'] == []
+        assert len(pr['commits']['nodes']) == 5 and pr['commits']['pageInfo']['hasNextPage']
+        assert len(commits['data']['node']['commits']['nodes']) == 2
+        assert len(batch['data']['n0']['commits']['nodes']) == 2
+        assert len(batch['data']['n1']['reviews']['nodes']) == 3
+        assert client.rate_limit_remaining == 5000
+
+
+class TestStandIns:
+    """Test the in-process broker and embeddings"""
+
+    def test_queue_manager_publishes_and_consumes_in_memory(self):
+        """Test QueueManager publish/get_single_message run against the in-memory broker"""
+        from app.etl.workers.queue_manager import QueueManager
+
+        original_get_channel = QueueManager.get_channel
+        with StandIns(broker=True, vector_store=False, embeddings=False) as stand_ins:
+            queue_manager = QueueManager()
+            assert queue_manager.publish_message('extraction_queue_premium', {'type': 'jira_dev_status', 'n': 1})
+            assert queue_manager.publish_message('extraction_queue_premium', {'type': 'jira_dev_status', 'n': 2})
+
+            assert stand_ins.broker.depths() == {'extraction_queue_premium': 2}
+            first = queue_manager.get_single_message('extraction_queue_premium')
+            second = queue_manager.get_single_message('extraction_queue_premium')
+            assert (first['n'], second['n']) == (1, 2) and 'enqueued_at' in first
+            assert queue_manager.get_single_message('extraction_queue_premium') is None
+
+        assert QueueManager.get_channel is original_get_channel
+
+    def test_deterministic_embedding(self):
+        """Test embeddings are unit vectors that only depend on the text"""
+        vector = deterministic_embedding('Login page fails', 16)
+
+        assert vector == deterministic_embedding('Login page fails', 16)
+        assert vector != deterministic_embedding('Login page works', 16)
+        assert sum(value * value for value in vector) == pytest.approx(1.0)
+
+
+class TestStatistics:
+    """Test latency percentiles"""
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles"""
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([3.0], 99) == 3.0
+        assert percentile([], 50) == 0.0
+
+    def test_stage_summary(self):
+        """Test a stage summary counts messages and busy time"""
+        stats = StageStats()
+        for seconds in (0.1, 0.2, 0.3, 0.4):
+            stats.record(wait_seconds=-1.0, processing_seconds=seconds)
+
+        summary = stats.summary()
+        assert summary['messages'] == 4
+        assert summary['busy_seconds'] == pytest.approx(1.0)
+        assert summary['p50'] == 0.2 and summary['max'] == 0.4
+        assert summary['wait_p95'] == 0.0  # Clock skew never gives negative waits
@@ -0,0 +1,227 @@
+"""
+Test weighted fair scheduling across tenants sharing a tier queue.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import json
+from collections import deque
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pika
+
+from app.core.config import get_settings
+from app.etl.workers.fair_scheduler import (
+    FairScheduler, resolve_priority, message_priority, tenant_queue_name, PRIORITY_HIGH, PRIORITY_BULK
+)
+from app.etl.workers.queue_manager import QueueManager
+
+BASE_QUEUE = 'transform_queue_premium'
+
+
+class FakeChannel:
+    """In-memory stand-in for a pika channel (basic_get / queue_declare)"""
+
+    def __init__(self, queues):
+        self.queues = {name: deque(json.dumps(m) for m in messages) for name, messages in queues.items()}
+        self.connection = MagicMock(channel=lambda: self)
+        self.is_open = True
+
+    def queue_declare(self, queue, passive=False, **kwargs):
+        if passive and queue not in self.queues:
+            raise pika.exceptions.ChannelClosedByBroker(404, f"NOT_FOUND - no queue '{queue}'")
+        self.queues.setdefault(queue, deque())
+        return MagicMock(method=MagicMock(message_count=len(self.queues[queue])))
+
+    def close(self):
+        pass
+
+    def basic_get(self, queue, auto_ack=False):
+        if not self.queues.get(queue):
+            return None, None, None
+        return MagicMock(delivery_tag=1), None, self.queues[queue].popleft()
+
+    def basic_ack(self, delivery_tag):
+        pass
+
+
+def _make_scheduler(queues, tenant_ids=(1, 2), workers=2):
+    channel = FakeChannel(queues)
+    queue_manager = MagicMock()
+    queue_manager.get_tier_tenant_ids.return_value = list(tenant_ids)
+
+    @contextmanager
+    def get_channel():
+        yield channel
+
+    queue_manager.get_channel = get_channel
+    scheduler = FairScheduler(BASE_QUEUE, queue_manager=queue_manager)
+    scheduler.high_weight = 4
+    scheduler.max_inflight_share = 0.5
+    scheduler.refresh_seconds = 0.0
+    for _ in range(workers):
+        scheduler.register_worker()
+    return scheduler
+
+
+def _bulk(tenant_id, count):
+    return [{'tenant_id': tenant_id, 'type': 'jira_issues'} for _ in range(count)]
+
+
+class TestPriority:
+    """Test how message priority is resolved"""
+
+    def test_explicit_inherited_and_incremental(self):
+        """Test explicit priority, inherited priority and the incremental-sync default"""
+        assert resolve_priority({'priority': PRIORITY_BULK, 'old_last_sync_date': '2025-01-01'}) == PRIORITY_BULK
+        assert resolve_priority({'old_last_sync_date': '2025-01-01'}) == PRIORITY_HIGH
+        assert resolve_priority({}) == PRIORITY_BULK
+
+        with message_priority(PRIORITY_HIGH):
+            assert resolve_priority({}) == PRIORITY_HIGH
+        assert resolve_priority({}) == PRIORITY_BULK
+
+
+class TestRouting:
+    """Test QueueManager.route_message"""
+
+    def test_disabled_keeps_shared_queue(self):
+        """Test that messages are only stamped while fair scheduling is off"""
+        message = {'tenant_id': 3}
+
+        with patch.object(get_settings(), 'ETL_FAIR_SCHEDULING_ENABLED', False):
+            routing_key = QueueManager().route_message(MagicMock(), BASE_QUEUE, message)
+
+        assert routing_key == BASE_QUEUE
+        assert message['priority'] == PRIORITY_BULK
+        assert 'enqueued_at' in message
+
+    def test_enabled_routes_to_tenant_sub_queue(self):
+        """Test per-tenant priority sub-queues, declared once per process"""
+        channel = MagicMock()
+
+        with patch.object(get_settings(), 'ETL_FAIR_SCHEDULING_ENABLED', True):
+            first = QueueManager().route_message(channel, BASE_QUEUE, {'tenant_id': 7, 'old_last_sync_date': 'x'})
+            second = QueueManager().route_message(channel, BASE_QUEUE, {'tenant_id': 7, 'old_last_sync_date': 'x'})
+            other = QueueManager().route_message(channel, 'some_other_queue', {'tenant_id': 7})
+
+        assert first == second == tenant_queue_name(BASE_QUEUE, 7, PRIORITY_HIGH)
+        assert other == 'some_other_queue'
+        channel.queue_declare.assert_called_once()
+
+
+class TestFairScheduler:
+    """Test dispatch order, in-flight caps and wait metrics"""
+
+    def test_small_tenant_not_starved_by_backfill(self):
+        """Test that tenants alternate regardless of backlog size"""
+        scheduler = _make_scheduler({
+            tenant_queue_name(BASE_QUEUE, 1, PRIORITY_BULK): _bulk(1, 100),
+            tenant_queue_name(BASE_QUEUE, 2, PRIORITY_BULK): _bulk(2, 3)
+        }, workers=10)
+
+        order = []
+        for _ in range(6):
+            message = scheduler.next_message()
+            scheduler.complete(message)
+            order.append(message['tenant_id'])
+
+        assert order.count(2) == 3
+        assert order[:4] in ([1, 2, 1, 2], [2, 1, 2, 1])
+
+    def test_high_priority_weighted_over_bulk(self):
+        """Test that high-priority flows get high_weight turns per bulk turn"""
+        scheduler = _make_scheduler({
+            tenant_queue_name(BASE_QUEUE, 1, PRIORITY_BULK): _bulk(1, 50),
+            tenant_queue_name(BASE_QUEUE, 2, PRIORITY_HIGH): _bulk(2, 50)
+        }, workers=10)
+
+        order = []
+        for _ in range(20):
+            message = scheduler.next_message()
+            scheduler.complete(message)
+            order.append(message['tenant_id'])
+
+        assert order.count(2) == 16
+        assert order.count(1) == 4
+
+    def test_inflight_cap_prefers_other_tenants(self):
+        """Test that a tenant at its cap waits while others have work, but not when alone"""
+        scheduler = _make_scheduler({
+            tenant_queue_name(BASE_QUEUE, 1, PRIORITY_HIGH): _bulk(1, 10),
+            tenant_queue_name(BASE_QUEUE, 2, PRIORITY_BULK): _bulk(2, 1)
+        }, workers=2)
+
+        first = scheduler.next_message()  # Tenant 1 (high priority), now at its cap of 1
+        second = scheduler.next_message()  # Tenant 2 although its pass is larger
+        third = scheduler.next_message()  # Only tenant 1 left: work-conserving
+
+        assert [first['tenant_id'], second['tenant_id'], third['tenant_id']] == [1, 2, 1]
+        assert scheduler.get_status()['tenants'][1]['in_flight'] == 2
+
+    def test_wait_metrics_per_tenant(self):
+        """Test wait-time metrics and tenant filtering in the status"""
+        scheduler = _make_scheduler({
+            tenant_queue_name(BASE_QUEUE, 1, PRIORITY_BULK): [{'tenant_id': 1, 'enqueued_at': 1000.0}],
+            tenant_queue_name(BASE_QUEUE, 2, PRIORITY_BULK): [{'tenant_id': 2, 'enqueued_at': 1004.0}]
+        })
+
+        with patch('app.etl.workers.fair_scheduler.time.time', return_value=1010.0):
+            scheduler.complete(scheduler.next_message())
+            scheduler.complete(scheduler.next_message())
+
+        status = scheduler.get_status(tenant_id=1)
+        assert list(status['tenants']) == [1]
+        assert status['tenants'][1]['avg_wait_seconds'] == 10.0
+        assert status['tenants'][1]['in_flight'] == 0
+        assert status['overall']['messages'] == 2
+        assert status['overall']['max_wait_seconds'] == 10.0
+
+    def test_refresh_does_not_create_sub_queues(self):
+        """Test depths are read with passive declares and missing sub-queues count as empty"""
+        scheduler = _make_scheduler({BASE_QUEUE: [], tenant_queue_name(BASE_QUEUE, 2, PRIORITY_BULK): _bulk(2, 2)})
+
+        message = scheduler.next_message()
+
+        with scheduler.queue_manager.get_channel() as channel:
+            assert set(channel.queues) == {BASE_QUEUE, tenant_queue_name(BASE_QUEUE, 2, PRIORITY_BULK)}
+        assert message['tenant_id'] == 2
+        assert scheduler._depths[tenant_queue_name(BASE_QUEUE, 1, PRIORITY_HIGH)] == 0
+
+    def test_undecodable_message_is_rejected_not_requeued(self):
+        """Test a message that cannot be decoded is rejected and the next flow is served"""
+        bad_queue = tenant_queue_name(BASE_QUEUE, 1, PRIORITY_HIGH)
+        scheduler = _make_scheduler({bad_queue: [], tenant_queue_name(BASE_QUEUE, 2, PRIORITY_BULK): _bulk(2, 1)})
+        with scheduler.queue_manager.get_channel() as channel:
+            channel.queues[bad_queue].append(b'\x00not json')
+
+        message = scheduler.next_message()
+
+        assert message['tenant_id'] == 2
+        assert not channel.queues[bad_queue]
+        scheduler.queue_manager.reject_undecodable.assert_called_once()
+        assert scheduler.queue_manager.reject_undecodable.call_args.args[1] == bad_queue
+
+
+class TestQueueStats:
+    """Test QueueManager.get_queue_stats over tenant sub-queues"""
+
+    def test_missing_sub_queues_count_as_empty(self):
+        """Test sub-queues are read passively: missing ones count 0, are not created, and later ones still count"""
+        from scripts.etl_benchmark.stand_ins import StandIns
+
+        with StandIns(broker=True, vector_store=False, embeddings=False) as stand_ins, \
+                patch.object(get_settings(), 'ETL_FAIR_SCHEDULING_ENABLED', True):
+            broker = stand_ins.broker
+            broker.publish(BASE_QUEUE, b'{}')
+            broker.publish(tenant_queue_name(BASE_QUEUE, 1, PRIORITY_BULK), b'{}')
+            broker.publish(tenant_queue_name(BASE_QUEUE, 1, PRIORITY_BULK), b'{}')
+            queue_manager = QueueManager()
+
+            with patch.object(queue_manager, 'get_tier_tenant_ids', return_value=[2, 1]):
+                stats = queue_manager.get_queue_stats(BASE_QUEUE, include_tenant_queues=True)
+
+            assert stats['message_count'] == 3
+            assert not broker.exists(tenant_queue_name(BASE_QUEUE, 2, PRIORITY_BULK))
@@ -0,0 +1,142 @@
+"""
+Test batched nested pagination for GitHub PR extraction.
+"""
+
+import asyncio
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.config import get_settings
+from app.etl.github.github_graphql_client import GitHubGraphQLClient, GitHubRateLimitException, get_graphql_url
+from app.etl.github.github_extraction_worker import GitHubExtractionWorker
+
+
+class TestGraphQLUrl:
+    """Test the GraphQL endpoint for github.com and GitHub Enterprise"""
+
+    def test_derived_from_api_url(self, monkeypatch):
+        """Test a GHE /api/v3 URL maps to /api/graphql and other URLs get /graphql appended"""
+        monkeypatch.setattr(get_settings(), 'GITHUB_GRAPHQL_URL', None)
+        for api_url, graphql_url in [
+            ('https://api.github.com', 'https://api.github.com/graphql'),
+            ('https://github.example.com/api/v3/', 'https://github.example.com/api/graphql'),
+            ('http://127.0.0.1:8123', 'http://127.0.0.1:8123/graphql'),
+        ]:
+            monkeypatch.setattr(get_settings(), 'GITHUB_API_URL', api_url)
+            assert get_graphql_url() == graphql_url
+
+    def test_explicit_setting(self, monkeypatch):
+        """Test GITHUB_GRAPHQL_URL overrides the derived URL"""
+        monkeypatch.setattr(get_settings(), 'GITHUB_API_URL', 'https://github.example.com/api/v3')
+        monkeypatch.setattr(get_settings(), 'GITHUB_GRAPHQL_URL', 'https://graphql.example.com/graphql')
+
+        assert GitHubGraphQLClient('test-token').graphql_url == 'https://graphql.example.com/graphql'
+
+
+class TestNestedBatchQuery:
+    """Test the aliased multi-PR nested query"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.client = GitHubGraphQLClient('test-token', batch_size=50)
+
+    def test_query_aliases_each_item(self):
+        """Test that each (PR, nested type) becomes its own aliased node lookup"""
+        items = [
+            {'pr_node_id': 'PR_A', 'nested_type': 'commits', 'nested_cursor': 'c1'},
+            {'pr_node_id': 'PR_B', 'nested_type': 'review_threads', 'nested_cursor': 'c2'},
+        ]
+
+        with patch.object(self.client, '_make_graphql_request', return_value={'data': {}}) as mock_request:
+            asyncio.run(self.client.get_more_nested_for_prs(items))
+
+        query, variables = mock_request.call_args[0]
+        assert 'n0: node(id: $id0)' in query
+        assert 'n1: node(id: $id1)' in query
+        assert 'commits(first: 50, after: $cursor0)' in query
+        assert 'reviewThreads(first: 50, after: $cursor1)' in query
+        assert variables == {'id0': 'PR_A', 'cursor0': 'c1', 'id1': 'PR_B', 'cursor1': 'c2'}
+
+    def test_items_per_query_respects_limits(self):
+        """Test that batches are clamped to the alias and node limits"""
+        assert self.client.max_nested_items_per_query(20) == 20
+        assert self.client.max_nested_items_per_query(1000) == GitHubGraphQLClient.MAX_NESTED_ALIASES_PER_QUERY
+        assert self.client.max_nested_items_per_query(0) == 1
+
+
+class TestNestedBatchPublishing:
+    """Test how pending nested pagination is split into messages"""
+
+    def test_only_final_batch_carries_last_pr_last_nested(self):
+        """Test that job completion flag is set on the final batch only"""
+        worker = GitHubExtractionWorker.__new__(GitHubExtractionWorker)
+        queue_manager = MagicMock()
+        pending = [
+            {'pr_node_id': f'PR_{i}', 'nested_type': 'commits', 'nested_cursor': f'c{i}'}
+            for i in range(5)
+        ]
+
+        queued = worker._publish_nested_batches(
+            queue_manager=queue_manager,
+            tenant_id=1,
+            integration_id=2,
+            job_id=3,
+            pending_nested=pending,
+            items_per_batch=2,
+            owner='acme',
+            repo_name='api',
+            full_name='acme/api',
+            old_last_sync_date=None,
+            new_last_sync_date='2024-01-01',
+            last_repo=True,
+            last_pr_last_nested=True,
+            token='job-token'
+        )
+
+        calls = queue_manager.publish_extraction_job.call_args_list
+        assert queued == 3
+        assert [len(c.kwargs['extraction_data']['nested_batch']) for c in calls] == [2, 2, 1]
+        assert [c.kwargs['last_pr_last_nested'] for c in calls] == [False, False, True]
+        assert all(c.kwargs['token'] == 'job-token' for c in calls)
+
+
+class TestNestedBatchRateLimit:
+    """Test rate limits hit while extracting a nested batch"""
+
+    def test_rate_limit_saves_checkpoint_and_signals_transform(self):
+        """Test the whole batch is checkpointed for recovery and transform is told the job is rate limited"""
+        worker = GitHubExtractionWorker.__new__(GitHubExtractionWorker)
+        nested_batch = [
+            {'pr_node_id': 'PR_A', 'nested_type': 'commits', 'nested_cursor': 'c1'},
+            {'pr_node_id': 'PR_B', 'nested_type': 'reviews', 'nested_cursor': 'c2'},
+        ]
+
+        github_client = MagicMock()
+        github_client.rate_limit_reset = '2026-06-01T13:00:00Z'
+        github_client.get_more_nested_for_prs = AsyncMock(
+            side_effect=GitHubRateLimitException('GitHub GraphQL API rate limit exceeded'))
+        credential_cache = MagicMock()
+        credential_cache.get_integration.return_value = MagicMock(token='gh-token', settings={})
+        credential_cache.get_client.return_value = github_client
+        queue_manager = MagicMock()
+
+        with patch('app.etl.github.github_extraction_worker.get_credential_cache', return_value=credential_cache), \
+                patch('app.etl.github.github_extraction_worker.update_checkpoint_data') as update_checkpoint, \
+                patch('app.etl.workers.queue_manager.QueueManager', return_value=queue_manager):
+            result = asyncio.run(worker.extract_nested_pagination_batch(
+                tenant_id=1, integration_id=2, job_id=3, nested_batch=nested_batch,
+                owner='acme', repo_name='api', token='job-token'
+            ))
+
+        assert result['is_rate_limit'] and result['rate_limit_reset_at'] == '2026-06-01T13:00:00Z'
+        update_checkpoint.assert_called_once_with(
+            job_id=3, tenant_id=1, token='job-token', full_name='acme/api',
+            checkpoint_data={'node_type': 'nested_batch', 'nested_batch': nested_batch,
+                             'rate_limit_reset_at': '2026-06-01T13:00:00Z'}
+        )
+        completion = queue_manager.publish_transform_job.call_args.kwargs
+        assert completion['integration_id'] == 2 and completion['raw_data_id'] is None
+        assert completion['data_type'] == 'github_prs_commits_reviews_comments'
+        assert completion['rate_limited'] and completion['last_job_item']
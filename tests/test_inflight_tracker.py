@@ -0,0 +1,177 @@
+"""
+Test per-job-token in-flight message counters.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.etl.workers import inflight_tracker
+from app.etl.workers.inflight_tracker import InflightTracker, get_queue_type
+from app.etl.workers.queue_manager import QueueManager
+
+
+class FakeRedis:
+    """Minimal in-memory Redis with the hash commands and counter script the tracker uses"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.expiries = {}
+
+    def register_script(self, script):
+        assert script == inflight_tracker._CHANGE_SCRIPT
+
+        def change(keys, args):
+            key, (queue_type, delta, ttl_seconds, now) = keys[0], args
+            values = self.hashes.setdefault(key, {})
+            values[queue_type] = max(0, int(values.get(queue_type, 0)) + delta)
+            values[f"{queue_type}:changed_at"] = now
+            self.expiries[key] = ttl_seconds
+            return values[queue_type]
+
+        return change
+
+    def hgetall(self, key):
+        return {field: str(value) for field, value in self.hashes.get(key, {}).items()}
+
+
+def _make_tracker():
+    with patch.object(InflightTracker, '_initialize_redis'):
+        tracker = InflightTracker()
+    tracker.redis_client = FakeRedis()
+    tracker._change_script = tracker.redis_client.register_script(inflight_tracker._CHANGE_SCRIPT)
+    return tracker
+
+
+class TestInflightTracker:
+    """Test counter updates and reads"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.tracker = _make_tracker()
+
+    def test_publish_and_done_per_queue_type(self):
+        """Test that counts are kept per token and queue type, including sub-queues"""
+        message = {'token': 'abc', 'tenant_id': 1}
+        self.tracker.record_published(message, 'transform_queue_premium')
+        self.tracker.record_published(message, 'transform_queue_premium.t1.high')
+        self.tracker.record_published(message, 'embedding_queue_premium')
+        self.tracker.record_done(message, 'transform_queue_premium.t1.high')
+
+        assert self.tracker.get_pending('abc', 'transform') == 1
+        assert self.tracker.get_pending('abc', 'embedding') == 1
+        assert self.tracker.get_pending('abc', 'extraction') == 0
+        assert self.tracker.redis_client.expiries['pulse:etl_inflight:abc'] == self.tracker.ttl_seconds
+
+    def test_untracked_token_and_messages_ignored(self):
+        """Test unknown tokens, messages without a token and non-tier queues"""
+        self.tracker.record_published({'tenant_id': 1}, 'transform_queue_premium')
+        self.tracker.record_published({'token': 'abc'}, 'some_queue')
+
+        assert self.tracker.get_pending('abc', 'transform') is None
+        assert self.tracker.redis_client.hashes == {}
+
+    def test_never_below_zero(self):
+        """Test that acks for messages published before tracking do not go negative"""
+        self.tracker.record_published({'token': 'abc'}, 'embedding_queue_premium')
+        self.tracker.record_done({'token': 'abc'}, 'extraction_queue_premium')
+
+        assert self.tracker.get_pending('abc', 'extraction') == 0
+
+    def test_stale_count_reported_untracked(self):
+        """Test a count left by a lost ack falls back to the queue check instead of blocking until the TTL"""
+        self.tracker.record_published({'token': 'abc'}, 'transform_queue_premium')
+        self.tracker.record_published({'token': 'abc'}, 'embedding_queue_premium')
+        self.tracker.record_done({'token': 'abc'}, 'embedding_queue_premium')
+        later = time.time() + self.tracker.stale_seconds + 1
+
+        with patch('app.etl.workers.inflight_tracker.time.time', return_value=later):
+            assert self.tracker.get_pending('abc', 'transform') is None
+            assert self.tracker.get_pending('abc', 'embedding') == 0
+        assert self.tracker.get_pending('abc', 'transform') == 1
+
+    def test_queue_type(self):
+        """Test queue type parsing"""
+        assert get_queue_type('embedding_queue_premium') == 'embedding'
+        assert get_queue_type('extraction_queue_premium.t4.bulk') == 'extraction'
+        assert get_queue_type('dead_letter') is None
+
+
+class TestHasPendingMessages:
+    """Test QueueManager.has_pending_messages"""
+
+    def test_counter_used_without_peeking(self):
+        """Test that a tracked token is answered from the counter"""
+        tracker = _make_tracker()
+        tracker.record_published({'token': 'abc'}, 'embedding_queue_premium')
+        queue_manager = QueueManager()
+
+        with patch('app.etl.workers.queue_manager.get_inflight_tracker', return_value=tracker), \
+                patch.object(queue_manager, 'check_messages_with_token') as mock_peek:
+            assert queue_manager.has_pending_messages('embedding_queue_premium', 'abc') is True
+            tracker.record_done({'token': 'abc'}, 'embedding_queue_premium')
+            assert queue_manager.has_pending_messages('embedding_queue_premium', 'abc') is False
+
+        mock_peek.assert_not_called()
+
+    def test_untracked_token_falls_back_to_peeking(self):
+        """Test the fallback for jobs started before tracking or without Redis"""
+        tracker = MagicMock()
+        tracker.get_pending.return_value = None
+        queue_manager = QueueManager()
+
+        with patch('app.etl.workers.queue_manager.get_inflight_tracker', return_value=tracker), \
+                patch.object(queue_manager, 'check_messages_with_token', return_value=True) as mock_peek:
+            assert queue_manager.has_pending_messages('transform_queue_premium', 'abc', tenant_id=3) is True
+
+        mock_peek.assert_called_once_with('transform_queue_premium', 'abc', tenant_id=3)
+
+    def test_failed_publish_released(self):
+        """Test that a message counted by route_message is released if publishing fails"""
+        tracker = _make_tracker()
+        queue_manager = QueueManager()
+        channel = MagicMock()
+        channel.basic_publish.side_effect = RuntimeError("connection lost")
+        channel_context = MagicMock()
+        channel_context.__enter__.return_value = channel
+
+        with patch('app.etl.workers.queue_manager.get_inflight_tracker', return_value=tracker), \
+                patch.object(queue_manager, 'get_channel', return_value=channel_context):
+            assert queue_manager.publish_message('transform_queue_premium', {'token': 'abc', 'tenant_id': 1}) is False
+
+        assert tracker.get_pending('abc', 'transform') == 0
+
+    def test_failed_publish_on_channel_released(self):
+        """Test that batch publishers holding a channel release the count and see the error"""
+        tracker = _make_tracker()
+        queue_manager = QueueManager()
+        channel = MagicMock()
+        channel.basic_publish.side_effect = RuntimeError("connection lost")
+
+        with patch('app.etl.workers.queue_manager.get_inflight_tracker', return_value=tracker):
+            with pytest.raises(RuntimeError):
+                queue_manager.publish_on_channel(channel, 'transform_queue_premium', {'token': 'abc', 'tenant_id': 1})
+
+        assert tracker.get_pending('abc', 'transform') == 0
+
+    def test_failed_declare_not_counted(self):
+        """Test that a tenant sub-queue declare failure leaves nothing in flight"""
+        from app.core.config import get_settings
+        from app.etl.workers import queue_manager as queue_manager_module
+
+        tracker = _make_tracker()
+        queue_manager = QueueManager()
+        channel = MagicMock()
+        channel.queue_declare.side_effect = RuntimeError("channel closed")
+
+        with patch('app.etl.workers.queue_manager.get_inflight_tracker', return_value=tracker), \
+                patch.object(get_settings(), 'ETL_FAIR_SCHEDULING_ENABLED', True), \
+                patch.object(queue_manager_module, '_declared_tenant_queues', set()):
+            with pytest.raises(RuntimeError):
+                queue_manager.publish_on_channel(channel, 'transform_queue_premium', {'token': 'abc', 'tenant_id': 1})
+
+        assert tracker.get_pending('abc', 'transform') is None
@@ -0,0 +1,272 @@
+"""
+Test the columnar workflow metrics engine against the per-item transform implementation.
+"""
+
+import random
+import pytest
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from app.etl.jira.jira_transform_worker import JiraTransformHandler
+from app.etl.jira import jira_workflow_metrics
+from app.etl.jira.jira_workflow_metrics import (
+    compute_workflow_metrics, workflow_metrics_to_rows, build_workflow_metrics_update_sql,
+    run_workflow_metrics_recompute, WORKFLOW_METRIC_COLUMNS
+)
+
+
+STATUS_CATEGORIES = {1: 'to do', 2: 'in progress', 3: 'done', 4: 'blocked', 5: None}
+
+
+def _random_changelogs(work_item_count: int, seed: int = 42):
+    """Generate changelog rows (work_item_id, date, to_status_id, time_in_status) with gaps and unknown statuses"""
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    rows = []
+    for work_item_id in range(1, work_item_count + 1):
+        for _ in range(rng.randint(1, 8)):
+            date = None if rng.random() < 0.05 else base + timedelta(
+                seconds=rng.randint(0, 10 ** 7), microseconds=rng.randint(0, 999999)
+            )
+            status_id = None if rng.random() < 0.03 else rng.randint(1, 6)
+            time_in_status = None if rng.random() < 0.1 else rng.random() * 1e5
+            rows.append((work_item_id, date, status_id, time_in_status))
+    rng.shuffle(rows)
+    return rows
+
+
+def _per_item_metrics(rows):
+    """Compute metrics with the transform worker's per-item function"""
+    handler = JiraTransformHandler.__new__(JiraTransformHandler)
+    by_work_item = {}
+    for work_item_id, date, status_id, time_in_status in rows:
+        by_work_item.setdefault(work_item_id, []).append({
+            'transition_change_date': date,
+            'to_status_id': status_id,
+            'time_in_status_seconds': time_in_status
+        })
+
+    results = {}
+    for work_item_id, changelogs in by_work_item.items():
+        sorted_changelogs = sorted(
+            changelogs,
+            key=lambda x: x['transition_change_date'] or datetime.min,
+            reverse=True
+        )
+        results[work_item_id] = handler._calculate_enhanced_workflow_metrics(sorted_changelogs, STATUS_CATEGORIES)
+    return results
+
+
+class TestWorkflowMetricsParity:
+    """Test that the columnar engine matches _calculate_enhanced_workflow_metrics"""
+
+    def test_matches_per_item_implementation(self):
+        """Test every metric for every work item against the per-item function"""
+        rows = _random_changelogs(500)
+
+        metrics = compute_workflow_metrics(*zip(*rows), STATUS_CATEGORIES)
+        columnar = {row['id']: row for row in workflow_metrics_to_rows(metrics)}
+        expected = _per_item_metrics(rows)
+
+        assert set(columnar) == set(expected)
+        for work_item_id, expected_metrics in expected.items():
+            for column in WORKFLOW_METRIC_COLUMNS:
+                value = columnar[work_item_id][column]
+                if isinstance(expected_metrics[column], float):
+                    assert value == pytest.approx(expected_metrics[column], rel=1e-9, abs=1e-6), (work_item_id, column)
+                else:
+                    assert value == expected_metrics[column], (work_item_id, column)
+
+    def test_direct_completion(self):
+        """Test a single transition straight to done"""
+        metrics = compute_workflow_metrics([7], [datetime(2024, 5, 1)], [3], [60.0], STATUS_CATEGORIES)
+        row = workflow_metrics_to_rows(metrics)[0]
+
+        assert row['direct_completion'] is True
+        assert row['work_first_completed_at'] == datetime(2024, 5, 1)
+        assert row['work_first_started_at'] is None
+        assert row['total_cycle_time_seconds'] == 0.0
+
+    def test_empty_input(self):
+        """Test that no changelogs produce no rows"""
+        metrics = compute_workflow_metrics([], [], [], [], STATUS_CATEGORIES)
+
+        assert workflow_metrics_to_rows(metrics) == []
+
+
+@pytest.fixture
+def postgres_connection():
+    """Open a PostgreSQL transaction that is always rolled back (skips if no database is reachable)"""
+    from sqlalchemy import create_engine
+    from app.core.config import get_settings
+
+    try:
+        engine = create_engine(get_settings().postgres_connection_string, connect_args={'connect_timeout': 3})
+        connection = engine.connect()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    transaction = connection.begin()
+    try:
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+def _create_workflow_tables(connection):
+    """TEMP tables that shadow the real ones for this transaction only"""
+    from sqlalchemy import text
+
+    metric_columns = ', '.join(
+        f"{c} timestamp" if c.endswith('_at') else
+        f"{c} double precision" if c.endswith('_seconds') else
+        f"{c} boolean" if c in ('rework_indicator', 'direct_completion') else
+        f"{c} integer"
+        for c in WORKFLOW_METRIC_COLUMNS
+    )
+
+    connection.execute(text("""
+        CREATE TEMP TABLE changelogs (
+            work_item_id integer, transition_change_date timestamp, to_status_id integer,
+            time_in_status_seconds double precision, tenant_id integer, integration_id integer, active boolean
+        ) ON COMMIT DROP
+    """))
+    connection.execute(text("""
+        CREATE TEMP TABLE statuses (
+            id integer, original_name text, category text, tenant_id integer, integration_id integer
+        ) ON COMMIT DROP
+    """))
+    connection.execute(text("""
+        CREATE TEMP TABLE statuses_mappings (
+            id serial, status_from text, status_category text, tenant_id integer, integration_id integer, active boolean
+        ) ON COMMIT DROP
+    """))
+    connection.execute(text(
+        f"CREATE TEMP TABLE work_items (id integer, tenant_id integer, {metric_columns}, last_updated_at timestamp) ON COMMIT DROP"
+    ))
+
+
+class TestWorkflowMetricsSqlParity:
+    """Test that the set-based SQL UPDATE matches _calculate_enhanced_workflow_metrics"""
+
+    def test_integration_filter_is_optional(self):
+        """Test that the integration filter is only added when requested"""
+        assert ':integration_id' not in build_workflow_metrics_update_sql()
+        assert ':integration_id' in build_workflow_metrics_update_sql(by_integration=True)
+        assert 'statuses_mappings' in build_workflow_metrics_update_sql()
+
+    def test_matches_per_item_implementation(self, postgres_connection):
+        """Test every metric written by the SQL UPDATE against the per-item function"""
+        from sqlalchemy import text
+
+        rows = _random_changelogs(300, seed=7)
+        _create_workflow_tables(postgres_connection)
+
+        postgres_connection.execute(
+            text("INSERT INTO statuses VALUES (:id, :name, :category, 1, 1)"),
+            [{'id': k, 'name': f"Status {k}", 'category': v.title() if v else None} for k, v in STATUS_CATEGORIES.items()]
+        )
+        postgres_connection.execute(
+            text("INSERT INTO work_items (id, tenant_id) VALUES (:id, 1)"),
+            [{'id': work_item_id} for work_item_id in {row[0] for row in rows}]
+        )
+        postgres_connection.execute(
+            text("""
+                INSERT INTO changelogs VALUES (:work_item_id, :date, :status_id, :time_in_status, 1, 1, TRUE)
+            """),
+            [{'work_item_id': r[0], 'date': r[1], 'status_id': r[2], 'time_in_status': r[3]} for r in rows]
+        )
+
+        postgres_connection.execute(
+            text(build_workflow_metrics_update_sql()),
+            {'tenant_id': 1, 'updated_at': datetime(2024, 6, 1)}
+        )
+
+        result = postgres_connection.execute(text(f"SELECT id, {', '.join(WORKFLOW_METRIC_COLUMNS)} FROM work_items"))
+        from_sql = {row[0]: dict(zip(WORKFLOW_METRIC_COLUMNS, row[1:])) for row in result}
+        expected = _per_item_metrics(rows)
+
+        for work_item_id, expected_metrics in expected.items():
+            for column in WORKFLOW_METRIC_COLUMNS:
+                value = from_sql[work_item_id][column]
+                if isinstance(expected_metrics[column], float):
+                    assert value == pytest.approx(expected_metrics[column], rel=1e-9, abs=1e-6), (work_item_id, column)
+                else:
+                    assert value == expected_metrics[column], (work_item_id, column)
+
+    def test_status_mapping_category_overrides_jira_category(self, postgres_connection):
+        """Test that changing a status mapping's category changes the recomputed metrics"""
+        from sqlalchemy import text
+
+        _create_workflow_tables(postgres_connection)
+        postgres_connection.execute(text("INSERT INTO work_items (id, tenant_id) VALUES (1, 1)"))
+
+        # Jira reports "Code Review" as 'In Progress'; the work item went In Progress -> Code Review -> Done
+        postgres_connection.execute(text("""
+            INSERT INTO statuses VALUES
+                (1, 'In Progress', 'In Progress', 1, 1), (2, 'Code Review', 'In Progress', 1, 1), (3, 'Done', 'Done', 1, 1)
+        """))
+        postgres_connection.execute(text("""
+            INSERT INTO changelogs VALUES
+                (1, '2024-01-01', 1, 3600, 1, 1, TRUE),
+                (1, '2024-01-02', 2, 7200, 1, 1, TRUE),
+                (1, '2024-01-03', 3, 0, 1, 1, TRUE)
+        """))
+
+        def recompute():
+            postgres_connection.execute(
+                text(build_workflow_metrics_update_sql(by_integration=True)),
+                {'tenant_id': 1, 'integration_id': 1, 'updated_at': datetime(2024, 6, 1)}
+            )
+            return postgres_connection.execute(text(
+                "SELECT total_work_starts, total_completions, work_first_completed_at FROM work_items"
+            )).one()
+
+        assert recompute() == (2, 1, datetime(2024, 1, 3))
+
+        # Map "Code Review" to Done: it now completes the work item instead of restarting work
+        postgres_connection.execute(text(
+            "INSERT INTO statuses_mappings (status_from, status_category, tenant_id, integration_id, active) "
+            "VALUES ('Code Review', 'Done', 1, 1, TRUE)"
+        ))
+        assert recompute() == (1, 2, datetime(2024, 1, 2))
+
+        # Inactive mappings are ignored
+        postgres_connection.execute(text("UPDATE statuses_mappings SET active = FALSE"))
+        assert recompute() == (2, 1, datetime(2024, 1, 3))
+
+
+class TestRunWorkflowMetricsRecompute:
+    """Test the scheduled recompute refreshes the DORA facts and invalidates cached dashboards"""
+
+    def _run(self, method, refresh_error=None):
+        calls = MagicMock()
+        calls.sql.return_value = {'work_items_updated': 3}
+        calls.columnar.return_value = {'work_items_updated': 4}
+        calls.refresh.side_effect = refresh_error
+        with patch.object(jira_workflow_metrics, 'recompute_workflow_metrics_sql', calls.sql), \
+                patch.object(jira_workflow_metrics, 'recompute_tenant_workflow_metrics', calls.columnar), \
+                patch('app.services.dora_lead_time_facts_service.refresh_dora_lead_time_facts', calls.refresh), \
+                patch('app.core.response_cache.bump_data_generation', calls.bump):
+            result = run_workflow_metrics_recompute(7, 2, method)
+        return result, [call[0] for call in calls.mock_calls]
+
+    @pytest.mark.parametrize('method, recompute', [('sql', 'sql'), ('columnar', 'columnar')])
+    def test_refresh_then_bump_after_recompute(self, method, recompute):
+        """Test facts are refreshed and the data generation bumped after the recompute, in that order"""
+        result, order = self._run(method)
+
+        assert order == [recompute, 'refresh', 'bump']
+        assert result['work_items_updated'] == (3 if method == 'sql' else 4)
+
+    def test_refresh_failure_still_bumps(self):
+        """Test a failed facts refresh is logged and cached dashboards are still invalidated"""
+        _, order = self._run('sql', refresh_error=RuntimeError('lock timeout'))
+
+        assert order == ['sql', 'refresh', 'bump']
+
@@ -0,0 +1,168 @@
+"""
+Test ETL message codecs: header negotiation, fallbacks and publishing on shared channels.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.etl.workers import message_codec
+from app.etl.workers.message_codec import (
+    JSON_CONTENT_TYPE, MessageCodecError, MessageEncoder, TOKEN_HEADER, ZSTD_ENCODING, decode_message
+)
+
+MESSAGE = {'tenant_id': 1, 'type': 'jira_dev_status', 'issue_key': 'PULSE-1', 'last_item': False, 'job_id': None}
+
+
+def headers(content_type=None, content_encoding=None):
+    return SimpleNamespace(content_type=content_type, content_encoding=content_encoding)
+
+
+class TestEncoding:
+    """Test encoding and decoding by AMQP headers"""
+
+    def test_json_round_trip(self):
+        """Test the default codec publishes persistent application/json messages"""
+        body, properties = MessageEncoder(codec='json', compression_threshold=0).encode(MESSAGE)
+
+        assert properties.delivery_mode == 2
+        assert properties.content_type == JSON_CONTENT_TYPE and properties.content_encoding is None
+        assert json.loads(body) == MESSAGE
+        assert decode_message(body, properties) == MESSAGE
+        assert properties.headers is None
+
+    def test_token_header(self):
+        """Test the job token is also sent as a header (readable when the body is not)"""
+        _, properties = MessageEncoder(codec='json', compression_threshold=0).encode({**MESSAGE, 'token': 'job-token'})
+
+        assert properties.headers == {TOKEN_HEADER: 'job-token'}
+
+    def test_legacy_messages_without_headers_are_json(self):
+        """Test messages published before codecs existed still decode"""
+        body = json.dumps(MESSAGE).encode()
+
+        assert decode_message(body) == MESSAGE
+        assert decode_message(body, headers()) == MESSAGE
+        assert decode_message(body, headers('application/json; charset=utf-8', 'identity')) == MESSAGE
+
+    def test_orjson_output_is_plain_json(self):
+        """Test orjson messages are readable by consumers that only know json"""
+        pytest.importorskip('orjson')
+        body, content_type, content_encoding = MessageEncoder(codec='orjson', compression_threshold=0).encode_body(
+            {**MESSAGE, 'counts': {3: 'three'}})
+
+        assert content_type == JSON_CONTENT_TYPE and content_encoding is None
+        assert json.loads(body) == {**MESSAGE, 'counts': {'3': 'three'}}
+
+    def test_msgpack_round_trip(self):
+        """Test msgpack messages are labeled and keep integer keys"""
+        pytest.importorskip('msgpack')
+        message = {**MESSAGE, 'counts': {3: 'three'}}
+        body, properties = MessageEncoder(codec='msgpack', compression_threshold=0).encode(message)
+
+        assert properties.content_type == message_codec.MSGPACK_CONTENT_TYPE
+        assert decode_message(body, properties) == message
+
+    def test_zstd_only_above_threshold(self):
+        """Test bodies below the threshold are sent uncompressed and larger ones compressed"""
+        pytest.importorskip('zstandard')
+        encoder = MessageEncoder(codec='json', compression_threshold=200)
+        large = {**MESSAGE, 'nested_batch': [{'nested_cursor': f"cursor-{i}"} for i in range(50)]}
+
+        assert encoder.encode_body(MESSAGE)[2] is None
+        body, properties = encoder.encode(large)
+        assert properties.content_encoding == ZSTD_ENCODING
+        assert len(body) < len(json.dumps(large))
+        assert decode_message(body, properties) == large
+
+    def test_unknown_headers_raise(self):
+        """Test undecodable messages raise instead of being read as the wrong format"""
+        body = json.dumps(MESSAGE).encode()
+
+        with pytest.raises(MessageCodecError):
+            decode_message(body, headers('text/plain'))
+        with pytest.raises(MessageCodecError):
+            decode_message(body, headers(JSON_CONTENT_TYPE, 'gzip'))
+
+    def test_unserializable_message_raises(self):
+        """Test encode errors name the codec"""
+        with pytest.raises(MessageCodecError, match='json'):
+            MessageEncoder(codec='json', compression_threshold=0).encode_body({'value': object()})
+
+
+class TestFallbacks:
+    """Test publishers without the optional packages"""
+
+    def test_unavailable_codec_publishes_json(self, monkeypatch):
+        """Test a codec whose package is missing falls back to json"""
+        monkeypatch.delitem(message_codec.CODECS, 'msgpack', raising=False)
+
+        assert MessageEncoder(codec='msgpack', compression_threshold=0).codec.name == 'json'
+
+    def test_missing_zstandard_disables_compression(self, monkeypatch):
+        """Test compression is turned off instead of failing every publish"""
+        monkeypatch.setattr(message_codec, 'zstandard', None)
+        encoder = MessageEncoder(codec='json', compression_threshold=1)
+
+        assert encoder.compression_threshold == 0
+        assert encoder.encode_body(MESSAGE)[2] is None
+        with pytest.raises(MessageCodecError):
+            decode_message(b'compressed', headers(JSON_CONTENT_TYPE, ZSTD_ENCODING))
+
+
+class TestQueueManagerPublishing:
+    """Test QueueManager and the batch publishers use the encoder"""
+
+    def test_publish_on_channel_routes_and_labels(self):
+        """Test shared-channel publishes are stamped, encoded and decoded by header"""
+        from app.etl.workers.queue_manager import QueueManager
+        from scripts.etl_benchmark.stand_ins import StandIns
+
+        with StandIns(broker=True, vector_store=False, embeddings=False) as stand_ins:
+            queue_manager = QueueManager()
+            with queue_manager.get_channel() as channel:
+                routing_key = queue_manager.publish_on_channel(channel, 'transform_queue_free', dict(MESSAGE))
+
+            _, body, properties = stand_ins.broker.get(routing_key)
+            assert properties.content_type == JSON_CONTENT_TYPE and properties.delivery_mode == 2
+            decoded = decode_message(body, properties)
+            assert decoded['issue_key'] == 'PULSE-1'
+            assert 'enqueued_at' in decoded and 'priority' in decoded
+
+
+    def test_undecodable_message_is_rejected_not_requeued(self):
+        """Test a message that cannot be decoded is dropped once and its in-flight count released"""
+        import pika
+        from app.etl.workers.queue_manager import QueueManager
+        from scripts.etl_benchmark.stand_ins import StandIns
+
+        properties = pika.BasicProperties(content_type='text/plain', headers={TOKEN_HEADER: 'job-token'})
+        tracker = MagicMock()
+        with StandIns(broker=True, vector_store=False, embeddings=False) as stand_ins, \
+                patch('app.etl.workers.queue_manager.get_inflight_tracker', return_value=tracker):
+            stand_ins.broker.publish('transform_queue_free', json.dumps(MESSAGE), properties)
+            queue_manager = QueueManager()
+
+            assert queue_manager.get_single_message('transform_queue_free') is None
+            assert stand_ins.broker.depth('transform_queue_free') == 0
+            assert queue_manager.get_single_message('transform_queue_free') is None
+
+        tracker.record_done.assert_called_once_with({'token': 'job-token'}, 'transform_queue_free')
+
+
+class TestBenchmark:
+    """Test the codec benchmark script"""
+
+    def test_run_benchmark(self):
+        """Test every message type is measured for each available codec"""
+        from scripts.benchmark_message_codecs import build_messages, run_benchmark
+
+        results = run_benchmark(['json'], iterations=3, compression_threshold=0, nested_items=4)
+
+        assert [result['message_type'] for result in results] == list(build_messages(4))
+        assert all(result['bytes'] > 0 and result['encode_us'] > 0 for result in results)
@@ -0,0 +1,215 @@
+"""
+Test the Prometheus metrics registry, /metrics endpoint and hot-path instrumentation.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from app.core.metrics import MetricsRegistry, queue_labels
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestRegistry:
+    """Test recording and the text exposition format"""
+
+    def test_histogram_renders_cumulative_buckets(self, registry):
+        """Test buckets are cumulative with +Inf, sum and count per label set"""
+        histogram = registry.histogram('pulse_test_seconds', 'Test latency.', ('route',), buckets=(0.1, 1.0))
+        histogram.observe(0.05, '/a')
+        histogram.observe(0.5, '/a')
+        histogram.observe(5.0, '/a')
+
+        text = registry.render()
+
+        assert '# TYPE pulse_test_seconds histogram' in text
+        assert 'pulse_test_seconds_bucket{route="/a",le="0.1"} 1' in text
+        assert 'pulse_test_seconds_bucket{route="/a",le="1.0"} 2' in text
+        assert 'pulse_test_seconds_bucket{route="/a",le="+Inf"} 3' in text
+        assert 'pulse_test_seconds_sum{route="/a"} 5.55' in text
+        assert 'pulse_test_seconds_count{route="/a"} 3' in text
+
+    def test_counter_and_label_escaping(self, registry):
+        """Test counters add up per label set and label values are escaped"""
+        counter = registry.counter('pulse_test_total', 'Test rows.', ('table',))
+        counter.inc('work_items', amount=3)
+        counter.inc('work_items', amount=2)
+        counter.inc('a"b\\c')
+
+        text = registry.render()
+
+        assert 'pulse_test_total{table="work_items"} 5.0' in text
+        assert 'pulse_test_total{table="a\\"b\\\\c"} 1.0' in text
+
+    def test_disabled_registry_records_nothing(self, registry):
+        """Test METRICS_ENABLED=false makes recording a no-op"""
+        registry.enabled = False
+        histogram = registry.histogram('pulse_test_seconds', 'Test latency.', ('route',))
+        counter = registry.counter('pulse_test_total', 'Test rows.')
+        histogram.observe(1.0, '/a')
+        counter.inc()
+
+        assert histogram.snapshot('/a') is None
+        assert counter.value() == 0.0
+
+    def test_failing_collector_does_not_break_scrape(self, registry):
+        """Test a collector error is skipped and other samples still render"""
+        registry.counter('pulse_test_total', 'Test rows.').inc()
+        registry.register_collector(lambda: 1 / 0)
+        registry.register_collector(lambda: ['pulse_collected 1'])
+
+        text = registry.render()
+
+        assert 'pulse_test_total 1.0' in text
+        assert 'pulse_collected 1' in text
+
+    def test_queue_labels(self):
+        """Test tier queues and their per-tenant sub-queues map to (queue_type, tier)"""
+        assert queue_labels('transform_queue_premium') == ('transform', 'premium')
+        assert queue_labels('embedding_queue_free.t12.bulk') == ('embedding', 'free')
+        assert queue_labels('custom_queue') == ('custom_queue', '')
+
+    def test_standalone_server(self):
+        """Test worker processes can serve /metrics without the FastAPI app"""
+        server = metrics.serve_metrics(0, host='127.0.0.1')
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.headers['Content-Type'] == metrics.CONTENT_TYPE
+                assert '# TYPE pulse_etl_message_duration_seconds histogram' in response.read().decode()
+        finally:
+            server.shutdown()
+
+    def test_standalone_server_token_and_default_host(self, monkeypatch):
+        """Test the worker server binds ETL_WORKER_METRICS_HOST and requires METRICS_BEARER_TOKEN"""
+        from app.core.config import get_settings
+        monkeypatch.setattr(get_settings(), 'METRICS_BEARER_TOKEN', 'scrape-secret')
+
+        server = metrics.serve_metrics(0)
+        try:
+            assert server.server_address[0] == get_settings().ETL_WORKER_METRICS_HOST == '127.0.0.1'
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            for headers in ({}, {'Authorization': 'Bearer wrong'}):
+                with pytest.raises(urllib.error.HTTPError) as error:
+                    urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=5)
+                assert error.value.code == 401
+            request = urllib.request.Request(url, headers={'Authorization': 'Bearer scrape-secret'})
+            with urllib.request.urlopen(request, timeout=5) as response:
+                assert response.status == 200
+        finally:
+            server.shutdown()
+
+
+class TestHttpMetrics:
+    """Test the request latency middleware and the /metrics route"""
+
+    @pytest.fixture
+    def client(self):
+        from app.api.metrics_routes import router
+        from app.core.middleware import MetricsMiddleware
+
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: int):
+            return {'id': item_id}
+
+        app.include_router(router)
+        app.add_middleware(MetricsMiddleware)
+        return TestClient(app)
+
+    def test_requests_labeled_by_route_template(self, client):
+        """Test path parameters do not become label values"""
+        before = metrics.HTTP_REQUEST_DURATION.snapshot('GET', '/items/{item_id}', '200')
+        client.get('/items/1')
+        client.get('/items/2')
+        client.get('/nowhere/3')
+
+        after = metrics.HTTP_REQUEST_DURATION.snapshot('GET', '/items/{item_id}', '200')
+        assert after['count'] == (before['count'] if before else 0) + 2
+        assert metrics.HTTP_REQUEST_DURATION.snapshot('GET', 'unmatched', '404')['count'] >= 1
+        assert metrics.HTTP_REQUEST_DURATION.snapshot('GET', '/items/2', '200') is None
+
+    def test_metrics_endpoint(self, client):
+        """Test the endpoint serves the exposition format"""
+        client.get('/items/1')
+        response = client.get('/metrics')
+
+        assert response.status_code == 200
+        assert response.headers['content-type'] == metrics.CONTENT_TYPE
+        assert 'pulse_http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"}' \
+            in response.text
+
+    def test_metrics_endpoint_token(self, client, monkeypatch):
+        """Test METRICS_BEARER_TOKEN is required when configured"""
+        from app.core.config import get_settings
+        monkeypatch.setattr(get_settings(), 'METRICS_BEARER_TOKEN', 'scrape-secret')
+
+        assert client.get('/metrics').status_code == 401
+        assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+        assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+
+
+class TestEtlMetrics:
+    """Test worker, bulk write and response cache metrics"""
+
+    def test_worker_message_duration_and_queue_wait(self):
+        """Test BaseWorker records processing time per worker type, tier, step and status"""
+        import time
+        from app.etl.workers import base_worker
+
+        class ProbeWorker(base_worker.BaseWorker):
+            async def process_message(self, message):
+                return message['type'] == 'jira_issues'
+
+        with patch.object(base_worker, 'QueueManager'), patch.object(base_worker, 'get_database'), \
+                patch.object(base_worker, 'WorkerStatusManager'):
+            worker = ProbeWorker('transform_queue_basic')
+
+        worker._handle_message({'type': 'jira_issues', 'enqueued_at': time.time() - 2.0})
+        worker._handle_message({'type': 'jira_dev_status'})
+
+        ok = metrics.MESSAGE_DURATION.snapshot('ProbeWorker', 'basic', 'jira_issues', 'success')
+        failed = metrics.MESSAGE_DURATION.snapshot('ProbeWorker', 'basic', 'jira_dev_status', 'failure')
+        wait = metrics.QUEUE_WAIT.snapshot('ProbeWorker', 'basic')
+        assert ok['count'] == 1 and failed['count'] == 1
+        assert wait['count'] == 1 and wait['sum'] >= 2.0
+
+    def test_bulk_insert_rows(self):
+        """Test bulk writes count rows per operation and table"""
+        from app.etl.workers.bulk_operations import BulkOperations
+
+        before = metrics.BULK_ROWS.value('insert', 'changelogs')
+        BulkOperations.bulk_insert(MagicMock(), 'changelogs', [{'tenant_id': 1, 'external_id': str(i)} for i in range(250)])
+
+        assert metrics.BULK_ROWS.value('insert', 'changelogs') == before + 250
+        assert metrics.BULK_WRITE_DURATION.snapshot('insert', 'changelogs')['count'] >= 1
+
+    def test_response_cache_collector(self, monkeypatch):
+        """Test cache stats are exported once the cache exists"""
+        from app.core import response_cache
+
+        monkeypatch.setattr(response_cache, '_response_cache', None)
+        assert response_cache._collect_metrics() == []
+
+        cache = response_cache.ResponseCache(max_entries=10, ttl_seconds=60,
+                                             generations=SimpleNamespace(get=lambda tenant_id: 0))
+        cache._stats.update(hits=4, misses=1)
+        monkeypatch.setattr(response_cache, '_response_cache', cache)
+
+        text = metrics.get_metrics_registry().render()
+        assert 'pulse_response_cache_requests_total{result="hits"} 4' in text
+        assert 'pulse_response_cache_entries 0' in text
@@ -0,0 +1,131 @@
+"""
+Test keyset (cursor) pagination and the list routes using it.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.core.pagination import Keyset, InvalidCursorError, NULL_TIMESTAMP_SENTINEL
+from app.models.unified_models import WorkItem, Project
+
+
+def _compile(clause):
+    return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+
+
+WORK_ITEMS = Keyset('work_items', WorkItem.created_at, WorkItem.id, null_sentinel=NULL_TIMESTAMP_SENTINEL)
+PROJECTS = Keyset('projects', Project.name, Project.id, descending=False)
+
+
+class TestKeyset:
+    """Test cursor encoding and keyset conditions"""
+
+    def test_cursor_round_trip(self):
+        """Test datetime sort values survive encoding"""
+        created = datetime(2025, 1, 6, 12, 30, 15, 123456)
+        cursor = WORK_ITEMS.encode(SimpleNamespace(created_at=created, id=42))
+
+        assert WORK_ITEMS.decode(cursor) == (created, 42)
+        assert '=' not in cursor
+
+    def test_null_sort_value_compares_against_sentinel(self):
+        """Test rows without a timestamp continue from the sentinel position"""
+        cursor = WORK_ITEMS.encode(SimpleNamespace(created_at=None, id=7))
+
+        sql = _compile(WORK_ITEMS.after(cursor))
+
+        assert sql.count(NULL_TIMESTAMP_SENTINEL) == 2
+        assert sql.endswith("< ('0001-01-01 00:00:00'::timestamp, 7)")
+
+    def test_descending_and_ascending_conditions(self):
+        """Test the row comparison direction follows the sort direction"""
+        work_item_sql = _compile(WORK_ITEMS.after(WORK_ITEMS.encode(SimpleNamespace(created_at=datetime(2025, 1, 6), id=3))))
+        project_sql = _compile(PROJECTS.after(PROJECTS.encode(SimpleNamespace(name='Apollo', id=9))))
+
+        assert 'coalesce(work_items.created_at' in work_item_sql and ') < (' in work_item_sql
+        assert project_sql == "(projects.name, projects.id) > ('Apollo', 9)"
+        assert [_compile(clause) for clause in PROJECTS.order_by()] == ['projects.name ASC', 'projects.id ASC']
+
+    def test_invalid_cursors(self):
+        """Test garbage and cursors of another listing are rejected"""
+        project_cursor = PROJECTS.encode(SimpleNamespace(name='Apollo', id=9))
+
+        for cursor in ('not-a-cursor', project_cursor):
+            with pytest.raises(InvalidCursorError):
+                WORK_ITEMS.decode(cursor)
+
+    def test_next_cursor_only_when_extra_row_fetched(self):
+        """Test the next cursor points at the last returned row, not the look-ahead row"""
+        rows = [SimpleNamespace(name=name, id=index) for index, name in enumerate('abc')]
+
+        assert PROJECTS.next_cursor(rows, 3) is None
+        assert PROJECTS.decode(PROJECTS.next_cursor(rows, 2)) == ('b', 1)
+
+
+class FakeAsyncSession:
+    """Records statements and returns canned results in order"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.statements = []
+
+    async def scalar(self, statement):
+        self.statements.append(statement)
+        return self.results.pop(0)
+
+    async def scalars(self, statement):
+        self.statements.append(statement)
+        return self.results.pop(0)
+
+
+class TestWorkItemsListRoute:
+    """Test cursor pagination on GET /api/work_items"""
+
+    def _get(self, session, **kwargs):
+        from app.api import issues
+
+        params = dict(tenant_id=1, include_ml_fields=False, limit=2, offset=0, cursor=None, include_total=True,
+                      project_key=None, status=None, assignee=None)
+        params.update(kwargs)
+        return asyncio.run(issues.get_work_items(db=session, user=SimpleNamespace(tenant_id=1), **params))
+
+    def _items(self, count):
+        items = []
+        for index in range(count):
+            item = MagicMock(created_at=datetime(2025, 1, 10 - index), id=100 - index)
+            item.to_dict.return_value = {'id': item.id}
+            items.append(item)
+        return items
+
+    def test_cursor_page_skips_count_and_offset(self):
+        """Test a cursor page uses the keyset condition and no COUNT when include_total is off"""
+        page = MagicMock()
+        page.all.return_value = self._items(3)
+        session = FakeAsyncSession([page])
+        cursor = WORK_ITEMS.encode(SimpleNamespace(created_at=datetime(2025, 1, 11), id=101))
+
+        response = self._get(session, cursor=cursor, include_total=False)
+
+        assert [issue['id'] for issue in response['issues']] == [100, 99]
+        assert response['total_count'] is None
+        assert WORK_ITEMS.decode(response['next_cursor']) == (datetime(2025, 1, 9), 99)
+        sql = _compile(session.statements[0])
+        assert 'OFFSET' not in sql
+        assert 'LIMIT 3' in sql
+        assert 'ORDER BY coalesce(work_items.created_at' in sql
+
+    def test_invalid_cursor_is_bad_request(self):
+        """Test an undecodable cursor returns 400"""
+        with pytest.raises(HTTPException) as error:
+            self._get(FakeAsyncSession([]), cursor='garbage', include_total=False)
+
+        assert error.value.status_code == 400
@@ -0,0 +1,149 @@
+"""
+Test concurrent multi-collection vector search in PulseQdrantClient.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from app.ai.qdrant_client import PulseQdrantClient
+
+
+class FakeQdrant:
+    """Blocking client standing in for QdrantClient: per-collection latency, hits and failures"""
+
+    def __init__(self, delays=None, hits=None, missing=(), errors=None):
+        self.delays = delays or {}
+        self.hits = hits or {}
+        self.missing = set(missing)
+        self.errors = errors or {}
+
+    def search(self, collection_name, query_vector, query_filter, limit, with_payload):
+        time.sleep(self.delays.get(collection_name, 0.0))
+        if collection_name in self.missing:
+            raise ValueError(f"Collection {collection_name} not found")
+        if collection_name in self.errors:
+            raise self.errors[collection_name]
+        return [
+            SimpleNamespace(id=index, score=score, payload={'collection': collection_name}, vector=None)
+            for index, score in enumerate(self.hits.get(collection_name, []))
+        ][:limit]
+
+    def get_collection(self, collection_name):
+        if collection_name in self.missing:
+            raise ValueError(f"Collection {collection_name} not found")
+        if collection_name in self.errors:
+            raise self.errors[collection_name]
+        return SimpleNamespace(points_count=len(self.hits.get(collection_name, [])), status=SimpleNamespace(value='green'))
+
+
+def _client(fake):
+    client = PulseQdrantClient(host='qdrant', port=6333)
+    client.client = fake
+    client.connected = True
+    return client
+
+
+class TestSearchCollections:
+    """Test fan-out, merging and degradation"""
+
+    def test_collections_are_searched_concurrently(self):
+        """Test total latency is close to the slowest collection, not the sum"""
+        names = [f"client_1_{kind}" for kind in ('work_items', 'prs', 'prs_comments', 'projects')]
+        client = _client(FakeQdrant(delays={name: 0.2 for name in names}))
+        asyncio.run(client.search_collections(['warm-up'], [0.1]))  # First search imports qdrant models
+
+        result = asyncio.run(client.search_collections(names, [0.1, 0.2], limit=5))
+
+        assert result.processing_time < 0.6
+        assert result.collection_status == {name: 'ok' for name in names}
+
+    def test_results_merged_by_score(self):
+        """Test hits from all collections are merged best-first and cut to top_k"""
+        client = _client(FakeQdrant(hits={'a': [0.9, 0.5], 'b': [0.95, 0.7, 0.61]}))
+
+        result = asyncio.run(client.search_collections(['a', 'b'], [0.1], limit=5, score_threshold=0.6, top_k=3))
+
+        assert [(hit.collection, hit.score) for hit in result.results] == [('b', 0.95), ('a', 0.9), ('b', 0.7)]
+        assert result.total_found == 4  # 0.5 is below the threshold
+
+    def test_slow_and_missing_collections_degrade(self):
+        """Test a timed-out or missing collection is reported while the others still return hits"""
+        client = _client(FakeQdrant(delays={'slow': 1.0}, hits={'fast': [0.8], 'slow': [0.99]}, missing=['gone']))
+
+        # processing_time: asyncio.run itself also waits for the abandoned executor thread on shutdown
+        result = asyncio.run(client.search_collections(['fast', 'slow', 'gone'], [0.1], timeout=0.2))
+
+        assert result.processing_time < 0.8
+        assert result.collection_status == {'fast': 'ok', 'slow': 'timeout', 'gone': 'unavailable'}
+        assert [hit.collection for hit in result.results] == ['fast']
+
+    def test_missing_collection_unavailable(self):
+        """Test a collection the Qdrant server does not know (404) is unavailable, not an error"""
+        not_found = UnexpectedResponse(404, 'Not Found', b'{"status": {"error": "Not found"}}', httpx.Headers())
+        client = _client(FakeQdrant(hits={'a': [0.9]}, errors={'gone': not_found}))
+
+        result = asyncio.run(client.search_collections(['a', 'gone'], [0.1]))
+
+        assert result.collection_status == {'a': 'ok', 'gone': 'unavailable'}
+        assert [hit.collection for hit in result.results] == ['a']
+
+    def test_failing_collection_error(self):
+        """Test connection failures and server errors are reported as errors"""
+        server_error = UnexpectedResponse(500, 'Internal Server Error', b'', httpx.Headers())
+        client = _client(FakeQdrant(errors={'down': ConnectionError('connection refused'), 'broken': server_error}))
+
+        result = asyncio.run(client.search_collections(['down', 'broken'], [0.1]))
+
+        assert result.collection_status == {'down': 'error', 'broken': 'error'}
+
+    def test_not_connected(self):
+        """Test a disconnected client reports every collection unavailable"""
+        client = PulseQdrantClient(host='qdrant', port=6333)
+
+        result = asyncio.run(client.search_collections(['a', 'b'], [0.1]))
+
+        assert result.results == []
+        assert result.collection_status == {'a': 'unavailable', 'b': 'unavailable'}
+
+    def test_get_collection_info(self):
+        """Test collection info exposes the point count and raises for missing collections"""
+        client = _client(FakeQdrant(hits={'a': [0.9, 0.5]}, missing=['gone']))
+
+        assert asyncio.run(client.get_collection_info('a')) == {'name': 'a', 'points_count': 2, 'status': 'green'}
+        try:
+            asyncio.run(client.get_collection_info('gone'))
+            raise AssertionError("Expected missing collection to raise")
+        except ValueError:
+            pass
+
+
+class TestCapabilities:
+    """Test the collection status reported by AIQueryProcessor.get_capabilities"""
+
+    def test_missing_unavailable_and_failing_error(self):
+        """Test a missing collection is unavailable and a failing one is an error"""
+        pytest.importorskip('openai')
+        from app.ai.query_processor import AIQueryProcessor
+
+        processor = AIQueryProcessor.__new__(AIQueryProcessor)
+        processor.qdrant_client = _client(FakeQdrant(
+            hits={'client_1_work_items': [0.9]},
+            missing=['client_1_prs'],
+            errors={'client_1_projects': ConnectionError('connection refused')}
+        ))
+        processor.query_cache = SimpleNamespace(stats=lambda tenant_id: {})
+
+        capabilities = asyncio.run(processor.get_capabilities(1))
+
+        statuses = {collection['name']: collection['status'] for collection in capabilities['collections']}
+        assert statuses['client_1_work_items'] == 'available'
+        assert statuses['client_1_prs'] == 'unavailable'
+        assert statuses['client_1_projects'] == 'error'
@@ -0,0 +1,79 @@
+"""
+Test the tenant-scoped query embedding/intent cache.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import time
+
+from app.ai.query_cache import QueryCache, normalize_query
+
+
+class TestQueryCache:
+    """Test lookups, scoping, expiry and counters"""
+
+    def test_repeated_query_hits_after_normalization(self):
+        """Test case and whitespace variants of a query share one entry"""
+        cache = QueryCache(max_entries=10, ttl_seconds=60)
+
+        assert cache.get_embedding(1, '7:mpnet', 'Open bugs') is None
+        cache.put_embedding(1, '7:mpnet', 'Open bugs', [0.1, 0.2])
+
+        assert normalize_query('  OPEN \n bugs ') == 'open bugs'
+        assert cache.get_embedding(1, '7:mpnet', '  OPEN \n bugs ') == [0.1, 0.2]
+        assert cache.stats(1)['embedding'] == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1}
+
+    def test_entries_are_scoped_by_tenant_and_model(self):
+        """Test another tenant or another model never sees the cached vector"""
+        cache = QueryCache(max_entries=10, ttl_seconds=60)
+        cache.put_embedding(1, '7:mpnet', 'open bugs', [0.1])
+
+        assert cache.get_embedding(2, '7:mpnet', 'open bugs') is None
+        assert cache.get_embedding(1, '8:text-embedding-3-small', 'open bugs') is None
+        assert cache.stats(2)['embedding']['misses'] == 1
+        assert cache.stats(2)['embedding']['size'] == 0
+
+    def test_cached_values_cannot_be_mutated_by_callers(self):
+        """Test returned vectors and intents are copies"""
+        cache = QueryCache(max_entries=10, ttl_seconds=60)
+        cache.put_embedding(1, 'm', 'q', [0.1])
+        cache.put_intent(1, 'm', 'q', {'type': 'semantic', 'entities': ['pr']})
+
+        cache.get_embedding(1, 'm', 'q').append(0.9)
+        cache.get_intent(1, 'm', 'q')['entities'].append('bug')
+
+        assert cache.get_embedding(1, 'm', 'q') == [0.1]
+        assert cache.get_intent(1, 'm', 'q') == {'type': 'semantic', 'entities': ['pr']}
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test the LRU entry goes first once max_entries is exceeded"""
+        cache = QueryCache(max_entries=2, ttl_seconds=60)
+        cache.put_intent(1, 'm', 'a', {'type': 'semantic'})
+        cache.put_intent(1, 'm', 'b', {'type': 'structured'})
+        cache.get_intent(1, 'm', 'a')
+        cache.put_intent(1, 'm', 'c', {'type': 'hybrid'})
+
+        assert cache.get_intent(1, 'm', 'b') is None
+        assert cache.get_intent(1, 'm', 'a') == {'type': 'semantic'}
+        assert cache.stats()['intent']['evictions'] == 1
+
+    def test_entries_expire(self):
+        """Test entries older than the TTL are misses"""
+        cache = QueryCache(max_entries=10, ttl_seconds=0.05)
+        cache.put_embedding(1, 'm', 'q', [0.1])
+        time.sleep(0.06)
+
+        assert cache.get_embedding(1, 'm', 'q') is None
+        assert cache.stats(1)['embedding']['size'] == 0
+
+    def test_invalidate_tenant(self):
+        """Test invalidation drops one tenant's entries only"""
+        cache = QueryCache(max_entries=10, ttl_seconds=60)
+        cache.put_embedding(1, 'm', 'q', [0.1])
+        cache.put_embedding(2, 'm', 'q', [0.2])
+
+        cache.invalidate_tenant(1)
+
+        assert cache.get_embedding(1, 'm', 'q') is None
+        assert cache.get_embedding(2, 'm', 'q') == [0.2]
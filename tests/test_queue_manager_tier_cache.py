@@ -0,0 +1,80 @@
+"""
+Test the cached tenant tier routing table in QueueManager.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+from unittest.mock import patch
+
+from app.core.config import get_settings
+from app.etl.workers.queue_manager import QueueManager, invalidate_tenant_tiers
+
+
+class TestTenantTierCache:
+    """Test tier lookups, expiry and invalidation"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        invalidate_tenant_tiers()
+        self.queue_manager = QueueManager()
+
+    def teardown_method(self):
+        """Clean up the process-wide routing table"""
+        invalidate_tenant_tiers()
+
+    def test_routing_table_loaded_once(self):
+        """Test that many publishes for several tenants need one database query"""
+        with patch.object(QueueManager, '_load_tenant_tiers', return_value={1: 'premium', 2: 'free'}) as mock_load:
+            for _ in range(1000):
+                assert self.queue_manager._get_tenant_tier(1) == 'premium'
+            assert QueueManager()._get_tenant_tier(2) == 'free'
+
+        assert mock_load.call_count == 1
+
+    def test_invalidation_picks_up_new_tier(self):
+        """Test that invalidate_tenant_tiers() forces a reload"""
+        with patch.object(QueueManager, '_load_tenant_tiers', side_effect=[{1: 'free'}, {1: 'enterprise'}]):
+            assert self.queue_manager.get_tenant_queue_name(1, 'embedding') == 'embedding_queue_free'
+            invalidate_tenant_tiers()
+            assert self.queue_manager.get_tenant_queue_name(1, 'embedding') == 'embedding_queue_enterprise'
+
+    def test_unknown_tenant_defaults_to_premium(self):
+        """Test that a tenant missing from the table falls back to premium"""
+        with patch.object(QueueManager, '_load_tenant_tiers', return_value={1: 'free'}):
+            assert self.queue_manager._get_tenant_tier(99) == 'premium'
+
+    def test_unknown_tenant_not_reloaded_until_expiry(self):
+        """Test that a tenant missing from the table does not reload it on every publish"""
+        with patch.object(QueueManager, '_load_tenant_tiers', return_value={1: 'free'}) as mock_load:
+            for _ in range(100):
+                assert self.queue_manager._get_tenant_tier(99) == 'premium'
+            assert mock_load.call_count == 1
+
+            invalidate_tenant_tiers()
+            self.queue_manager._get_tenant_tier(99)
+            assert mock_load.call_count == 2
+
+        with patch.object(get_settings(), 'TENANT_TIER_CACHE_TTL_SECONDS', 0), \
+                patch.object(QueueManager, '_load_tenant_tiers', return_value={1: 'free', 99: 'basic'}):
+            assert self.queue_manager._get_tenant_tier(99) == 'basic'
+
+    def test_database_error_keeps_stale_tier(self):
+        """Test that a failed reload reuses the last known tier"""
+        with patch.object(QueueManager, '_load_tenant_tiers', return_value={1: 'basic'}):
+            self.queue_manager._get_tenant_tier(1)
+
+        with patch.object(get_settings(), 'TENANT_TIER_CACHE_TTL_SECONDS', 0), \
+                patch.object(QueueManager, '_load_tenant_tiers', side_effect=Exception('db down')):
+            assert self.queue_manager._get_tenant_tier(1) == 'basic'
+
+    def test_pre_resolved_queue_skips_tier_lookup(self):
+        """Test that batch publishers can pass the queue name explicitly"""
+        with patch.object(QueueManager, '_get_tenant_tier') as mock_tier, \
+                patch.object(QueueManager, '_publish_message', return_value=True) as mock_publish:
+            self.queue_manager.publish_embedding_job(
+                tenant_id=1, table_name='work_items', external_id='10', queue_name='embedding_queue_premium'
+            )
+
+        mock_tier.assert_not_called()
+        assert mock_publish.call_args[0][0] == 'embedding_queue_premium'
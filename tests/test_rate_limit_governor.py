@@ -0,0 +1,137 @@
+"""
+Test shared rate budget pacing for GitHub/Jira API clients.
+"""
+
+import time
+import pytest
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+from unittest.mock import MagicMock, patch
+
+from app.etl.workers.rate_limit_governor import RateLimitGovernor, parse_reset_timestamp
+
+
+class TestRateLimitGovernor:
+    """Test process-local pacing decisions"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.governor = RateLimitGovernor()
+        self.governor.redis_client = None
+        self.governor.max_wait_seconds = 900
+        self.governor.reserve_fraction = 0.0
+        self.governor.pacing_threshold = 0.25
+
+    def test_unknown_key_is_not_paced(self):
+        """Test that requests run immediately before any budget is known"""
+        assert self.governor._reserve_local('github:unknown', 1) == 0.0
+
+    def test_healthy_budget_is_not_paced(self):
+        """Test that requests run immediately while budget is above the pacing threshold"""
+        self.governor.record('github:abc', remaining=4000, limit=5000, reset_at=time.time() + 3600)
+
+        assert self.governor._reserve_local('github:abc', 1) == 0.0
+
+    def test_low_budget_spreads_requests_until_reset(self):
+        """Test that concurrent callers get evenly spaced slots when budget is low"""
+        self.governor.record('github:abc', remaining=100, limit=5000, reset_at=time.time() + 1000)
+
+        first = self.governor._reserve_local('github:abc', 1)
+        second = self.governor._reserve_local('github:abc', 1)
+
+        assert first == pytest.approx(0.0, abs=0.01)
+        assert second == pytest.approx(10.0, abs=0.5)
+
+    def test_exhausted_budget_waits_for_reset(self):
+        """Test that an exhausted budget waits for the window to reset"""
+        self.governor.record('jira:example.atlassian.net', remaining=0, limit=100, reset_at=time.time() + 30)
+
+        delay = self.governor._reserve_local('jira:example.atlassian.net', 1)
+
+        assert delay == pytest.approx(30.0, abs=0.5)
+
+    def test_acquire_does_not_wait_beyond_max_wait(self):
+        """Test that very long waits are left to the RATE_LIMITED job handling"""
+        self.governor.max_wait_seconds = 60
+        self.governor.record('github:abc', remaining=0, limit=5000, reset_at=time.time() + 3600)
+
+        with patch('app.etl.workers.rate_limit_governor.time.sleep') as mock_sleep:
+            assert self.governor.acquire('github:abc') == 0.0
+            mock_sleep.assert_not_called()
+
+    def test_expired_window_clears_budget(self):
+        """Test that a past reset time drops the stale budget"""
+        self.governor.record('github:abc', remaining=0, limit=5000, reset_at=time.time() - 1)
+
+        assert self.governor._reserve_local('github:abc', 1) == 0.0
+        assert self.governor.get_budget('github:abc') is None
+
+    def test_keys_do_not_contain_token(self):
+        """Test that GitHub budget keys are derived from a token hash"""
+        key = RateLimitGovernor.github_key('ghp_secret_token', 'core')
+
+        assert 'ghp_secret_token' not in key
+        assert key.startswith('github:') and key.endswith(':core')
+        assert RateLimitGovernor.jira_key('https://Example.atlassian.net/') == 'jira:example.atlassian.net'
+
+
+class TestJiraClientRateLimit:
+    """Test JiraAPIClient backing off on HTTP 429"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        from app.etl.jira.jira_client import JiraAPIClient
+
+        self.governor = RateLimitGovernor()
+        self.governor.redis_client = None
+        self.governor.max_wait_seconds = 60
+        with patch('app.etl.jira.jira_client.get_rate_limit_governor', return_value=self.governor):
+            self.client = JiraAPIClient('user@example.com', 'token', 'https://example.atlassian.net')
+
+    @staticmethod
+    def _response(status_code, retry_after=None):
+        response = MagicMock(status_code=status_code)
+        response.headers = {'Retry-After': retry_after} if retry_after else {}
+        return response
+
+    def test_retries_after_waiting_retry_after(self):
+        """Test that a 429 is retried only after Retry-After seconds"""
+        responses = [self._response(429, '20'), self._response(200)]
+
+        with patch('app.etl.jira.jira_client.requests.request', side_effect=responses) as mock_request, \
+                patch('app.etl.workers.rate_limit_governor.time.sleep') as governor_sleep, \
+                patch('app.etl.jira.jira_client.time.sleep') as client_sleep:
+            response = self.client._request('GET', 'https://example.atlassian.net/rest/api/3/myself')
+
+        assert response.status_code == 200 and mock_request.call_count == 2
+        waited = sum(c.args[0] for c in governor_sleep.call_args_list + client_sleep.call_args_list)
+        assert waited == pytest.approx(20.0, abs=0.5)
+
+    def test_retry_after_beyond_max_wait_returns_429(self):
+        """Test that a Retry-After longer than the max wait is not hammered with retries"""
+        with patch('app.etl.jira.jira_client.requests.request', return_value=self._response(429, '3600')) as mock_request, \
+                patch('app.etl.jira.jira_client.time.sleep'):
+            response = self.client._request('GET', 'https://example.atlassian.net/rest/api/3/myself')
+
+        assert response.status_code == 429
+        assert mock_request.call_count == 1
+
+    def test_sleeps_when_governor_does_not_pace(self):
+        """Test the client still backs off when the shared budget cannot be reserved"""
+        responses = [self._response(429, '5'), self._response(200)]
+
+        with patch('app.etl.jira.jira_client.requests.request', side_effect=responses), \
+                patch.object(self.governor, 'acquire', return_value=0.0), \
+                patch('app.etl.jira.jira_client.time.sleep') as client_sleep:
+            self.client._request('GET', 'https://example.atlassian.net/rest/api/3/myself')
+
+        client_sleep.assert_called_once_with(5.0)
+
+
+def test_parse_reset_timestamp_formats():
+    """Test parsing of epoch and ISO-8601 reset values"""
+    assert parse_reset_timestamp('1700000000') == 1700000000.0
+    assert parse_reset_timestamp('2023-11-14T22:13:20Z') == 1700000000.0
+    assert parse_reset_timestamp(None) is None
+    assert parse_reset_timestamp('not-a-date') is None
@@ -0,0 +1,155 @@
+"""
+Test replica lag monitoring and read-your-writes routing.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from app.core.database_router import DatabaseRouter
+from app.core.replica_lag_monitor import ReplicaLagMonitor, parse_lsn, lsn_reached
+
+
+def _make_monitor(lag_seconds=0.0, replay_lsn='0/5000', error=None):
+    engine = MagicMock()
+    conn = engine.connect.return_value.__enter__.return_value
+    if error:
+        conn.execute.side_effect = error
+    else:
+        conn.execute.return_value.fetchone.return_value = SimpleNamespace(lag_seconds=lag_seconds, replay_lsn=replay_lsn)
+    monitor = ReplicaLagMonitor(engine)
+    monitor.max_lag_seconds = 30.0
+    monitor.interval_seconds = 5.0
+    return monitor
+
+
+class FakeEngineRegistry:
+    """Engine registry whose session factories hand out sessions tagged by role"""
+
+    has_dedicated_analytics_pool = False
+
+    def __init__(self):
+        self.engines = {'primary': MagicMock(name='primary_engine'), 'replica': MagicMock(name='replica_engine')}
+        self.sessions = {'primary': [], 'replica': []}
+
+    def get_engine(self, role):
+        return self.engines[role]
+
+    def get_session_factory(self, role):
+        def factory():
+            session = MagicMock(name=role, info={})
+            self.sessions[role].append(session)
+            return session
+        return factory
+
+
+def _make_router(monitor):
+    """Router over a fake engine registry with the given lag monitor"""
+    registry = FakeEngineRegistry()
+    with patch('app.core.database_router.get_engine_registry', return_value=registry), \
+            patch('app.core.database_router.get_replica_lag_monitor', return_value=monitor):
+        router = DatabaseRouter()
+    router.settings = MagicMock(USE_READ_REPLICA=True)
+    return router, registry.sessions
+
+
+class TestLsn:
+    """Test LSN parsing and comparison"""
+
+    def test_parse_and_compare(self):
+        """Test that both LSN halves are compared numerically"""
+        assert parse_lsn('1/0') == 1 << 32
+        assert parse_lsn('0/A') == 10
+        assert parse_lsn('garbage') is None
+        assert lsn_reached('1/0', '0/FFFFFFFF')
+        assert not lsn_reached('0/9', '0/A')
+        assert not lsn_reached(None, '0/A')
+        assert lsn_reached(None, None)
+
+
+class TestReplicaLagMonitor:
+    """Test lag samples and health"""
+
+    def test_healthy_and_lagging(self):
+        """Test that health follows the max lag setting"""
+        monitor = _make_monitor(lag_seconds=2.0)
+        assert monitor.is_healthy() is False  # No sample yet
+
+        monitor.sample()
+        assert monitor.is_healthy() is True
+
+        monitor = _make_monitor(lag_seconds=45.0)
+        monitor.sample()
+        assert monitor.is_healthy() is False
+        assert monitor.get_status()['lag_seconds'] == 45.0
+
+    def test_failed_and_stale_samples_unhealthy(self):
+        """Test that an unreachable replica or stalled monitor routes away from the replica"""
+        monitor = _make_monitor(error=ConnectionError("replica down"))
+        monitor.sample()
+        assert monitor.is_healthy() is False
+        assert 'replica down' in monitor.get_status()['error']
+
+        monitor = _make_monitor(lag_seconds=0.0)
+        monitor.sample()
+        with patch('app.core.replica_lag_monitor.time.monotonic', return_value=monitor.last_sample.sampled_at + 60):
+            assert monitor.is_healthy() is False
+
+    def test_has_replayed(self):
+        """Test read-your-writes checks against the sampled replay LSN"""
+        monitor = _make_monitor(replay_lsn='0/5000')
+        monitor.sample()
+
+        assert monitor.has_replayed('0/4FFF')
+        assert not monitor.has_replayed('0/5001')
+
+
+class TestLagAwareRouting:
+    """Test DatabaseRouter read routing with the lag monitor and commit LSN tokens"""
+
+    def test_lagging_replica_reads_from_primary(self):
+        """Test that reads leave the replica while lag is too high"""
+        monitor = _make_monitor(lag_seconds=0.0)
+        monitor.sample()
+        router, sessions = _make_router(monitor)
+        assert router.get_read_session() in sessions['replica']
+
+        monitor.engine.connect.return_value.__enter__.return_value.execute.return_value.fetchone.return_value = \
+            SimpleNamespace(lag_seconds=120.0, replay_lsn='0/5000')
+        monitor.sample()
+        assert router.get_read_session() in sessions['primary']
+
+    def test_write_records_commit_lsn(self):
+        """Test that write sessions expose the post-commit WAL position"""
+        monitor = _make_monitor()
+        router, sessions = _make_router(monitor)
+
+        with router.get_write_session_context() as session:
+            session.execute.return_value.scalar.return_value = '0/6000'
+
+        session.commit.assert_called_once()
+        assert session.info['commit_lsn'] == '0/6000'
+
+    def test_read_your_writes_waits_for_replay(self):
+        """Test that a token is served by the replica only after it has replayed the write"""
+        monitor = _make_monitor(replay_lsn='0/5000')
+        monitor.sample()
+        router, sessions = _make_router(monitor)
+
+        # Monitor already saw the position: replica, no extra query
+        session = router.get_read_session(min_lsn='0/4000')
+        assert session in sessions['replica']
+        session.execute.assert_not_called()
+
+        # Ahead of the monitor: ask the replica, which has not caught up yet
+        with patch('app.core.database_router.lsn_reached', return_value=False):
+            session = router.get_read_session(min_lsn='0/6000')
+        assert session in sessions['primary']
+        sessions['replica'][-1].close.assert_called_once()
+
+        # Replica caught up since the last sample
+        with patch('app.core.database_router.lsn_reached', return_value=True):
+            session = router.get_read_session(min_lsn='0/6000')
+        assert session in sessions['replica']
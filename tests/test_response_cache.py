@@ -0,0 +1,142 @@
+"""
+Test the tenant-scoped dashboard response cache (ETag / If-None-Match, data generations).
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI, Header, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core import response_cache
+from app.core.response_cache import ResponseCache, bump_data_generation, cached_response
+
+
+class FakeGenerations:
+    """Process-local generations; available=False simulates an unreachable Redis"""
+
+    def __init__(self, available=True):
+        self.available = available
+        self.values = {}
+
+    def get(self, tenant_id):
+        return self.values.get(tenant_id, 0) if self.available else None
+
+    def bump(self, tenant_id):
+        self.values[tenant_id] = self.values.get(tenant_id, 0) + 1
+        return self.values[tenant_id]
+
+
+def current_user(x_tenant: int = Header(...)):
+    return SimpleNamespace(tenant_id=x_tenant)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ResponseCache(max_entries=10, ttl_seconds=60, generations=FakeGenerations())
+    monkeypatch.setattr(response_cache, '_response_cache', cache)
+    return cache
+
+
+@pytest.fixture
+def app_calls():
+    app = FastAPI()
+    calls = []
+
+    @app.get("/stats")
+    @cached_response("test.stats")
+    async def stats(days: int = 30, user=Depends(current_user)):
+        calls.append((user.tenant_id, days))
+        if days > 365:
+            raise HTTPException(status_code=400, detail="Too many days")
+        return {'tenant_id': user.tenant_id, 'days': days, 'total': len(calls)}
+
+    return TestClient(app), calls, stats
+
+
+class TestCachedResponse:
+    """Test caching, revalidation and invalidation of a decorated endpoint"""
+
+    def test_repeated_request_is_served_from_cache(self, cache, app_calls):
+        """Test the second identical request does not run the endpoint"""
+        client, calls, _ = app_calls
+
+        first = client.get("/stats?days=7", headers={'X-Tenant': '1'})
+        second = client.get("/stats?days=7", headers={'X-Tenant': '1'})
+
+        assert first.json() == second.json() == {'tenant_id': 1, 'days': 7, 'total': 1}
+        assert first.headers['etag'] == second.headers['etag']
+        assert first.headers['cache-control'] == 'private, no-cache'
+        assert calls == [(1, 7)]
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'not_modified': 0, 'size': 1}
+
+    def test_matching_etag_is_not_modified(self, cache, app_calls):
+        """Test If-None-Match with the current ETag returns an empty 304"""
+        client, calls, _ = app_calls
+        etag = client.get("/stats", headers={'X-Tenant': '1'}).headers['etag']
+
+        response = client.get("/stats", headers={'X-Tenant': '1', 'If-None-Match': f'W/{etag}'})
+
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+        assert len(calls) == 1
+
+    def test_generation_bump_invalidates_tenant(self, cache, app_calls):
+        """Test an ETL completion recomputes that tenant's responses only"""
+        client, calls, _ = app_calls
+        etag = client.get("/stats", headers={'X-Tenant': '1'}).headers['etag']
+        client.get("/stats", headers={'X-Tenant': '2'})
+
+        bump_data_generation(1)
+        refreshed = client.get("/stats", headers={'X-Tenant': '1', 'If-None-Match': etag})
+        client.get("/stats", headers={'X-Tenant': '2'})
+
+        assert refreshed.status_code == 200
+        assert refreshed.headers['etag'] != etag
+        assert calls == [(1, 30), (2, 30), (1, 30)]
+
+    def test_query_parameters_and_tenants_are_part_of_the_key(self, cache, app_calls):
+        """Test different parameters or tenants never share an entry"""
+        client, calls, _ = app_calls
+
+        client.get("/stats?days=7", headers={'X-Tenant': '1'})
+        client.get("/stats?days=14", headers={'X-Tenant': '1'})
+        other = client.get("/stats?days=7", headers={'X-Tenant': '2'})
+
+        assert other.json()['tenant_id'] == 2
+        assert calls == [(1, 7), (1, 14), (2, 7)]
+
+    def test_errors_are_not_cached(self, cache, app_calls):
+        """Test an HTTPException passes through and is raised again next time"""
+        client, calls, _ = app_calls
+
+        assert client.get("/stats?days=999", headers={'X-Tenant': '1'}).status_code == 400
+        assert client.get("/stats?days=999", headers={'X-Tenant': '1'}).status_code == 400
+        assert len(calls) == 2
+        assert cache.stats()['size'] == 0
+
+    def test_unavailable_generation_bypasses_cache(self, monkeypatch, app_calls):
+        """Test requests are computed every time when the generation cannot be read"""
+        monkeypatch.setattr(response_cache, '_response_cache',
+                            ResponseCache(max_entries=10, ttl_seconds=60, generations=FakeGenerations(available=False)))
+        client, calls, _ = app_calls
+
+        client.get("/stats", headers={'X-Tenant': '1'})
+        response = client.get("/stats", headers={'X-Tenant': '1'})
+
+        assert response.json()['total'] == 2
+        assert 'etag' not in response.headers
+
+    def test_direct_call_bypasses_cache(self, cache, app_calls):
+        """Test calling the endpoint function without a request returns its plain result"""
+        import asyncio
+        _, calls, stats = app_calls
+
+        result = asyncio.run(stats(days=5, user=SimpleNamespace(tenant_id=3)))
+
+        assert result == {'tenant_id': 3, 'days': 5, 'total': 1}
+        assert cache.stats()['size'] == 0
@@ -0,0 +1,57 @@
+"""
+Test trigram-backed substring search helpers and their migration.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import importlib.util
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.text_search import TRIGRAM_INDEXED_COLUMNS, contains, escape_like, trigram_index_name
+from app.models.unified_models import Base, WorkItem
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location(
+        'migration_0008', 'services/backend-service/scripts/migrations/0008_trigram_search_indexes.py'
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestContains:
+    """Test the substring filter expression"""
+
+    def test_wildcards_are_matched_literally(self):
+        """Test % and _ in user input do not act as LIKE wildcards"""
+        assert escape_like('50%_a/b') == '50/%/_a//b'
+
+    def test_pattern_is_a_single_bound_parameter(self):
+        """Test the filter renders as ILIKE on the bare column (index-matchable) with an ESCAPE clause"""
+        compiled = contains(WorkItem.assignee, 'jo_hn').compile(dialect=postgresql.dialect())
+
+        assert str(compiled).startswith("work_items.assignee ILIKE %(assignee_1)s")
+        assert str(compiled).endswith("ESCAPE '/'")
+        assert compiled.params == {'assignee_1': '%jo/_hn%'}
+
+
+class TestTrigramMigration:
+    """Test migration 0008 indexes exactly the searchable columns"""
+
+    def test_migration_covers_searchable_columns(self):
+        """Test every column in TRIGRAM_INDEXED_COLUMNS gets an index and nothing else does"""
+        migration = _load_migration()
+
+        declared = {(table, column) for table, columns in TRIGRAM_INDEXED_COLUMNS.items() for column in columns}
+        assert set(migration.TRIGRAM_COLUMNS) == declared
+
+    def test_searchable_columns_exist(self):
+        """Test the registry only names real model columns"""
+        tables = Base.metadata.tables
+        for table, columns in TRIGRAM_INDEXED_COLUMNS.items():
+            for column in columns:
+                assert column in tables[table].c, f"{table}.{column}"
+                assert trigram_index_name(table, column) == f"idx_{table}_{column}_trgm"
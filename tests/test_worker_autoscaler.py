@@ -0,0 +1,152 @@
+"""
+Test queue-depth driven autoscaling of the in-process worker pools.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+import threading
+from unittest.mock import MagicMock, patch
+
+from app.etl.workers.worker_autoscaler import WorkerAutoscaler
+from app.etl.workers.worker_manager import WorkerManager
+
+
+class FakeWorker:
+    """Worker stand-in that blocks in start_consuming() until stopped"""
+
+    def __init__(self):
+        self.running = False
+        self.messages_processed = 0
+        self.busy_seconds = 0.0
+        self.processing = False
+        self._stopped = threading.Event()
+
+    def start_consuming(self):
+        self.running = True
+        self._stopped.wait(5)
+
+    def stop(self):
+        self.running = False
+        self._stopped.set()
+
+
+def _make_autoscaler():
+    autoscaler = WorkerAutoscaler(MagicMock(), queue_manager=MagicMock())
+    autoscaler.min_workers = 1
+    autoscaler.max_workers = 10
+    autoscaler.target_drain_seconds = 100
+    autoscaler.cooldown_seconds = 300
+    return autoscaler
+
+
+class TestScalingDecision:
+    """Test the sizing rule and its bounds"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.autoscaler = _make_autoscaler()
+
+    def test_backlog_sized_from_throughput(self):
+        """Test that 1000 messages at 2 msg/s per worker need 5 workers to drain in 100s"""
+        decision = self.autoscaler.decide('transform', current_workers=2, message_count=1000,
+                                          throughput_per_worker=2.0, capacity_limit=50, now=1000.0)
+
+        assert decision.action == 'scale_up'
+        assert decision.target_workers == 5
+        assert decision.message_count == 1000
+
+    def test_growth_capped_by_max_and_capacity(self):
+        """Test the per-pool maximum and the shared connection budget"""
+        by_max = self.autoscaler.decide('transform', 2, 10 ** 6, 1.0, capacity_limit=50, now=1000.0)
+        by_capacity = self.autoscaler.decide('embedding', 2, 10 ** 6, 1.0, capacity_limit=4, now=1000.0)
+
+        assert by_max.target_workers == 10
+        assert by_capacity.target_workers == 4
+
+    def test_unknown_throughput_grows_one_step(self):
+        """Test that a backlog without measurements adds a single worker"""
+        decision = self.autoscaler.decide('extraction', 3, 50, None, capacity_limit=50, now=1000.0)
+
+        assert decision.target_workers == 4
+
+    def test_scale_down_waits_for_cooldown_and_steps_by_one(self):
+        """Test that an empty queue shrinks one worker at a time after the cooldown"""
+        self.autoscaler.decide('transform', 2, 1000, 1.0, capacity_limit=50, now=1000.0)
+
+        during_cooldown = self.autoscaler.decide('transform', 10, 0, None, capacity_limit=50, now=1100.0)
+        after_cooldown = self.autoscaler.decide('transform', 10, 0, None, capacity_limit=50, now=1400.0)
+
+        assert during_cooldown.action == 'hold'
+        assert during_cooldown.target_workers == 10
+        assert after_cooldown.action == 'scale_down'
+        assert after_cooldown.target_workers == 9
+
+    def test_never_below_minimum(self):
+        """Test that pools keep min_workers when idle"""
+        decision = self.autoscaler.decide('transform', 1, 0, None, capacity_limit=50, now=10 ** 6)
+
+        assert decision.action == 'hold'
+        assert decision.target_workers == 1
+
+
+class TestAutoscalerLoop:
+    """Test sampling and applying decisions"""
+
+    def test_run_once_applies_decision_and_uses_busy_throughput(self):
+        """Test that throughput comes from busy time and decisions reach the worker manager"""
+        autoscaler = _make_autoscaler()
+        manager = autoscaler.worker_manager
+        manager.running = True
+        manager.tier_workers = {'premium': {'extraction': [1], 'transform': [1, 2], 'embedding': [1]}}
+        manager.get_worker_capacity.return_value = {'max_recommended_workers': 64}
+        manager.get_busy_worker_count.return_value = 0
+        manager.get_pool_counters.side_effect = lambda queue_type: {
+            'transform': (0, 0.0)
+        }.get(queue_type, (0, 0.0))
+        manager.scale_queue_type_workers.side_effect = lambda queue_type, target: target
+        autoscaler.queue_manager.get_tier_queue_name.side_effect = lambda tier, queue_type: f"{queue_type}_queue_{tier}"
+        autoscaler.queue_manager.get_queue_stats.side_effect = lambda name, include_tenant_queues=False: {
+            'message_count': 800 if name.startswith('transform') else 0, 'consumer_count': 0
+        }
+
+        autoscaler.run_once()  # First sample: no throughput yet
+        manager.get_pool_counters.side_effect = lambda queue_type: (
+            (100, 25.0) if queue_type == 'transform' else (0, 0.0)
+        )
+        decisions = autoscaler.run_once()
+
+        assert decisions['transform'].throughput_per_worker == 4.0
+        assert decisions['transform'].target_workers == 2  # 800 / (4 msg/s * 100s)
+        manager.scale_queue_type_workers.assert_any_call('transform', 3)  # First run: +1 step
+
+    def test_stopped_pools_not_restarted(self):
+        """Test that the autoscaler does nothing after workers are stopped"""
+        autoscaler = _make_autoscaler()
+        autoscaler.worker_manager.running = False
+
+        autoscaler.run_once()
+
+        autoscaler.queue_manager.get_queue_stats.assert_not_called()
+        autoscaler.worker_manager.scale_queue_type_workers.assert_not_called()
+
+
+class TestPoolScaling:
+    """Test WorkerManager.scale_queue_type_workers with real threads"""
+
+    def test_scale_up_then_drain_down(self):
+        """Test that scale-down stops the highest-numbered workers and keeps their counters"""
+        manager = WorkerManager()
+        with patch.object(WorkerManager, 'create_worker', side_effect=lambda *args: FakeWorker()):
+            assert manager.scale_queue_type_workers('transform', 3) == 3
+
+        removed = manager.tier_workers['premium']['transform'][2]
+        removed.messages_processed = 7
+        removed.busy_seconds = 1.5
+
+        assert manager.scale_queue_type_workers('transform', 1) == 1
+        assert set(manager.workers) == {'transform_premium_worker_0'}
+        assert removed.running is False
+        assert manager.get_pool_counters('transform') == (7, 1.5)
+
+        manager.scale_queue_type_workers('transform', 0)
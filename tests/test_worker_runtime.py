@@ -0,0 +1,132 @@
+"""
+Test the standalone multi-process ETL worker runtime.
+"""
+
+import sys
+sys.path.insert(0, 'services/backend-service')
+
+from unittest.mock import MagicMock, patch
+
+from app.etl.workers.run import WorkerProcessSupervisor, resolve_worker_counts, _parse_args
+from app.etl.workers.worker_manager import WorkerManager
+
+
+def _fake_process(alive=True, pid=100):
+    process = MagicMock()
+    process.is_alive.return_value = alive
+    process.pid = pid
+    process.exitcode = None if alive else 1
+    return process
+
+
+class TestWorkerCounts:
+    """Test how CLI options and system_settings combine"""
+
+    def test_defaults_come_from_configuration(self):
+        """Test that counts fall back to the configured pool sizes"""
+        counts = resolve_worker_counts(_parse_args([]), {'extraction': 5, 'transform': 3, 'embedding': 2})
+
+        assert counts == {'extraction': 5, 'transform': 3, 'embedding': 2}
+
+    def test_cli_overrides_and_queue_type_filter(self):
+        """Test explicit counts and disabled queue types"""
+        args = _parse_args(['--queue-types', 'transform,embedding', '--transform', '8'])
+        counts = resolve_worker_counts(args, {'extraction': 5, 'transform': 3, 'embedding': 2})
+
+        assert counts == {'extraction': 0, 'transform': 8, 'embedding': 2}
+
+    def test_unknown_queue_type_rejected(self):
+        """Test that typos in --queue-types fail fast"""
+        try:
+            resolve_worker_counts(_parse_args(['--queue-types', 'transfrom']), {})
+            assert False, "expected ValueError"
+        except ValueError as e:
+            assert 'transfrom' in str(e)
+
+
+class TestWorkerProcessSupervisor:
+    """Test process supervision, status and drain"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.supervisor = WorkerProcessSupervisor('premium', {'extraction': 1, 'transform': 2}, drain_timeout=1)
+        self.supervisor._registry = MagicMock()
+
+    def test_dead_process_restarted(self):
+        """Test that an exited worker is replaced while running"""
+        self.supervisor.processes = {
+            'extraction_premium_worker_0': _fake_process(),
+            'transform_premium_worker_0': _fake_process(alive=False),
+            'transform_premium_worker_1': _fake_process()
+        }
+
+        with patch.object(self.supervisor, '_start_process') as mock_start:
+            self.supervisor.check_processes()
+
+        mock_start.assert_called_once_with('transform_premium_worker_0', 'transform', 0)
+        assert self.supervisor.restarts['transform_premium_worker_0'] == 1
+
+    def test_no_restart_while_draining(self):
+        """Test that processes exiting during shutdown stay stopped"""
+        self.supervisor.processes = {'extraction_premium_worker_0': _fake_process(alive=False)}
+        self.supervisor.request_stop()
+
+        with patch.object(self.supervisor, '_start_process') as mock_start:
+            self.supervisor.check_processes()
+
+        mock_start.assert_not_called()
+
+    def test_drain_terminates_then_kills_stragglers(self):
+        """Test SIGTERM for all workers and kill only for those still alive after the timeout"""
+        finished = _fake_process()
+        finished.is_alive.side_effect = [True, False]
+        stuck = _fake_process()
+        self.supervisor.processes = {'a': finished, 'b': stuck}
+
+        self.supervisor.drain()
+
+        finished.terminate.assert_called_once()
+        stuck.terminate.assert_called_once()
+        finished.kill.assert_not_called()
+        stuck.kill.assert_called_once()
+        self.supervisor._registry.remove.assert_called_once_with(self.supervisor.runtime_id)
+
+    def test_status_lists_every_process(self):
+        """Test the heartbeat payload"""
+        self.supervisor.processes = {'extraction_premium_worker_0': _fake_process(pid=42)}
+
+        status = self.supervisor.get_status()
+
+        assert status['tier'] == 'premium'
+        assert len(status['processes']) == 3
+        assert status['processes'][0] == {
+            'worker_key': 'extraction_premium_worker_0', 'queue_type': 'extraction', 'worker_number': 0,
+            'pid': 42, 'alive': True, 'restarts': 0
+        }
+        assert status['processes'][1]['alive'] is False
+
+
+class TestStandaloneWorkerStatus:
+    """Test that /workers/status includes standalone worker processes"""
+
+    def test_runtime_processes_merged_into_pools(self):
+        """Test that heartbeats appear as pool instances"""
+        registry = MagicMock()
+        registry.get_runtimes.return_value = [{
+            'runtime_id': 'host-a:1',
+            'tier': 'premium',
+            'last_heartbeat': 1.0,
+            'processes': [
+                {'worker_key': 'transform_premium_worker_0', 'queue_type': 'transform', 'worker_number': 0, 'pid': 11, 'alive': True},
+                {'worker_key': 'transform_premium_worker_1', 'queue_type': 'transform', 'worker_number': 1, 'pid': 12, 'alive': False}
+            ]
+        }]
+
+        with patch('app.etl.workers.worker_registry.get_worker_registry', return_value=registry):
+            status = WorkerManager().get_worker_status()
+
+        pool = status['workers']['premium_transform']
+        assert status['running'] is True
+        assert pool['count'] == 2
+        assert [instance['pid'] for instance in pool['instances']] == [11, 12]
+        assert pool['instances'][0]['runtime_id'] == 'host-a:1'